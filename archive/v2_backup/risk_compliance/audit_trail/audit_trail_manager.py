@@ -20,6 +20,9 @@ try:
 except ImportError:
     MONGODB_AVAILABLE = False
 
+from .segment_store import AuditSegmentStore
+from .audit_writer import AuditLogWriter
+
 # Initialize logger
 logger = logging.getLogger(__name__)
 
@@ -127,14 +130,64 @@ class AuditTrailManager:
         self.file_logger.setLevel(logging.INFO)
         self.file_logger.addHandler(file_handler)
         
+        # Segmented, indexed store used for queries
+        self.audit_store = AuditSegmentStore(
+            f"{self.log_dir}/{env_prefix}_segments",
+            segment_seconds=self.config.get("segment_seconds", 3600),
+            block_records=self.config.get("segment_block_records", 256),
+            max_workers=self.config.get("query_workers", 4)
+        )
+        
+        # Group-committed, hash-chained writes to the segment store
+        self.audit_writer = AuditLogWriter(
+            self.audit_store,
+            max_batch_size=self.config.get("commit_batch_size", 512),
+            max_latency_ms=self.config.get("commit_latency_ms", 5.0),
+            sync=self.config.get("fsync", True)
+        )
+        if not self.audit_store.segments and os.path.getsize(self.log_file) > 0:
+            self._import_log_file(self.log_file)
+        
         logger.info(f"File-based audit trail storage initialized at {self.log_file}")
     
+    def _import_log_file(self, log_file: str) -> int:
+        """
+        Load the events of an existing audit log file into the segment store
+        
+        Args:
+            log_file (str): Path of the audit log file
+            
+        Returns:
+            int: Number of events imported
+        """
+        imported = 0
+        with open(log_file, 'r') as f:
+            for line in f:
+                json_start = line.find('{')
+                if json_start == -1:
+                    continue
+                try:
+                    self.audit_writer.write(json.loads(line[json_start:]))
+                    imported += 1
+                except json.JSONDecodeError:
+                    continue
+        self.audit_writer.flush()
+        
+        logger.info(f"Imported {imported} audit events from {log_file}")
+        return imported
+    
     def log_event(self, event_type: str, user_id: str = None, description: str = None, 
                 entity_type: str = None, entity_id: str = None,
                 status: str = "SUCCESS", metadata: Dict[str, Any] = None) -> str:
         """
         Log an audit event to the audit trail
         
+        Returns once the event is committed to the segment store, or after
+        "commit_timeout_seconds" if the commit takes longer (the event is
+        then still committed when the writer catches up). With
+        "wait_for_commit" set to False in the audit configuration it returns
+        straight away and the event is committed with the next group commit.
+        
         Args:
             event_type (str): Type of event (e.g., "login", "transaction", "account_create")
             user_id (str, optional): ID of the user performing the action
@@ -182,15 +235,20 @@ class AuditTrailManager:
                 # Store in MongoDB
                 self.audit_collection.insert_one(event)
             
-            # Always log to file as backup
-            if hasattr(self, 'file_logger'):
+            if hasattr(self, 'audit_writer'):
+                committed = self.audit_writer.write(event)
+                if self.config.get("wait_for_commit", True):
+                    committed.result(timeout=self.config.get("commit_timeout_seconds", 5.0))
+            
+            # Plain-text copy of the audit trail, unless disabled
+            if hasattr(self, 'file_logger') and self.config.get("text_log", True):
                 self.file_logger.info(json.dumps(event))
                 
             return event_id
         except Exception as e:
             logger.error(f"Failed to store audit event: {str(e)}")
             # Emergency fallback - log to application log
-            logger.info(f"AUDIT: {json.dumps(event)}")
+            logger.info(f"AUDIT: {json.dumps(event, default=str)}")
             return event_id
     
     def query_events(self, filters: Dict[str, Any] = None, 
@@ -209,7 +267,10 @@ class AuditTrailManager:
         Returns:
             List[Dict]: List of matching audit events
         """
-        query = filters or {}
+        # Copy so the caller's filters are not changed; the segment store
+        # takes the field filters and the time range separately
+        filters = dict(filters or {})
+        query = dict(filters)
         
         # Add time range if provided
         if start_time or end_time:
@@ -240,7 +301,16 @@ class AuditTrailManager:
                 logger.error(f"Failed to query MongoDB audit trail: {str(e)}")
                 # Fall back to file-based query
         
-        # If MongoDB unavailable or query failed, try to parse from file
+        # Otherwise use the indexed segment store
+        if hasattr(self, 'audit_store'):
+            try:
+                self.audit_writer.flush()
+                return self.audit_store.query(filters, start_time, end_time, limit)
+            except Exception as e:
+                logger.error(f"Failed to query audit segment store: {str(e)}")
+                # Fall back to scanning the log file
+        
+        # If the stores are unavailable or failed, try to parse from file
         if hasattr(self, 'log_file'):
             try:
                 results = []
@@ -286,6 +356,20 @@ class AuditTrailManager:
         # Return empty list if all queries fail
         return []
     
+    def verify_integrity(self, workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Verify the hash chain and Merkle roots of the stored audit trail
+        
+        Args:
+            workers (int, optional): Worker processes for segment verification
+            
+        Returns:
+            Dict: Verification report with a "valid" flag and any errors
+        """
+        if not hasattr(self, 'audit_writer'):
+            return {"valid": False, "errors": ["No segment store configured"]}
+        return self.audit_writer.verify(workers)
+    
     def generate_report(self, report_type: str, filters: Dict[str, Any] = None,
                        start_time: datetime.datetime = None,
                        end_time: datetime.datetime = None) -> Dict[str, Any]:
@@ -463,4 +547,5 @@ audit_trail = AuditTrailManager()
 # Export main functions for easy access
 log_event = audit_trail.log_event
 query_events = audit_trail.query_events
-generate_report = audit_trail.generate_report
\ No newline at end of file
+generate_report = audit_trail.generate_report
+verify_integrity = audit_trail.verify_integrity
\ No newline at end of file
@@ -0,0 +1,542 @@
+"""
+Tamper-evident Audit Log Writer for Core Banking System
+
+This module writes audit events to the segment store in group commits:
+events queue for at most a configurable latency, each batch is written
+with a single write and a single fsync, and a commit record after the
+batch holds the Merkle root of its events chained by hash to the
+previous batch. Each segment is sealed with the Merkle root of its batch
+roots, and verification re-derives all of it, one process per segment.
+"""
+
+import os
+import json
+import time
+import queue
+import hashlib
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
+
+from .segment_store import (AuditSegment, AuditSegmentStore, SEGMENT_HEADER, RECORD_HEADER, EVENT_RECORD,
+                            COMMIT_RECORD, read_records, to_epoch)
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Previous hash of the first batch in a store
+GENESIS_HASH = "0" * 64
+
+# Number of recent commit latencies kept for percentiles
+LATENCY_SAMPLES = 10000
+
+_STOP = object()
+
+
+def leaf_hash(payload: bytes) -> bytes:
+    """Hash of one event record payload (domain-separated from inner nodes)"""
+    return hashlib.sha256(b"\x00" + payload).digest()
+
+
+def merkle_root(leaves: List[bytes]) -> bytes:
+    """
+    Compute the Merkle root of a list of hashes
+
+    An odd node at the end of a level is carried up unchanged rather than
+    paired with itself, so distinct leaf lists never share a root.
+
+    Args:
+        leaves (List[bytes]): Leaf hashes
+
+    Returns:
+        bytes: Root hash (the hash of nothing for an empty list)
+    """
+    if not leaves:
+        return hashlib.sha256(b"").digest()
+    level = leaves
+    while len(level) > 1:
+        paired = [hashlib.sha256(b"\x01" + level[i] + level[i + 1]).digest()
+                  for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0]
+
+
+def chain_hash(previous: str, root: bytes) -> str:
+    """Hash linking a batch's Merkle root to the previous batch hash"""
+    return hashlib.sha256(bytes.fromhex(previous) + root).hexdigest()
+
+
+def _read_chain(data: bytes) -> Dict[str, Any]:
+    """
+    Re-derive the hash chain of one segment's contents
+
+    Returns:
+        Dict: Record and batch counts, the batch roots, the first batch's
+            previous hash and the last batch hash, the leaves of trailing
+            events without a commit record, the offset where readable
+            records end, and any errors found
+    """
+    errors = []
+    pending: List[bytes] = []
+    batch_roots: List[bytes] = []
+    first_prev = None
+    last_hash = None
+    records = 0
+    end = SEGMENT_HEADER.size
+
+    try:
+        for offset, kind, _, payload, checksum_ok in read_records(data):
+            end = offset + RECORD_HEADER.size + len(payload)
+            if not checksum_ok:
+                errors.append(f"checksum mismatch in record at offset {offset}")
+            if kind == EVENT_RECORD:
+                pending.append(leaf_hash(payload))
+                records += 1
+                continue
+            if kind != COMMIT_RECORD:
+                errors.append(f"unknown record kind {kind} at offset {offset}")
+                continue
+
+            try:
+                commit = json.loads(payload)
+                root = merkle_root(pending)
+                if commit["count"] != len(pending):
+                    errors.append(f"commit at offset {offset} covers {commit['count']} events, found {len(pending)}")
+                if commit["root"] != root.hex():
+                    errors.append(f"Merkle root mismatch for batch committed at offset {offset}")
+                if last_hash is None:
+                    first_prev = commit["prev"]
+                elif commit["prev"] != last_hash:
+                    errors.append(f"hash chain broken at offset {offset}")
+                if chain_hash(commit["prev"], root) != commit["hash"]:
+                    errors.append(f"batch hash mismatch at offset {offset}")
+                last_hash = commit["hash"]
+                batch_roots.append(root)
+            except (ValueError, KeyError, TypeError) as e:
+                errors.append(f"unreadable commit record at offset {offset}: {str(e)}")
+            pending = []
+    except ValueError as e:
+        # Missing or unsupported segment header: nothing in the file is readable
+        errors.append(str(e))
+        end = len(data)
+
+    return {
+        "records": records,
+        "batches": len(batch_roots),
+        "batch_roots": batch_roots,
+        "first_prev": first_prev,
+        "last_hash": last_hash,
+        "pending": pending,
+        "end": end,
+        "errors": errors
+    }
+
+
+def verify_segment(path: str) -> Dict[str, Any]:
+    """
+    Verify the records, batch roots and internal hash chain of one segment file
+
+    Runs in a worker process during parallel verification.
+
+    Args:
+        path (str): Segment file path
+
+    Returns:
+        Dict: Counts, the first batch's previous hash, the last batch hash,
+            the segment Merkle root, uncommitted events and errors
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    chain = _read_chain(data)
+
+    errors = chain["errors"]
+    if chain["end"] < len(data):
+        errors.append(f"{len(data) - chain['end']} trailing bytes do not form a complete record")
+
+    return {
+        "path": path,
+        "records": chain["records"],
+        "batches": chain["batches"],
+        "first_prev": chain["first_prev"],
+        "last_hash": chain["last_hash"],
+        "merkle_root": merkle_root(chain["batch_roots"]).hex() if chain["batch_roots"] else None,
+        "uncommitted": len(chain["pending"]),
+        "errors": errors
+    }
+
+
+class AuditLogWriter:
+    """
+    Group-committing, hash-chaining writer on top of an AuditSegmentStore
+
+    Events are queued and written by a single committer thread, so commit
+    records are appended in chain order. An event arriving on its own is
+    committed straight away; events that queue up behind a commit are
+    gathered into the next batch, which closes when it reaches
+    max_batch_size events, when its first event has waited max_latency_ms,
+    or before an event of a later rotation period, so every batch goes to
+    a single segment. On startup the chain head is recovered from the
+    store, and events left without a commit record by a crash are committed.
+
+    A batch whose write fails is cut off its segment again and its events
+    are reported as failed. Only if that cut fails too, and the batch is
+    found in the log after recovery, are its events reported as committed.
+    """
+
+    def __init__(self,
+                 store: AuditSegmentStore,
+                 max_batch_size: int = 512,
+                 max_latency_ms: float = 5.0,
+                 sync: bool = True):
+        """
+        Initialize the writer
+
+        Args:
+            store (AuditSegmentStore): Store the batches are written to
+            max_batch_size (int): Most events per group commit
+            max_latency_ms (float): Longest time an event waits for others to join its
+                batch; only spent when several events are queued together
+            sync (bool): fsync each batch before reporting it committed
+        """
+        self.store = store
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_latency_seconds = max(0.0, max_latency_ms) / 1000.0
+        self.sync = sync
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition()
+        self._submitted = 0
+        self._committed = 0
+        self._cancelled = 0
+
+        # Chain state
+        self._head = GENESIS_HASH
+        self._segment_number: Optional[int] = None
+        self._segment_roots: List[bytes] = []
+
+        # Metrics
+        self._batches = 0
+        self._errors = 0
+        self._write_seconds = 0.0
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+
+        store.seal_listeners.append(self._on_seal)
+        self._recover()
+
+    @property
+    def chain_head(self) -> str:
+        """Hash of the last committed batch, suitable for external anchoring"""
+        return self._head
+
+    def _recover(self):
+        """Restore the chain state from the store and commit a torn final batch"""
+        self._head = GENESIS_HASH
+        self._segment_number = None
+        self._segment_roots = []
+        if not self.store.segments:
+            return
+
+        last = self.store.segments[-1]
+        with open(last.path, "rb") as f:
+            chain = _read_chain(f.read())
+        self._segment_number = last.number
+        self._segment_roots = chain["batch_roots"]
+
+        if chain["last_hash"] is not None:
+            self._head = chain["last_hash"]
+        else:
+            # Find the head in earlier segments
+            for segment in reversed(self.store.segments[:-1]):
+                head = segment.metadata.get("chain_head")
+                if head is None:
+                    with open(segment.path, "rb") as f:
+                        head = _read_chain(f.read())["last_hash"]
+                if head is not None:
+                    self._head = head
+                    break
+
+        if chain["pending"]:
+            pending = chain["pending"]
+            self.store.append_batch(
+                [],
+                commit=lambda segment, payloads: self._commit_record(segment, pending, recovered=True),
+                sync=self.sync,
+                timestamp=last.bucket
+            )
+            logger.warning(f"Committed {len(pending)} audit events left uncommitted in {last.path}")
+
+    def _commit_record(self, segment: AuditSegment, leaves: List[bytes], recovered: bool = False) -> bytes:
+        """Chain a batch of event leaves and build its commit record (called under the store lock)"""
+        if segment.number != self._segment_number:
+            self._segment_number = segment.number
+            self._segment_roots = []
+
+        root = merkle_root(leaves)
+        previous = self._head
+        self._head = chain_hash(previous, root)
+        self._segment_roots.append(root)
+
+        commit = {"count": len(leaves), "prev": previous, "root": root.hex(), "hash": self._head}
+        if recovered:
+            commit["recovered"] = True
+        return json.dumps(commit).encode("utf-8")
+
+    def _on_seal(self, segment: AuditSegment):
+        """Record the segment Merkle root and chain head in a sealed segment's index"""
+        if segment.number == self._segment_number and self._segment_roots:
+            segment.metadata["merkle_root"] = merkle_root(self._segment_roots).hex()
+            segment.metadata["chain_head"] = self._head
+
+    def start(self):
+        """Start the committer thread if it is not running"""
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(target=self._run, name="audit-committer", daemon=True)
+            self._worker.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Commit the queued events and stop the committer thread
+
+        Args:
+            timeout (float, optional): Seconds to wait for the thread
+        """
+        with self._lock:
+            worker = self._worker
+            if worker is None:
+                return
+            self._queue.put(_STOP)
+            self._worker = None
+        worker.join(timeout)
+
+    def write(self, event: Dict[str, Any]) -> Future:
+        """
+        Queue an event for the next group commit
+
+        The event is JSON-encoded here, so an event that cannot be encoded
+        fails only its own future.
+
+        Args:
+            event (Dict): Audit event
+
+        Returns:
+            Future: Resolves to True once the event's batch is written (and
+                synced); cancelling it before then keeps the event out of the log
+        """
+        future = Future()
+        try:
+            payload = json.dumps(event).encode("utf-8")
+        except (TypeError, ValueError) as e:
+            future.set_exception(e)
+            return future
+        event_time = to_epoch(event.get("timestamp"))
+        if event_time is None:
+            event_time = time.time()
+
+        if self._worker is None:
+            self.start()
+        with self._idle:
+            self._submitted += 1
+        self._queue.put((event, payload, event_time, future, time.perf_counter()))
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every event written so far has been committed
+
+        Args:
+            timeout (float, optional): Longest wait in seconds
+
+        Returns:
+            bool: True if nothing is left uncommitted
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._committed >= self._submitted, timeout)
+
+    def _run(self):
+        """Committer loop: gather a batch within the latency bound and commit it"""
+        carried = None
+        stopping = False
+        while not stopping:
+            first = carried if carried is not None else self._queue.get()
+            carried = None
+            if first is _STOP:
+                break
+            batch = [first]
+            period = self._period(first[2])
+            deadline = time.perf_counter() + self.max_latency_seconds
+
+            while len(batch) < self.max_batch_size:
+                try:
+                    # Only wait for more when others arrived with the first
+                    remaining = deadline - time.perf_counter()
+                    if len(batch) > 1 and remaining > 0:
+                        item = self._queue.get(timeout=remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                if self._period(item[2]) > period:
+                    # Starts a new segment: it opens the next batch
+                    carried = item
+                    break
+                batch.append(item)
+
+            try:
+                self._commit(batch)
+            except Exception as e:
+                logger.error(f"Audit committer failed on a batch of {len(batch)} events: {str(e)}")
+
+    def _period(self, event_time: float) -> int:
+        """Rotation period of an event time"""
+        return int(event_time // self.store.segment_seconds)
+
+    def _commit(self, batch: List[Tuple[Dict[str, Any], bytes, float, Future, float]]):
+        """Write one batch with its commit record and resolve its futures"""
+        # Cancelled events are left out; the others can no longer be cancelled
+        live = [item for item in batch if item[3].set_running_or_notify_cancel()]
+        try:
+            if live:
+                self._write_batch(live)
+        finally:
+            with self._idle:
+                self._cancelled += len(batch) - len(live)
+                self._committed += len(batch)
+                self._idle.notify_all()
+
+    def _write_batch(self, batch: List[Tuple[Dict[str, Any], bytes, float, Future, float]]):
+        """Append a batch to the store and resolve its futures"""
+        previous = self._head
+        started = time.perf_counter()
+        try:
+            self.store.append_batch(
+                [event for event, _, _, _, _ in batch],
+                commit=lambda segment, payloads: self._commit_record(segment, [leaf_hash(p) for p in payloads]),
+                sync=self.sync,
+                payloads=[payload for _, payload, _, _, _ in batch],
+                event_times=[event_time for _, _, event_time, _, _ in batch]
+            )
+        except Exception as e:
+            logger.error(f"Audit group commit of {len(batch)} events failed: {str(e)}")
+            # The chain head advanced before the write; take it from disk again
+            try:
+                self._recover()
+                on_disk = self._head != previous
+            except Exception as recover_error:
+                logger.error(f"Could not recover the audit chain: {str(recover_error)}")
+                on_disk = False
+            if not on_disk:
+                self._errors += len(batch)
+                for _, _, _, future, _ in batch:
+                    future.set_exception(e)
+                return
+            logger.warning(f"Audit batch of {len(batch)} events is in the log despite the failed write")
+
+        finished = time.perf_counter()
+        self._batches += 1
+        self._write_seconds += finished - started
+        for _, _, _, future, submitted in batch:
+            self._latencies.append(finished - submitted)
+            future.set_result(True)
+
+    def verify(self, workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Verify every segment and the chain linking them
+
+        Segments are verified independently, in parallel worker processes;
+        the links between segments and the Merkle roots recorded when
+        segments were sealed are then checked in order.
+
+        Args:
+            workers (int, optional): Worker processes, one per CPU if None;
+                1 verifies in this process
+
+        Returns:
+            Dict: valid flag, segment/record/batch counts, chain head,
+                per-segment Merkle roots, errors and elapsed time
+        """
+        self.flush()
+        started = time.perf_counter()
+        segments = list(self.store.segments)
+        paths = [segment.path for segment in segments]
+
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+                results = list(pool.map(verify_segment, paths, chunksize=max(1, len(paths) // (4 * workers))))
+        else:
+            results = [verify_segment(path) for path in paths]
+
+        errors = []
+        previous = GENESIS_HASH
+        roots = {}
+        for segment, result in zip(segments, results):
+            name = os.path.basename(segment.path)
+            errors.extend(f"{name}: {error}" for error in result["errors"])
+            if result["batches"]:
+                if result["first_prev"] != previous:
+                    errors.append(f"{name}: hash chain broken from the previous segment")
+                previous = result["last_hash"]
+            if result["uncommitted"]:
+                errors.append(f"{name}: {result['uncommitted']} events without a commit record")
+            recorded = segment.metadata.get("merkle_root")
+            if recorded is not None and recorded != result["merkle_root"]:
+                errors.append(f"{name}: Merkle root differs from the one recorded at sealing")
+            roots[name] = result["merkle_root"]
+
+        if results and previous != self._head:
+            errors.append("chain head on disk differs from the writer's chain head")
+
+        return {
+            "valid": not errors,
+            "segments": len(results),
+            "records": sum(result["records"] for result in results),
+            "batches": sum(result["batches"] for result in results),
+            "chain_head": previous,
+            "merkle_roots": roots,
+            "errors": errors,
+            "elapsed_seconds": time.perf_counter() - started
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get group commit metrics
+
+        Returns:
+            Dict: Committed events and batches, mean batch size, mean write
+                (and fsync) time per batch, and commit latency percentiles
+                in milliseconds
+        """
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+        committed = self._committed - self._errors - self._cancelled
+        return {
+            "events_committed": committed,
+            "batches": self._batches,
+            "errors": self._errors,
+            "cancelled": self._cancelled,
+            "queued": self._submitted - self._committed,
+            "mean_batch_size": committed / self._batches if self._batches else 0.0,
+            "mean_batch_write_ms": self._write_seconds / self._batches * 1000 if self._batches else 0.0,
+            "commit_latency_ms": {
+                "p50": percentile(0.50),
+                "p99": percentile(0.99),
+                "max": latencies[-1] * 1000 if latencies else 0.0
+            },
+            "chain_head": self._head
+        }
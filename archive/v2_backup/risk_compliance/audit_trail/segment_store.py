@@ -0,0 +1,618 @@
+"""
+Segmented Audit Event Store for Core Banking System
+
+This module stores audit events in append-only segment files rotated by
+time. A segment file starts with a magic string and format version; each
+record is a small binary header (payload length, CRC32, event timestamp
+and record kind) followed by the event as JSON. Records are grouped into
+blocks, and every segment keeps its timestamp range and sparse indexes
+mapping event_type/user_id values to the blocks that contain them, so a
+query only opens the segments and reads the blocks that can match.
+"""
+
+import os
+import json
+import zlib
+import struct
+import logging
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple, Iterable, Iterator, Callable
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Segment file header: magic, format version. Format 1 segments had no
+# file header and no record kind ("<IId" record headers); they are refused.
+SEGMENT_HEADER = struct.Struct("<8sH")
+SEGMENT_MAGIC = b"CBSAUDIT"
+FORMAT_VERSION = 2
+
+# Record header: payload length, payload CRC32, event time (epoch seconds), record kind
+RECORD_HEADER = struct.Struct("<IIdB")
+
+# Record kinds: audit events, and commit records written by the audit writer
+EVENT_RECORD = 0
+COMMIT_RECORD = 1
+
+# Fields with sparse block indexes
+DEFAULT_INDEX_FIELDS = ("event_type", "user_id")
+
+SEGMENT_SUFFIX = ".seg"
+INDEX_SUFFIX = ".idx"
+
+
+def to_epoch(value: Any) -> Optional[float]:
+    """
+    Convert an event timestamp to epoch seconds
+
+    Args:
+        value: datetime (naive values are UTC, as written by log_event),
+            ISO 8601 string or number
+
+    Returns:
+        float: Epoch seconds, or None if the value cannot be converted
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.timestamp()
+
+
+def encode_record(payload: bytes, timestamp: float, kind: int = EVENT_RECORD) -> bytes:
+    """Frame a payload as a segment record"""
+    return RECORD_HEADER.pack(len(payload), zlib.crc32(payload), timestamp, kind) + payload
+
+
+def check_segment_header(data: bytes, path: str = "segment"):
+    """
+    Check that segment file contents start with a supported format header
+
+    Args:
+        data (bytes): Segment file contents (at least the header)
+        path (str): File name used in the error message
+
+    Raises:
+        ValueError: If the header is missing or has another format version
+    """
+    if len(data) < SEGMENT_HEADER.size:
+        raise ValueError(f"{path} is too short for an audit segment header")
+    magic, version = SEGMENT_HEADER.unpack_from(data)
+    if magic != SEGMENT_MAGIC:
+        raise ValueError(f"{path} has no audit segment header; segments written before "
+                         f"format {FORMAT_VERSION} must be re-imported")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"{path} has audit segment format {version}, expected {FORMAT_VERSION}")
+
+
+def read_records(data: bytes) -> Iterator[Tuple[int, int, float, bytes, bool]]:
+    """
+    Iterate over the records of segment file contents
+
+    Iteration stops at a record that runs past the end of the data.
+
+    Args:
+        data (bytes): Segment file contents, including the file header
+
+    Yields:
+        Tuple: (offset, kind, timestamp, payload, checksum_ok)
+
+    Raises:
+        ValueError: If the file header is missing or unsupported
+    """
+    check_segment_header(data)
+    offset = SEGMENT_HEADER.size
+    while offset + RECORD_HEADER.size <= len(data):
+        length, checksum, timestamp, kind = RECORD_HEADER.unpack_from(data, offset)
+        end = offset + RECORD_HEADER.size + length
+        if end > len(data):
+            return
+        payload = data[offset + RECORD_HEADER.size:end]
+        yield offset, kind, timestamp, payload, zlib.crc32(payload) == checksum
+        offset = end
+
+
+class AuditSegment:
+    """Metadata and sparse indexes of one segment file"""
+
+    def __init__(self, directory: str, number: int, bucket: int, index_fields: Tuple[str, ...]):
+        self.number = number
+        self.bucket = bucket  # start of the rotation period (epoch seconds)
+        self.path = os.path.join(directory, f"{number:08d}-{bucket}{SEGMENT_SUFFIX}")
+        self.index_path = self.path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX
+        self.min_ts = float("inf")
+        self.max_ts = float("-inf")
+        self.count = 0
+        self.size = SEGMENT_HEADER.size
+        self.blocks: List[List[float]] = []  # [offset, end, min_ts, max_ts] per block
+        self.values: Dict[str, Dict[str, List[int]]] = {field: {} for field in index_fields}
+        self.metadata: Dict[str, Any] = {}  # set by seal listeners, e.g. integrity roots
+
+    def add(self, offset: int, length: int, timestamp: float, event: Dict[str, Any], block_records: int):
+        """Account for a record written at offset"""
+        if self.count % block_records == 0:
+            self.blocks.append([offset, offset, timestamp, timestamp])
+        block_number = len(self.blocks) - 1
+        block = self.blocks[block_number]
+        block[1] = offset + length
+        block[2] = min(block[2], timestamp)
+        block[3] = max(block[3], timestamp)
+
+        for field, postings in self.values.items():
+            value = event.get(field)
+            if value is not None:
+                blocks = postings.setdefault(str(value), [])
+                if not blocks or blocks[-1] != block_number:
+                    blocks.append(block_number)
+
+        self.min_ts = min(self.min_ts, timestamp)
+        self.max_ts = max(self.max_ts, timestamp)
+        self.count += 1
+        self.size = offset + length
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "number": self.number,
+            "bucket": self.bucket,
+            "min_ts": self.min_ts if self.count else None,
+            "max_ts": self.max_ts if self.count else None,
+            "count": self.count,
+            "size": self.size,
+            "blocks": self.blocks,
+            "values": self.values,
+            "metadata": self.metadata
+        }
+
+    def load(self, data: Dict[str, Any]):
+        self.min_ts = data["min_ts"] if data["min_ts"] is not None else float("inf")
+        self.max_ts = data["max_ts"] if data["max_ts"] is not None else float("-inf")
+        self.count = data["count"]
+        self.size = data["size"]
+        self.blocks = data["blocks"]
+        self.values.update(data["values"])
+        self.metadata = data.get("metadata", {})
+
+
+class AuditSegmentStore:
+    """
+    Append-only, time-segmented audit event store with a query planner
+
+    Events are appended to the active segment until one arrives for a
+    later rotation period, which seals the segment (its index is written
+    next to it) and opens a new one. Late events go to the active segment,
+    whose timestamp range simply widens. Queries are planned against the
+    in-memory segment metadata and the matching segments are read in
+    parallel, newest first, stopping once the limit is certain to be met.
+    """
+
+    def __init__(self,
+                 directory: str,
+                 segment_seconds: int = 3600,
+                 block_records: int = 256,
+                 index_fields: Iterable[str] = DEFAULT_INDEX_FIELDS,
+                 max_workers: int = 4):
+        """
+        Open or create a store
+
+        Args:
+            directory (str): Directory holding the segment and index files
+            segment_seconds (int): Rotation period of the segments
+            block_records (int): Records per indexed block
+            index_fields (Iterable[str]): Event fields with sparse indexes
+            max_workers (int): Segments read in parallel by a query
+        """
+        self.directory = directory
+        self.segment_seconds = int(segment_seconds)
+        self.block_records = int(block_records)
+        self.index_fields = tuple(index_fields)
+        self.max_workers = max(1, int(max_workers))
+
+        self.segments: List[AuditSegment] = []
+        self.seal_listeners: List[Callable[[AuditSegment], None]] = []
+        self._handle = None
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._open_segments()
+
+    def _open_segments(self):
+        """
+        Load segment metadata, rebuilding indexes that are missing or stale
+
+        Raises:
+            ValueError: If a segment has no header or another format version
+        """
+        names = sorted(name for name in os.listdir(self.directory) if name.endswith(SEGMENT_SUFFIX))
+        for name in names:
+            number, bucket = name[:-len(SEGMENT_SUFFIX)].split("-")
+            segment = AuditSegment(self.directory, int(number), int(bucket), self.index_fields)
+            size = os.path.getsize(segment.path)
+            if size == 0:
+                # Created but torn before its header was written
+                with open(segment.path, "ab") as f:
+                    f.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, FORMAT_VERSION))
+                size = SEGMENT_HEADER.size
+            with open(segment.path, "rb") as f:
+                check_segment_header(f.read(SEGMENT_HEADER.size), segment.path)
+
+            loaded = False
+            if os.path.exists(segment.index_path):
+                try:
+                    with open(segment.index_path, "r") as f:
+                        data = json.load(f)
+                    if data["size"] == size and set(data["values"]) == set(self.index_fields):
+                        segment.load(data)
+                        loaded = True
+                except (ValueError, KeyError, OSError):
+                    pass
+
+            if not loaded:
+                self._rebuild_index(segment)
+            self.segments.append(segment)
+
+        if self.segments:
+            logger.info(f"Opened audit store with {len(self.segments)} segments in {self.directory}")
+
+    def _rebuild_index(self, segment: AuditSegment):
+        """Rebuild a segment's index by scanning it, truncating a torn final record"""
+        offset = SEGMENT_HEADER.size
+        with open(segment.path, "rb") as f:
+            data = f.read()
+        for record_offset, kind, timestamp, payload, checksum_ok in read_records(data):
+            if not checksum_ok:
+                # Kept for verification to report, unless nothing valid follows it
+                logger.warning(f"Audit record at offset {record_offset} in {segment.path} fails its checksum")
+                continue
+            end = record_offset + RECORD_HEADER.size + len(payload)
+            if kind == EVENT_RECORD:
+                segment.add(record_offset, end - record_offset, timestamp, json.loads(payload), self.block_records)
+            segment.size = end
+            offset = end
+
+        if offset < len(data):
+            logger.warning(f"Truncating {len(data) - offset} bytes of incomplete audit records in {segment.path}")
+            with open(segment.path, "r+b") as f:
+                f.truncate(offset)
+        logger.info(f"Rebuilt audit segment index for {segment.path}")
+
+    def append(self, event: Dict[str, Any]) -> float:
+        """
+        Append an event to the store
+
+        Args:
+            event (Dict): Audit event with an ISO 8601 "timestamp"
+
+        Returns:
+            float: Event time used for indexing (epoch seconds)
+        """
+        timestamp = to_epoch(event.get("timestamp"))
+        if timestamp is None:
+            timestamp = datetime.datetime.now(datetime.timezone.utc).timestamp()
+        record = encode_record(json.dumps(event).encode("utf-8"), timestamp)
+
+        with self._lock:
+            segment = self._active_segment(timestamp)
+            offset = segment.size
+            self._handle.write(record)
+            self._handle.flush()
+            segment.add(offset, len(record), timestamp, event, self.block_records)
+        return timestamp
+
+    def append_batch(self,
+                     events: List[Dict[str, Any]],
+                     commit: Optional[Callable[[AuditSegment, List[bytes]], bytes]] = None,
+                     sync: bool = False,
+                     timestamp: Optional[float] = None,
+                     payloads: Optional[List[bytes]] = None,
+                     event_times: Optional[List[float]] = None) -> List[AuditSegment]:
+        """
+        Append several events, one write per segment, each optionally followed by a commit record
+
+        A batch spanning rotation periods is split where an event of a later
+        period arrives, exactly as if its events had been appended one by
+        one; every piece is written to its own segment with its own commit
+        record. A piece whose write, flush or fsync fails is cut off the
+        segment again before the error is raised; earlier pieces stay written.
+
+        Args:
+            events (List[Dict]): Audit events
+            commit (Callable, optional): Builds the commit record payload from
+                the target segment and the event payloads of one piece;
+                called under the store lock, so commit records are ordered
+                like the pieces
+            sync (bool): fsync the segment file after writing each piece
+            timestamp (float, optional): Time that selects the segment of the
+                first piece, the first event's time by default
+            payloads (List[bytes], optional): The events already JSON-encoded
+            event_times (List[float], optional): Event times (epoch seconds)
+                used for indexing, taken from the events by default
+
+        Returns:
+            List[AuditSegment]: Segments written to, in order
+        """
+        now = datetime.datetime.now(datetime.timezone.utc).timestamp()
+        if payloads is None:
+            payloads = [json.dumps(event).encode("utf-8") for event in events]
+        timestamps = event_times
+        if timestamps is None:
+            timestamps = []
+            for event in events:
+                event_time = to_epoch(event.get("timestamp"))
+                timestamps.append(now if event_time is None else event_time)
+
+        written = []
+        with self._lock:
+            if timestamp is None:
+                timestamp = timestamps[0] if timestamps else now
+            start = 0
+            while True:
+                segment = self._active_segment(timestamp)
+                end = start
+                while end < len(events) and self._bucket(timestamps[end]) <= segment.bucket:
+                    end += 1
+                if end > start or not events:
+                    self._write_piece(segment, events[start:end], timestamps[start:end],
+                                      payloads[start:end], commit, sync, now)
+                    written.append(segment)
+                if end >= len(events):
+                    break
+                start = end
+                timestamp = timestamps[start]
+        return written
+
+    def _write_piece(self,
+                     segment: AuditSegment,
+                     events: List[Dict[str, Any]],
+                     timestamps: List[float],
+                     payloads: List[bytes],
+                     commit: Optional[Callable[[AuditSegment, List[bytes]], bytes]],
+                     sync: bool,
+                     now: float):
+        """Write events (and their commit record) to the active segment with one write (lock held)"""
+        records = [encode_record(payload, event_time) for payload, event_time in zip(payloads, timestamps)]
+        if commit is not None:
+            records.append(encode_record(commit(segment, payloads), max(timestamps, default=now), COMMIT_RECORD))
+        try:
+            self._handle.write(b"".join(records))
+            self._handle.flush()
+            if sync:
+                os.fsync(self._handle.fileno())
+        except Exception:
+            self._roll_back(segment)
+            raise
+
+        offset = segment.size
+        for event, event_time, record in zip(events, timestamps, records):
+            segment.add(offset, len(record), event_time, event, self.block_records)
+            offset += len(record)
+        segment.size += sum(len(record) for record in records[len(events):])
+
+    def _roll_back(self, segment: AuditSegment):
+        """Cut a failed write off the active segment (lock held)"""
+        try:
+            self._handle.close()
+        except OSError:
+            pass
+        self._handle = None
+        try:
+            os.truncate(segment.path, segment.size)
+        except OSError as e:
+            logger.error(f"Could not roll back a failed write to {segment.path}: {str(e)}")
+
+    def _bucket(self, timestamp: float) -> int:
+        """Start of the rotation period containing a time"""
+        return int(timestamp // self.segment_seconds) * self.segment_seconds
+
+    def _active_segment(self, timestamp: float) -> AuditSegment:
+        """Get the segment to append to, rotating when a new period starts"""
+        bucket = self._bucket(timestamp)
+        active = self.segments[-1] if self.segments else None
+
+        if active is not None and bucket <= active.bucket:
+            if self._handle is None:
+                # Reopened for appends: what was recorded when it was sealed no longer holds
+                active.metadata = {}
+                self._handle = open(active.path, "ab")
+            return active
+
+        if active is not None:
+            self._seal(active)
+        number = active.number + 1 if active is not None else 1
+        segment = AuditSegment(self.directory, number, bucket, self.index_fields)
+        self.segments.append(segment)
+        self._handle = open(segment.path, "ab")
+        self._handle.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, FORMAT_VERSION))
+        return segment
+
+    def _seal(self, segment: AuditSegment):
+        """Close the active segment and write its index"""
+        for listener in self.seal_listeners:
+            listener(segment)
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        self._write_index(segment)
+
+    def _write_index(self, segment: AuditSegment):
+        temp_path = segment.index_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(segment.to_dict(), f)
+        os.replace(temp_path, segment.index_path)
+
+    def close(self):
+        """Close the active segment, writing its index"""
+        with self._lock:
+            if self.segments:
+                self._seal(self.segments[-1])
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def plan(self,
+             filters: Optional[Dict[str, Any]] = None,
+             start_time: Any = None,
+             end_time: Any = None) -> List[Tuple[AuditSegment, List[int]]]:
+        """
+        Choose the segments and blocks a query has to read
+
+        A segment is skipped if its timestamp range misses the query range
+        or an indexed filter value never occurs in it; within a segment
+        only blocks that contain every indexed filter value and overlap
+        the time range are read.
+
+        Args:
+            filters (Dict, optional): Field equality filters
+            start_time: Earliest event time (inclusive)
+            end_time: Latest event time (inclusive)
+
+        Returns:
+            List[Tuple]: (segment, block numbers) pairs, newest segment first
+        """
+        filters = filters or {}
+        start = to_epoch(start_time)
+        end = to_epoch(end_time)
+        indexed = [(field, str(value)) for field, value in filters.items()
+                   if field in self.index_fields and value is not None]
+
+        with self._lock:
+            segments = list(self.segments)
+
+        plan = []
+        for segment in sorted(segments, key=lambda s: s.max_ts, reverse=True):
+            if not segment.count:
+                continue
+            if (start is not None and segment.max_ts < start) or (end is not None and segment.min_ts > end):
+                continue
+
+            with self._lock:
+                blocks = list(segment.blocks)
+                postings = [segment.values[field].get(value) for field, value in indexed]
+
+            if any(posting is None for posting in postings):
+                continue
+            candidates = set(range(len(blocks)))
+            for posting in postings:
+                candidates.intersection_update(posting)
+
+            chosen = [number for number in sorted(candidates)
+                      if (start is None or blocks[number][3] >= start)
+                      and (end is None or blocks[number][2] <= end)]
+            if chosen:
+                plan.append((segment, [(number, list(blocks[number])) for number in chosen]))
+        return plan
+
+    def query(self,
+              filters: Optional[Dict[str, Any]] = None,
+              start_time: Any = None,
+              end_time: Any = None,
+              limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Query events, newest first
+
+        Args:
+            filters (Dict, optional): Field equality filters (e.g. {"event_type": "login"})
+            start_time: Earliest event time (inclusive)
+            end_time: Latest event time (inclusive)
+            limit (int): Maximum number of events to return
+
+        Returns:
+            List[Dict]: Matching events ordered by timestamp, newest first
+        """
+        filters = filters or {}
+        start = to_epoch(start_time)
+        end = to_epoch(end_time)
+        plan = self.plan(filters, start_time, end_time)
+
+        with self._lock:
+            if self._handle is not None:
+                self._handle.flush()
+
+        matches: List[Tuple[float, Dict[str, Any]]] = []
+        for wave_start in range(0, len(plan), self.max_workers):
+            wave = plan[wave_start:wave_start + self.max_workers]
+            if len(wave) == 1 or self.max_workers == 1:
+                found = [self._scan(segment, blocks, filters, start, end, limit) for segment, blocks in wave]
+            else:
+                found = list(self._pool().map(
+                    lambda item: self._scan(item[0], item[1], filters, start, end, limit), wave))
+            for segment_matches in found:
+                matches.extend(segment_matches)
+
+            matches.sort(key=lambda match: match[0], reverse=True)
+            del matches[limit:]
+            # Later segments are older than every match kept so far
+            remaining = plan[wave_start + self.max_workers:]
+            if len(matches) >= limit and remaining and remaining[0][0].max_ts < matches[-1][0]:
+                break
+
+        return [event for _, event in matches]
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="audit-query")
+        return self._executor
+
+    def _scan(self,
+              segment: AuditSegment,
+              blocks: List[Tuple[int, List[float]]],
+              filters: Dict[str, Any],
+              start: Optional[float],
+              end: Optional[float],
+              limit: int) -> List[Tuple[float, Dict[str, Any]]]:
+        """Read the planned blocks of one segment, newest block first"""
+        # A filter value absent from a record's raw bytes cannot match it
+        needles = [json.dumps(value).encode("utf-8") for value in filters.values()
+                   if isinstance(value, (str, int)) and not isinstance(value, bool)]
+
+        matches: List[Tuple[float, Dict[str, Any]]] = []
+        ordered = sorted(blocks, key=lambda item: item[1][3], reverse=True)
+        with open(segment.path, "rb") as f:
+            for _, (offset, block_end, block_min, block_max) in ordered:
+                if len(matches) >= limit and block_max < matches[-1][0]:
+                    break
+                f.seek(int(offset))
+                data = f.read(int(block_end - offset))
+
+                position = 0
+                while position + RECORD_HEADER.size <= len(data):
+                    length, checksum, timestamp, kind = RECORD_HEADER.unpack_from(data, position)
+                    payload_start = position + RECORD_HEADER.size
+                    position = payload_start + length
+                    if kind != EVENT_RECORD:
+                        continue
+                    if (start is not None and timestamp < start) or (end is not None and timestamp > end):
+                        continue
+                    payload = data[payload_start:position]
+                    if any(needle not in payload for needle in needles):
+                        continue
+                    if zlib.crc32(payload) != checksum:
+                        logger.warning(f"Skipping corrupt audit record at {int(offset) + payload_start} in {segment.path}")
+                        continue
+                    event = json.loads(payload)
+                    if all(field in event and event[field] == value for field, value in filters.items()):
+                        matches.append((timestamp, event))
+
+                matches.sort(key=lambda match: match[0], reverse=True)
+                del matches[limit:]
+        return matches
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get segment, record and size counts"""
+        with self._lock:
+            return {
+                "segments": len(self.segments),
+                "records": sum(segment.count for segment in self.segments),
+                "bytes": sum(segment.size for segment in self.segments),
+                "directory": self.directory
+            }
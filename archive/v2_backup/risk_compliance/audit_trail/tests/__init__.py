@@ -0,0 +1,3 @@
+"""
+Audit trail tests package.
+"""
@@ -0,0 +1,388 @@
+"""
+Audit Log Writer Tests - Audit Trail
+
+This module checks the group-committing audit writer: its hash chain and
+Merkle roots against direct recomputation, tamper detection, recovery of
+uncommitted events and the refusal of old segment formats.
+"""
+
+import os
+import json
+import struct
+import hashlib
+import logging
+import datetime
+import tempfile
+import threading
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+from ..segment_store import (AuditSegmentStore, SEGMENT_HEADER, SEGMENT_MAGIC, COMMIT_RECORD,
+                             encode_record, read_records)
+from ..audit_writer import AuditLogWriter, GENESIS_HASH, chain_hash, leaf_hash, merkle_root, verify_segment
+
+BASE = datetime.datetime(2026, 1, 1)
+SEGMENT_SECONDS = 600
+
+
+def make_event(i, seconds=None):
+    return {"event_id": i, "event_type": "login" if i % 3 else "transfer", "user_id": f"u{i % 7}",
+            "timestamp": (BASE + datetime.timedelta(seconds=i if seconds is None else seconds)).isoformat()}
+
+
+def reference_root(leaves):
+    """Merkle root by recursive halving at the largest power of two, which carrying odd nodes up matches"""
+    if not leaves:
+        return hashlib.sha256(b"").digest()
+    if len(leaves) == 1:
+        return leaves[0]
+    split = 1
+    while split * 2 < len(leaves):
+        split *= 2
+    return hashlib.sha256(b"\x01" + reference_root(leaves[:split]) + reference_root(leaves[split:])).digest()
+
+
+class TestMerkleRoot(unittest.TestCase):
+    """Tests for the Merkle root and chain hashes"""
+
+    def test_root_matches_reference(self):
+        """Test the root of every leaf count up to 40 against the recursive definition"""
+        leaves = [leaf_hash(str(i).encode()) for i in range(40)]
+        for count in range(41):
+            self.assertEqual(merkle_root(leaves[:count]), reference_root(leaves[:count]), count)
+
+    def test_odd_leaf_is_not_duplicated(self):
+        """Test that repeating the last leaf changes the root"""
+        leaves = [leaf_hash(b"a"), leaf_hash(b"b"), leaf_hash(b"c")]
+
+        self.assertNotEqual(merkle_root(leaves), merkle_root(leaves + leaves[-1:]))
+
+    def test_chain_hash(self):
+        """Test that a batch hash covers the previous hash and the root"""
+        root = merkle_root([leaf_hash(b"event")])
+
+        self.assertEqual(chain_hash(GENESIS_HASH, root),
+                         hashlib.sha256(bytes.fromhex(GENESIS_HASH) + root).hexdigest())
+
+
+class TestAuditLogWriter(unittest.TestCase):
+    """Tests for AuditLogWriter"""
+
+    def setUp(self):
+        """Set up a store directory"""
+        logging.disable(logging.WARNING)
+        self.directory = tempfile.TemporaryDirectory()
+        self.opened = []
+
+    def tearDown(self):
+        """Stop the writers, close the stores and re-enable logging"""
+        for store, writer in self.opened:
+            writer.stop(timeout=5)
+            store.close()
+        self.directory.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def open_writer(self, **kwargs):
+        store = AuditSegmentStore(self.directory.name, segment_seconds=SEGMENT_SECONDS, block_records=16)
+        kwargs.setdefault("sync", False)
+        writer = AuditLogWriter(store, **kwargs)
+        self.opened.append((store, writer))
+        return store, writer
+
+    def write_all(self, writer, events):
+        futures = [writer.write(event) for event in events]
+        self.assertTrue(writer.flush(10))
+        self.assertTrue(all(future.result(5) for future in futures))
+
+    def commits(self, store):
+        """Commit records of every segment, in order"""
+        found = []
+        for segment in store.segments:
+            with open(segment.path, "rb") as f:
+                data = f.read()
+            found.extend(json.loads(payload) for _, kind, _, payload, _ in read_records(data) if kind == COMMIT_RECORD)
+        return found
+
+    def test_chain_matches_recomputation(self):
+        """Test the commit records against rehashing the events of each batch"""
+        store, writer = self.open_writer(max_batch_size=64)
+        self.write_all(writer, [make_event(i) for i in range(2000)])
+
+        previous = GENESIS_HASH
+        committed = 0
+        for segment in store.segments:
+            with open(segment.path, "rb") as f:
+                data = f.read()
+            leaves = []
+            for _, kind, _, payload, checksum_ok in read_records(data):
+                self.assertTrue(checksum_ok)
+                if kind != COMMIT_RECORD:
+                    leaves.append(leaf_hash(payload))
+                    continue
+                commit = json.loads(payload)
+                self.assertLessEqual(commit["count"], 64)
+                self.assertEqual(commit["count"], len(leaves))
+                self.assertEqual(commit["prev"], previous)
+                self.assertEqual(commit["root"], reference_root(leaves).hex())
+                previous = chain_hash(previous, reference_root(leaves))
+                self.assertEqual(commit["hash"], previous)
+                committed += len(leaves)
+                leaves = []
+            self.assertEqual(leaves, [])
+
+        self.assertEqual(committed, 2000)
+        self.assertEqual(writer.chain_head, previous)
+        self.assertEqual(writer.get_stats()["events_committed"], 2000)
+
+    def test_verify_in_process_and_in_parallel(self):
+        """Test that serial and parallel verification agree on an untouched log"""
+        store, writer = self.open_writer()
+        self.write_all(writer, [make_event(i) for i in range(3000)])
+
+        serial = writer.verify(workers=1)
+        parallel = writer.verify(workers=2)
+
+        self.assertTrue(serial["valid"], serial["errors"])
+        self.assertEqual(serial["records"], 3000)
+        self.assertEqual(serial["chain_head"], writer.chain_head)
+        for key in ("valid", "segments", "records", "batches", "chain_head", "merkle_roots"):
+            self.assertEqual(serial[key], parallel[key])
+
+    def test_batches_split_at_segment_boundaries(self):
+        """Test that a batch spanning rotation periods is committed once per segment"""
+        store, writer = self.open_writer(max_batch_size=10000, max_latency_ms=200)
+        events = [make_event(i, seconds=i * 20) for i in range(200)]
+        self.write_all(writer, events)
+
+        self.assertEqual(len(store.segments), 200 * 20 // SEGMENT_SECONDS + 1)
+        for segment in store.segments:
+            result = verify_segment(segment.path)
+            self.assertEqual(result["uncommitted"], 0)
+            self.assertGreaterEqual(result["batches"], 1)
+        self.assertTrue(writer.verify(workers=1)["valid"])
+        self.assertEqual(sum(commit["count"] for commit in self.commits(store)), 200)
+
+    def test_edited_event_is_detected(self):
+        """Test that changing an event, even with a matching checksum, fails verification"""
+        store, writer = self.open_writer()
+        self.write_all(writer, [make_event(i) for i in range(100)])
+        path = store.segments[0].path
+        with open(path, "rb") as f:
+            data = bytearray(f.read())
+
+        offset, _, timestamp, payload, _ = next(read_records(bytes(data)))
+        forged = payload.replace(b'"u0"', b'"u9"')
+        data[offset:offset + len(encode_record(payload, timestamp))] = encode_record(forged, timestamp)
+        with open(path, "wb") as f:
+            f.write(data)
+
+        result = writer.verify(workers=1)
+        self.assertFalse(result["valid"])
+        self.assertTrue(any("Merkle root mismatch" in error for error in result["errors"]))
+
+        data[offset + SEGMENT_HEADER.size + 40] ^= 0xFF
+        with open(path, "wb") as f:
+            f.write(data)
+        self.assertTrue(any("checksum" in error for error in writer.verify(workers=1)["errors"]))
+
+    def test_removed_segment_breaks_chain(self):
+        """Test that dropping a whole segment is detected"""
+        store, writer = self.open_writer()
+        self.write_all(writer, [make_event(i, seconds=i * 20) for i in range(100)])
+        self.assertGreater(len(store.segments), 2)
+
+        os.remove(store.segments[1].path)
+        del store.segments[1]
+
+        result = writer.verify(workers=1)
+        self.assertFalse(result["valid"])
+        self.assertTrue(any("hash chain broken" in error for error in result["errors"]))
+
+    def test_reopen_continues_the_chain(self):
+        """Test that a reopened writer recovers the chain head and keeps the log valid"""
+        store, writer = self.open_writer()
+        self.write_all(writer, [make_event(i) for i in range(500)])
+        head = writer.chain_head
+        writer.stop(timeout=5)
+        store.close()
+
+        store, writer = self.open_writer()
+        self.assertEqual(writer.chain_head, head)
+        self.write_all(writer, [make_event(i) for i in range(500, 600)])
+        self.assertTrue(writer.verify(workers=1)["valid"])
+
+    def test_uncommitted_events_are_committed_on_startup(self):
+        """Test that events left without a commit record by a crash are committed"""
+        store, writer = self.open_writer()
+        self.write_all(writer, [make_event(i) for i in range(50)])
+        writer.stop(timeout=5)
+        for i in range(50, 60):
+            store.append(make_event(i))
+        store.close()
+
+        store, writer = self.open_writer()
+        result = writer.verify(workers=1)
+
+        self.assertTrue(result["valid"], result["errors"])
+        self.assertEqual(result["records"], 60)
+        recovered = self.commits(store)[-1]
+        self.assertEqual((recovered["count"], recovered.get("recovered")), (10, True))
+
+    def test_failed_commit_fails_its_events(self):
+        """Test that a failed write fails the batch's futures and leaves the chain head alone"""
+        store, writer = self.open_writer()
+        self.write_all(writer, [make_event(i) for i in range(10)])
+        head = writer.chain_head
+
+        def broken(*args, **kwargs):
+            raise OSError("disk full")
+
+        store.append_batch = broken
+        with self.assertRaises(OSError):
+            writer.write(make_event(10)).result(5)
+        self.assertTrue(writer.flush(5))
+        self.assertEqual(writer.chain_head, head)
+        self.assertEqual(writer.get_stats()["errors"], 1)
+
+        del store.append_batch
+        self.write_all(writer, [make_event(11)])
+        self.assertTrue(writer.verify(workers=1)["valid"])
+
+    def test_cancelled_event_is_left_out(self):
+        """Test that a cancelled event is not written and does not stop the committer"""
+        store, writer = self.open_writer()
+        release = threading.Event()
+        append_batch = store.append_batch
+
+        def held(*args, **kwargs):
+            release.wait(5)
+            return append_batch(*args, **kwargs)
+
+        store.append_batch = held
+        first = writer.write(make_event(0))
+        cancelled = writer.write(make_event(1))
+        self.assertTrue(cancelled.cancel())
+        release.set()
+
+        self.assertTrue(first.result(5))
+        self.assertTrue(writer.flush(5))
+        self.write_all(writer, [make_event(2)])
+        self.assertEqual([event["event_id"] for event in store.query(limit=10)], [2, 0])
+        self.assertEqual(writer.get_stats()["cancelled"], 1)
+        self.assertTrue(writer.verify(workers=1)["valid"])
+
+    def test_unencodable_event_fails_alone(self):
+        """Test that an event that cannot be JSON-encoded does not fail its batch"""
+        store, writer = self.open_writer(max_latency_ms=100)
+        good = writer.write(make_event(0))
+        bad = writer.write(dict(make_event(1), metadata={"amount": Decimal("10.00")}))
+
+        with self.assertRaises(TypeError):
+            bad.result(5)
+        self.assertTrue(good.result(5))
+        self.assertTrue(writer.flush(5))
+        self.assertEqual(writer.get_stats()["errors"], 0)
+
+    def test_failed_sync_is_rolled_back(self):
+        """Test that a batch whose fsync fails is cut off the log and reported as failed"""
+        store, writer = self.open_writer(sync=True)
+        self.write_all(writer, [make_event(i) for i in range(10)])
+        head = writer.chain_head
+        size = os.path.getsize(store.segments[-1].path)
+
+        with mock.patch("os.fsync", side_effect=OSError("I/O error")):
+            failed = writer.write(make_event(10))
+            with self.assertRaises(OSError):
+                failed.result(5)
+
+        self.assertEqual(os.path.getsize(store.segments[-1].path), size)
+        self.assertEqual(writer.chain_head, head)
+        self.write_all(writer, [make_event(10)])
+        result = writer.verify(workers=1)
+        self.assertTrue(result["valid"], result["errors"])
+        self.assertEqual(result["records"], 11)
+
+    def test_batch_left_in_log_is_reported_committed(self):
+        """Test that a failed write that cannot be cut off is reported as committed, not failed"""
+        store, writer = self.open_writer(sync=True)
+        self.write_all(writer, [make_event(i) for i in range(10)])
+        head = writer.chain_head
+
+        with mock.patch("os.fsync", side_effect=OSError("I/O error")), \
+                mock.patch("os.truncate", side_effect=OSError("read-only")):
+            self.assertTrue(writer.write(make_event(10)).result(5))
+
+        self.assertNotEqual(writer.chain_head, head)
+        self.assertEqual(writer.get_stats()["errors"], 0)
+        result = writer.verify(workers=1)
+        self.assertTrue(result["valid"], result["errors"])
+        self.assertEqual(result["records"], 11)
+
+    def test_lone_event_is_committed_straight_away(self):
+        """Test that an event with nothing queued behind it does not wait out the latency bound"""
+        store, writer = self.open_writer(max_latency_ms=1000)
+        writer.write(make_event(0)).result(5)
+
+        started = datetime.datetime.now()
+        for i in range(1, 6):
+            writer.write(make_event(i)).result(5)
+
+        self.assertLess((datetime.datetime.now() - started).total_seconds(), 1)
+        self.assertEqual(writer.get_stats()["batches"], 6)
+
+    def test_stop_commits_queued_events(self):
+        """Test that stopping the writer commits what was already written"""
+        store, writer = self.open_writer(max_latency_ms=50)
+        futures = [writer.write(make_event(i)) for i in range(100)]
+        writer.stop(timeout=5)
+
+        self.assertTrue(all(future.result(0) for future in futures))
+        self.assertEqual(writer.get_stats()["queued"], 0)
+
+    def test_synced_commits(self):
+        """Test group commits with fsync"""
+        store, writer = self.open_writer(sync=True)
+        self.write_all(writer, [make_event(i) for i in range(200)])
+
+        stats = writer.get_stats()
+        self.assertEqual(stats["events_committed"], 200)
+        self.assertGreater(stats["mean_batch_size"], 1)
+        self.assertTrue(writer.verify(workers=1)["valid"])
+
+
+class TestSegmentFormat(unittest.TestCase):
+    """Tests for refusing segment files of other formats"""
+
+    def setUp(self):
+        """Set up a store directory"""
+        logging.disable(logging.WARNING)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "00000001-0.seg")
+
+    def tearDown(self):
+        """Remove the directory and re-enable logging"""
+        self.directory.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def test_format_1_segment_is_refused(self):
+        """Test that a segment without a file header is refused, not misread"""
+        payload = json.dumps(make_event(0)).encode("utf-8")
+        with open(self.path, "wb") as f:
+            f.write(struct.pack("<IId", len(payload), 0, 0.0) + payload)
+
+        with self.assertRaises(ValueError):
+            AuditSegmentStore(self.directory.name)
+        self.assertTrue(verify_segment(self.path)["errors"])
+
+    def test_other_format_version_is_refused(self):
+        """Test that a segment with another format version is refused"""
+        with open(self.path, "wb") as f:
+            f.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, 1))
+
+        with self.assertRaises(ValueError):
+            AuditSegmentStore(self.directory.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
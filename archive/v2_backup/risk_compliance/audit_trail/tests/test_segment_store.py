@@ -0,0 +1,204 @@
+"""
+Audit Segment Store Tests - Audit Trail
+
+This module checks indexed segment store queries against filtering every
+event, and the store's recovery of its indexes and torn segment files.
+"""
+
+import os
+import random
+import logging
+import datetime
+import tempfile
+import unittest
+
+from ..segment_store import AuditSegmentStore, INDEX_SUFFIX, SEGMENT_HEADER, to_epoch
+
+BASE = datetime.datetime(2026, 1, 1)
+SEGMENT_SECONDS = 600
+
+
+def make_events(count, seed=0):
+    """Build events over several rotation periods, with some arriving late"""
+    rng = random.Random(seed)
+    events = []
+    for i in range(count):
+        seconds = i * 3
+        if i % 17 == 0 and i:
+            seconds -= rng.randint(1, 900)
+        events.append({
+            "event_id": i,
+            "event_type": rng.choice(["login", "logout", "transfer", "config_change"]),
+            "user_id": f"u{rng.randint(0, 9)}",
+            "severity": rng.choice(["INFO", "WARNING"]),
+            "timestamp": (BASE + datetime.timedelta(seconds=seconds, microseconds=i)).isoformat()
+        })
+    return events
+
+
+def brute_force_query(events, filters=None, start_time=None, end_time=None, limit=100):
+    """Filter every event and order the matches newest first"""
+    start = to_epoch(start_time)
+    end = to_epoch(end_time)
+    matches = [
+        event for event in events
+        if all(event.get(field) == value for field, value in (filters or {}).items())
+        and (start is None or to_epoch(event["timestamp"]) >= start)
+        and (end is None or to_epoch(event["timestamp"]) <= end)
+    ]
+    matches.sort(key=lambda event: to_epoch(event["timestamp"]), reverse=True)
+    return matches[:limit]
+
+
+class TestAuditSegmentStore(unittest.TestCase):
+    """Tests for AuditSegmentStore"""
+
+    def setUp(self):
+        """Set up a store directory"""
+        logging.disable(logging.WARNING)
+        self.directory = tempfile.TemporaryDirectory()
+        self.stores = []
+
+    def tearDown(self):
+        """Close the stores, remove the directory and re-enable logging"""
+        for store in self.stores:
+            store.close()
+        self.directory.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def open_store(self, **kwargs):
+        kwargs.setdefault("segment_seconds", SEGMENT_SECONDS)
+        kwargs.setdefault("block_records", 16)
+        store = AuditSegmentStore(self.directory.name, **kwargs)
+        self.stores.append(store)
+        return store
+
+    def fill(self, store, events):
+        for start in range(0, len(events), 50):
+            store.append_batch(events[start:start + 50])
+
+    def assert_queries_match(self, store, events, seed=1):
+        rng = random.Random(seed)
+        for _ in range(60):
+            filters = {}
+            if rng.random() < 0.6:
+                filters["event_type"] = rng.choice(["login", "logout", "transfer", "config_change", "missing"])
+            if rng.random() < 0.5:
+                filters["user_id"] = f"u{rng.randint(0, 10)}"
+            if rng.random() < 0.3:
+                filters["severity"] = "WARNING"
+            start_time = end_time = None
+            if rng.random() < 0.6:
+                start_time = BASE + datetime.timedelta(seconds=rng.randint(-100, 3000))
+                end_time = start_time + datetime.timedelta(seconds=rng.randint(0, 2000))
+            limit = rng.choice([1, 5, 50, 10000])
+
+            self.assertEqual(store.query(filters, start_time, end_time, limit),
+                             brute_force_query(events, filters, start_time, end_time, limit),
+                             (filters, start_time, end_time, limit))
+
+    def test_queries_match_brute_force(self):
+        """Test filtered, time-ranged and limited queries against filtering every event"""
+        events = make_events(1200)
+        store = self.open_store()
+        self.fill(store, events)
+
+        self.assertGreater(len(store.segments), 3)
+        self.assert_queries_match(store, events)
+
+    def test_single_event_appends(self):
+        """Test that events appended one at a time are queried like batches"""
+        events = make_events(300, seed=3)
+        store = self.open_store(max_workers=1)
+        for event in events:
+            store.append(event)
+
+        self.assert_queries_match(store, events, seed=4)
+        self.assertEqual(store.get_stats()["records"], len(events))
+
+    def test_plan_skips_segments_and_blocks(self):
+        """Test that the planner only reads segments and blocks that can match"""
+        events = make_events(1200)
+        events.append({"event_id": "rare", "event_type": "password_reset", "user_id": "u0",
+                       "timestamp": (BASE + datetime.timedelta(seconds=1500)).isoformat()})
+        store = self.open_store()
+        self.fill(store, events)
+
+        plan = store.plan({"event_type": "password_reset"})
+        self.assertEqual(len(plan), 1)
+        self.assertEqual(len(plan[0][1]), 1)
+        self.assertEqual(store.plan({"event_type": "never_logged"}), [])
+
+        start = BASE + datetime.timedelta(seconds=3000)
+        timed = store.plan(None, start, start + datetime.timedelta(seconds=60))
+        self.assertLess(len(timed), len(store.segments))
+
+    def test_reopen_loads_or_rebuilds_indexes(self):
+        """Test that a reopened store answers the same queries, with or without index files"""
+        events = make_events(900, seed=5)
+        store = self.open_store()
+        self.fill(store, events)
+        store.close()
+
+        self.assert_queries_match(self.open_store(), events, seed=6)
+
+        for name in os.listdir(self.directory.name):
+            if name.endswith(INDEX_SUFFIX):
+                os.remove(os.path.join(self.directory.name, name))
+        self.assert_queries_match(self.open_store(), events, seed=7)
+
+    def test_torn_final_record_is_truncated(self):
+        """Test that an incomplete record at the end of a segment is dropped on reopen"""
+        events = make_events(200, seed=8)
+        store = self.open_store()
+        self.fill(store, events)
+        store.close()
+        path = store.segments[-1].path
+        size = os.path.getsize(path)
+        with open(path, "ab") as f:
+            f.write(b"\x40\x00\x00\x00torn")
+
+        reopened = self.open_store()
+        self.assertEqual(os.path.getsize(path), size)
+        self.assert_queries_match(reopened, events, seed=9)
+
+        late = {"event_id": "after", "event_type": "login", "user_id": "u1",
+                "timestamp": events[-1]["timestamp"]}
+        reopened.append(late)
+        self.assertEqual(reopened.query({"event_id": "after"}), [late])
+
+    def test_empty_segment_file_gets_a_header(self):
+        """Test that a segment torn before its header was written is reopened empty"""
+        store = self.open_store()
+        store.append(make_events(1)[0])
+        store.close()
+        path = store.segments[0].path
+        open(path, "wb").close()
+
+        reopened = self.open_store()
+        self.assertEqual(os.path.getsize(path), SEGMENT_HEADER.size)
+        self.assertEqual(reopened.query(), [])
+
+    def test_query_does_not_change_filters(self):
+        """Test that the caller's filters are left as they were"""
+        store = self.open_store()
+        self.fill(store, make_events(100))
+        filters = {"event_type": "login"}
+
+        store.query(filters, BASE, BASE + datetime.timedelta(hours=1))
+        self.assertEqual(filters, {"event_type": "login"})
+
+    def test_to_epoch(self):
+        """Test timestamp conversion of the accepted types"""
+        expected = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc).timestamp()
+
+        self.assertEqual(to_epoch(BASE), expected)
+        self.assertEqual(to_epoch(BASE.isoformat()), expected)
+        self.assertEqual(to_epoch("2026-01-01T05:30:00+05:30"), expected)
+        self.assertEqual(to_epoch(expected), expected)
+        self.assertIsNone(to_epoch("not a time"))
+        self.assertIsNone(to_epoch(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,236 @@
+"""
+Micro-batched Model Inference for Core Banking System
+
+This module batches model scoring requests from concurrent callers: the
+requests queued while the model is busy are stacked into one matrix, the
+model is called once for the whole batch and every caller's future is
+resolved with its own score. A lone request is scored straight away; a
+batch only waits (at most a few milliseconds, or until it is full) when
+other requests are already arriving with it.
+"""
+
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Try to import optional dependencies
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Number of recent request latencies kept for percentiles
+LATENCY_SAMPLES = 10000
+
+_STOP = object()
+
+
+class MicroBatchInference:
+    """Queue scoring requests and score them in micro-batches on a worker thread"""
+
+    def __init__(self,
+                 score_batch: Callable[[Any], Sequence[float]],
+                 max_batch_size: int = 64,
+                 max_wait_ms: float = 2.0,
+                 name: str = "model"):
+        """
+        Initialize the batching stage
+
+        Args:
+            score_batch (Callable): Scores a feature matrix (one row per request)
+                and returns one score per row
+            max_batch_size (int): Largest batch passed to score_batch
+            max_wait_ms (float): Longest time a batch waits for more requests once
+                several are queued together (a lone request never waits)
+            name (str): Name used for the worker thread and in logs
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.score_batch = score_batch
+        self.max_batch_size = int(max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_ms) / 1000.0
+        self.name = name
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._started_at: Optional[float] = None
+        self._requests = 0
+        self._batches = 0
+        self._largest_batch = 0
+        self._errors = 0
+        self._inference_seconds = 0.0
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def start(self):
+        """Start the worker thread if it is not running"""
+        with self._lock:
+            self._start()
+
+    def _start(self):
+        """Start the worker thread on a queue of its own (lock held)"""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._started_at = time.perf_counter()
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, args=(self._queue,),
+                                        name=f"{self.name}-batcher", daemon=True)
+        self._worker.start()
+        logger.info(f"Started micro-batch inference for {self.name} "
+                    f"(batch size {self.max_batch_size}, wait {self.max_wait_seconds * 1000:.1f} ms)")
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop the worker thread after scoring the requests already queued
+
+        Requests that reach the worker's queue after the stop are failed
+        with a RuntimeError rather than left waiting.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the worker to finish
+        """
+        with self._lock:
+            worker = self._worker
+            if worker is None:
+                return
+            self._queue.put(_STOP)
+            self._worker = None
+        worker.join(timeout)
+
+    def submit(self, features: Sequence[float]) -> Future:
+        """
+        Queue one feature vector for scoring
+
+        Args:
+            features (Sequence): Feature vector
+
+        Returns:
+            Future: Resolves to the score of the feature vector
+        """
+        future = Future()
+        with self._lock:
+            if self._worker is None:
+                self._start()
+            self._queue.put((features, future, time.perf_counter()))
+        return future
+
+    def score(self, features: Sequence[float], timeout: Optional[float] = None) -> float:
+        """
+        Score one feature vector, waiting for its batch
+
+        Args:
+            features (Sequence): Feature vector
+            timeout (float, optional): Seconds to wait for the result
+
+        Returns:
+            float: Score of the feature vector
+        """
+        return self.submit(features).result(timeout)
+
+    def _run(self, requests: "queue.Queue"):
+        """Worker loop: gather a batch, score it, resolve its futures"""
+        stopping = False
+        while not stopping:
+            first = requests.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = time.perf_counter() + self.max_wait_seconds
+
+            while len(batch) < self.max_batch_size:
+                try:
+                    # Only wait for more when others arrived with the first
+                    remaining = deadline - time.perf_counter()
+                    if len(batch) > 1 and remaining > 0:
+                        item = requests.get(timeout=remaining)
+                    else:
+                        item = requests.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._score(batch)
+
+        # Fail anything queued behind the stop request
+        while True:
+            try:
+                item = requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                item[1].set_exception(RuntimeError(f"Micro-batch inference for {self.name} is stopped"))
+                self._errors += 1
+
+    def _score(self, batch: List[Tuple[Sequence[float], Future, float]]):
+        """Score one batch and resolve its futures"""
+        rows = [features for features, _, _ in batch]
+        matrix = np.asarray(rows, dtype=float) if NUMPY_AVAILABLE else rows
+
+        started = time.perf_counter()
+        try:
+            scores = list(self.score_batch(matrix))
+            if len(scores) != len(batch):
+                raise ValueError(f"score_batch returned {len(scores)} scores for {len(batch)} rows")
+        except Exception as e:
+            logger.error(f"Batch scoring failed for {self.name}: {str(e)}")
+            for _, future, _ in batch:
+                future.set_exception(e)
+            self._errors += len(batch)
+            return
+        finished = time.perf_counter()
+
+        for (_, future, submitted), score in zip(batch, scores):
+            future.set_result(float(score))
+            self._latencies.append(finished - submitted)
+
+        self._requests += len(batch)
+        self._batches += 1
+        self._largest_batch = max(self._largest_batch, len(batch))
+        self._inference_seconds += finished - started
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get batching, latency and throughput metrics
+
+        Returns:
+            Dict: Request and batch counts, mean and largest batch size,
+                throughput since start, mean inference time per batch and
+                request latency percentiles (submit to result) in milliseconds
+        """
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        return {
+            "requests": self._requests,
+            "batches": self._batches,
+            "errors": self._errors,
+            "queued": self._queue.qsize(),
+            "mean_batch_size": self._requests / self._batches if self._batches else 0.0,
+            "largest_batch": self._largest_batch,
+            "throughput_per_second": self._requests / elapsed if elapsed > 0 else 0.0,
+            "mean_batch_inference_ms": self._inference_seconds / self._batches * 1000 if self._batches else 0.0,
+            "latency_ms": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": latencies[-1] * 1000 if latencies else 0.0
+            }
+        }
@@ -34,6 +34,9 @@ try:
 except ImportError:
     ML_AVAILABLE = False
 
+from .velocity_store import VelocityFeatureStore
+from .batch_inference import MicroBatchInference
+
 # Initialize logger
 logger = logging.getLogger(__name__)
 
@@ -104,9 +107,13 @@ class FraudDetectionSystem:
         # Update thresholds
         self.thresholds.update(env_thresholds)
         
-        # Cache for velocity checking
-        self.transaction_cache = {}
+        # Streaming per-user state for velocity, recipient and location checks
         self.cache_expiry_minutes = self.thresholds["velocity_window_minutes"] * 2
+        self.velocity_store = VelocityFeatureStore(
+            window_seconds=self.thresholds["velocity_window_minutes"] * 60,
+            expiry_seconds=self.cache_expiry_minutes * 60,
+            capacity=max(16, self.thresholds["velocity_threshold"] + 1)
+        )
         
         logger.info(f"Configured fraud detection thresholds for {self.environment} environment")
     
@@ -114,6 +121,7 @@ class FraudDetectionSystem:
         """Initialize rule engines and ML models"""
         self.rules_enabled = self.config.get("enable_rules", True)
         self.ml_enabled = self.config.get("enable_ml", False)
+        self.ml_batcher = None
         
         # Initialize ML models if enabled and available
         if self.ml_enabled and ML_AVAILABLE:
@@ -145,6 +153,15 @@ class FraudDetectionSystem:
             else:
                 logger.warning("No pre-trained ML models found. Will train on new data.")
             
+            # Score concurrent requests in micro-batches
+            if self.config.get("ml_batching", True):
+                self.ml_batcher = MicroBatchInference(
+                    self._score_transaction_features,
+                    max_batch_size=self.config.get("ml_batch_size", 64),
+                    max_wait_ms=self.config.get("ml_batch_wait_ms", 2.0),
+                    name="transaction_model"
+                )
+            
             logger.info("ML models initialized for fraud detection")
         except Exception as e:
             logger.error(f"Failed to initialize ML models: {str(e)}")
@@ -203,13 +220,54 @@ class FraudDetectionSystem:
         # Update transaction cache for velocity checks
         self._update_transaction_cache(transaction_data)
         
-        # Determine overall action based on risk score
+        self._set_action(result)
+        return result
+    
+    def check_transactions(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Check a batch of transactions for potential fraud
+        
+        Rules are applied in order, so each transaction sees the velocity
+        state of the ones before it; the ML model scores the whole batch
+        in a single call.
+        
+        Args:
+            transactions (List[Dict]): Transactions, with the fields of check_transaction
+            
+        Returns:
+            List[Dict]: Fraud check results, in the order of the transactions
+        """
+        results = []
+        for transaction_data in transactions:
+            result = {
+                "is_suspicious": False,
+                "risk_score": 0,
+                "risk_factors": [],
+                "action": "ALLOW"
+            }
+            if self.rules_enabled:
+                self._apply_transaction_rules(transaction_data, result)
+            results.append(result)
+            self._update_transaction_cache(transaction_data)
+        
+        if self.ml_enabled and ML_AVAILABLE and transactions and hasattr(self, "transaction_scaler"):
+            try:
+                features = [self._transaction_features(tx) for tx in transactions]
+                for result, score in zip(results, self._score_transaction_features(features)):
+                    self._apply_ml_score(score, result)
+            except Exception as e:
+                logger.error(f"Error in ML fraud detection: {str(e)}")
+        
+        for result in results:
+            self._set_action(result)
+        return results
+    
+    def _set_action(self, result: Dict[str, Any]):
+        """Determine overall action based on risk score"""
         if result["risk_score"] >= 80:
             result["action"] = "BLOCK"
         elif result["risk_score"] >= 50:
             result["action"] = "REVIEW"
-        
-        return result
     
     def _apply_transaction_rules(self, transaction_data: Dict[str, Any], result: Dict[str, Any]):
         """Apply rule-based fraud checks to transaction"""
@@ -218,6 +276,7 @@ class FraudDetectionSystem:
         transaction_type = transaction_data.get("transaction_type", "")
         recipient_id = transaction_data.get("recipient_id")
         channel = transaction_data.get("channel", "")
+        now = transaction_data.get("timestamp") or time.time()
         
         # High amount check
         if amount > self.thresholds["transaction_amount"]:
@@ -225,10 +284,8 @@ class FraudDetectionSystem:
             result["risk_score"] += 30
         
         # Velocity check (multiple transactions in short time)
-        if user_id in self.transaction_cache:
-            user_transactions = self.transaction_cache[user_id]
-            recent_count = len([tx for tx in user_transactions 
-                             if time.time() - tx["timestamp"] < self.thresholds["velocity_window_minutes"] * 60])
+        if user_id in self.velocity_store:
+            recent_count = self.velocity_store.recent_count(user_id, now)
             
             if recent_count > self.thresholds["velocity_threshold"]:
                 result["risk_factors"].append("HIGH_VELOCITY")
@@ -237,14 +294,14 @@ class FraudDetectionSystem:
         # New recipient check for transfers
         if transaction_type == "TRANSFER" and recipient_id:
             # Check if recipient is new and amount is significant
-            if not self._is_known_recipient(user_id, recipient_id) and amount > self.thresholds["new_beneficiary_amount"]:
+            if not self._is_known_recipient(user_id, recipient_id, now) and amount > self.thresholds["new_beneficiary_amount"]:
                 result["risk_factors"].append("NEW_RECIPIENT_HIGH_AMOUNT")
                 result["risk_score"] += 20
         
         # Unusual location check
         if "location" in transaction_data:
             location = transaction_data["location"]
-            if self._is_location_change_suspicious(user_id, location):
+            if self._is_location_change_suspicious(user_id, location, now):
                 result["risk_factors"].append("UNUSUAL_LOCATION")
                 result["risk_score"] += 35
         
@@ -254,33 +311,54 @@ class FraudDetectionSystem:
     def _apply_transaction_ml(self, transaction_data: Dict[str, Any], result: Dict[str, Any]):
         """Apply machine learning checks to transaction"""
         try:
-            # Extract and prepare features
-            features = [
-                float(transaction_data.get("amount", 0)),
-                self._encode_channel(transaction_data.get("channel", "")),
-                self._encode_transaction_type(transaction_data.get("transaction_type", "")),
-                self._get_hour_of_day(transaction_data.get("timestamp", time.time())),
-                self._get_day_of_week(transaction_data.get("timestamp", time.time()))
-            ]
-            
-            # Add historical features if available
+            # Scoring needs a fitted scaler
             if hasattr(self, "transaction_scaler"):
-                # Scale features
-                features_scaled = self.transaction_scaler.transform([features])
+                features = self._transaction_features(transaction_data)
                 
-                # Get anomaly score
-                anomaly_score = self.transaction_model.decision_function([features_scaled[0]])[0]
-                normalized_score = 1.0 - (anomaly_score + 0.5)  # Convert to 0-1 range
+                if self.ml_batcher is not None:
+                    normalized_score = self.ml_batcher.score(features)
+                else:
+                    normalized_score = self._score_transaction_features([features])[0]
                 
-                if normalized_score > self.thresholds["ml_anomaly_score"]:
-                    result["risk_factors"].append("ML_ANOMALY_DETECTED")
-                    result["risk_score"] += 40
-                    result["is_suspicious"] = True
+                self._apply_ml_score(normalized_score, result)
         except Exception as e:
             logger.error(f"Error in ML fraud detection: {str(e)}")
     
+    def _transaction_features(self, transaction_data: Dict[str, Any]) -> List[float]:
+        """Extract the ML feature vector of a transaction"""
+        timestamp = transaction_data.get("timestamp", time.time())
+        return [
+            float(transaction_data.get("amount", 0)),
+            self._encode_channel(transaction_data.get("channel", "")),
+            self._encode_transaction_type(transaction_data.get("transaction_type", "")),
+            self._get_hour_of_day(timestamp),
+            self._get_day_of_week(timestamp)
+        ]
+    
+    def _score_transaction_features(self, features) -> List[float]:
+        """Scale a feature matrix and convert its anomaly scores to the 0-1 range"""
+        features_scaled = self.transaction_scaler.transform(features)
+        anomaly_scores = self.transaction_model.decision_function(features_scaled)
+        return [1.0 - (score + 0.5) for score in anomaly_scores]
+    
+    def _apply_ml_score(self, normalized_score: float, result: Dict[str, Any]):
+        """Add the ML risk factor if the anomaly score exceeds its threshold"""
+        if normalized_score > self.thresholds["ml_anomaly_score"]:
+            result["risk_factors"].append("ML_ANOMALY_DETECTED")
+            result["risk_score"] += 40
+            result["is_suspicious"] = True
+    
+    def get_ml_metrics(self) -> Dict[str, Any]:
+        """
+        Get micro-batch inference metrics
+        
+        Returns:
+            Dict: Batching, latency and throughput metrics, empty if batching is off
+        """
+        return self.ml_batcher.get_metrics() if self.ml_batcher is not None else {}
+    
     def _update_transaction_cache(self, transaction_data: Dict[str, Any]):
-        """Update transaction cache for velocity checks"""
+        """Record transaction in the velocity store"""
         user_id = transaction_data.get("user_id")
         if not user_id:
             return
@@ -289,66 +367,43 @@ class FraudDetectionSystem:
         if "timestamp" not in transaction_data:
             transaction_data["timestamp"] = time.time()
         
-        # Initialize user cache if needed
-        if user_id not in self.transaction_cache:
-            self.transaction_cache[user_id] = []
-        
-        # Add transaction to cache
-        self.transaction_cache[user_id].append(transaction_data)
-        
-        # Clean old transactions from cache
-        self._clean_transaction_cache()
+        self.velocity_store.record(
+            user_id,
+            transaction_data["timestamp"],
+            recipient_id=transaction_data.get("recipient_id"),
+            location=transaction_data.get("location")
+        )
     
-    def _clean_transaction_cache(self):
-        """Remove old transactions from cache"""
-        current_time = time.time()
-        expiry_seconds = self.cache_expiry_minutes * 60
-        
-        for user_id in list(self.transaction_cache.keys()):
-            # Filter out expired transactions
-            self.transaction_cache[user_id] = [
-                tx for tx in self.transaction_cache[user_id]
-                if current_time - tx["timestamp"] < expiry_seconds
-            ]
-            
-            # Remove empty user entries
-            if not self.transaction_cache[user_id]:
-                del self.transaction_cache[user_id]
+    def _clean_transaction_cache(self, current_time: Optional[float] = None) -> int:
+        """Drop velocity state of users idle longer than the cache expiry"""
+        return self.velocity_store.expire(current_time or time.time())
     
-    def _is_known_recipient(self, user_id: str, recipient_id: str) -> bool:
+    def _is_known_recipient(self, user_id: str, recipient_id: str, now: Optional[float] = None) -> bool:
         """Check if recipient is known based on transaction history"""
         # In a real system, this would query a database
-        if user_id in self.transaction_cache:
-            for tx in self.transaction_cache[user_id]:
-                if tx.get("recipient_id") == recipient_id:
-                    return True
-        return False
+        return self.velocity_store.is_known_recipient(user_id, recipient_id, now or time.time())
     
-    def _is_location_change_suspicious(self, user_id: str, location: Dict[str, Any]) -> bool:
+    def _is_location_change_suspicious(self, user_id: str, location: Dict[str, Any],
+                                       now: Optional[float] = None) -> bool:
         """Check if location change is suspicious"""
-        if user_id not in self.transaction_cache:
-            return False
-            
+        now = now or time.time()
+        
         # Get last known transaction location
-        last_tx = None
-        for tx in reversed(sorted(self.transaction_cache[user_id], key=lambda x: x.get("timestamp", 0))):
-            if "location" in tx:
-                last_tx = tx
-                break
-                
-        if not last_tx:
+        last = self.velocity_store.last_location(user_id, now)
+        if last is None:
             return False
+        last_location, last_timestamp = last
         
         # Check time difference
-        time_diff_hours = (time.time() - last_tx["timestamp"]) / 3600
+        time_diff_hours = (now - last_timestamp) / 3600
         
         # If both locations have lat/long, calculate distance
         if ("lat" in location and "long" in location and 
-            "lat" in last_tx["location"] and "long" in last_tx["location"]):
+            "lat" in last_location and "long" in last_location):
             
             distance_km = self._calculate_distance(
                 location["lat"], location["long"],
-                last_tx["location"]["lat"], last_tx["location"]["long"]
+                last_location["lat"], last_location["long"]
             )
             
             # Calculate maximum reasonable travel speed (km/h)
@@ -366,10 +421,10 @@ class FraudDetectionSystem:
                     return True
         
         # If IP-based location, compare country/city
-        elif "ip" in location and "ip" in last_tx["location"]:
+        elif "ip" in location and "ip" in last_location:
             # In a production system, this would use geolocation
             # For now, just compare IP addresses
-            if location["ip"] != last_tx["location"]["ip"]:
+            if location["ip"] != last_location["ip"]:
                 if time_diff_hours < self.thresholds["location_change_hours"]:
                     return True
         
@@ -502,6 +557,7 @@ fraud_detection = FraudDetectionSystem()
 
 # Export main functions for easy access
 check_transaction = fraud_detection.check_transaction
+check_transactions = fraud_detection.check_transactions
 check_login_activity = fraud_detection.check_login_activity
 batch_analyze = fraud_detection.batch_analyze
 train_models = fraud_detection.train_models
@@ -0,0 +1,362 @@
+"""
+Partitioned Transaction Monitoring for Fraud Detection
+
+This module runs transaction monitoring across several worker processes.
+Transactions are hash-partitioned by user, so each worker owns the
+velocity state of its users and needs no locking with the others; the
+workers report processed counts and suspicious transactions over a
+single result channel that feeds the usual stats and alert handlers.
+"""
+
+import time
+import zlib
+import queue
+import logging
+import threading
+import multiprocessing
+from typing import Any, Callable, Dict, List, Optional
+
+from .fraud_detection_system import FraudDetectionSystem
+from .transaction_monitor import TransactionMonitor
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Seconds the collector waits for results before checking that the workers are alive
+WORKER_CHECK_SECONDS = 0.5
+
+
+def partition_for(key: Any, partitions: int) -> int:
+    """
+    Get the partition of a user or account ID
+
+    A CRC is used rather than hash() so that the mapping is the same in
+    every process and across restarts.
+
+    Args:
+        key: User or account ID
+        partitions (int): Number of partitions
+
+    Returns:
+        int: Partition index
+    """
+    return zlib.crc32(str(key).encode("utf-8")) % partitions
+
+
+def _partition_worker(partition: int,
+                      inbox,
+                      results,
+                      batch_size: int,
+                      detector_factory: Callable[[], FraudDetectionSystem]):
+    """
+    Worker process: check the transactions of one partition
+
+    Chunks (of at most batch_size transactions) are drained from the inbox
+    while they fit in batch_size and checked with one check_transactions
+    call; a chunk that does not fit opens the next batch. Each batch is reported as
+    ("batch", partition, processed, volume by hour, suspicious pairs,
+    errors); ("stopped", partition) is sent on shutdown.
+    """
+    detector = detector_factory()
+    carried = None
+    stopping = False
+
+    while not stopping:
+        chunk = carried if carried is not None else inbox.get()
+        carried = None
+        if chunk is None:
+            break
+        batch = list(chunk)
+        while len(batch) < batch_size:
+            try:
+                chunk = inbox.get_nowait()
+            except queue.Empty:
+                break
+            if chunk is None:
+                stopping = True
+                break
+            if len(batch) + len(chunk) > batch_size:
+                carried = chunk
+                break
+            batch.extend(chunk)
+
+        volume: Dict[str, int] = {}
+        suspicious = []
+        errors = 0
+        try:
+            checked = detector.check_transactions(batch)
+        except Exception as e:
+            logger.error(f"Error in monitoring partition {partition}: {str(e)}")
+            checked = []
+            errors = len(batch)
+
+        for transaction, result in zip(batch, checked):
+            hour = time.strftime("%Y-%m-%d %H:00", time.localtime(transaction.get("timestamp", time.time())))
+            volume[hour] = volume.get(hour, 0) + 1
+            if result["is_suspicious"]:
+                suspicious.append((transaction, result))
+
+        results.put(("batch", partition, len(checked), volume, suspicious, errors))
+
+    results.put(("stopped", partition))
+
+
+class PartitionedTransactionMonitor(TransactionMonitor):
+    """
+    Transaction monitor that checks transactions in partitioned worker processes
+
+    Each partition admits at most queue_size transactions that are queued
+    or being checked: when a worker falls behind, submit_transaction blocks
+    (or fails, if asked not to block) instead of letting the backlog grow
+    without limit. Alerts and stats are handled in this process by a
+    collector thread reading the workers' results, which also returns each
+    partition's capacity as its transactions are checked. If a worker
+    process exits unexpectedly, the transactions it held are counted as
+    errors and its partition rejects further submissions until restart.
+    """
+
+    def __init__(self,
+                 num_workers: Optional[int] = None,
+                 queue_size: int = 1024,
+                 batch_size: int = 256,
+                 detector_factory: Callable[[], FraudDetectionSystem] = FraudDetectionSystem,
+                 start_method: Optional[str] = None):
+        """
+        Initialize the partitioned monitor
+
+        Args:
+            num_workers (int, optional): Worker processes, one per CPU if None
+            queue_size (int): Transactions each partition holds (queued or being
+                checked) before submitters block
+            batch_size (int): Most transactions a worker checks in one batch
+            detector_factory (Callable): Builds each worker's fraud detection system
+                (must be picklable for the "spawn" start method)
+            start_method (str, optional): multiprocessing start method
+        """
+        super().__init__()
+        self.num_workers = num_workers or multiprocessing.cpu_count()
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+        self.queue_size = int(queue_size)
+        self.batch_size = batch_size
+        self.detector_factory = detector_factory
+        self._context = multiprocessing.get_context(start_method)
+
+        self.workers = []
+        self.inboxes = []
+        self.results = None
+        self.collector_thread = None
+
+        self._submitted = 0
+        self._completed = 0
+        self._in_flight = [0] * self.num_workers  # transactions per partition not yet reported back
+        self._exited = set()  # partitions whose worker exited without stopping
+        self._idle = threading.Condition()
+
+        self.stats["errors"] = 0
+        self.stats["transactions_by_partition"] = [0] * self.num_workers
+
+    def start_monitoring(self):
+        """Start the worker processes and the result collector"""
+        if self.is_running:
+            logger.warning("Transaction monitor is already running")
+            return False
+
+        # Backlog is bounded by the in-flight transaction counts, not by the queues
+        self.inboxes = [self._context.Queue() for _ in range(self.num_workers)]
+        self._in_flight = [0] * self.num_workers
+        self._exited = set()
+        self.results = self._context.Queue()
+        self.workers = [
+            self._context.Process(
+                target=_partition_worker,
+                args=(partition, inbox, self.results, self.batch_size, self.detector_factory),
+                name=f"fraud-monitor-{partition}",
+                daemon=True
+            )
+            for partition, inbox in enumerate(self.inboxes)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+        self.is_running = True
+        self.stats["monitoring_start_time"] = time.time()
+
+        self.collector_thread = threading.Thread(target=self._collect_results, daemon=True)
+        self.collector_thread.start()
+
+        logger.info(f"Partitioned transaction monitoring started with {self.num_workers} workers")
+        return True
+
+    def stop_monitoring(self, timeout: float = 5.0):
+        """
+        Stop the workers after they have checked the transactions already queued
+
+        Args:
+            timeout (float): Seconds to wait for each worker
+        """
+        if not self.is_running:
+            logger.warning("Transaction monitor is not running")
+            return False
+
+        for inbox in self.inboxes:
+            inbox.put(None)
+        for worker in self.workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                logger.warning(f"Terminating unresponsive monitoring worker {worker.name}")
+                worker.terminate()
+
+        self.is_running = False
+        if self.collector_thread and self.collector_thread.is_alive():
+            self.collector_thread.join(timeout)
+
+        logger.info("Partitioned transaction monitoring stopped")
+        return True
+
+    def submit_transaction(self, transaction_data: Dict[str, Any],
+                           block: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Submit a transaction to its user's partition
+
+        Args:
+            transaction_data (Dict): Transaction details
+            block (bool): Wait for room in a full partition
+            timeout (float, optional): Longest wait when blocking
+
+        Returns:
+            bool: False if the partition stayed full
+        """
+        return self.submit_transactions([transaction_data], block, timeout) == 1
+
+    def submit_transactions(self, transactions: List[Dict[str, Any]],
+                            block: bool = True, timeout: Optional[float] = None) -> int:
+        """
+        Submit several transactions, sending one chunk per partition
+
+        A partition's chunk is split into pieces of at most queue_size
+        transactions; each piece is sent, in chunks of at most batch_size,
+        once the partition has room for it. A partition whose worker has
+        exited rejects its transactions.
+
+        Args:
+            transactions (List[Dict]): Transaction details
+            block (bool): Wait for room in full partitions
+            timeout (float, optional): Longest wait per piece when blocking
+
+        Returns:
+            int: Number of transactions accepted
+        """
+        if not self.is_running:
+            logger.warning("Transaction monitor is not running - starting now")
+            self.start_monitoring()
+
+        chunks: Dict[int, List[Dict[str, Any]]] = {}
+        for transaction_data in transactions:
+            # Add timestamp if not present
+            if "timestamp" not in transaction_data:
+                transaction_data["timestamp"] = time.time()
+            key = transaction_data.get("user_id", transaction_data.get("account_id"))
+            chunks.setdefault(partition_for(key, self.num_workers), []).append(transaction_data)
+
+        accepted = 0
+        for partition, chunk in chunks.items():
+            sent = 0
+            while sent < len(chunk):
+                piece = chunk[sent:sent + self.queue_size]
+                with self._idle:
+                    has_room = self._idle.wait_for(
+                        lambda: (partition in self._exited
+                                 or self._in_flight[partition] + len(piece) <= self.queue_size),
+                        timeout if block else 0
+                    )
+                    if not has_room or partition in self._exited:
+                        break
+                    self._in_flight[partition] += len(piece)
+                    self._submitted += len(piece)
+                for start in range(0, len(piece), self.batch_size):
+                    self.inboxes[partition].put(piece[start:start + self.batch_size])
+                sent += len(piece)
+
+            accepted += sent
+            if sent < len(chunk):
+                logger.warning(f"Monitoring partition {partition} is full - "
+                               f"{len(chunk) - sent} transactions rejected")
+
+        return accepted
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every submitted transaction has been checked
+
+        Args:
+            timeout (float, optional): Longest wait in seconds
+
+        Returns:
+            bool: True if the monitor is idle
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._completed >= self._submitted, timeout)
+
+    def _collect_results(self):
+        """Collector thread: fold worker results into stats and raise alerts"""
+        running = set(range(self.num_workers))
+        while running:
+            try:
+                self._handle_result(self.results.get(timeout=WORKER_CHECK_SECONDS), running)
+            except queue.Empty:
+                exited = [partition for partition in running if not self.workers[partition].is_alive()]
+                if not exited:
+                    continue
+                # Whatever the exited workers sent is readable by now
+                while True:
+                    try:
+                        self._handle_result(self.results.get_nowait(), running)
+                    except queue.Empty:
+                        break
+                for partition in exited:
+                    if partition in running:
+                        running.discard(partition)
+                        self._release_partition(partition)
+
+    def _handle_result(self, message, running):
+        """Fold one worker message into the stats"""
+        if message[0] == "stopped":
+            running.discard(message[1])
+            return
+
+        _, partition, processed, volume, suspicious, errors = message
+        self.stats["transactions_processed"] += processed
+        self.stats["transactions_by_partition"][partition] += processed
+        self.stats["errors"] += errors
+        for hour, count in volume.items():
+            self.stats["transaction_volume_by_hour"][hour] = (
+                self.stats["transaction_volume_by_hour"].get(hour, 0) + count
+            )
+        for transaction, result in suspicious:
+            self._handle_suspicious_transaction(transaction, result)
+
+        with self._idle:
+            self._completed += processed + errors
+            self._in_flight[partition] -= processed + errors
+            self._idle.notify_all()
+
+    def _release_partition(self, partition: int):
+        """Count the transactions of an exited worker as errors and wake its submitters"""
+        with self._idle:
+            lost = self._in_flight[partition]
+            self._in_flight[partition] = 0
+            self._completed += lost
+            self._exited.add(partition)
+            self._idle.notify_all()
+        self.stats["errors"] += lost
+        logger.error(f"Monitoring worker for partition {partition} exited with {lost} transactions unchecked")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get monitoring statistics aggregated across partitions"""
+        stats = super().get_stats()
+        stats["transaction_volume_by_hour"] = dict(stats["transaction_volume_by_hour"])
+        stats["transactions_by_partition"] = list(stats["transactions_by_partition"])
+        stats["num_workers"] = self.num_workers
+        stats["queue_size"] = self._submitted - self._completed
+        return stats
@@ -0,0 +1,3 @@
+"""
+Fraud detection tests package.
+"""
@@ -0,0 +1,187 @@
+"""
+Micro-batch Inference Tests - Fraud Detection
+
+This module checks that micro-batched scoring gives every caller the
+score it would get from scoring its row alone, and the failure paths of
+the batching stage.
+"""
+
+import time
+import random
+import logging
+import threading
+import unittest
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+from sklearn.ensemble import IsolationForest
+from sklearn.preprocessing import StandardScaler
+
+from ..batch_inference import MicroBatchInference
+from ..fraud_detection_system import FraudDetectionSystem
+
+
+def row_sums(matrix):
+    return matrix.sum(axis=1)
+
+
+class TestMicroBatchInference(unittest.TestCase):
+    """Tests for MicroBatchInference"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        logging.disable(logging.ERROR)
+
+    def tearDown(self):
+        """Re-enable logging"""
+        logging.disable(logging.NOTSET)
+
+    def test_concurrent_requests_get_their_own_scores(self):
+        """Test that batched scores match scoring each row alone"""
+        batcher = MicroBatchInference(row_sums, max_batch_size=16, max_wait_ms=5.0)
+        rows = [[float(i), float(i % 7), 0.5] for i in range(400)]
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            scores = list(pool.map(batcher.score, rows))
+        batcher.stop(timeout=5)
+
+        self.assertEqual(scores, [sum(row) for row in rows])
+        metrics = batcher.get_metrics()
+        self.assertEqual(metrics["requests"], len(rows))
+        self.assertLessEqual(metrics["largest_batch"], 16)
+        self.assertEqual(metrics["errors"], 0)
+
+    def test_requests_queued_while_busy_share_a_batch(self):
+        """Test that requests arriving during a model call are scored together"""
+        release = threading.Event()
+        batch_sizes = []
+
+        def slow_scores(matrix):
+            batch_sizes.append(len(matrix))
+            release.wait(5)
+            return matrix.sum(axis=1)
+
+        batcher = MicroBatchInference(slow_scores, max_batch_size=64, max_wait_ms=1.0)
+        first = batcher.submit([1.0])
+        while not batch_sizes:
+            time.sleep(0.001)
+        futures = [batcher.submit([float(i)]) for i in range(10)]
+        release.set()
+
+        self.assertEqual(first.result(5), 1.0)
+        self.assertEqual([future.result(5) for future in futures], [float(i) for i in range(10)])
+        self.assertEqual(batch_sizes, [1, 10])
+        batcher.stop(timeout=5)
+
+    def test_lone_request_does_not_wait(self):
+        """Test that a request on an idle batcher is scored without the batch wait"""
+        batcher = MicroBatchInference(row_sums, max_wait_ms=1000.0)
+        batcher.score([1.0, 2.0], timeout=5)
+
+        started = time.perf_counter()
+        for _ in range(5):
+            batcher.score([1.0, 2.0], timeout=5)
+        elapsed = time.perf_counter() - started
+        batcher.stop(timeout=5)
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(batcher.get_metrics()["mean_batch_size"], 1.0)
+
+    def test_wrong_number_of_scores_fails_the_batch(self):
+        """Test that a scorer returning too few scores fails every request"""
+        batcher = MicroBatchInference(lambda matrix: [0.0] * (len(matrix) - 1))
+
+        with self.assertRaises(ValueError):
+            batcher.score([1.0], timeout=5)
+        batcher.stop(timeout=5)
+        self.assertEqual(batcher.get_metrics()["errors"], 1)
+
+    def test_scorer_errors_reach_callers(self):
+        """Test that a model exception is raised to the waiting caller"""
+        def broken(matrix):
+            raise KeyError("model not loaded")
+
+        batcher = MicroBatchInference(broken)
+        with self.assertRaises(KeyError):
+            batcher.score([1.0], timeout=5)
+        batcher.stop(timeout=5)
+
+    def test_requests_behind_stop_are_failed(self):
+        """Test that a request reaching a stopped worker's queue fails instead of hanging"""
+        release = threading.Event()
+
+        def blocked_scores(matrix):
+            release.wait(5)
+            return matrix.sum(axis=1)
+
+        batcher = MicroBatchInference(blocked_scores)
+        first = batcher.submit([1.0])
+        requests = batcher._queue
+        worker = batcher._worker
+        batcher.stop(timeout=0)
+        racing = Future()
+        requests.put(([3.0], racing, time.perf_counter()))
+        release.set()
+        worker.join(5)
+
+        self.assertEqual(first.result(5), 1.0)
+        with self.assertRaises(RuntimeError):
+            racing.result(5)
+        self.assertEqual(batcher.get_metrics()["errors"], 1)
+
+    def test_invalid_batch_size_is_rejected(self):
+        """Test that the batch size must be at least one"""
+        with self.assertRaises(ValueError):
+            MicroBatchInference(row_sums, max_batch_size=0)
+
+
+class TestFraudModelBatching(unittest.TestCase):
+    """Tests for batched ML scoring in the fraud detection system"""
+
+    def setUp(self):
+        """Set up a fraud detection system with a fitted transaction model"""
+        logging.disable(logging.INFO)
+        rng = random.Random(0)
+        self.transactions = [
+            {"user_id": f"u{rng.randint(0, 50)}", "amount": rng.lognormvariate(6, 1.5),
+             "channel": rng.choice(["ATM", "UPI", "INTERNET"]), "transaction_type": "PAYMENT",
+             "timestamp": 1.7e9 + rng.uniform(0, 86400 * 7)}
+            for _ in range(300)
+        ]
+
+        self.system = FraudDetectionSystem()
+        features = np.array([self.system._transaction_features(tx) for tx in self.transactions])
+        self.system.transaction_scaler = StandardScaler().fit(features)
+        self.system.transaction_model = IsolationForest(random_state=42).fit(
+            self.system.transaction_scaler.transform(features))
+        self.system.ml_enabled = True
+        self.system.thresholds["ml_anomaly_score"] = 0.5
+
+    def tearDown(self):
+        """Stop the batcher and re-enable logging"""
+        if self.system.ml_batcher is not None:
+            self.system.ml_batcher.stop(timeout=5)
+        logging.disable(logging.NOTSET)
+
+    def results(self, check):
+        return [check(dict(tx)) for tx in self.transactions]
+
+    def test_batched_results_match_unbatched(self):
+        """Test that checks through the batcher, one by one and as a batch agree"""
+        unbatched = self.results(self.system.check_transaction)
+        self.assertTrue(any("ML_ANOMALY_DETECTED" in result["risk_factors"] for result in unbatched))
+
+        self.system.velocity_store = FraudDetectionSystem().velocity_store
+        self.system.ml_batcher = MicroBatchInference(self.system._score_transaction_features)
+        batched = self.results(self.system.check_transaction)
+
+        self.system.velocity_store = FraudDetectionSystem().velocity_store
+        whole = self.system.check_transactions([dict(tx) for tx in self.transactions])
+
+        self.assertEqual(batched, unbatched)
+        self.assertEqual(whole, unbatched)
+        self.assertEqual(self.system.get_ml_metrics()["requests"], len(self.transactions))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,217 @@
+"""
+Partitioned Monitor Tests - Fraud Detection
+
+This module checks the partitioned transaction monitor against checking
+the same stream with a single fraud detection system, and its bounded
+partition queues.
+"""
+
+import time
+import random
+import logging
+import threading
+import unittest
+
+from ..fraud_detection_system import FraudDetectionSystem
+from ..partitioned_monitor import PartitionedTransactionMonitor, partition_for
+
+
+class SlowDetector(FraudDetectionSystem):
+    """Fraud detection system that takes a while over every batch"""
+
+    def check_transactions(self, transactions):
+        time.sleep(0.5)
+        return super().check_transactions(transactions)
+
+
+class BrokenDetector(FraudDetectionSystem):
+    """Fraud detection system whose batch checks always fail"""
+
+    def check_transactions(self, transactions):
+        raise RuntimeError("model unavailable")
+
+
+class HungDetector(FraudDetectionSystem):
+    """Fraud detection system that never finishes a batch"""
+
+    def check_transactions(self, transactions):
+        time.sleep(60)
+
+
+class SmallBatchDetector(FraudDetectionSystem):
+    """Fraud detection system that refuses batches larger than MAX_BATCH"""
+
+    MAX_BATCH = 8
+
+    def check_transactions(self, transactions):
+        if len(transactions) > self.MAX_BATCH:
+            raise ValueError(f"batch of {len(transactions)} transactions")
+        return super().check_transactions(transactions)
+
+
+def make_stream(count, users=40, seed=0):
+    """Build a transaction stream with repeat recipients, bursts and large amounts"""
+    rng = random.Random(seed)
+    now = time.time()
+    return [
+        {"transaction_id": f"T{i}", "user_id": f"u{rng.randint(0, users - 1)}",
+         "amount": rng.choice([50, 200, 800, 5000]), "transaction_type": "TRANSFER",
+         "recipient_id": f"r{rng.randint(0, 5)}", "ip_address": f"10.0.0.{rng.randint(1, 3)}",
+         "timestamp": now + i * 0.5}
+        for i in range(count)
+    ]
+
+
+class TestPartitionedTransactionMonitor(unittest.TestCase):
+    """Tests for PartitionedTransactionMonitor"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        logging.disable(logging.CRITICAL)
+        self.monitors = []
+
+    def tearDown(self):
+        """Stop any running monitors and re-enable logging"""
+        for monitor in self.monitors:
+            if monitor.is_running:
+                monitor.stop_monitoring()
+        logging.disable(logging.NOTSET)
+
+    def make_monitor(self, **kwargs):
+        monitor = PartitionedTransactionMonitor(**kwargs)
+        self.monitors.append(monitor)
+        return monitor
+
+    def test_alerts_match_single_detector(self):
+        """Test that partitioned checks raise the alerts of checking the stream in order"""
+        transactions = make_stream(600)
+        detector = FraudDetectionSystem()
+        expected = {}
+        for transaction in transactions:
+            result = detector.check_transaction(dict(transaction))
+            if result["is_suspicious"]:
+                expected[transaction["transaction_id"]] = (result["risk_score"], result["risk_factors"])
+        self.assertTrue(expected)
+
+        alerts = []
+        monitor = self.make_monitor(num_workers=3, queue_size=64, batch_size=16)
+        monitor.register_alert_handler(alerts.append)
+        monitor.start_monitoring()
+        for start in range(0, len(transactions), 50):
+            self.assertEqual(monitor.submit_transactions(
+                [dict(transaction) for transaction in transactions[start:start + 50]]), 50)
+        self.assertTrue(monitor.wait_until_idle(30))
+
+        received = {alert["transaction_id"]: (alert["risk_score"], alert["risk_factors"]) for alert in alerts}
+        self.assertEqual(received, expected)
+
+        stats = monitor.get_stats()
+        self.assertEqual(stats["transactions_processed"], len(transactions))
+        self.assertEqual(stats["alerts_generated"], len(expected))
+        self.assertEqual(stats["queue_size"], 0)
+        self.assertEqual(stats["errors"], 0)
+
+        by_partition = [0] * 3
+        for transaction in transactions:
+            by_partition[partition_for(transaction["user_id"], 3)] += 1
+        self.assertEqual(stats["transactions_by_partition"], by_partition)
+
+    def test_partition_is_stable(self):
+        """Test that a key always maps to the same partition"""
+        self.assertEqual(partition_for("u1", 8), partition_for("u1", 8))
+        self.assertEqual(partition_for(42, 8), partition_for("42", 8))
+        self.assertTrue(all(0 <= partition_for(f"u{i}", 5) < 5 for i in range(100)))
+
+    def test_full_partition_rejects_without_blocking(self):
+        """Test that a partition holding queue_size transactions turns away more"""
+        transactions = make_stream(3, users=1)
+        monitor = self.make_monitor(num_workers=1, queue_size=2, detector_factory=SlowDetector)
+        monitor.start_monitoring()
+
+        self.assertEqual(monitor.submit_transactions(transactions[:2]), 2)
+        self.assertFalse(monitor.submit_transaction(transactions[2], block=False))
+        self.assertFalse(monitor.submit_transaction(transactions[2], timeout=0.05))
+        self.assertEqual(monitor.get_stats()["queue_size"], 2)
+
+        self.assertTrue(monitor.wait_until_idle(10))
+        self.assertTrue(monitor.submit_transaction(transactions[2], block=False))
+        self.assertTrue(monitor.wait_until_idle(10))
+        self.assertEqual(monitor.get_stats()["transactions_processed"], 3)
+
+    def test_oversized_batch_is_sent_in_pieces(self):
+        """Test that a batch larger than queue_size is accepted piece by piece"""
+        transactions = make_stream(50, users=1)
+        monitor = self.make_monitor(num_workers=2, queue_size=8)
+        monitor.start_monitoring()
+
+        self.assertEqual(monitor.submit_transactions(transactions, timeout=10), 50)
+        self.assertTrue(monitor.wait_until_idle(10))
+        self.assertEqual(monitor.get_stats()["transactions_processed"], 50)
+
+    def test_batches_do_not_exceed_batch_size(self):
+        """Test that pieces larger than batch_size are checked in batches of batch_size"""
+        monitor = self.make_monitor(num_workers=1, queue_size=50, batch_size=SmallBatchDetector.MAX_BATCH,
+                                    detector_factory=SmallBatchDetector)
+        monitor.start_monitoring()
+
+        self.assertEqual(monitor.submit_transactions(make_stream(200, users=3), timeout=10), 200)
+        self.assertTrue(monitor.wait_until_idle(10))
+
+        stats = monitor.get_stats()
+        self.assertEqual(stats["errors"], 0)
+        self.assertEqual(stats["transactions_processed"], 200)
+
+    def test_exited_worker_releases_its_partition(self):
+        """Test that submitters blocked on a dead worker's partition are released"""
+        monitor = self.make_monitor(num_workers=1, queue_size=4, detector_factory=HungDetector)
+        monitor.start_monitoring()
+        transactions = make_stream(5, users=1)
+        self.assertEqual(monitor.submit_transactions(transactions[:4]), 4)
+
+        accepted = []
+        blocked = threading.Thread(target=lambda: accepted.append(monitor.submit_transaction(transactions[4])))
+        blocked.start()
+        time.sleep(0.2)
+        self.assertTrue(blocked.is_alive())
+        monitor.workers[0].terminate()
+
+        blocked.join(10)
+        self.assertFalse(blocked.is_alive())
+        self.assertEqual(accepted, [False])
+        self.assertTrue(monitor.wait_until_idle(10))
+        stats = monitor.get_stats()
+        self.assertEqual(stats["errors"], 4)
+        self.assertEqual(stats["queue_size"], 0)
+
+    def test_failed_batches_are_counted(self):
+        """Test that a failing detector counts errors without stalling the monitor"""
+        monitor = self.make_monitor(num_workers=2, detector_factory=BrokenDetector)
+        monitor.start_monitoring()
+
+        self.assertEqual(monitor.submit_transactions(make_stream(20)), 20)
+        self.assertTrue(monitor.wait_until_idle(10))
+
+        stats = monitor.get_stats()
+        self.assertEqual(stats["errors"], 20)
+        self.assertEqual(stats["transactions_processed"], 0)
+        self.assertEqual(stats["queue_size"], 0)
+
+    def test_stop_checks_queued_transactions(self):
+        """Test that stopping drains what was already submitted"""
+        monitor = self.make_monitor(num_workers=2)
+        monitor.start_monitoring()
+        monitor.submit_transactions(make_stream(100))
+
+        self.assertTrue(monitor.stop_monitoring())
+        self.assertFalse(monitor.is_running)
+        self.assertEqual(monitor.get_stats()["transactions_processed"], 100)
+        self.assertFalse(monitor.stop_monitoring())
+
+    def test_invalid_queue_size_is_rejected(self):
+        """Test that each partition must hold at least one transaction"""
+        with self.assertRaises(ValueError):
+            PartitionedTransactionMonitor(num_workers=1, queue_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+"""
+Velocity Feature Store Tests - Fraud Detection
+
+This module checks the streaming velocity feature store against the
+per-user transaction lists it replaced, and its lazy expiry of idle users.
+"""
+
+import random
+import logging
+import unittest
+
+from ..velocity_store import VelocityFeatureStore
+from ..fraud_detection_system import FraudDetectionSystem
+
+WINDOW = 3600.0
+EXPIRY = 7200.0
+
+
+class LegacyTransactionCache:
+    """Per-user transaction lists, as the fraud rules used to keep them (expired entries filtered at query time)"""
+
+    def __init__(self):
+        self.transactions = {}
+
+    def record(self, user_id, timestamp, recipient_id=None, location=None):
+        self.transactions.setdefault(user_id, []).append(
+            {"timestamp": timestamp, "recipient_id": recipient_id, "location": location})
+
+    def _live(self, user_id, now):
+        return [tx for tx in self.transactions.get(user_id, []) if now - tx["timestamp"] < EXPIRY]
+
+    def recent_count(self, user_id, now):
+        return len([tx for tx in self._live(user_id, now) if now - tx["timestamp"] < WINDOW])
+
+    def is_known_recipient(self, user_id, recipient_id, now):
+        return any(tx["recipient_id"] == recipient_id for tx in self._live(user_id, now))
+
+    def last_location(self, user_id, now):
+        located = [tx for tx in self._live(user_id, now) if tx["location"] is not None]
+        if not located:
+            return None
+        last = max(located, key=lambda tx: tx["timestamp"])
+        return last["location"], last["timestamp"]
+
+
+def make_stream(count=5000, users=200, seed=1):
+    """Time-ordered transactions with recipients and occasional locations"""
+    rng = random.Random(seed)
+    now = 1.7e9
+    stream = []
+    for _ in range(count):
+        now += rng.expovariate(1 / 20.0)
+        location = {"ip": f"10.0.0.{rng.randint(0, 3)}"} if rng.random() < 0.3 else None
+        stream.append((f"u{rng.randint(0, users - 1)}", now, f"r{rng.randint(0, 30)}", location))
+    return stream
+
+
+class TestVelocityFeatureStore(unittest.TestCase):
+    """Tests for VelocityFeatureStore"""
+
+    def test_queries_match_legacy_cache(self):
+        """Test that every query matches the transaction lists before each record"""
+        store = VelocityFeatureStore(WINDOW, EXPIRY, capacity=64)
+        legacy = LegacyTransactionCache()
+
+        for user_id, now, recipient_id, location in make_stream():
+            self.assertEqual(store.recent_count(user_id, now), legacy.recent_count(user_id, now))
+            self.assertEqual(store.is_known_recipient(user_id, recipient_id, now),
+                             legacy.is_known_recipient(user_id, recipient_id, now))
+            self.assertEqual(store.last_location(user_id, now), legacy.last_location(user_id, now))
+            store.record(user_id, now, recipient_id, location)
+            legacy.record(user_id, now, recipient_id, location)
+
+    def test_count_is_capped_at_capacity(self):
+        """Test that a window count is exact up to the ring capacity"""
+        store = VelocityFeatureStore(WINDOW, EXPIRY, capacity=4)
+        for i in range(10):
+            store.record("u1", 1000.0 + i)
+
+        self.assertEqual(store.recent_count("u1", 1010.0), 4)
+        self.assertEqual(store.recent_count("u1", 1010.0, window_seconds=3.5), 3)
+        self.assertEqual(store.recent_count("unknown", 1010.0), 0)
+
+    def test_idle_users_expire(self):
+        """Test that the timer wheel drops idle users and keeps active ones"""
+        store = VelocityFeatureStore(WINDOW, EXPIRY, wheel_slots=8)
+        store.record("idle", 0.0)
+        store.record("active", 0.0)
+        for step in range(1, 6):
+            store.record("active", step * 2000.0)
+
+        self.assertNotIn("idle", store)
+        self.assertIn("active", store)
+        self.assertEqual(len(store), 1)
+        self.assertEqual(store.expire(10000.0 + EXPIRY + EXPIRY / 8), 1)
+        self.assertEqual(len(store), 0)
+
+    def test_expiry_never_drops_recent_users(self):
+        """Test that lazy expiry only removes users idle for the expiry period"""
+        store = VelocityFeatureStore(WINDOW, EXPIRY)
+        last_seen = {}
+        for user_id, now, recipient_id, location in make_stream(count=3000, users=500, seed=2):
+            store.record(user_id, now, recipient_id, location)
+            last_seen[user_id] = now
+
+        for user_id, seen in last_seen.items():
+            if now - seen < EXPIRY:
+                self.assertIn(user_id, store)
+        self.assertLessEqual(len(store), len(last_seen))
+
+    def test_out_of_order_location_keeps_latest(self):
+        """Test that a late-arriving transaction does not replace a newer location"""
+        store = VelocityFeatureStore(WINDOW, EXPIRY)
+        store.record("u1", 200.0, location={"ip": "new"})
+        store.record("u1", 100.0, location={"ip": "old"})
+
+        self.assertEqual(store.last_location("u1", 300.0), ({"ip": "new"}, 200.0))
+        self.assertIsNone(store.last_location("u1", 200.0 + EXPIRY))
+
+    def test_invalid_periods_are_rejected(self):
+        """Test that the window and expiry must be positive"""
+        with self.assertRaises(ValueError):
+            VelocityFeatureStore(0, EXPIRY)
+        with self.assertRaises(ValueError):
+            VelocityFeatureStore(WINDOW, -1)
+
+
+class TestFraudRulesOnVelocityStore(unittest.TestCase):
+    """Tests for the fraud rules that read the velocity store"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        logging.disable(logging.INFO)
+        self.system = FraudDetectionSystem()
+        self.threshold = self.system.thresholds["velocity_threshold"]
+
+    def tearDown(self):
+        """Re-enable logging"""
+        logging.disable(logging.NOTSET)
+
+    def check(self, timestamp, **fields):
+        transaction = {"user_id": "u1", "amount": 10, "timestamp": timestamp}
+        transaction.update(fields)
+        return self.system.check_transaction(transaction)
+
+    def test_velocity_flag_follows_window_count(self):
+        """Test that HIGH_VELOCITY is raised once the window holds more than the threshold"""
+        flags = [("HIGH_VELOCITY" in self.check(1000.0 + i)["risk_factors"]) for i in range(self.threshold + 2)]
+
+        self.assertEqual(flags, [False] * (self.threshold + 1) + [True])
+        self.assertNotIn("HIGH_VELOCITY", self.check(1000.0 + WINDOW + self.threshold + 1)["risk_factors"])
+
+    def test_recipient_becomes_known(self):
+        """Test that a paid recipient is known until the cache expiry"""
+        amount = self.system.thresholds["new_beneficiary_amount"] + 1
+        first = self.check(1000.0, amount=amount, transaction_type="TRANSFER", recipient_id="r1")
+        second = self.check(2000.0, amount=amount, transaction_type="TRANSFER", recipient_id="r1")
+        expiry = self.system.cache_expiry_minutes * 60
+        later = self.check(2000.0 + expiry, amount=amount, transaction_type="TRANSFER", recipient_id="r1")
+
+        self.assertIn("NEW_RECIPIENT_HIGH_AMOUNT", first["risk_factors"])
+        self.assertNotIn("NEW_RECIPIENT_HIGH_AMOUNT", second["risk_factors"])
+        self.assertIn("NEW_RECIPIENT_HIGH_AMOUNT", later["risk_factors"])
+
+    def test_ip_change_is_unusual(self):
+        """Test the location rule on the last recorded location"""
+        self.check(1000.0, location={"ip": "10.0.0.1"})
+
+        self.assertIn("UNUSUAL_LOCATION", self.check(1600.0, location={"ip": "10.0.0.2"})["risk_factors"])
+        self.assertNotIn("UNUSUAL_LOCATION", self.check(1700.0, location={"ip": "10.0.0.2"})["risk_factors"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,240 @@
+"""
+Velocity Feature Store for Core Banking System
+
+This module keeps the per-user state that the real-time fraud rules need
+(recent transaction times, known recipients, last location) in compact
+per-user records, so that recording a transaction and answering a
+velocity query are constant-time operations independent of the number
+of users. Idle users are expired lazily through a timer wheel instead of
+by sweeping every user on each transaction.
+"""
+
+import logging
+from array import array
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+
+class UserVelocityState:
+    """Streaming state of one user"""
+
+    __slots__ = (
+        "times",
+        "head",
+        "size",
+        "last_seen",
+        "recipients",
+        "recipients_pruned_size",
+        "last_location",
+        "last_location_time",
+    )
+
+    def __init__(self, capacity: int):
+        self.times = array("d", bytes(8 * capacity))  # ring of the latest transaction times
+        self.head = 0  # next ring position to write
+        self.size = 0
+        self.last_seen = float("-inf")
+        self.recipients: Dict[Hashable, float] = {}  # recipient -> last transaction time
+        self.recipients_pruned_size = 0
+        self.last_location: Optional[Dict[str, Any]] = None
+        self.last_location_time = float("-inf")
+
+
+class VelocityFeatureStore:
+    """
+    Streaming per-user feature store for velocity-based fraud rules
+
+    Each user holds a fixed-size ring of their latest transaction times,
+    so a window count is exact up to the ring capacity (capacity should
+    exceed the velocity threshold the rules compare against). Recipients
+    and the last location are kept with the time they were last seen and
+    are ignored once older than the expiry period.
+
+    Every user has exactly one entry in a timer wheel at the slot of its
+    expiry deadline. When the wheel passes that slot the user is dropped
+    if it has been idle for the expiry period, or moved to its new
+    deadline otherwise, so expiry costs amortized O(1) per transaction.
+    """
+
+    def __init__(self,
+                 window_seconds: float,
+                 expiry_seconds: float,
+                 capacity: int = 16,
+                 wheel_slots: int = 64):
+        """
+        Initialize the feature store
+
+        Args:
+            window_seconds (float): Default velocity window
+            expiry_seconds (float): Idle time after which a user's state is dropped
+            capacity (int): Transaction times kept per user
+            wheel_slots (int): Number of timer wheel slots spanning the expiry period
+        """
+        if expiry_seconds <= 0 or window_seconds <= 0:
+            raise ValueError("Velocity window and expiry must be positive")
+        self.window_seconds = float(window_seconds)
+        self.expiry_seconds = float(expiry_seconds)
+        self.capacity = max(1, int(capacity))
+
+        self._users: Dict[Hashable, UserVelocityState] = {}
+        self._slot_seconds = self.expiry_seconds / wheel_slots
+        self._wheel: List[List[Hashable]] = [[] for _ in range(wheel_slots)]
+        self._tick: Optional[int] = None  # last wheel tick processed
+        self._clock = float("-inf")  # latest transaction time seen
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def __contains__(self, user_id: Hashable) -> bool:
+        return user_id in self._users
+
+    def record(self,
+               user_id: Hashable,
+               timestamp: float,
+               recipient_id: Optional[Hashable] = None,
+               location: Optional[Dict[str, Any]] = None):
+        """
+        Record a transaction in its user's state
+
+        Args:
+            user_id: ID of the user initiating the transaction
+            timestamp (float): Transaction time (epoch seconds)
+            recipient_id: ID of the recipient, if any
+            location (Dict, optional): Transaction location
+        """
+        if timestamp > self._clock:
+            self._clock = timestamp
+            self.expire(timestamp)
+
+        state = self._users.get(user_id)
+        if state is None:
+            state = UserVelocityState(self.capacity)
+            self._users[user_id] = state
+            state.last_seen = timestamp
+            self._schedule(user_id, state)
+        elif timestamp > state.last_seen:
+            state.last_seen = timestamp
+
+        state.times[state.head] = timestamp
+        state.head = (state.head + 1) % self.capacity
+        if state.size < self.capacity:
+            state.size += 1
+
+        if recipient_id is not None:
+            recipients = state.recipients
+            if timestamp > recipients.get(recipient_id, float("-inf")):
+                recipients[recipient_id] = timestamp
+            if len(recipients) > 2 * state.recipients_pruned_size + 8:
+                self._prune_recipients(state)
+
+        if location is not None and timestamp >= state.last_location_time:
+            state.last_location = location
+            state.last_location_time = timestamp
+
+    def recent_count(self, user_id: Hashable, now: float, window_seconds: Optional[float] = None) -> int:
+        """
+        Count a user's transactions within a window before now
+
+        Args:
+            user_id: User ID
+            now (float): Reference time (epoch seconds)
+            window_seconds (float, optional): Window length, the store default if None
+
+        Returns:
+            int: Number of transactions in the window, at most the ring capacity
+        """
+        state = self._users.get(user_id)
+        if state is None:
+            return 0
+        window = self.window_seconds if window_seconds is None else window_seconds
+        times = state.times
+        count = 0
+        for i in range(state.size):
+            if now - times[i] < window:
+                count += 1
+        return count
+
+    def is_known_recipient(self, user_id: Hashable, recipient_id: Hashable, now: float) -> bool:
+        """
+        Check whether a user has paid a recipient within the expiry period
+
+        Args:
+            user_id: User ID
+            recipient_id: Recipient ID
+            now (float): Reference time (epoch seconds)
+
+        Returns:
+            bool: True if the recipient is known
+        """
+        state = self._users.get(user_id)
+        if state is None:
+            return False
+        seen = state.recipients.get(recipient_id)
+        return seen is not None and now - seen < self.expiry_seconds
+
+    def last_location(self, user_id: Hashable, now: float) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Get a user's most recent transaction location within the expiry period
+
+        Args:
+            user_id: User ID
+            now (float): Reference time (epoch seconds)
+
+        Returns:
+            Tuple: (location, timestamp), or None if there is none
+        """
+        state = self._users.get(user_id)
+        if state is None or state.last_location is None:
+            return None
+        if now - state.last_location_time >= self.expiry_seconds:
+            return None
+        return state.last_location, state.last_location_time
+
+    def expire(self, now: float) -> int:
+        """
+        Advance the timer wheel to now and drop users idle for the expiry period
+
+        Args:
+            now (float): Current time (epoch seconds)
+
+        Returns:
+            int: Number of users dropped
+        """
+        target = int(now // self._slot_seconds)
+        if self._tick is None:
+            self._tick = target
+            return 0
+        if target <= self._tick:
+            return 0
+
+        slots = len(self._wheel)
+        first = self._tick + 1
+        self._tick = target
+        dropped = 0
+        # A jump of more than one rotation only needs each slot visited once
+        for tick in range(max(first, target - slots + 1), target + 1):
+            index = tick % slots
+            due, self._wheel[index] = self._wheel[index], []
+            for user_id in due:
+                state = self._users[user_id]
+                if now - state.last_seen >= self.expiry_seconds:
+                    del self._users[user_id]
+                    dropped += 1
+                else:
+                    self._schedule(user_id, state)
+        return dropped
+
+    def _schedule(self, user_id: Hashable, state: UserVelocityState):
+        """Put a user in the wheel slot of its expiry deadline"""
+        deadline = int((state.last_seen + self.expiry_seconds) // self._slot_seconds)
+        if self._tick is not None and deadline <= self._tick:
+            deadline = self._tick + 1
+        self._wheel[deadline % len(self._wheel)].append(user_id)
+
+    def _prune_recipients(self, state: UserVelocityState):
+        """Drop recipients not seen within the expiry period"""
+        cutoff = self._clock - self.expiry_seconds
+        state.recipients = {recipient: seen for recipient, seen in state.recipients.items() if seen > cutoff}
+        state.recipients_pruned_size = len(state.recipients)
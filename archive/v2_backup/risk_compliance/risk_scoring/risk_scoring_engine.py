@@ -11,7 +11,8 @@ import logging
 import datetime
 import json
 import math
-from typing import Dict, Any, List, Optional, Union, Tuple
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Union, Tuple, Sequence
 
 # Try to import optional dependencies
 try:
@@ -50,6 +51,113 @@ except ImportError:
             return {}
 
 
+class TTLLRUCache:
+    """Bounded least-recently-used cache whose entries expire a fixed time after being stored"""
+    
+    def __init__(self, max_size: int, ttl_seconds: float):
+        """
+        Initialize the cache
+        
+        Args:
+            max_size (int): Most entries held; the least recently used is evicted beyond it
+            ttl_seconds (float): Seconds an entry stays valid after it is stored
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (stored_at, value), least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Any, now: Optional[float] = None) -> Any:
+        """
+        Get a cached value, or None if absent or expired
+        
+        Args:
+            key: Cache key
+            now (float, optional): Current time, time.time() if None
+            
+        Returns:
+            Any: Cached value or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        if now is None:
+            now = time.time()
+        if now - entry[0] >= self.ttl_seconds:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+    
+    def put(self, key: Any, value: Any, now: Optional[float] = None):
+        """
+        Store a value, evicting the least recently used entries beyond max_size
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            now (float, optional): Current time, time.time() if None
+        """
+        if now is None:
+            now = time.time()
+        self._entries[key] = (now, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def pop(self, key: Any) -> Any:
+        """Remove an entry and return its value, or None if absent"""
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
+    
+    def clear(self):
+        """Remove all entries"""
+        self._entries.clear()
+    
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        """
+        Remove every expired entry
+        
+        Args:
+            now (float, optional): Current time, time.time() if None
+            
+        Returns:
+            int: Number of entries removed
+        """
+        if now is None:
+            now = time.time()
+        cutoff = now - self.ttl_seconds
+        expired = [key for key, (stored_at, _) in self._entries.items() if stored_at <= cutoff]
+        for key in expired:
+            del self._entries[key]
+        self.expirations += len(expired)
+        return len(expired)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss/eviction counts"""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+
 class RiskScoringEngine:
     """Risk scoring engine for banking entities"""
     
@@ -136,23 +244,14 @@ class RiskScoringEngine:
             "high": 80
         }
         
-        # Initialize risk score cache
-        self.score_cache = {
-            "customer": {},
-            "account": {},
-            "transaction": {},
-            "loan": {}
-        }
-        
         # Cache expiry in seconds
-        self.cache_expiry = 3600  # 1 hour
-        
-        # Cache timestamps for expiry checking
-        self.cache_timestamps = {
-            "customer": {},
-            "account": {},
-            "transaction": {},
-            "loan": {}
+        self.cache_expiry = self.config.get("cache_expiry_seconds", 3600)  # 1 hour
+        self.cache_max_entries = self.config.get("cache_max_entries", 100000)
+        
+        # Initialize risk score cache (bounded LRU per entity type)
+        self.score_cache = {
+            entity_type: TTLLRUCache(self.cache_max_entries, self.cache_expiry)
+            for entity_type in ("customer", "account", "transaction", "loan")
         }
     
     def score_customer(self, customer_data: Dict[str, Any], 
@@ -184,10 +283,10 @@ class RiskScoringEngine:
         customer_id = customer_data.get("customer_id")
         
         # Check cache if not forcing refresh
-        if not force_refresh and customer_id in self.score_cache["customer"]:
-            cache_time = self.cache_timestamps["customer"].get(customer_id, 0)
-            if time.time() - cache_time < self.cache_expiry:
-                return self.score_cache["customer"][customer_id]
+        if not force_refresh and customer_id:
+            cached = self.score_cache["customer"].get(customer_id)
+            if cached is not None:
+                return cached
         
         # Initialize score components and risk factors
         score_components = {}
@@ -313,8 +412,7 @@ class RiskScoringEngine:
         
         # Cache the result
         if customer_id:
-            self.score_cache["customer"][customer_id] = result
-            self.cache_timestamps["customer"][customer_id] = time.time()
+            self.score_cache["customer"].put(customer_id, result)
         
         return result
     
@@ -335,10 +433,10 @@ class RiskScoringEngine:
         account_id = account_data.get("account_id")
         
         # Check cache if not forcing refresh
-        if not force_refresh and account_id in self.score_cache["account"]:
-            cache_time = self.cache_timestamps["account"].get(account_id, 0)
-            if time.time() - cache_time < self.cache_expiry:
-                return self.score_cache["account"][account_id]
+        if not force_refresh and account_id:
+            cached = self.score_cache["account"].get(account_id)
+            if cached is not None:
+                return cached
         
         # Initialize score components and risk factors
         score_components = {}
@@ -396,8 +494,8 @@ class RiskScoringEngine:
         if customer_risk_score is None:
             # If no customer score provided, use a default or calculate
             customer_id = account_data.get("customer_id")
-            if customer_id and customer_id in self.score_cache["customer"]:
-                cached_customer = self.score_cache["customer"][customer_id]
+            cached_customer = self.score_cache["customer"].get(customer_id) if customer_id else None
+            if cached_customer is not None:
                 customer_risk_score = cached_customer.get("risk_score", 50)
             else:
                 customer_risk_score = 50  # Default moderate risk
@@ -431,8 +529,7 @@ class RiskScoringEngine:
         
         # Cache the result
         if account_id:
-            self.score_cache["account"][account_id] = result
-            self.cache_timestamps["account"][account_id] = time.time()
+            self.score_cache["account"].put(account_id, result)
         
         return result
     
@@ -527,6 +624,218 @@ class RiskScoringEngine:
         # Implementation would score loan based on amount, term, purpose, collateral, etc.
         return {"loan_id": loan_data.get("loan_id"), "risk_score": 50, "risk_level": "MEDIUM"}
     
+    def score_customers(self, customers: Any) -> Dict[str, Any]:
+        """
+        Calculate risk scores for a batch of customers
+        
+        Every component is computed as an array operation over the whole
+        batch, with the same bands and weights as score_customer. Batch
+        results are not cached.
+        
+        Args:
+            customers: Columnar frame (pandas DataFrame or dict of column
+                sequences) with the fields of score_customer; missing
+                columns and missing values take score_customer's defaults
+                
+        Returns:
+            Dict: customer_id, risk_score and risk_level arrays, and the
+                component score arrays
+        """
+        size = self._frame_length(customers)
+        age = self._numeric_column(customers, "age", 35, size)
+        credit_score = self._numeric_column(customers, "credit_score", 700, size)
+        employment_status = self._text_column(customers, "employment_status", "EMPLOYED", size)
+        employment_years = self._numeric_column(customers, "employment_years", 3, size)
+        income = self._numeric_column(customers, "income", 50000, size)
+        address_years = self._numeric_column(customers, "address_years", 3, size)
+        delinquencies = self._numeric_column(customers, "past_delinquencies", 0, size)
+        banking_years = self._numeric_column(customers, "banking_history_years", 5, size)
+        kyc_status = self._text_column(customers, "kyc_status", "VERIFIED", size)
+        
+        components = {
+            "age": np.select([age < 25, age > 65], [70, 40], 20),
+            "credit_score": np.select([credit_score < 600, credit_score < 700, credit_score < 800], [90, 60, 30], 10),
+            "employment_stability": np.select(
+                [employment_status == "UNEMPLOYED", employment_status == "SELF_EMPLOYED",
+                 employment_years < 1, employment_years < 3],
+                [90, 60, 70, 40], 20),
+            "income_stability": np.select([income < 15000, income < 30000, income < 100000], [80, 60, 40], 20),
+            "address_stability": np.select([address_years < 1, address_years < 2], [70, 50], 20),
+            "past_delinquencies": np.select([delinquencies >= 3, delinquencies == 2, delinquencies == 1], [95, 80, 60], 10),
+            "banking_history": np.select([banking_years < 1, banking_years < 3], [80, 50], 20),
+            "kyc_status": np.select([kyc_status == "UNVERIFIED", kyc_status == "PARTIAL"], [100, 70], 10)
+        }
+        
+        risk_score = self._weighted_score(components, self.customer_risk_weights, size)
+        return self._batch_result("customer_id", customers, risk_score, components)
+    
+    def score_accounts(self, accounts: Any,
+                       customer_risk_scores: Optional[Sequence[float]] = None) -> Dict[str, Any]:
+        """
+        Calculate risk scores for a batch of accounts
+        
+        Args:
+            accounts: Columnar frame (pandas DataFrame or dict of column
+                sequences) with the fields of score_account
+            customer_risk_scores (Sequence, optional): Customer risk score per
+                account; otherwise taken from a customer_risk_score column, or
+                from cached customer scores, defaulting to 50
+                
+        Returns:
+            Dict: account_id, risk_score and risk_level arrays, and the
+                component score arrays
+        """
+        size = self._frame_length(accounts)
+        account_type = self._text_column(accounts, "account_type", "SAVINGS", size)
+        account_age_days = self._numeric_column(accounts, "account_age_days", 365, size)
+        balance_volatility = self._numeric_column(accounts, "balance_volatility", 0.2, size)
+        overdraft_count = self._numeric_column(accounts, "overdraft_count_90days", 0, size)
+        
+        if customer_risk_scores is not None:
+            customer_score = np.asarray(customer_risk_scores, dtype=float)
+        elif "customer_risk_score" in accounts:
+            customer_score = self._numeric_column(accounts, "customer_risk_score", 50, size)
+        else:
+            customer_cache = self.score_cache["customer"]
+            customer_ids = (self._text_column(accounts, "customer_id", None, size)
+                            if "customer_id" in accounts else [None] * size)
+            cached = [customer_cache.get(customer_id) if customer_id else None for customer_id in customer_ids]
+            customer_score = np.array([entry.get("risk_score", 50) if entry is not None else 50
+                                       for entry in cached], dtype=float)
+        
+        components = {
+            "account_type": np.select(
+                [account_type == "CHECKING", account_type == "SAVINGS", account_type == "FIXED_DEPOSIT"],
+                [40, 30, 10], 50),
+            "account_age": np.select([account_age_days < 30, account_age_days < 180, account_age_days < 365],
+                                     [80, 60, 40], 20),
+            "balance_volatility": np.select(
+                [balance_volatility > 0.5, balance_volatility > 0.3, balance_volatility > 0.1], [80, 60, 40], 20),
+            "overdraft_frequency": np.select([overdraft_count >= 3, overdraft_count == 2, overdraft_count == 1],
+                                             [90, 70, 50], 10),
+            "customer_risk_score": customer_score
+        }
+        
+        risk_score = self._weighted_score(components, self.account_risk_weights, size)
+        return self._batch_result("account_id", accounts, risk_score, components)
+    
+    def score_transactions(self, transactions: Any) -> Dict[str, Any]:
+        """
+        Calculate risk scores for a batch of transactions
+        
+        Args:
+            transactions: Columnar frame (pandas DataFrame or dict of column
+                sequences) with the fields of score_transaction
+                
+        Returns:
+            Dict: transaction_id, risk_score and risk_level arrays, and the
+                component score arrays
+        """
+        size = self._frame_length(transactions)
+        amount = self._numeric_column(transactions, "amount", 0, size)
+        avg_transaction = self._numeric_column(transactions, "average_tx_amount", 500, size)
+        tx_type = self._text_column(transactions, "transaction_type", "TRANSFER", size)
+        
+        positive = avg_transaction > 0
+        amount_ratio = np.divide(amount, avg_transaction, out=np.ones(size), where=positive)
+        
+        components = {
+            "amount": np.select([amount_ratio > 10, amount_ratio > 5, amount_ratio > 2], [90, 70, 50], 20),
+            "transaction_type": np.select(
+                [tx_type == "INTERNATIONAL_WIRE", (tx_type == "CASH_WITHDRAWAL") | (tx_type == "CASH_DEPOSIT"),
+                 tx_type == "TRANSFER"],
+                [80, 60, 40], 30)
+        }
+        
+        # Components without a model yet score as moderate risk
+        for component in self.transaction_risk_weights:
+            if component not in components:
+                components[component] = np.full(size, 50)
+        
+        risk_score = self._weighted_score(components, self.transaction_risk_weights, size)
+        return self._batch_result("transaction_id", transactions, risk_score, components)
+    
+    def score_loans(self, loans: Any,
+                    customer_risk_scores: Optional[Sequence[float]] = None) -> Dict[str, Any]:
+        """
+        Calculate risk scores for a batch of loans
+        
+        Args:
+            loans: Columnar frame (pandas DataFrame or dict of column sequences)
+            customer_risk_scores (Sequence, optional): Customer risk score per loan
+                
+        Returns:
+            Dict: loan_id, risk_score and risk_level arrays
+        """
+        # Mirrors score_loan until loan scoring is implemented
+        size = self._frame_length(loans)
+        return {
+            "loan_id": self._id_column(loans, "loan_id"),
+            "risk_score": np.full(size, 50.0),
+            "risk_level": np.full(size, "MEDIUM")
+        }
+    
+    def _frame_length(self, frame: Any) -> int:
+        """Get the number of rows of a columnar frame"""
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required for batch risk scoring")
+        if PANDAS_AVAILABLE and isinstance(frame, pd.DataFrame):
+            return len(frame)
+        for values in frame.values():
+            return len(values)
+        return 0
+    
+    def _numeric_column(self, frame: Any, name: str, default: float, size: int) -> "np.ndarray":
+        """Get a numeric column as a float array, filling missing values with the default"""
+        if name not in frame:
+            return np.full(size, float(default))
+        values = np.asarray(frame[name], dtype=float)
+        return np.where(np.isnan(values), float(default), values)
+    
+    def _text_column(self, frame: Any, name: str, default: Optional[str], size: int) -> "np.ndarray":
+        """Get a categorical column as an object array, filling missing values with the default"""
+        if name not in frame:
+            return np.full(size, default, dtype=object)
+        values = np.array(frame[name], dtype=object)
+        if PANDAS_AVAILABLE:
+            missing = pd.isna(values)
+        else:
+            missing = np.array([value is None or value != value for value in values], dtype=bool)
+        values[missing] = default
+        return values
+    
+    def _id_column(self, frame: Any, name: str) -> Optional["np.ndarray"]:
+        """Get an ID column as an array, or None if the frame has none"""
+        return np.asarray(frame[name], dtype=object) if name in frame else None
+    
+    def _weighted_score(self, components: Dict[str, "np.ndarray"], weights: Dict[str, float],
+                        size: int) -> "np.ndarray":
+        """Sum the weighted component arrays, in the same order as the single-entity scorers"""
+        risk_score = np.zeros(size)
+        for component, scores in components.items():
+            risk_score += scores * weights.get(component, 0.1)
+        return risk_score
+    
+    def _batch_result(self, id_name: str, frame: Any, risk_score: "np.ndarray",
+                      components: Dict[str, "np.ndarray"]) -> Dict[str, Any]:
+        """Build a batch scoring result from the unrounded scores"""
+        return {
+            id_name: self._id_column(frame, id_name),
+            "risk_score": np.round(risk_score, 2),
+            "risk_level": self._get_risk_levels(risk_score),
+            "components": components
+        }
+    
+    def _get_risk_levels(self, scores: "np.ndarray") -> "np.ndarray":
+        """Convert an array of risk scores to risk levels"""
+        return np.select(
+            [scores >= self.risk_thresholds["high"],
+             scores >= self.risk_thresholds["medium"],
+             scores >= self.risk_thresholds["low"]],
+            ["HIGH", "MEDIUM", "LOW"],
+            "VERY LOW"
+        )
+    
     def _get_risk_level(self, score: float) -> str:
         """Convert risk score to risk level"""
         if score >= self.risk_thresholds["high"]:
@@ -553,21 +862,15 @@ class RiskScoringEngine:
         try:
             if not entity_type:
                 # Clear all caches
-                for cache_type in self.score_cache:
-                    self.score_cache[cache_type] = {}
-                    self.cache_timestamps[cache_type] = {}
+                for cache in self.score_cache.values():
+                    cache.clear()
             elif entity_type in self.score_cache:
                 if not entity_id:
                     # Clear specific type
-                    self.score_cache[entity_type] = {}
-                    self.cache_timestamps[entity_type] = {}
+                    self.score_cache[entity_type].clear()
                 else:
                     # Clear specific entity
-                    if entity_id in self.score_cache[entity_type]:
-                        del self.score_cache[entity_type][entity_id]
-                    
-                    if entity_id in self.cache_timestamps[entity_type]:
-                        del self.cache_timestamps[entity_type][entity_id]
+                    self.score_cache[entity_type].pop(entity_id)
             
             return True
         except Exception as e:
@@ -583,6 +886,9 @@ class RiskScoringEngine:
                 "transaction": len(self.score_cache["transaction"]),
                 "loan": len(self.score_cache["loan"])
             },
+            "cache_stats": {
+                entity_type: cache.get_stats() for entity_type, cache in self.score_cache.items()
+            },
             "environment": self.environment,
             "risk_thresholds": self.risk_thresholds
         }
@@ -598,5 +904,9 @@ score_customer = risk_scoring.score_customer
 score_account = risk_scoring.score_account
 score_transaction = risk_scoring.score_transaction
 score_loan = risk_scoring.score_loan
+score_customers = risk_scoring.score_customers
+score_accounts = risk_scoring.score_accounts
+score_transactions = risk_scoring.score_transactions
+score_loans = risk_scoring.score_loans
 clear_cache = risk_scoring.clear_cache
 get_scoring_stats = risk_scoring.get_scoring_stats
@@ -0,0 +1,3 @@
+"""
+Risk scoring tests package.
+"""
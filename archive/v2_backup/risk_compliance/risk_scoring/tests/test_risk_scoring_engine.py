@@ -0,0 +1,207 @@
+"""
+Risk Scoring Engine Tests - Risk Scoring
+
+This module checks batch risk scoring against scoring each entity with
+the single-entity scorers, and the bounded TTL LRU score cache.
+"""
+
+import random
+import logging
+import unittest
+
+import pandas as pd
+
+from ..risk_scoring_engine import RiskScoringEngine, TTLLRUCache
+
+CUSTOMER_FIELDS = {
+    "age": [18, 24, 25, 40, 65, 66, 80],
+    "credit_score": [550, 599, 600, 699, 700, 799, 800, 850],
+    "employment_status": ["EMPLOYED", "UNEMPLOYED", "SELF_EMPLOYED", "RETIRED"],
+    "employment_years": [0, 0.5, 1, 2, 3, 5],
+    "income": [10000, 15000, 20000, 30000, 60000, 100000, 200000],
+    "address_years": [0, 1, 2, 5],
+    "past_delinquencies": [0, 1, 2, 3, 4],
+    "banking_history_years": [0, 1, 3, 10],
+    "kyc_status": ["VERIFIED", "UNVERIFIED", "PARTIAL"]
+}
+
+
+def make_customers(count, seed=0):
+    """Build customers with every band of every field, some fields left out"""
+    rng = random.Random(seed)
+    customers = []
+    for i in range(count):
+        customer = {"customer_id": f"C{i}"}
+        for field, values in CUSTOMER_FIELDS.items():
+            if rng.random() > 0.1:
+                customer[field] = rng.choice(values)
+        customers.append(customer)
+    return customers
+
+
+def columns(records):
+    """Turn records into a dict of columns, None where a record lacks the field"""
+    fields = sorted({field for record in records for field in record})
+    return {field: [record.get(field) for record in records] for field in fields}
+
+
+class TestTTLLRUCache(unittest.TestCase):
+    """Tests for TTLLRUCache"""
+
+    def test_entries_expire_after_ttl(self):
+        """Test that an entry is served until ttl_seconds after it was stored"""
+        cache = TTLLRUCache(max_size=10, ttl_seconds=10)
+        cache.put("a", 1, now=0)
+
+        self.assertEqual(cache.get("a", now=0), 1)
+        self.assertEqual(cache.get("a", now=9.5), 1)
+        self.assertIsNone(cache.get("a", now=10))
+        self.assertEqual(len(cache), 0)
+
+        stats = cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["expirations"]), (2, 1, 1))
+
+    def test_least_recently_used_is_evicted(self):
+        """Test that a read keeps an entry and the least recently used one is evicted"""
+        cache = TTLLRUCache(max_size=2, ttl_seconds=60)
+        cache.put("a", 1, now=0)
+        cache.put("b", 2, now=0)
+        cache.get("a", now=1)
+        cache.put("c", 3, now=2)
+
+        self.assertIsNone(cache.get("b", now=3))
+        self.assertEqual(cache.get("a", now=3), 1)
+        self.assertEqual(cache.get("c", now=3), 3)
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+
+    def test_put_refreshes_stored_time(self):
+        """Test that storing a key again restarts its TTL"""
+        cache = TTLLRUCache(max_size=2, ttl_seconds=10)
+        cache.put("a", 1, now=0)
+        cache.put("a", 2, now=8)
+
+        self.assertEqual(cache.get("a", now=15), 2)
+        self.assertEqual(len(cache), 1)
+
+    def test_purge_expired(self):
+        """Test that purging removes only expired entries"""
+        cache = TTLLRUCache(max_size=10, ttl_seconds=10)
+        for i in range(5):
+            cache.put(i, i, now=i * 5)
+
+        self.assertEqual(cache.purge_expired(now=20), 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(4, now=20), 4)
+
+    def test_pop_and_clear(self):
+        """Test removing single entries and clearing the cache"""
+        cache = TTLLRUCache(max_size=10, ttl_seconds=10)
+        cache.put("a", 1)
+        cache.put("b", 2)
+
+        self.assertEqual(cache.pop("a"), 1)
+        self.assertIsNone(cache.pop("a"))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+class TestBatchRiskScoring(unittest.TestCase):
+    """Tests for batch risk scoring against the single-entity scorers"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        logging.disable(logging.INFO)
+        self.engine = RiskScoringEngine()
+
+    def tearDown(self):
+        """Re-enable logging"""
+        logging.disable(logging.NOTSET)
+
+    def assert_matches_scalar(self, batch, scalar_results):
+        for i, scalar in enumerate(scalar_results):
+            self.assertAlmostEqual(batch["risk_score"][i], scalar["risk_score"], places=9)
+            self.assertEqual(batch["risk_level"][i], scalar["risk_level"])
+
+    def test_customers_match_score_customer(self):
+        """Test batch customer scores from dict columns and DataFrames"""
+        customers = make_customers(2000)
+        expected = [self.engine.score_customer(customer, force_refresh=True) for customer in customers]
+
+        for frame in (columns(customers), pd.DataFrame(columns(customers))):
+            batch = self.engine.score_customers(frame)
+            self.assert_matches_scalar(batch, expected)
+            self.assertEqual(list(batch["customer_id"]), [customer["customer_id"] for customer in customers])
+
+    def test_missing_columns_take_defaults(self):
+        """Test that a frame without a field scores as if every row lacked it"""
+        customers = [{"customer_id": f"C{i}", "age": age} for i, age in enumerate([20, 40, 70])]
+
+        batch = self.engine.score_customers(columns(customers))
+
+        self.assert_matches_scalar(batch, [self.engine.score_customer(c, force_refresh=True) for c in customers])
+
+    def test_accounts_match_score_account(self):
+        """Test batch account scores, including customer scores taken from the cache"""
+        rng = random.Random(1)
+        customers = make_customers(50)
+        for customer in customers[:25]:
+            self.engine.score_customer(customer)
+        accounts = [
+            {"account_id": f"A{i}", "customer_id": f"C{rng.randint(0, 49)}",
+             "account_type": rng.choice(["CHECKING", "SAVINGS", "FIXED_DEPOSIT", "LOAN"]),
+             "account_age_days": rng.choice([10, 30, 100, 180, 300, 365, 1000]),
+             "balance_volatility": rng.choice([0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6]),
+             "overdraft_count_90days": rng.choice([0, 1, 2, 3, 5])}
+            for i in range(1000)
+        ]
+
+        batch = self.engine.score_accounts(columns(accounts))
+
+        self.assert_matches_scalar(batch, [self.engine.score_account(a, force_refresh=True) for a in accounts])
+
+    def test_explicit_customer_scores(self):
+        """Test that given customer scores are used for every account"""
+        accounts = [{"account_id": "A1", "account_type": "SAVINGS"}, {"account_id": "A2", "account_type": "LOAN"}]
+
+        batch = self.engine.score_accounts(columns(accounts), customer_risk_scores=[90, 10])
+
+        self.assert_matches_scalar(batch, [
+            self.engine.score_account(accounts[0], customer_risk_score=90, force_refresh=True),
+            self.engine.score_account(accounts[1], customer_risk_score=10, force_refresh=True)
+        ])
+
+    def test_transactions_match_score_transaction(self):
+        """Test batch transaction scores"""
+        rng = random.Random(2)
+        transactions = [
+            {"transaction_id": f"T{i}", "amount": rng.choice([0, 100, 500, 1001, 2600, 5001, 10000]),
+             "average_tx_amount": rng.choice([0, 500, 1000]),
+             "transaction_type": rng.choice(["TRANSFER", "INTERNATIONAL_WIRE", "CASH_WITHDRAWAL",
+                                             "CASH_DEPOSIT", "PAYMENT"])}
+            for i in range(1000)
+        ]
+
+        batch = self.engine.score_transactions(columns(transactions))
+
+        self.assert_matches_scalar(batch, [self.engine.score_transaction(t) for t in transactions])
+
+    def test_empty_batch(self):
+        """Test that an empty frame gives empty results"""
+        batch = self.engine.score_customers({"customer_id": []})
+
+        self.assertEqual(len(batch["risk_score"]), 0)
+        self.assertEqual(len(batch["risk_level"]), 0)
+
+    def test_cached_scores_and_clear_cache(self):
+        """Test that customer scores are served from the cache until it is cleared"""
+        customer = make_customers(1)[0]
+        first = self.engine.score_customer(customer)
+
+        self.assertIs(self.engine.score_customer(dict(customer, age=18)), first)
+        self.assertTrue(self.engine.clear_cache("customer", customer["customer_id"]))
+        self.assertIsNot(self.engine.score_customer(customer), first)
+        self.assertEqual(self.engine.get_scoring_stats()["cache_stats"]["customer"]["hits"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,5 @@
+"""
+Benchmarks for treasury pricing and risk engines.
+
+Each module is runnable, e.g. ``python -m treasury.benchmarks.lattice_pricing``.
+"""
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Benchmark: American option pricing on lattices.
+
+Reports, for an at-the-money-ish American put:
+
+- convergence: price error per lattice model as steps grow to 5,000,
+  against a 20,001-step Leisen-Reimer reference
+- legacy:      BinomialTree.price_option (full matrices, Python loops)
+  against the rolling-array pricer at the same step count
+- throughput:  a book of American options priced in one batch at 5,000 steps
+
+Usage:
+    python -m treasury.benchmarks.lattice_pricing [book_size] [steps]
+"""
+
+import datetime
+import sys
+import time
+from decimal import Decimal
+
+import numpy as np
+
+from treasury.derivatives.lattice_pricing import LatticePricer, LatticeModel
+from treasury.derivatives.options_pricing import Option, OptionType, OptionStyle, BinomialTree
+
+SPOT, STRIKE, EXPIRY, VOL, RATE, DIVIDEND = 100.0, 110.0, 1.0, 0.25, 0.06, 0.01
+CONVERGENCE_STEPS = (50, 100, 250, 500, 1000, 2500, 5000)
+LEGACY_STEPS = 300
+
+
+def _american_put(pricer):
+    return float(pricer.price(SPOT, STRIKE, EXPIRY, VOL, RATE, DIVIDEND, is_call=False, early_exercise=True)["price"][0])
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def convergence():
+    reference = _american_put(LatticePricer(LatticeModel.LEISEN_REIMER, 20001))
+    print(f"American put S={SPOT} K={STRIKE} T={EXPIRY} vol={VOL}: reference {reference:.6f}")
+    print(f"  {'steps':>6}" + "".join(f"  {model.value:>24}" for model in LatticeModel))
+    for steps in CONVERGENCE_STEPS:
+        cells = []
+        for model in LatticeModel:
+            price, seconds = _timed(lambda: _american_put(LatticePricer(model, steps)))
+            cells.append(f"{price - reference:+.2e} {seconds * 1000:8.1f} ms")
+        print(f"  {steps:>6}" + "".join(f"  {cell:>24}" for cell in cells))
+
+
+def legacy_comparison():
+    option = Option(
+        id="BENCH-PUT",
+        underlying="BENCH",
+        option_type=OptionType.PUT,
+        style=OptionStyle.AMERICAN,
+        strike_price=Decimal(str(STRIKE)),
+        expiry_date=datetime.date.today() + datetime.timedelta(days=365)
+    )
+    legacy, legacy_seconds = _timed(lambda: BinomialTree.price_option(option, SPOT, RATE, VOL, DIVIDEND, steps=LEGACY_STEPS))
+    rolling, rolling_seconds = _timed(lambda: LatticePricer(LatticeModel.CRR, LEGACY_STEPS).price_option(option, SPOT, RATE, VOL, DIVIDEND))
+    print(f"CRR at {LEGACY_STEPS} steps:")
+    print(f"  legacy BinomialTree {legacy_seconds * 1000:9.1f} ms  price {legacy['price']:.6f}")
+    print(f"  rolling array       {rolling_seconds * 1000:9.1f} ms  price {rolling['price']:.6f}"
+          f"  ({legacy_seconds / rolling_seconds:.0f}x)")
+
+
+def throughput(book_size, steps):
+    rng = np.random.default_rng(7)
+    spot = rng.uniform(80.0, 120.0, book_size)
+    expiry = rng.uniform(0.1, 2.0, book_size)
+    vol = rng.uniform(0.1, 0.5, book_size)
+    is_call = rng.random(book_size) < 0.5
+
+    pricer = LatticePricer(LatticeModel.LEISEN_REIMER, steps)
+    _, seconds = _timed(lambda: pricer.price(spot, 100.0, expiry, vol, RATE, DIVIDEND, is_call, early_exercise=True))
+    print(f"Book of {book_size} American options at {pricer.steps} steps: "
+          f"{seconds:.2f} s ({seconds / book_size * 1000:.1f} ms per option)")
+
+
+def main():
+    book_size = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    convergence()
+    legacy_comparison()
+    throughput(book_size, steps)
+
+
+if __name__ == "__main__":
+    main()
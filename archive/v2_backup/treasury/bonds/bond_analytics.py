@@ -0,0 +1,210 @@
+"""
+Bond analytics module for treasury operations.
+
+This module computes yields, durations and convexities for whole bond
+portfolios at once. Future cash flows are laid out as one padded matrix
+(bonds x payment dates) per valuation date, and every measure is an array
+expression over that matrix, including a Newton solve for all yields.
+Conventions follow BondValuation: annual compounding, ACT/365 times,
+yields and prices in percent.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+import logging
+import numpy as np
+
+from treasury.curves.curve_risk import CashFlowSchedule
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Newton settings for the yield solve (yields as decimals)
+_NEWTON_GUESS = 0.05
+_NEWTON_TOLERANCE = 1e-12
+_NEWTON_MAX_ITERATIONS = 50
+_BISECTION_BRACKET = (-0.5, 1.0)
+
+
+@dataclass
+class BondCashFlowMatrix:
+    """
+    Future cash flows of many bonds as padded (bonds x payment dates) arrays.
+
+    Rows shorter than the longest bond are padded with zero amounts, which
+    drop out of every sum.
+    """
+
+    bond_ids: List[str]
+    times: np.ndarray  # years from the valuation date
+    amounts: np.ndarray  # per bond
+    face_values: np.ndarray
+
+    @classmethod
+    def from_schedule(cls, schedule: CashFlowSchedule, face_values: Sequence[float]) -> "BondCashFlowMatrix":
+        """
+        Lay out a flat cash-flow schedule as a padded matrix.
+
+        Args:
+            schedule: Per-bond cash flows (e.g., from BondPortfolio.cash_flow_schedule)
+            face_values: Face value of each bond, in schedule order
+
+        Returns:
+            BondCashFlowMatrix
+        """
+        count = len(schedule.ids)
+        order = np.argsort(schedule.flow_instrument, kind="stable")
+        owners = schedule.flow_instrument[order]
+        per_bond = np.bincount(owners, minlength=count)
+        starts = np.concatenate(([0], np.cumsum(per_bond)[:-1])) if count else np.zeros(0, dtype=np.int64)
+        columns = np.arange(owners.size) - np.repeat(starts, per_bond)
+
+        width = int(per_bond.max()) if count else 0
+        times = np.zeros((count, width))
+        amounts = np.zeros((count, width))
+        times[owners, columns] = schedule.times[order]
+        amounts[owners, columns] = schedule.amounts[order]
+        return cls(list(schedule.ids), times, amounts, np.asarray(face_values, dtype=np.float64))
+
+    def _discount(self, yields: np.ndarray) -> np.ndarray:
+        """Discount factors (1 + y) ** -t per flow, for decimal yields per bond."""
+        return np.power(1.0 + yields[:, None], -self.times)
+
+    def prices(self, yields: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Price every bond from its yield.
+
+        Args:
+            yields: Annual yields as percentages, per bond or shared
+
+        Returns:
+            Prices as percentages of face value
+        """
+        y = np.broadcast_to(np.asarray(yields, dtype=np.float64) / 100, (len(self.bond_ids),))
+        return (self.amounts * self._discount(y)).sum(axis=1) / self.face_values * 100
+
+    def yields_to_maturity(self, prices: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Solve every bond's yield to maturity at once.
+
+        Newton steps run on all unconverged bonds together; any that fail
+        to converge (or leave the valid range) are finished by a vectorized
+        bisection over the same bracket BondValuation falls back to.
+
+        Args:
+            prices: Prices as percentages of face value (NaN for no price)
+
+        Returns:
+            Yields as percentages (NaN where there is no price or no solution)
+        """
+        count = len(self.bond_ids)
+        targets = np.broadcast_to(np.asarray(prices, dtype=np.float64), (count,)) * self.face_values / 100
+        yields = np.full(count, _NEWTON_GUESS)
+        active = np.isfinite(targets) & (self.amounts.sum(axis=1) > 0)
+        converged = np.zeros(count, dtype=bool)
+
+        for _ in range(_NEWTON_MAX_ITERATIONS):
+            rows = np.flatnonzero(active & ~converged)
+            if rows.size == 0:
+                break
+            y = yields[rows]
+            pv = self.amounts[rows] * np.power(1.0 + y[:, None], -self.times[rows])
+            error = pv.sum(axis=1) - targets[rows]
+            slope = -(pv * self.times[rows]).sum(axis=1) / (1.0 + y)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                step = error / slope
+            new_y = y - step
+            bad = ~np.isfinite(new_y) | (new_y <= -0.99)
+            yields[rows] = np.where(bad, y, new_y)
+            converged[rows] = ~bad & (np.abs(step) < _NEWTON_TOLERANCE)
+            active[rows[bad]] = False
+
+        # Bisection for whatever Newton could not settle
+        rows = np.flatnonzero(np.isfinite(targets) & ~converged)
+        if rows.size:
+            low = np.full(rows.size, _BISECTION_BRACKET[0])
+            high = np.full(rows.size, _BISECTION_BRACKET[1])
+            amounts, times, target = self.amounts[rows], self.times[rows], targets[rows]
+
+            def npv(y):
+                return (amounts * np.power(1.0 + y[:, None], -times)).sum(axis=1) - target
+
+            solvable = np.sign(npv(low)) != np.sign(npv(high))
+            for _ in range(100):
+                mid = 0.5 * (low + high)
+                above = npv(mid) > 0  # price still too high: yield is above mid
+                low = np.where(above, mid, low)
+                high = np.where(above, high, mid)
+            yields[rows] = np.where(solvable, 0.5 * (low + high), np.nan)
+            if not solvable.all():
+                logger.error(f"Failed to calculate yield to maturity for {int((~solvable).sum())} bonds")
+
+        yields[~np.isfinite(targets)] = np.nan
+        return yields * 100
+
+    def durations(self, yields: Union[float, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Macaulay and modified durations of every bond.
+
+        Args:
+            yields: Annual yields as percentages
+
+        Returns:
+            Dictionary with macaulay_duration and modified_duration arrays
+        """
+        y = np.broadcast_to(np.asarray(yields, dtype=np.float64) / 100, (len(self.bond_ids),))
+        pv = self.amounts * self._discount(y)
+        price = pv.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            macaulay = np.where(price != 0, (pv * self.times).sum(axis=1) / price, 0.0)
+        return {"macaulay_duration": macaulay, "modified_duration": macaulay / (1.0 + y)}
+
+    def convexities(self, yields: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Convexity of every bond.
+
+        Args:
+            yields: Annual yields as percentages
+
+        Returns:
+            Convexities
+        """
+        y = np.broadcast_to(np.asarray(yields, dtype=np.float64) / 100, (len(self.bond_ids),))
+        pv = self.amounts * self._discount(y)
+        price = pv.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weighted = (pv * self.times * (self.times + 1.0)).sum(axis=1) / price
+        return np.where(price != 0, weighted / (1.0 + y) ** 2, 0.0)
+
+    def analyze(self,
+                prices: Union[float, np.ndarray],
+                yield_changes: Optional[Sequence[float]] = None) -> Dict[str, np.ndarray]:
+        """
+        Yields, durations, convexities and price-change estimates in one pass.
+
+        Args:
+            prices: Prices as percentages of face value
+            yield_changes: Yield changes in percentage points to estimate
+                           price changes for (defaults to -1, +1)
+
+        Returns:
+            Dictionary of per-bond arrays: yield_to_maturity, macaulay_duration,
+            modified_duration, convexity, and price_change_pct of shape
+            (bonds, len(yield_changes))
+        """
+        yield_changes = np.asarray([-1.0, 1.0] if yield_changes is None else yield_changes, dtype=np.float64)
+        yields = self.yields_to_maturity(prices)
+        durations = self.durations(yields)
+        convexity = self.convexities(yields)
+
+        dy = yield_changes[None, :] / 100
+        price_change = (-durations["modified_duration"][:, None] * dy + 0.5 * convexity[:, None] * dy ** 2) * 100
+
+        return {
+            "yield_to_maturity": yields,
+            "macaulay_duration": durations["macaulay_duration"],
+            "modified_duration": durations["modified_duration"],
+            "convexity": convexity,
+            "yield_changes": yield_changes,
+            "price_change_pct": price_change
+        }
@@ -7,10 +7,16 @@ including position tracking, performance monitoring, and portfolio analytics.
 
 import datetime
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Union
+from typing import List, Dict, Optional, Sequence, Tuple, Union
 from decimal import Decimal
 import logging
 import uuid
+import numpy as np
+
+from treasury.bonds.bond_valuation import BondValuation
+from treasury.bonds.bond_analytics import BondCashFlowMatrix
+from treasury.curves.discount_curve import DiscountCurve
+from treasury.curves.curve_risk import CashFlowSchedule, DEFAULT_KEY_TENORS
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -82,6 +88,9 @@ class BondPortfolio:
         self.positions: Dict[str, BondPosition] = {}
         self.historical_valuations: Dict[datetime.date, Decimal] = {}
         self._creation_date = datetime.date.today()
+        # Per-bond cash flows for one valuation date and set of bonds
+        self._schedule: Optional[Tuple[datetime.date, Tuple[str, ...], CashFlowSchedule]] = None
+        self._cash_flow_matrix: Optional[Tuple[CashFlowSchedule, BondCashFlowMatrix]] = None
         
     def add_position(self, position: BondPosition) -> None:
         """
@@ -177,6 +186,134 @@ class BondPortfolio:
         
         return total_value
         
+    def cash_flow_schedule(self, valuation_date: datetime.date) -> CashFlowSchedule:
+        """
+        Get the future cash flows of every bond held, per bond.
+        
+        The schedule is built once per valuation date and set of bonds;
+        quantities are applied at valuation time, so trading in bonds
+        already held does not rebuild it.
+        
+        Args:
+            valuation_date: Date of valuation
+            
+        Returns:
+            CashFlowSchedule with one instrument per bond
+        """
+        bond_ids = tuple(self.positions)
+        if self._schedule is not None and self._schedule[:2] == (valuation_date, bond_ids):
+            return self._schedule[2]
+            
+        flows = []
+        for bond_id in bond_ids:
+            bond = self.positions[bond_id].bond
+            cash_flows = [cf for cf in BondValuation.calculate_cash_flows(
+                bond.issue_date, bond.maturity_date, bond.face_value, bond.coupon_rate,
+                bond.payment_frequency, settlement_date=valuation_date
+            ) if cf.date >= valuation_date]
+            flows.append((
+                bond_id,
+                bond.currency,
+                [(cf.date - valuation_date).days / 365.0 for cf in cash_flows],
+                [float(cf.amount) for cf in cash_flows]
+            ))
+            
+        schedule = CashFlowSchedule.from_flows(flows)
+        self._schedule = (valuation_date, bond_ids, schedule)
+        return schedule
+        
+    def calculate_curve_sensitivities(self,
+                                      valuation_date: datetime.date,
+                                      curves: Union[DiscountCurve, Dict[str, DiscountCurve]],
+                                      key_tenors: Sequence[float] = DEFAULT_KEY_TENORS,
+                                      bump: float = 0.0001) -> Dict[str, object]:
+        """
+        Value the portfolio on discount curves with parallel and key-rate PV01.
+        
+        Args:
+            valuation_date: Date of valuation
+            curves: One curve, or curves by currency (e.g., from a CurveStore)
+            key_tenors: Key-rate tenors in years
+            bump: Zero rate bump (e.g., 0.0001 for 1bp)
+            
+        Returns:
+            Dictionary with bond_ids, key_tenors, per-position present_value,
+            pv01 and key_rate_pv01 arrays, and portfolio totals
+        """
+        schedule = self.cash_flow_schedule(valuation_date)
+        quantities = np.array([self.positions[bond_id].quantity for bond_id in schedule.ids], dtype=np.float64)
+        risk = schedule.sensitivities(curves, quantities, key_tenors, bump)
+        
+        return {
+            "bond_ids": schedule.ids,
+            "key_tenors": list(key_tenors),
+            "present_value": risk["present_value"],
+            "pv01": risk["pv01"],
+            "key_rate_pv01": risk["key_rate_pv01"],
+            "total_present_value": float(np.nansum(risk["present_value"])),
+            "total_pv01": float(np.nansum(risk["pv01"])),
+            "total_key_rate_pv01": np.nansum(risk["key_rate_pv01"], axis=0)
+        }
+        
+    def cash_flow_matrix(self, valuation_date: datetime.date) -> BondCashFlowMatrix:
+        """
+        Get the padded (bonds x payment dates) cash-flow matrix for a valuation date.
+        
+        Args:
+            valuation_date: Date of valuation
+            
+        Returns:
+            BondCashFlowMatrix, one row per bond held
+        """
+        schedule = self.cash_flow_schedule(valuation_date)
+        if self._cash_flow_matrix is None or self._cash_flow_matrix[0] is not schedule:
+            face_values = [float(self.positions[bond_id].bond.face_value) for bond_id in schedule.ids]
+            self._cash_flow_matrix = (schedule, BondCashFlowMatrix.from_schedule(schedule, face_values))
+        return self._cash_flow_matrix[1]
+        
+    def calculate_portfolio_analytics(self,
+                                      valuation_date: datetime.date,
+                                      market_prices: Dict[str, Decimal],
+                                      yield_changes: Optional[Sequence[float]] = None) -> Dict[str, object]:
+        """
+        Yields, durations, convexities and price-change estimates for every position.
+        
+        Args:
+            valuation_date: Date of valuation
+            market_prices: Dictionary of bond prices (as percentage of face value)
+            yield_changes: Yield changes in percentage points for the price-change
+                           estimates (defaults to -1, +1)
+            
+        Returns:
+            Dictionary with bond_ids, the per-bond arrays from
+            BondCashFlowMatrix.analyze, market_value per position, and the
+            market-value weighted portfolio_modified_duration and
+            portfolio_convexity (positions without a price are NaN and
+            left out of the portfolio figures)
+        """
+        matrix = self.cash_flow_matrix(valuation_date)
+        prices = np.array([float(market_prices[bond_id]) if bond_id in market_prices else np.nan
+                           for bond_id in matrix.bond_ids])
+        for bond_id in matrix.bond_ids:
+            if bond_id not in market_prices:
+                logger.warning(f"No market price available for bond {bond_id}")
+                
+        analytics = matrix.analyze(prices, yield_changes)
+        quantities = np.array([self.positions[bond_id].quantity for bond_id in matrix.bond_ids], dtype=np.float64)
+        market_value = quantities * matrix.face_values * prices / 100
+        
+        priced = np.isfinite(market_value) & np.isfinite(analytics["yield_to_maturity"])
+        total = market_value[priced].sum()
+        weights = market_value[priced] / total if total else np.zeros(int(priced.sum()))
+        
+        analytics.update({
+            "bond_ids": matrix.bond_ids,
+            "market_value": market_value,
+            "portfolio_modified_duration": float(weights @ analytics["modified_duration"][priced]),
+            "portfolio_convexity": float(weights @ analytics["convexity"][priced])
+        })
+        return analytics
+        
     def get_bond_exposure_by_issuer(self) -> Dict[str, Decimal]:
         """
         Calculate bond exposure by issuer.
@@ -14,6 +14,8 @@ import numpy as np
 from scipy import optimize
 import logging
 
+from treasury.curves.discount_curve import DiscountCurve, InterpolationScheme
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -53,6 +55,9 @@ class YieldCurve:
         self.currency = currency
         self.valuation_date = valuation_date
         self.points: List[YieldCurvePoint] = []
+        # Maturity and yield arrays for lookups, rebuilt after points change
+        self._maturities: Optional[np.ndarray] = None
+        self._yields: Optional[np.ndarray] = None
         
     def add_point(self, maturity_years: float, yield_rate: Decimal) -> None:
         """
@@ -66,6 +71,14 @@ class YieldCurve:
         self.points.append(point)
         # Sort points by maturity to ensure interpolation works correctly
         self.points.sort(key=lambda p: p.maturity_years)
+        self._maturities = None
+        
+    def _arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Maturities and yields (percent) as arrays, compiled once per set of points."""
+        if self._maturities is None or self._maturities.size != len(self.points):
+            self._maturities = np.array([p.maturity_years for p in self.points], dtype=np.float64)
+            self._yields = np.array([float(p.yield_rate) for p in self.points], dtype=np.float64)
+        return self._maturities, self._yields
     
     def get_yield(self, maturity_years: float) -> Decimal:
         """
@@ -80,27 +93,72 @@ class YieldCurve:
         if not self.points:
             raise ValueError("Yield curve contains no points")
             
-        # Check if maturity is below the shortest point
+        # Flat beyond the shortest and longest points
         if maturity_years <= self.points[0].maturity_years:
             return self.points[0].yield_rate
-            
-        # Check if maturity is beyond the longest point
         if maturity_years >= self.points[-1].maturity_years:
             return self.points[-1].yield_rate
             
-        # Find surrounding points for interpolation
-        for i in range(len(self.points) - 1):
-            point1 = self.points[i]
-            point2 = self.points[i + 1]
+        # Binary search for the surrounding points, then interpolate linearly
+        maturities, _ = self._arrays()
+        i = int(np.searchsorted(maturities, maturity_years, side="right")) - 1
+        point1, point2 = self.points[i], self.points[i + 1]
+        t = (maturity_years - point1.maturity_years) / (point2.maturity_years - point1.maturity_years)
+        return point1.yield_rate + Decimal(str(t)) * (point2.yield_rate - point1.yield_rate)
+        
+    def get_yields(self, maturities: np.ndarray) -> np.ndarray:
+        """
+        Get interpolated yields for an array of maturities.
+        
+        Args:
+            maturities: Times to maturity in years
             
-            if point1.maturity_years <= maturity_years <= point2.maturity_years:
-                # Linear interpolation
-                t = (maturity_years - point1.maturity_years) / (point2.maturity_years - point1.maturity_years)
-                interpolated = point1.yield_rate + t * (point2.yield_rate - point1.yield_rate)
-                return interpolated
-                
-        # Fallback (should not reach here)
-        return self.points[-1].yield_rate
+        Returns:
+            Yields as percentages (floats)
+        """
+        if not self.points:
+            raise ValueError("Yield curve contains no points")
+            
+        known_maturities, yields = self._arrays()
+        return np.interp(np.asarray(maturities, dtype=np.float64), known_maturities, yields)
+        
+    def to_discount_curve(self, scheme: InterpolationScheme = InterpolationScheme.LINEAR_ZERO) -> DiscountCurve:
+        """
+        Convert the annually compounded yields to a compiled discount curve.
+        
+        Args:
+            scheme: Interpolation scheme of the discount curve
+            
+        Returns:
+            DiscountCurve with continuously compounded zero rates
+        """
+        maturities, yields = self._arrays()
+        return DiscountCurve(maturities, np.log1p(yields / 100), scheme)
+        
+    @classmethod
+    def from_discount_curve(cls,
+                            curve: DiscountCurve,
+                            currency: str,
+                            valuation_date: datetime.date,
+                            maturities: Optional[List[float]] = None) -> "YieldCurve":
+        """
+        Build a yield curve from a discount curve (e.g., a bootstrapped one).
+        
+        Args:
+            curve: Discount curve
+            currency: Currency code
+            valuation_date: Date for which the curve is valid
+            maturities: Maturities to sample (defaults to the curve tenors)
+            
+        Returns:
+            YieldCurve of annually compounded yields
+        """
+        times = curve.tenors if maturities is None else np.asarray(maturities, dtype=np.float64)
+        yields = np.expm1(curve.zero_rates(times)) * 100
+        yield_curve = cls(currency, valuation_date)
+        for maturity, rate in zip(times.tolist(), yields.tolist()):
+            yield_curve.add_point(maturity, Decimal(str(round(rate, 6))))
+        return yield_curve
 
 
 class BondValuation:
@@ -112,7 +170,8 @@ class BondValuation:
         maturity_date: datetime.date,
         face_value: Decimal,
         coupon_rate: Decimal,
-        payment_frequency: int
+        payment_frequency: int,
+        settlement_date: Optional[datetime.date] = None
     ) -> List[CashFlow]:
         """
         Calculate all future cash flows for a bond.
@@ -123,6 +182,7 @@ class BondValuation:
             face_value: Bond face value
             coupon_rate: Annual coupon rate as a percentage
             payment_frequency: Number of coupon payments per year
+            settlement_date: Cash flows before this date are dropped (default: today)
             
         Returns:
             List of cash flows
@@ -135,8 +195,8 @@ class BondValuation:
         # Calculate period between payments in months
         months_per_period = 12 // payment_frequency
         
-        # Start from next coupon date after today
-        today = datetime.date.today()
+        # Start from next coupon date after settlement
+        today = settlement_date or datetime.date.today()
         next_coupon_date = issue_date
         
         # Find first coupon date after or on issue date
@@ -258,24 +318,24 @@ class BondValuation:
         settlement = settlement_date or datetime.date.today()
         
         # Convert price to absolute value
-        price_absolute = price * face_value / 100
+        price_absolute = float(price * face_value / 100)
+        
+        # Convert the cash flows to arrays once rather than on every iteration
+        future = [cf for cf in cash_flows if cf.date >= settlement]
+        years = np.array([(cf.date - settlement).days / 365.0 for cf in future])
+        amounts = np.array([float(cf.amount) for cf in future])
         
         def npv_function(ytm):
             """Calculate NPV given a yield rate."""
-            total = 0
-            for cf in cash_flows:
-                if cf.date < settlement:
-                    continue
-                
-                years = (cf.date - settlement).days / 365.0
-                discount_factor = 1 / ((1 + ytm) ** years)
-                total += float(cf.amount) * discount_factor
+            return float(amounts @ (1 + ytm) ** -years) - price_absolute
             
-            return total - float(price_absolute)
+        def npv_derivative(ytm):
+            """Derivative of the NPV with respect to the yield."""
+            return float(-(amounts * years) @ (1 + ytm) ** (-years - 1))
             
         # Find the yield that gives NPV = 0, starting with initial guess of 5%
         try:
-            result = optimize.newton(npv_function, 0.05)
+            result = optimize.newton(npv_function, 0.05, fprime=npv_derivative)
             # Convert to percentage
             ytm = Decimal(str(result * 100)).quantize(Decimal('0.001'))
             return ytm
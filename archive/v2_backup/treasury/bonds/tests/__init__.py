@@ -0,0 +1,3 @@
+"""
+Treasury bond tests package.
+"""
@@ -0,0 +1,164 @@
+"""
+Bond Analytics Tests - Treasury
+
+This module checks the portfolio-wide yield, duration and convexity
+analytics against the per-bond BondValuation calculations.
+"""
+import datetime
+import logging
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from ..bond_portfolio import Bond, BondPosition, BondPortfolio
+from ..bond_valuation import BondValuation
+from ..bond_analytics import BondCashFlowMatrix
+
+VALUATION_DATE = datetime.date(2026, 1, 15)
+COUPON_DATE = datetime.date(2026, 3, 10)
+
+
+def make_portfolio(count=24, seed=1):
+    """Portfolio of annual, semi-annual and quarterly bonds with random coupons and prices."""
+    rng = np.random.default_rng(seed)
+    portfolio = BondPortfolio("test")
+    prices = {}
+    for i in range(count):
+        bond = Bond(f"B{i}", f"ISIN{i}", None, f"Issuer {i % 4}", datetime.date(2020, 3, 10),
+                    datetime.date(2027 + i % 20, 3 if i % 2 else 9, 10),
+                    Decimal(str(round(rng.uniform(0, 8), 2))), Decimal("1000"), "USD", "government",
+                    [1, 2, 4][i % 3], "ACT/365")
+        portfolio.add_position(BondPosition(bond, 10 + i, VALUATION_DATE, Decimal("100"), Decimal("4")))
+        prices[bond.id] = Decimal(str(round(rng.uniform(85, 115), 2)))
+    return portfolio, prices
+
+
+def scalar_analytics(bond, price, valuation_date, yield_rate):
+    """
+    Yield of one bond from BondValuation, and its modified duration and
+    convexity at yield_rate (BondValuation rounds yields to 3 decimals).
+    """
+    cash_flows = BondValuation.calculate_cash_flows(
+        bond.issue_date, bond.maturity_date, bond.face_value, bond.coupon_rate,
+        bond.payment_frequency, settlement_date=valuation_date
+    )
+    ytm = BondValuation.calculate_yield_to_maturity(cash_flows, price, bond.face_value, valuation_date)
+    _, modified = BondValuation.calculate_duration(cash_flows, Decimal(repr(yield_rate)), valuation_date)
+    convexity = BondValuation.calculate_convexity(cash_flows, Decimal(repr(yield_rate)), valuation_date)
+    return float(ytm), float(modified), float(convexity)
+
+
+class TestPortfolioAnalytics(unittest.TestCase):
+    """Test cases for BondPortfolio.calculate_portfolio_analytics."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        logging.disable(logging.INFO)
+        self.portfolio, self.prices = make_portfolio()
+
+    def tearDown(self):
+        """Re-enable logging."""
+        logging.disable(logging.NOTSET)
+
+    def assert_matches_scalar(self, valuation_date):
+        analytics = self.portfolio.calculate_portfolio_analytics(valuation_date, self.prices)
+
+        for k, bond_id in enumerate(analytics["bond_ids"]):
+            bond = self.portfolio.positions[bond_id].bond
+            ytm, modified, convexity = scalar_analytics(
+                bond, self.prices[bond_id], valuation_date, float(analytics["yield_to_maturity"][k]))
+            self.assertAlmostEqual(analytics["yield_to_maturity"][k], ytm, delta=5e-4, msg=bond_id)
+            self.assertAlmostEqual(analytics["modified_duration"][k], modified, places=9, msg=bond_id)
+            self.assertAlmostEqual(analytics["convexity"][k], convexity, places=8, msg=bond_id)
+
+    def test_matches_scalar_valuation(self):
+        """Test that yields, durations and convexities match BondValuation bond by bond."""
+        self.assert_matches_scalar(VALUATION_DATE)
+
+    def test_matches_scalar_valuation_on_coupon_date(self):
+        """Test that a coupon paid on the valuation date is treated like BondValuation does."""
+        self.assert_matches_scalar(COUPON_DATE)
+
+    def test_portfolio_figures_are_market_value_weighted(self):
+        """Test the portfolio duration and convexity weights."""
+        analytics = self.portfolio.calculate_portfolio_analytics(VALUATION_DATE, self.prices)
+
+        expected_value = [float(self.portfolio.positions[bond_id].quantity * 1000 * self.prices[bond_id] / 100)
+                          for bond_id in analytics["bond_ids"]]
+        np.testing.assert_allclose(analytics["market_value"], expected_value)
+        weights = analytics["market_value"] / analytics["market_value"].sum()
+        self.assertAlmostEqual(analytics["portfolio_modified_duration"], weights @ analytics["modified_duration"])
+        self.assertAlmostEqual(analytics["portfolio_convexity"], weights @ analytics["convexity"])
+
+    def test_missing_price_is_left_out(self):
+        """Test that a bond without a price is NaN and excluded from the portfolio figures."""
+        prices = dict(self.prices)
+        del prices["B3"]
+
+        analytics = self.portfolio.calculate_portfolio_analytics(VALUATION_DATE, prices)
+        k = analytics["bond_ids"].index("B3")
+        priced = np.arange(len(analytics["bond_ids"])) != k
+
+        self.assertTrue(np.isnan(analytics["yield_to_maturity"][k]))
+        self.assertTrue(np.isnan(analytics["market_value"][k]))
+        weights = analytics["market_value"][priced] / analytics["market_value"][priced].sum()
+        self.assertAlmostEqual(analytics["portfolio_modified_duration"],
+                               weights @ analytics["modified_duration"][priced])
+
+    def test_price_change_estimates(self):
+        """Test the duration-convexity price-change estimate for each yield change."""
+        analytics = self.portfolio.calculate_portfolio_analytics(VALUATION_DATE, self.prices, [-0.5, 0.25])
+
+        self.assertEqual(analytics["price_change_pct"].shape, (len(analytics["bond_ids"]), 2))
+        for column, change in enumerate([-0.005, 0.0025]):
+            expected = (-analytics["modified_duration"] * change + 0.5 * analytics["convexity"] * change ** 2) * 100
+            np.testing.assert_allclose(analytics["price_change_pct"][:, column], expected)
+
+
+class TestBondCashFlowMatrix(unittest.TestCase):
+    """Test cases for the padded cash-flow matrix."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        logging.disable(logging.INFO)
+        self.portfolio, self.prices = make_portfolio()
+        self.matrix = self.portfolio.cash_flow_matrix(VALUATION_DATE)
+
+    def tearDown(self):
+        """Re-enable logging."""
+        logging.disable(logging.NOTSET)
+
+    def test_rows_match_schedule(self):
+        """Test that each row holds its bond's flows, padded with zeros."""
+        schedule = self.portfolio.cash_flow_schedule(VALUATION_DATE)
+
+        self.assertEqual(self.matrix.bond_ids, list(schedule.ids))
+        for k in range(len(schedule.ids)):
+            flows = schedule.flow_instrument == k
+            self.assertAlmostEqual(self.matrix.amounts[k].sum(), schedule.amounts[flows].sum())
+            self.assertEqual(np.count_nonzero(self.matrix.amounts[k]), flows.sum())
+        self.assertIs(self.portfolio.cash_flow_matrix(VALUATION_DATE), self.matrix)
+
+    def test_prices_invert_yields(self):
+        """Test that pricing at the solved yields gives back the quoted prices."""
+        prices = np.array([float(self.prices[bond_id]) for bond_id in self.matrix.bond_ids])
+
+        np.testing.assert_allclose(self.matrix.prices(self.matrix.yields_to_maturity(prices)), prices, atol=1e-8)
+
+    def test_bisection_fallback_and_unsolvable_prices(self):
+        """Test prices Newton cannot settle and prices with no yield in the bracket."""
+        matrix = BondCashFlowMatrix(["deep", "impossible", "unpriced"],
+                                    np.array([[1.0, 30.0]] * 3),
+                                    np.array([[0.0, 1000.0]] * 3),
+                                    np.full(3, 1000.0))
+
+        yields = matrix.yields_to_maturity(np.array([0.01, 1e15, np.nan]))
+
+        self.assertAlmostEqual(matrix.prices(yields)[0], 0.01, places=6)
+        self.assertTrue(np.isnan(yields[1]))
+        self.assertTrue(np.isnan(yields[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+Yield curves package for treasury operations.
+
+This package provides the discount curves shared by the bond and swap
+books: curve bootstrapping from market quotes, a per-currency, per-date
+curve store, and parallel and key-rate risk on cached cash-flow schedules.
+"""
+
+from pathlib import Path
+import os
+import sys
+
+# Add current directory to path to ensure local imports work
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+# Use centralized import manager
+try:
+    from utils.lib.packages import fix_path, import_module
+    fix_path()  # Ensures the project root is in sys.path
+except ImportError:
+    # Fallback for when the import manager is not available
+    import sys
+    from pathlib import Path
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))  # Adjust levels as needed
+
+
+# Import modules
+from treasury.curves.discount_curve import InterpolationScheme, DiscountCurve
+
+from treasury.curves.curve_builder import (
+    DepositQuote, FRAQuote, SwapQuote, BondQuote,
+    YieldCurveBuilder, CurveStore, resolve_date, coupon_dates
+)
+
+from treasury.curves.curve_risk import (
+    CashFlowSchedule, key_rate_weights, DEFAULT_KEY_TENORS
+)
+
+__all__ = [
+    # Curves
+    'InterpolationScheme', 'DiscountCurve',
+
+    # Bootstrapping
+    'DepositQuote', 'FRAQuote', 'SwapQuote', 'BondQuote',
+    'YieldCurveBuilder', 'CurveStore', 'resolve_date', 'coupon_dates',
+
+    # Risk
+    'CashFlowSchedule', 'key_rate_weights', 'DEFAULT_KEY_TENORS'
+]
@@ -0,0 +1,334 @@
+"""
+Yield curve bootstrapping module for treasury operations.
+
+This module strips a zero curve out of money-market deposits, FRAs, par
+swap rates and bond prices, one node per instrument in maturity order,
+and keeps the results in a store keyed by currency and valuation date so
+that bond and swap books priced on the same day share a single curve.
+"""
+
+import datetime
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import logging
+import numpy as np
+from scipy import optimize
+
+from treasury.curves.discount_curve import DiscountCurve, InterpolationScheme
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Instrument dates are either explicit dates or tenors such as "3M", "2Y"
+DateOrTenor = Union[datetime.date, str]
+
+# Bracket for the zero rate solved at each new curve node
+_RATE_BRACKET = (-0.5, 2.0)
+
+# Stop re-solving nodes once every quote reprices within this (price units)
+_REPRICING_TOLERANCE = 1e-10
+_MAX_SWEEPS = 50
+
+
+def _add_months(date: datetime.date, months: int) -> datetime.date:
+    """Add months to a date, clipping to the end of the month."""
+    month = date.month - 1 + months
+    year = date.year + month // 12
+    month = month % 12 + 1
+    next_month = datetime.date(year + month // 12, month % 12 + 1, 1)
+    last_day = (next_month - datetime.timedelta(days=1)).day
+    return datetime.date(year, month, min(date.day, last_day))
+
+
+def resolve_date(valuation_date: datetime.date, date_or_tenor: DateOrTenor) -> datetime.date:
+    """
+    Turn a date or tenor string into a date.
+
+    Args:
+        valuation_date: Date tenors are counted from
+        date_or_tenor: Date, or tenor like "1D", "2W", "6M", "5Y"
+
+    Returns:
+        Resolved date
+    """
+    if isinstance(date_or_tenor, datetime.date):
+        return date_or_tenor
+
+    tenor = date_or_tenor.strip().upper()
+    count, unit = int(tenor[:-1]), tenor[-1]
+    if unit == "D":
+        return valuation_date + datetime.timedelta(days=count)
+    if unit == "W":
+        return valuation_date + datetime.timedelta(weeks=count)
+    if unit == "M":
+        return _add_months(valuation_date, count)
+    if unit == "Y":
+        return _add_months(valuation_date, 12 * count)
+    raise ValueError(f"Unknown tenor: {date_or_tenor}")
+
+
+def coupon_dates(valuation_date: datetime.date, maturity_date: datetime.date, frequency: int) -> List[datetime.date]:
+    """
+    Payment dates after the valuation date, stepped back from maturity.
+
+    Args:
+        valuation_date: Valuation date
+        maturity_date: Final payment date
+        frequency: Payments per year
+
+    Returns:
+        Ascending payment dates
+    """
+    months = 12 // frequency
+    dates = []
+    periods = 0
+    date = maturity_date
+    while date > valuation_date:
+        dates.append(date)
+        periods += 1
+        date = _add_months(maturity_date, -months * periods)
+    return dates[::-1]
+
+
+def _times(dates: Sequence[datetime.date], valuation_date: datetime.date) -> np.ndarray:
+    return np.array([(d - valuation_date).days / 365.0 for d in dates], dtype=np.float64)
+
+
+@dataclass(frozen=True)
+class DepositQuote:
+    """Money-market deposit quote (simple rate, as a decimal)."""
+
+    maturity: DateOrTenor
+    rate: float
+    day_count_basis: float = 360.0
+
+    def calibration_terms(self, valuation_date: datetime.date) -> Tuple[np.ndarray, np.ndarray, float]:
+        """DF(T) * (1 + rate * tau) = 1."""
+        end = resolve_date(valuation_date, self.maturity)
+        tau = (end - valuation_date).days / self.day_count_basis
+        return _times([end], valuation_date), np.array([1.0 + self.rate * tau]), 1.0
+
+
+@dataclass(frozen=True)
+class FRAQuote:
+    """Forward rate agreement quote (simple rate, as a decimal)."""
+
+    start: DateOrTenor
+    end: DateOrTenor
+    rate: float
+    day_count_basis: float = 360.0
+
+    def calibration_terms(self, valuation_date: datetime.date) -> Tuple[np.ndarray, np.ndarray, float]:
+        """DF(T2) * (1 + rate * tau) - DF(T1) = 0."""
+        start = resolve_date(valuation_date, self.start)
+        end = resolve_date(valuation_date, self.end)
+        tau = (end - start).days / self.day_count_basis
+        return _times([start, end], valuation_date), np.array([-1.0, 1.0 + self.rate * tau]), 0.0
+
+
+@dataclass(frozen=True)
+class SwapQuote:
+    """Par swap rate quote (as a decimal) for a spot-starting swap."""
+
+    maturity: DateOrTenor
+    rate: float
+    payment_frequency: int = 1  # fixed leg payments per year
+
+    def calibration_terms(self, valuation_date: datetime.date) -> Tuple[np.ndarray, np.ndarray, float]:
+        """rate * sum(alpha_i * DF(t_i)) + DF(T) = 1, ACT/365 fixed accruals."""
+        dates = coupon_dates(valuation_date, resolve_date(valuation_date, self.maturity), self.payment_frequency)
+        times = _times(dates, valuation_date)
+        weights = self.rate * np.diff(times, prepend=0.0)
+        weights[-1] += 1.0
+        return times, weights, 1.0
+
+
+@dataclass(frozen=True)
+class BondQuote:
+    """Bond quote: coupon as a percentage, full (dirty) price as a percentage of face."""
+
+    maturity: DateOrTenor
+    coupon_rate: float
+    price: float
+    payment_frequency: int = 2
+
+    def calibration_terms(self, valuation_date: datetime.date) -> Tuple[np.ndarray, np.ndarray, float]:
+        """sum(coupon * DF(t_i)) + 100 * DF(T) = price."""
+        dates = coupon_dates(valuation_date, resolve_date(valuation_date, self.maturity), self.payment_frequency)
+        weights = np.full(len(dates), self.coupon_rate / self.payment_frequency)
+        weights[-1] += 100.0
+        return _times(dates, valuation_date), weights, self.price
+
+
+CurveQuote = Union[DepositQuote, FRAQuote, SwapQuote, BondQuote]
+
+
+class YieldCurveBuilder:
+    """
+    Sequential bootstrapper for zero curves.
+
+    Quotes are sorted by their last cash-flow time; each one adds a node at
+    that time whose zero rate is solved (Brent) so the quote reprices
+    exactly, with earlier nodes held fixed. Flows falling between nodes
+    are valued on the curve's interpolation scheme, so the scheme used for
+    stripping should be the one the curve is later priced with; for the
+    monotone cubic scheme the strip is repeated until all quotes reprice.
+    """
+
+    def __init__(self, scheme: InterpolationScheme = InterpolationScheme.LOG_LINEAR_DF):
+        """
+        Initialize the builder.
+
+        Args:
+            scheme: Interpolation scheme of the bootstrapped curves
+        """
+        self.scheme = scheme
+
+    def bootstrap(self, quotes: Iterable[CurveQuote], valuation_date: datetime.date) -> DiscountCurve:
+        """
+        Bootstrap a discount curve.
+
+        Args:
+            quotes: Deposit, FRA, swap and bond quotes
+            valuation_date: Valuation date
+
+        Returns:
+            DiscountCurve with one node per quote
+        """
+        equations = sorted(
+            (quote.calibration_terms(valuation_date) + (quote,) for quote in quotes),
+            key=lambda terms: terms[0][-1]
+        )
+        if not equations:
+            raise ValueError("Cannot bootstrap a curve without quotes")
+
+        tenors = [float(terms[0][-1]) for terms in equations]
+        for previous, (node, terms) in zip([0.0] + tenors, zip(tenors, equations)):
+            if node <= previous:
+                raise ValueError(f"Quote {terms[3]} does not extend the curve beyond {previous:.4f}y")
+
+        # The first sweep strips node by node; schemes whose interpolation is
+        # not local (monotone cubic) move earlier segments as nodes are added,
+        # so further sweeps re-solve each node against the full curve
+        rates: List[float] = []
+        for sweep in range(_MAX_SWEEPS):
+            for index, (times, weights, target, quote) in enumerate(equations):
+                size = index + 1 if sweep == 0 else len(tenors)
+                trial = (rates + [0.0])[:size]
+
+                def pricing_error(rate: float) -> float:
+                    trial[index] = rate
+                    curve = DiscountCurve(tenors[:size], trial, self.scheme)
+                    return float(weights @ curve.discount_factors(times)) - target
+
+                try:
+                    rate = optimize.brentq(pricing_error, *_RATE_BRACKET, xtol=1e-14)
+                except ValueError:
+                    raise ValueError(f"Cannot solve curve node at {tenors[index]:.4f}y for quote {quote}")
+                if sweep == 0:
+                    rates.append(rate)
+                else:
+                    rates[index] = rate
+
+            curve = DiscountCurve(tenors, rates, self.scheme)
+            worst = max(abs(float(weights @ curve.discount_factors(times)) - target)
+                        for times, weights, target, _ in equations)
+            if worst < _REPRICING_TOLERANCE:
+                break
+        else:
+            logger.warning(f"Curve bootstrap stopped after {_MAX_SWEEPS} sweeps, worst repricing error {worst:.2e}")
+
+        logger.debug(f"Bootstrapped {len(tenors)} curve nodes for {valuation_date}")
+        return curve
+
+
+class CurveStore:
+    """
+    Bootstrapped curves cached by (currency, valuation date).
+
+    A curve is rebuilt only when the quotes supplied for its key change, so
+    every book asking for the same currency and date gets the same object.
+    """
+
+    def __init__(self, builder: Optional[YieldCurveBuilder] = None):
+        """
+        Initialize the store.
+
+        Args:
+            builder: Bootstrapper (defaults to log-linear discount factors)
+        """
+        self.builder = builder or YieldCurveBuilder()
+        self._curves: Dict[Tuple[str, datetime.date], Tuple[Optional[Tuple[CurveQuote, ...]], DiscountCurve]] = {}
+
+    def build(self, currency: str, valuation_date: datetime.date, quotes: Iterable[CurveQuote]) -> DiscountCurve:
+        """
+        Get the curve for a currency and date, bootstrapping it if the quotes changed.
+
+        Args:
+            currency: Currency code
+            valuation_date: Valuation date
+            quotes: Market quotes for the curve
+
+        Returns:
+            DiscountCurve
+        """
+        key = (currency, valuation_date)
+        quotes = tuple(quotes)
+        cached = self._curves.get(key)
+        if cached is not None and cached[0] == quotes:
+            return cached[1]
+
+        curve = self.builder.bootstrap(quotes, valuation_date)
+        self._curves[key] = (quotes, curve)
+        logger.info(f"Bootstrapped {currency} curve for {valuation_date} from {len(quotes)} quotes")
+        return curve
+
+    def put(self, currency: str, valuation_date: datetime.date, curve: DiscountCurve) -> None:
+        """
+        Store an externally built curve.
+
+        Args:
+            currency: Currency code
+            valuation_date: Valuation date
+            curve: Discount curve
+        """
+        self._curves[(currency, valuation_date)] = (None, curve)
+
+    def get(self, currency: str, valuation_date: datetime.date) -> Optional[DiscountCurve]:
+        """
+        Get a cached curve.
+
+        Args:
+            currency: Currency code
+            valuation_date: Valuation date
+
+        Returns:
+            DiscountCurve, or None if none has been built
+        """
+        cached = self._curves.get((currency, valuation_date))
+        return cached[1] if cached is not None else None
+
+    def curves(self, valuation_date: datetime.date) -> Dict[str, DiscountCurve]:
+        """
+        Get every cached curve for a valuation date.
+
+        Args:
+            valuation_date: Valuation date
+
+        Returns:
+            Dictionary mapping currency to DiscountCurve
+        """
+        return {currency: cached[1] for (currency, date), cached in self._curves.items()
+                if date == valuation_date}
+
+    def invalidate(self, currency: Optional[str] = None, valuation_date: Optional[datetime.date] = None) -> None:
+        """
+        Drop cached curves.
+
+        Args:
+            currency: Only drop curves for this currency
+            valuation_date: Only drop curves for this date
+        """
+        for key in list(self._curves):
+            if (currency is None or key[0] == currency) and (valuation_date is None or key[1] == valuation_date):
+                del self._curves[key]
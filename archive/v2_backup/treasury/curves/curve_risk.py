@@ -0,0 +1,176 @@
+"""
+Curve risk module for treasury operations.
+
+This module values books of fixed cash flows on discount curves and
+measures their parallel and key-rate sensitivities. Cash flows are held
+as flat arrays built once per book and valuation date; a bump only
+rescales the base discount factors, so no schedule is regenerated and
+the curve is not rebuilt per scenario.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+import logging
+import numpy as np
+
+from treasury.curves.discount_curve import DiscountCurve
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Key-rate tenors in years
+DEFAULT_KEY_TENORS = (0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0, 20.0, 30.0)
+
+CurveSet = Union[DiscountCurve, Dict[str, DiscountCurve]]
+
+
+def key_rate_weights(times: np.ndarray, key_tenors: Sequence[float]) -> np.ndarray:
+    """
+    Triangular key-rate bump profiles.
+
+    Each key rate moves zero rates by 1 at its tenor, falling linearly to 0
+    at the neighbouring key tenors; the first and last profiles stay flat
+    beyond the ends. The profiles sum to 1 at every time, so the key-rate
+    sensitivities add up to the parallel one.
+
+    Args:
+        times: Times in years
+        key_tenors: Ascending key-rate tenors
+
+    Returns:
+        Array of shape (len(key_tenors), len(times))
+    """
+    keys = np.asarray(key_tenors, dtype=np.float64)
+    t = np.clip(np.asarray(times, dtype=np.float64), keys[0], keys[-1])
+    weights = np.zeros((keys.size, t.size))
+    if keys.size == 1:
+        weights[0] = 1.0
+        return weights
+
+    upper = np.clip(np.searchsorted(keys, t, side="left"), 1, keys.size - 1)
+    lower = upper - 1
+    fraction = (t - keys[lower]) / (keys[upper] - keys[lower])
+    columns = np.arange(t.size)
+    weights[lower, columns] = 1.0 - fraction
+    weights[upper, columns] += fraction
+    return weights
+
+
+@dataclass
+class CashFlowSchedule:
+    """
+    Fixed cash flows of many instruments, flattened into arrays.
+
+    Amounts are per unit of each instrument; holdings are applied when the
+    schedule is valued, so position changes do not invalidate it.
+    """
+
+    ids: List[str]
+    currencies: List[str]  # per instrument
+    flow_instrument: np.ndarray  # instrument of each flow
+    times: np.ndarray  # years from the valuation date
+    amounts: np.ndarray
+
+    @classmethod
+    def from_flows(cls, flows: Iterable[Tuple[str, str, Sequence[float], Sequence[float]]]) -> "CashFlowSchedule":
+        """
+        Build a schedule from per-instrument flows.
+
+        Args:
+            flows: (instrument id, currency, times, amounts) per instrument
+
+        Returns:
+            CashFlowSchedule
+        """
+        ids, currencies, owners, times, amounts = [], [], [], [], []
+        for index, (instrument_id, currency, flow_times, flow_amounts) in enumerate(flows):
+            flow_times = np.asarray(flow_times, dtype=np.float64)
+            ids.append(instrument_id)
+            currencies.append(currency)
+            owners.append(np.full(flow_times.size, index, dtype=np.int64))
+            times.append(flow_times)
+            amounts.append(np.asarray(flow_amounts, dtype=np.float64))
+
+        return cls(
+            ids=ids,
+            currencies=currencies,
+            flow_instrument=np.concatenate(owners) if owners else np.zeros(0, dtype=np.int64),
+            times=np.concatenate(times) if times else np.zeros(0),
+            amounts=np.concatenate(amounts) if amounts else np.zeros(0)
+        )
+
+    def discount_factors(self, curves: CurveSet) -> np.ndarray:
+        """
+        Discount factors of every flow, each on its instrument's currency curve.
+
+        Args:
+            curves: One curve for everything, or curves by currency (missing currencies give NaN)
+
+        Returns:
+            Discount factors
+        """
+        if isinstance(curves, DiscountCurve):
+            return curves.discount_factors(self.times)
+
+        dfs = np.full(self.times.shape, np.nan)
+        flow_currency = np.asarray(self.currencies, dtype=object)[self.flow_instrument]
+        for currency in set(self.currencies):
+            curve = curves.get(currency)
+            if curve is not None:
+                mask = flow_currency == currency
+                dfs[mask] = curve.discount_factors(self.times[mask])
+        return dfs
+
+    def _sum_by_instrument(self, flow_values: np.ndarray) -> np.ndarray:
+        return np.bincount(self.flow_instrument, weights=flow_values, minlength=len(self.ids))
+
+    def present_values(self, curves: CurveSet, holdings: Union[float, np.ndarray] = 1.0) -> np.ndarray:
+        """
+        Present value of every instrument.
+
+        Args:
+            curves: Discount curve(s)
+            holdings: Units held per instrument
+
+        Returns:
+            Present values, one per instrument
+        """
+        return self._sum_by_instrument(self.amounts * self.discount_factors(curves)) * holdings
+
+    def sensitivities(self,
+                      curves: CurveSet,
+                      holdings: Union[float, np.ndarray] = 1.0,
+                      key_tenors: Sequence[float] = DEFAULT_KEY_TENORS,
+                      bump: float = 0.0001) -> Dict[str, np.ndarray]:
+        """
+        Parallel and key-rate sensitivities of every instrument.
+
+        A bump of b on the zero rate at time t scales the discount factor by
+        exp(-b * w(t) * t), so each scenario reuses the base flow values.
+
+        Args:
+            curves: Discount curve(s)
+            holdings: Units held per instrument
+            key_tenors: Key-rate tenors in years
+            bump: Zero rate bump (e.g., 0.0001 for 1bp)
+
+        Returns:
+            Dictionary with present_value and pv01 per instrument, and
+            key_rate_pv01 of shape (instruments, key tenors); PV01s are the
+            value changes for an upward bump
+        """
+        base = self.amounts * self.discount_factors(curves)
+        present_value = self._sum_by_instrument(base)
+        pv01 = self._sum_by_instrument(base * np.expm1(-bump * self.times)) * holdings
+
+        weights = key_rate_weights(self.times, key_tenors)
+        key_rate_pv01 = np.empty((len(self.ids), weights.shape[0]))
+        for k, profile in enumerate(weights):
+            key_rate_pv01[:, k] = self._sum_by_instrument(base * np.expm1(-bump * profile * self.times))
+        key_rate_pv01 *= np.reshape(holdings, (-1, 1)) if np.ndim(holdings) else holdings
+
+        return {
+            "present_value": present_value * holdings,
+            "pv01": pv01,
+            "key_rate_pv01": key_rate_pv01
+        }
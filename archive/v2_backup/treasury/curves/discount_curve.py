@@ -0,0 +1,144 @@
+"""
+Discount curve module for treasury operations.
+
+This module holds the compiled zero curve shared by the bond and swap
+books: continuously compounded zero rates on sorted tenor arrays, with
+vectorized discount factor lookup under a choice of interpolation scheme.
+"""
+
+from enum import Enum
+from typing import Dict, Sequence, Union
+import logging
+import numpy as np
+from scipy.interpolate import PchipInterpolator
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class InterpolationScheme(Enum):
+    """Discount curve interpolation schemes."""
+    LINEAR_ZERO = "linear_zero"  # Linear in continuously compounded zero rate
+    LOG_LINEAR_DF = "log_linear_df"  # Linear in log discount factor (piecewise flat forwards)
+    MONOTONE_CUBIC = "monotone_cubic"  # Monotone (PCHIP) cubic in zero rate
+
+
+class DiscountCurve:
+    """
+    Compiled zero curve with vectorized discount factor lookup.
+    
+    Tenors (years) and continuously compounded zero rates are stored as sorted
+    arrays once, so each lookup is a searchsorted over an array of times
+    rather than a re-parse and scan of the curve dictionary. Zero rates are
+    extrapolated flat beyond the first and last tenors.
+    """
+    
+    def __init__(self,
+                 tenors: Sequence[float],
+                 zero_rates: Sequence[float],
+                 scheme: InterpolationScheme = InterpolationScheme.LINEAR_ZERO):
+        """
+        Initialize the curve.
+        
+        Args:
+            tenors: Curve tenors in years
+            zero_rates: Continuously compounded zero rates for the tenors
+            scheme: Interpolation scheme
+        """
+        tenors = np.asarray(tenors, dtype=np.float64)
+        zero_rates = np.asarray(zero_rates, dtype=np.float64)
+        if tenors.size == 0 or tenors.shape != zero_rates.shape:
+            raise ValueError("Curve needs matching, non-empty tenors and rates")
+            
+        order = np.argsort(tenors, kind="stable")
+        self.tenors = tenors[order]
+        self.zero_rates_at_tenors = zero_rates[order]
+        self.scheme = scheme
+        self._log_dfs = -self.zero_rates_at_tenors * self.tenors
+        self._cubic = None
+        if scheme == InterpolationScheme.MONOTONE_CUBIC and self.tenors.size > 1:
+            self._cubic = PchipInterpolator(self.tenors, self.zero_rates_at_tenors, extrapolate=False)
+            
+    @classmethod
+    def from_dict(cls,
+                  yield_curve: Dict[str, float],
+                  scheme: InterpolationScheme = InterpolationScheme.LINEAR_ZERO) -> "DiscountCurve":
+        """
+        Compile a curve from a dictionary of tenor strings (years) to rates.
+        
+        Args:
+            yield_curve: Dictionary mapping tenors (in years, as strings) to yields
+            scheme: Interpolation scheme
+            
+        Returns:
+            DiscountCurve
+        """
+        return cls([float(t) for t in yield_curve], list(yield_curve.values()), scheme)
+        
+    def zero_rates(self, times: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Interpolate zero rates.
+        
+        Args:
+            times: Times in years
+            
+        Returns:
+            Zero rates for the times
+        """
+        t = np.clip(np.asarray(times, dtype=np.float64), self.tenors[0], self.tenors[-1])
+        if self.tenors.size == 1:
+            return np.full_like(t, self.zero_rates_at_tenors[0])
+            
+        if self._cubic is not None:
+            return self._cubic(t)
+            
+        upper = np.clip(np.searchsorted(self.tenors, t, side="left"), 1, self.tenors.size - 1)
+        lower = upper - 1
+        t0, t1 = self.tenors[lower], self.tenors[upper]
+        weight = (t - t0) / (t1 - t0)
+        
+        r0, r1 = self.zero_rates_at_tenors[lower], self.zero_rates_at_tenors[upper]
+        if self.scheme == InterpolationScheme.LOG_LINEAR_DF:
+            log_df = self._log_dfs[lower] + weight * (self._log_dfs[upper] - self._log_dfs[lower])
+            # A tenor at t = 0 has no discounting to recover its rate from; use the quoted rate
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return np.where(t > 0, -log_df / t, r0)
+            
+        return r0 + weight * (r1 - r0)
+        
+    def discount_factors(self, times: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Get discount factors for an array of times.
+        
+        Args:
+            times: Times in years (times <= 0 discount at 1.0)
+            
+        Returns:
+            Discount factors for the times
+        """
+        t = np.asarray(times, dtype=np.float64)
+        return np.where(t > 0, np.exp(-self.zero_rates(t) * t), 1.0)
+        
+    def discount_factor(self, years: float) -> float:
+        """
+        Get the discount factor for one time.
+        
+        Args:
+            years: Time in years
+            
+        Returns:
+            Discount factor
+        """
+        return float(self.discount_factors(years))
+        
+    def shifted(self, shift: float) -> "DiscountCurve":
+        """
+        Get a copy of the curve with every zero rate moved by shift.
+        
+        Args:
+            shift: Parallel shift (e.g., 0.0001 for 1bp)
+            
+        Returns:
+            Shifted DiscountCurve
+        """
+        return DiscountCurve(self.tenors, self.zero_rates_at_tenors + shift, self.scheme)
@@ -0,0 +1,3 @@
+"""
+Treasury yield curve tests package.
+"""
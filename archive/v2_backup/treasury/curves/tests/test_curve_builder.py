@@ -0,0 +1,237 @@
+"""
+Yield Curve Tests - Treasury
+
+This module checks that bootstrapped curves reprice their input quotes,
+the curve store, and curve risk on cached cash-flow schedules.
+"""
+import datetime
+import logging
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from treasury.bonds.bond_portfolio import Bond, BondPosition, BondPortfolio
+from treasury.bonds.bond_valuation import BondValuation, YieldCurve
+from treasury.derivatives.swap_operations import SwapManager
+from ..discount_curve import DiscountCurve, InterpolationScheme
+from ..curve_builder import (
+    DepositQuote, FRAQuote, SwapQuote, BondQuote,
+    YieldCurveBuilder, CurveStore, resolve_date, coupon_dates
+)
+from ..curve_risk import CashFlowSchedule, key_rate_weights
+
+VALUATION_DATE = datetime.date(2025, 3, 31)
+
+QUOTES = [
+    DepositQuote("1M", 0.030),
+    DepositQuote("3M", 0.031),
+    FRAQuote("3M", "6M", 0.032),
+    FRAQuote("6M", "9M", 0.033),
+    SwapQuote("2Y", 0.034),
+    SwapQuote("3Y", 0.035, 2),
+    SwapQuote("5Y", 0.036),
+    BondQuote("7Y", 4.0, 101.5),
+    SwapQuote("10Y", 0.038),
+    SwapQuote("30Y", 0.040)
+]
+
+
+def years(date):
+    return (date - VALUATION_DATE).days / 365.0
+
+
+def quote_error(curve, quote):
+    """Repricing error of a quote, written out per instrument type."""
+    df = lambda date: curve.discount_factor(years(date))
+    if isinstance(quote, DepositQuote):
+        end = resolve_date(VALUATION_DATE, quote.maturity)
+        return df(end) * (1 + quote.rate * (end - VALUATION_DATE).days / 360.0) - 1.0
+    if isinstance(quote, FRAQuote):
+        start, end = resolve_date(VALUATION_DATE, quote.start), resolve_date(VALUATION_DATE, quote.end)
+        forward = (df(start) / df(end) - 1) / ((end - start).days / 360.0)
+        return forward - quote.rate
+    dates = coupon_dates(VALUATION_DATE, resolve_date(VALUATION_DATE, quote.maturity), quote.payment_frequency)
+    if isinstance(quote, SwapQuote):
+        annuity, previous = 0.0, VALUATION_DATE
+        for date in dates:
+            annuity += (date - previous).days / 365.0 * df(date)
+            previous = date
+        return (1 - df(dates[-1])) / annuity - quote.rate
+    price = sum(quote.coupon_rate / quote.payment_frequency * df(date) for date in dates) + 100 * df(dates[-1])
+    return price - quote.price
+
+
+class TestYieldCurveBuilder(unittest.TestCase):
+    """Test cases for curve bootstrapping."""
+
+    def test_every_scheme_reprices_its_quotes(self):
+        """Test that each bootstrapped curve reprices deposits, FRAs, swaps and bonds."""
+        for scheme in InterpolationScheme:
+            curve = YieldCurveBuilder(scheme).bootstrap(QUOTES, VALUATION_DATE)
+
+            self.assertEqual(len(curve.tenors), len(QUOTES))
+            for quote in QUOTES:
+                self.assertAlmostEqual(quote_error(curve, quote), 0.0, places=9, msg=f"{scheme.value} {quote}")
+
+    def test_quote_order_does_not_matter(self):
+        """Test that quotes are sorted by maturity before stripping."""
+        forward = YieldCurveBuilder().bootstrap(QUOTES, VALUATION_DATE)
+        backward = YieldCurveBuilder().bootstrap(QUOTES[::-1], VALUATION_DATE)
+
+        np.testing.assert_allclose(forward.zero_rates_at_tenors, backward.zero_rates_at_tenors)
+
+    def test_invalid_quote_sets_raise(self):
+        """Test rejection of empty and overlapping quote sets."""
+        with self.assertRaises(ValueError):
+            YieldCurveBuilder().bootstrap([], VALUATION_DATE)
+        with self.assertRaises(ValueError):
+            YieldCurveBuilder().bootstrap([DepositQuote("3M", 0.03), FRAQuote("1M", "3M", 0.031)], VALUATION_DATE)
+
+    def test_resolve_date_and_coupon_dates(self):
+        """Test tenor arithmetic, month-end clipping and coupon schedules."""
+        self.assertEqual(resolve_date(VALUATION_DATE, "2W"), datetime.date(2025, 4, 14))
+        self.assertEqual(resolve_date(VALUATION_DATE, "2M"), datetime.date(2025, 5, 31))
+        self.assertEqual(resolve_date(VALUATION_DATE, "11m"), datetime.date(2026, 2, 28))
+        self.assertEqual(coupon_dates(VALUATION_DATE, datetime.date(2026, 6, 30), 2),
+                         [datetime.date(2025, 6, 30), datetime.date(2025, 12, 30), datetime.date(2026, 6, 30)])
+        with self.assertRaises(ValueError):
+            resolve_date(VALUATION_DATE, "3Q")
+
+
+class TestCurveStore(unittest.TestCase):
+    """Test cases for the per-currency, per-date curve store."""
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.store = CurveStore()
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_same_quotes_return_cached_curve(self):
+        """Test that a curve is only rebuilt when its quotes change."""
+        curve = self.store.build("USD", VALUATION_DATE, QUOTES)
+
+        self.assertIs(self.store.build("USD", VALUATION_DATE, list(QUOTES)), curve)
+        rebuilt = self.store.build("USD", VALUATION_DATE, QUOTES[:-1] + [SwapQuote("30Y", 0.041)])
+        self.assertIsNot(rebuilt, curve)
+        self.assertIs(self.store.get("USD", VALUATION_DATE), rebuilt)
+
+    def test_curves_and_invalidation_by_date(self):
+        """Test listing and dropping curves by currency and date."""
+        usd = self.store.build("USD", VALUATION_DATE, QUOTES)
+        self.store.put("EUR", VALUATION_DATE, DiscountCurve([1.0], [0.02]))
+        self.store.put("USD", VALUATION_DATE + datetime.timedelta(days=1), DiscountCurve([1.0], [0.03]))
+
+        self.assertEqual(set(self.store.curves(VALUATION_DATE)), {"USD", "EUR"})
+        self.store.invalidate(valuation_date=VALUATION_DATE)
+        self.assertIsNone(self.store.get("USD", VALUATION_DATE))
+        self.assertIsNotNone(self.store.get("USD", VALUATION_DATE + datetime.timedelta(days=1)))
+        self.assertIsNot(self.store.build("USD", VALUATION_DATE, QUOTES), usd)
+
+    def test_swap_manager_prefers_bootstrapped_curve(self):
+        """Test that a bootstrapped curve takes precedence over the yield curve dictionary."""
+        manager = SwapManager(curve_store=self.store)
+        manager.update_yield_curve("USD", {"1": 0.05, "10": 0.05})
+
+        curve = manager.update_curve_quotes("USD", QUOTES, VALUATION_DATE)
+
+        self.assertIs(manager.get_discount_curve("USD", VALUATION_DATE), curve)
+        self.assertEqual(manager.get_discount_curve("USD", VALUATION_DATE - datetime.timedelta(days=1))
+                         .zero_rates_at_tenors.tolist(), [0.05, 0.05])
+
+
+class TestCurveRisk(unittest.TestCase):
+    """Test cases for parallel and key-rate curve risk."""
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.curve = YieldCurveBuilder().bootstrap(QUOTES, VALUATION_DATE)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_key_rate_profiles_sum_to_one(self):
+        """Test that key-rate bump profiles add up to a parallel bump everywhere."""
+        weights = key_rate_weights(np.linspace(0, 40, 81), [0.5, 2.0, 5.0, 10.0, 30.0])
+
+        np.testing.assert_allclose(weights.sum(axis=0), 1.0)
+        self.assertEqual(weights[:, 0].tolist(), [1.0, 0.0, 0.0, 0.0, 0.0])
+
+    def test_sensitivities_match_bumped_curves(self):
+        """Test PV01 and key-rate PV01 against revaluation on shifted curves."""
+        schedule = CashFlowSchedule.from_flows([
+            ("A", "USD", [0.5, 1.0, 1.5, 2.0], [2.0, 2.0, 2.0, 102.0]),
+            ("B", "USD", [3.0, 7.0, 12.0], [-50.0, 10.0, 110.0])
+        ])
+        holdings = np.array([10.0, -4.0])
+
+        risk = schedule.sensitivities(self.curve, holdings, key_tenors=[1.0, 5.0, 10.0])
+        base = schedule.present_values(self.curve, holdings)
+        bumped = schedule.present_values(self.curve.shifted(0.0001), holdings)
+
+        np.testing.assert_allclose(risk["present_value"], base)
+        np.testing.assert_allclose(risk["pv01"], bumped - base, rtol=1e-9)
+        np.testing.assert_allclose(risk["key_rate_pv01"].sum(axis=1), risk["pv01"], rtol=1e-3)
+
+    def test_missing_currency_curve_gives_nan(self):
+        """Test that instruments without a curve are valued as NaN, not zero."""
+        schedule = CashFlowSchedule.from_flows([("A", "USD", [1.0], [100.0]), ("B", "JPY", [1.0], [100.0])])
+
+        values = schedule.present_values({"USD": self.curve})
+
+        self.assertTrue(np.isfinite(values[0]))
+        self.assertTrue(np.isnan(values[1]))
+
+    def test_bond_portfolio_on_bootstrapped_curve(self):
+        """Test bond portfolio curve values against discounting each bond's cash flows."""
+        portfolio = BondPortfolio("curve-test")
+        for i, (term, coupon) in enumerate([(2, "3.0"), (7, "4.0"), (25, "4.5")]):
+            bond = Bond(id=f"B{i}", isin=f"US{i:010d}", cusip=None, issuer="UST",
+                        issue_date=datetime.date(2024, 3, 31), maturity_date=datetime.date(2024 + term, 3, 31),
+                        coupon_rate=Decimal(coupon), face_value=Decimal("1000"), currency="USD",
+                        bond_type="government", payment_frequency=2, day_count_convention="ACT/365")
+            portfolio.add_position(BondPosition(bond, 100 * (i + 1), VALUATION_DATE, Decimal("100"), Decimal("3")))
+
+        result = portfolio.calculate_curve_sensitivities(VALUATION_DATE, {"USD": self.curve})
+
+        for index, bond_id in enumerate(result["bond_ids"]):
+            position = portfolio.positions[bond_id]
+            bond = position.bond
+            flows = [cf for cf in BondValuation.calculate_cash_flows(
+                bond.issue_date, bond.maturity_date, bond.face_value, bond.coupon_rate,
+                bond.payment_frequency, settlement_date=VALUATION_DATE) if cf.date >= VALUATION_DATE]
+            expected = sum(float(cf.amount) * self.curve.discount_factor(years(cf.date)) for cf in flows)
+            self.assertAlmostEqual(result["present_value"][index], expected * position.quantity, places=6)
+        self.assertLess(result["total_pv01"], 0)
+
+
+class TestYieldCurveBridge(unittest.TestCase):
+    """Test cases for converting between bond yield curves and discount curves."""
+
+    def test_round_trip_through_discount_curve(self):
+        """Test that annually compounded yields survive conversion both ways."""
+        yield_curve = YieldCurve("USD", VALUATION_DATE)
+        for maturity, rate in [(1, "3.0"), (2, "3.5"), (5, "4.0")]:
+            yield_curve.add_point(maturity, Decimal(rate))
+
+        restored = YieldCurve.from_discount_curve(yield_curve.to_discount_curve(), "USD", VALUATION_DATE)
+
+        for maturity in (1, 2, 5):
+            self.assertAlmostEqual(float(restored.get_yield(maturity)), float(yield_curve.get_yield(maturity)), places=5)
+        np.testing.assert_allclose(yield_curve.get_yields(np.array([0.5, 1.5, 3.5, 9.0])), [3.0, 3.25, 3.75, 4.0])
+
+    def test_log_linear_curve_with_a_spot_tenor(self):
+        """Test finite zero rates at a tenor of zero on a log-linear curve."""
+        curve = DiscountCurve([0.0, 1.0, 2.0], [0.02, 0.03, 0.035], InterpolationScheme.LOG_LINEAR_DF)
+
+        rates = curve.zero_rates(np.array([0.0, 0.5, 1.0, 2.0]))
+
+        self.assertTrue(np.all(np.isfinite(rates)))
+        np.testing.assert_allclose(rates[[0, 2, 3]], [0.02, 0.03, 0.035])
+        np.testing.assert_allclose(curve.discount_factors(np.array([0.0, 1.0])), [1.0, np.exp(-0.03)])
+
+
+if __name__ == "__main__":
+    unittest.main()
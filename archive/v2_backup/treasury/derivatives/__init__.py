@@ -28,12 +28,28 @@ except ImportError:
 # Import modules
 from treasury.derivatives.options_pricing import (
     Option, OptionType, OptionStyle, 
-    BlackScholes, BinomialTreeModel
+    BlackScholes, BinomialTree
+)
+
+# Name exported by earlier releases
+BinomialTreeModel = BinomialTree
+
+from treasury.derivatives.batch_pricing import (
+    OptionArrays, VectorizedBlackScholes,
+    arrays_from_options, arrays_from_positions
+)
+
+from treasury.derivatives.lattice_pricing import LatticePricer, LatticeModel
+
+from treasury.derivatives.implied_volatility import (
+    ImpliedVolatilitySolver, ImpliedVolResult,
+    VolatilitySurface, VolatilitySurfaceCache
 )
 
 from treasury.derivatives.swap_operations import (
     SwapContract, SwapLeg, SwapType, SwapManager,
-    PaymentFrequency, DayCountConvention, SwapPricingModel
+    PaymentFrequency, DayCountConvention, SwapPricingModel,
+    InterpolationScheme, DiscountCurve, SwapCashflowSchedule
 )
 
 from treasury.derivatives.futures_management import (
@@ -41,6 +57,13 @@ from treasury.derivatives.futures_management import (
     MarginType, MarginCall, FuturesManager
 )
 
+from treasury.derivatives.futures_margin import FuturesMarginEngine, SpanParameters
+
+from treasury.derivatives.risk_engine import (
+    RiskBook, ScenarioSet, ScenarioRiskEngine, StressGridResult,
+    factor_name, factor_changes
+)
+
 from treasury.derivatives.derivatives_risk import (
     DerivativesRiskManager, DerivativePosition, 
     RiskMetricType, StressTestLevel, RiskLimit, RiskReport
@@ -48,17 +71,24 @@ from treasury.derivatives.derivatives_risk import (
 
 __all__ = [
     # Options
-    'Option', 'OptionType', 'OptionStyle', 'BlackScholes', 'BinomialTreeModel',
+    'Option', 'OptionType', 'OptionStyle', 'BlackScholes', 'BinomialTree', 'BinomialTreeModel',
+    'OptionArrays', 'VectorizedBlackScholes', 'arrays_from_options', 'arrays_from_positions',
+    'LatticePricer', 'LatticeModel',
+    'ImpliedVolatilitySolver', 'ImpliedVolResult', 'VolatilitySurface', 'VolatilitySurfaceCache',
     
     # Swaps
     'SwapContract', 'SwapLeg', 'SwapType', 'SwapManager',
     'PaymentFrequency', 'DayCountConvention', 'SwapPricingModel',
+    'InterpolationScheme', 'DiscountCurve', 'SwapCashflowSchedule',
     
     # Futures
     'FuturesContract', 'FuturesPosition', 'FuturesType',
     'MarginType', 'MarginCall', 'FuturesManager',
+    'FuturesMarginEngine', 'SpanParameters',
     
     # Risk Management
     'DerivativesRiskManager', 'DerivativePosition',
-    'RiskMetricType', 'StressTestLevel', 'RiskLimit', 'RiskReport'
+    'RiskMetricType', 'StressTestLevel', 'RiskLimit', 'RiskReport',
+    'RiskBook', 'ScenarioSet', 'ScenarioRiskEngine', 'StressGridResult',
+    'factor_name', 'factor_changes'
 ]
\ No newline at end of file
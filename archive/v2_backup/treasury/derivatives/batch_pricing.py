@@ -0,0 +1,347 @@
+"""
+Batch options pricing module for treasury operations.
+
+This module prices whole option books in one vectorized Black-Scholes pass.
+Inputs are NumPy arrays (one element per contract), so end-of-day
+revaluation costs a handful of array operations instead of one Python
+call per option and per Greek.
+"""
+
+import datetime
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Union, Any
+import logging
+import numpy as np
+from scipy.special import ndtr
+
+# Local imports - assuming these modules are available
+try:
+    from treasury.derivatives.options_pricing import Option, OptionType
+except ImportError:
+    # For standalone usage during development
+    pass
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+MarketInput = Union[float, Dict[str, float]]
+
+
+def _norm_pdf(x: np.ndarray) -> np.ndarray:
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+@dataclass
+class OptionArrays:
+    """Columnar representation of an option book."""
+
+    ids: List[str]
+    underlyings: np.ndarray  # object array of underlying identifiers
+    spot: np.ndarray
+    strike: np.ndarray
+    time_to_expiry: np.ndarray  # years
+    volatility: np.ndarray
+    rate: np.ndarray
+    dividend_yield: np.ndarray
+    is_call: np.ndarray  # bool
+    contract_size: np.ndarray
+    quantity: np.ndarray = field(default=None)
+
+    def __post_init__(self):
+        if self.quantity is None:
+            self.quantity = np.ones_like(self.spot)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class VectorizedBlackScholes:
+    """
+    Vectorized Black-Scholes pricing model.
+
+    Greeks follow the conventions of BlackScholes.price_option: theta is
+    per calendar day, vega and rho are per 1% move, and every output is
+    scaled by contract size (and by position quantity when given).
+    """
+
+    @staticmethod
+    def price_and_greeks(
+        spot: np.ndarray,
+        strike: np.ndarray,
+        time_to_expiry: np.ndarray,
+        volatility: np.ndarray,
+        risk_free_rate: Union[float, np.ndarray],
+        dividend_yield: Union[float, np.ndarray],
+        is_call: np.ndarray,
+        contract_size: Union[float, np.ndarray] = 1.0,
+        quantity: Union[float, np.ndarray] = 1.0
+    ) -> Dict[str, np.ndarray]:
+        """
+        Price options and compute all Greeks in one pass.
+
+        Args:
+            spot: Underlying prices
+            strike: Strike prices
+            time_to_expiry: Years to expiry (<= 0 means expired, priced at intrinsic)
+            volatility: Volatilities (as decimals)
+            risk_free_rate: Risk-free rates (as decimals)
+            dividend_yield: Dividend yields (as decimals)
+            is_call: True for calls, False for puts
+            contract_size: Units per contract
+            quantity: Number of contracts (signed for short positions)
+
+        Returns:
+            Dictionary of arrays: price, delta, gamma, theta, vega, rho
+        """
+        S = np.asarray(spot, dtype=np.float64)
+        K = np.asarray(strike, dtype=np.float64)
+        T = np.asarray(time_to_expiry, dtype=np.float64)
+        sigma = np.asarray(volatility, dtype=np.float64)
+        r = np.asarray(risk_free_rate, dtype=np.float64)
+        q = np.asarray(dividend_yield, dtype=np.float64)
+        call = np.asarray(is_call, dtype=bool)
+        S, K, T, sigma, r, q, call = np.broadcast_arrays(S, K, T, sigma, r, q, call)
+        scale = np.asarray(contract_size, dtype=np.float64) * np.asarray(quantity, dtype=np.float64)
+
+        live = (T > 0) & (sigma > 0)
+        # Dummy values on dead contracts keep the math finite; they are overwritten below
+        T_safe = np.where(live, T, 1.0)
+        sigma_safe = np.where(live, sigma, 1.0)
+
+        sqrt_T = np.sqrt(T_safe)
+        sigma_sqrt_T = sigma_safe * sqrt_T
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma_safe * sigma_safe) * T_safe) / sigma_sqrt_T
+        d2 = d1 - sigma_sqrt_T
+
+        df_r = np.exp(-r * T_safe)
+        df_q = np.exp(-q * T_safe)
+        sign = np.where(call, 1.0, -1.0)
+
+        # N(sign*d) gives N(d) for calls and N(-d) for puts
+        nd1 = ndtr(sign * d1)
+        nd2 = ndtr(sign * d2)
+        pdf_d1 = _norm_pdf(d1)
+
+        price = sign * (S * df_q * nd1 - K * df_r * nd2)
+        delta = sign * df_q * nd1
+        gamma = df_q * pdf_d1 / (S * sigma_sqrt_T)
+        theta = (
+            -S * df_q * pdf_d1 * sigma_safe / (2.0 * sqrt_T)
+            - sign * r * K * df_r * nd2
+            + sign * q * S * df_q * nd1
+        ) / 365.0
+        vega = S * df_q * sqrt_T * pdf_d1 * 0.01
+        rho = sign * K * T_safe * df_r * nd2 * 0.01
+
+        if not live.all():
+            dead = ~live
+            intrinsic = np.maximum(sign * (S - K), 0.0)
+            if np.any(dead & (T > 0)):
+                # Zero volatility: discounted forward intrinsic value
+                forward_intrinsic = np.maximum(sign * (S * np.exp(-q * T) - K * np.exp(-r * T)), 0.0)
+                intrinsic = np.where(T > 0, forward_intrinsic, intrinsic)
+            price = np.where(dead, intrinsic, price)
+            delta = np.where(dead, np.where(intrinsic > 0, sign, 0.0), delta)
+            gamma = np.where(dead, 0.0, gamma)
+            theta = np.where(dead, 0.0, theta)
+            vega = np.where(dead, 0.0, vega)
+            rho = np.where(dead, 0.0, rho)
+
+        return {
+            "price": price * scale,
+            "delta": delta * scale,
+            "gamma": gamma * scale,
+            "theta": theta * scale,
+            "vega": vega * scale,
+            "rho": rho * scale
+        }
+
+    @staticmethod
+    def price(
+        spot: np.ndarray,
+        strike: np.ndarray,
+        time_to_expiry: np.ndarray,
+        volatility: np.ndarray,
+        risk_free_rate: Union[float, np.ndarray],
+        dividend_yield: Union[float, np.ndarray],
+        is_call: np.ndarray
+    ) -> np.ndarray:
+        """
+        Price options per unit of underlying, without Greeks.
+
+        Inputs broadcast against each other, so a (scenarios x options) grid
+        of spots prices in one call. Used by scenario revaluation, where
+        only the price is needed and the Greeks would double the work.
+
+        Args:
+            spot: Underlying prices
+            strike: Strike prices
+            time_to_expiry: Years to expiry (<= 0 means expired, priced at intrinsic)
+            volatility: Volatilities (as decimals)
+            risk_free_rate: Risk-free rates (as decimals)
+            dividend_yield: Dividend yields (as decimals)
+            is_call: True for calls, False for puts
+
+        Returns:
+            Array of option prices
+        """
+        S, K, T, sigma, r, q = (np.asarray(a, dtype=np.float64) for a in
+                                (spot, strike, time_to_expiry, volatility, risk_free_rate, dividend_yield))
+        sign = np.where(np.asarray(is_call, dtype=bool), 1.0, -1.0)
+
+        live = (T > 0) & (sigma > 0)
+        T_safe = np.where(live, T, 1.0)
+        sigma_sqrt_T = np.where(live, sigma, 1.0) * np.sqrt(T_safe)
+        forward_df = np.exp(-q * T_safe)
+        strike_df = np.exp(-r * T_safe)
+
+        d1 = (np.log(S * forward_df / (K * strike_df))) / sigma_sqrt_T + 0.5 * sigma_sqrt_T
+        d2 = d1 - sigma_sqrt_T
+        price = sign * (S * forward_df * ndtr(sign * d1) - K * strike_df * ndtr(sign * d2))
+
+        if not live.all():
+            T_dead = np.maximum(T, 0.0)
+            intrinsic = np.maximum(sign * (S * np.exp(-q * T_dead) - K * np.exp(-r * T_dead)), 0.0)
+            price = np.where(live, price, intrinsic)
+        return price
+
+    @staticmethod
+    def price_book(book: OptionArrays) -> Dict[str, np.ndarray]:
+        """
+        Price a columnar option book.
+
+        Args:
+            book: Option arrays
+
+        Returns:
+            Dictionary of arrays: price, delta, gamma, theta, vega, rho
+        """
+        return VectorizedBlackScholes.price_and_greeks(
+            book.spot, book.strike, book.time_to_expiry, book.volatility,
+            book.rate, book.dividend_yield, book.is_call,
+            book.contract_size, book.quantity
+        )
+
+
+def _lookup(values: MarketInput, keys: Sequence[str], name: str, default: Optional[float] = None) -> np.ndarray:
+    """Resolve a scalar or per-underlying mapping into an array aligned with keys."""
+    if not isinstance(values, dict):
+        return np.full(len(keys), float(values))
+
+    out = np.empty(len(keys))
+    for i, key in enumerate(keys):
+        value = values.get(key, default)
+        if value is None:
+            raise ValueError(f"No {name} for underlying {key}")
+        out[i] = value
+    return out
+
+
+def _years_between(valuation_date: datetime.date, expiries: Sequence[datetime.date]) -> np.ndarray:
+    ordinals = np.fromiter((d.toordinal() for d in expiries), dtype=np.int64, count=len(expiries))
+    return np.maximum(ordinals - valuation_date.toordinal(), 0) / 365.0
+
+
+def arrays_from_options(
+    options: Sequence["Option"],
+    spot_prices: MarketInput,
+    volatilities: MarketInput,
+    risk_free_rate: MarketInput,
+    dividend_yields: MarketInput = 0.0,
+    quantities: Optional[Sequence[float]] = None,
+    valuation_date: Optional[datetime.date] = None
+) -> OptionArrays:
+    """
+    Build option arrays from Option objects.
+
+    Market inputs may be a single value or a dict keyed by underlying
+    (rates and dividend yields default to 0 for missing underlyings).
+
+    Args:
+        options: Option contracts
+        spot_prices: Spot price(s)
+        volatilities: Volatility(ies)
+        risk_free_rate: Risk-free rate(s)
+        dividend_yields: Dividend yield(s)
+        quantities: Optional number of contracts per option
+        valuation_date: Valuation date (defaults to today)
+
+    Returns:
+        OptionArrays for the options
+    """
+    valuation_date = valuation_date or datetime.date.today()
+    underlyings = [option.underlying for option in options]
+
+    return OptionArrays(
+        ids=[option.id for option in options],
+        underlyings=np.array(underlyings, dtype=object),
+        spot=_lookup(spot_prices, underlyings, "spot price"),
+        strike=np.fromiter((float(o.strike_price) for o in options), dtype=np.float64, count=len(options)),
+        time_to_expiry=_years_between(valuation_date, [o.expiry_date for o in options]),
+        volatility=_lookup(volatilities, underlyings, "volatility"),
+        rate=_lookup(risk_free_rate, underlyings, "risk-free rate", default=0.0),
+        dividend_yield=_lookup(dividend_yields, underlyings, "dividend yield", default=0.0),
+        is_call=np.fromiter((o.option_type == OptionType.CALL for o in options), dtype=bool, count=len(options)),
+        contract_size=np.fromiter((o.contract_size for o in options), dtype=np.float64, count=len(options)),
+        quantity=None if quantities is None else np.asarray(quantities, dtype=np.float64)
+    )
+
+
+def arrays_from_positions(
+    positions: Sequence[Any],
+    spot_prices: MarketInput,
+    volatilities: MarketInput,
+    risk_free_rate: MarketInput,
+    dividend_yields: MarketInput = 0.0,
+    valuation_date: Optional[datetime.date] = None
+) -> OptionArrays:
+    """
+    Build option arrays from option DerivativePositions.
+
+    Uses the instrument_details keys of option positions: option_type,
+    strike_price, expiry_date (date or ISO string), contract_size and
+    quantity. Volatility may also come from an "implied_volatility" detail,
+    which takes precedence over the volatilities argument.
+
+    Args:
+        positions: DerivativePositions with instrument_type "option"
+        spot_prices: Spot price(s)
+        volatilities: Volatility(ies)
+        risk_free_rate: Risk-free rate(s)
+        dividend_yields: Dividend yield(s)
+        valuation_date: Valuation date (defaults to today)
+
+    Returns:
+        OptionArrays for the positions
+    """
+    valuation_date = valuation_date or datetime.date.today()
+    count = len(positions)
+    details = [position.instrument_details for position in positions]
+    underlyings = [position.underlying or d.get("underlying", "unknown") for position, d in zip(positions, details)]
+
+    expiries = []
+    for d in details:
+        expiry = d["expiry_date"]
+        expiries.append(datetime.date.fromisoformat(expiry) if isinstance(expiry, str) else expiry)
+
+    volatility = _lookup(volatilities, underlyings, "volatility") if volatilities is not None else np.full(count, np.nan)
+    overrides = np.fromiter((float(d.get("implied_volatility", np.nan)) for d in details), dtype=np.float64, count=count)
+    volatility = np.where(np.isnan(overrides), volatility, overrides)
+    if np.isnan(volatility).any():
+        raise ValueError("Missing volatility for some option positions")
+
+    return OptionArrays(
+        ids=[position.position_id for position in positions],
+        underlyings=np.array(underlyings, dtype=object),
+        spot=_lookup(spot_prices, underlyings, "spot price"),
+        strike=np.fromiter((float(d["strike_price"]) for d in details), dtype=np.float64, count=count),
+        time_to_expiry=_years_between(valuation_date, expiries),
+        volatility=volatility,
+        rate=_lookup(risk_free_rate, underlyings, "risk-free rate", default=0.0),
+        dividend_yield=_lookup(dividend_yields, underlyings, "dividend yield", default=0.0),
+        is_call=np.fromiter((str(d.get("option_type", "call")).lower() == "call" for d in details), dtype=bool, count=count),
+        contract_size=np.fromiter((float(d.get("contract_size", 1)) for d in details), dtype=np.float64, count=count),
+        quantity=np.fromiter((float(d.get("quantity", 1)) for d in details), dtype=np.float64, count=count)
+    )
@@ -23,6 +23,9 @@ try:
     from treasury.derivatives.options_pricing import Option, OptionType
     from treasury.derivatives.swap_operations import SwapContract, SwapType
     from treasury.derivatives.futures_management import FuturesPosition, FuturesType
+    from treasury.derivatives.batch_pricing import OptionArrays, VectorizedBlackScholes, arrays_from_positions
+    from treasury.derivatives.risk_engine import RiskBook, ScenarioSet, ScenarioRiskEngine, factor_changes
+    from treasury.derivatives.implied_volatility import VolatilitySurfaceCache
 except ImportError:
     # For standalone usage during development
     pass
@@ -111,6 +114,7 @@ class DerivativesRiskManager:
         self.correlations: Dict[str, Dict[str, float]] = {}
         self.risk_reports: List[RiskReport] = []
         self.scenarios: Dict[str, Dict[str, Any]] = {}
+        self.volatility_surfaces = VolatilitySurfaceCache()
         
     def add_position(self, position: DerivativePosition) -> None:
         """
@@ -270,6 +274,164 @@ class DerivativesRiskManager:
         """
         return sum(position.market_value for position in self.positions.values())
         
+    def revalue_option_positions(self,
+                               spot_prices: Union[float, Dict[str, float]],
+                               volatilities: Optional[Union[float, Dict[str, float]]],
+                               risk_free_rate: Union[float, Dict[str, float]],
+                               dividend_yields: Union[float, Dict[str, float]] = 0.0,
+                               valuation_date: Optional[datetime.date] = None,
+                               update_positions: bool = True) -> Dict[str, Any]:
+        """
+        Revalue all option positions in one vectorized Black-Scholes pass.
+        
+        Args:
+            spot_prices: Spot price, or dict of spot prices by underlying
+            volatilities: Volatility, dict of volatilities by underlying, or None
+                          to price off the cached volatility surfaces
+            risk_free_rate: Risk-free rate, or dict of rates by underlying
+            dividend_yields: Dividend yield, or dict of yields by underlying
+            valuation_date: Valuation date (defaults to today)
+            update_positions: Write market value and Greeks back to the positions
+            
+        Returns:
+            Dictionary with position IDs, per-position result arrays and book totals
+        """
+        options = [p for p in self.positions.values() if p.instrument_type == "option"]
+        if not options:
+            return {"position_ids": [], "results": {}, "totals": {}}
+            
+        book = self._option_arrays(options, spot_prices, volatilities, risk_free_rate,
+                                   dividend_yields, valuation_date)
+        results = VectorizedBlackScholes.price_book(book)
+        
+        if update_positions:
+            now = datetime.datetime.now()
+            columns = {name: values.tolist() for name, values in results.items()}
+            for i, position in enumerate(options):
+                position.market_value = Decimal(str(round(columns["price"][i], 2)))
+                for metric in ("delta", "gamma", "theta", "vega", "rho"):
+                    position.risk_metrics[metric] = Decimal(repr(columns[metric][i]))
+                position.last_updated = now
+                
+        logger.info(f"Revalued {len(options)} option positions")
+        return {
+            "position_ids": book.ids,
+            "results": results,
+            "totals": {name: float(values.sum()) for name, values in results.items()}
+        }
+        
+    def _option_arrays(self,
+                       options: List[DerivativePosition],
+                       spot_prices: Union[float, Dict[str, float]],
+                       volatilities: Optional[Union[float, Dict[str, float]]],
+                       risk_free_rate: Union[float, Dict[str, float]],
+                       dividend_yields: Union[float, Dict[str, float]],
+                       valuation_date: Optional[datetime.date]) -> OptionArrays:
+        """
+        Build option arrays, taking volatilities from the cached surfaces when None.
+        
+        A position's own "implied_volatility" detail takes precedence over
+        both the volatilities argument and the surfaces.
+        """
+        use_surfaces = volatilities is None
+        book = arrays_from_positions(
+            options, spot_prices, 0.0 if use_surfaces else volatilities,
+            risk_free_rate, dividend_yields, valuation_date
+        )
+        if use_surfaces:
+            surface = self.volatility_surfaces.lookup(
+                book.underlyings, book.strike, book.time_to_expiry
+            )
+            overridden = np.fromiter(("implied_volatility" in p.instrument_details for p in options),
+                                     dtype=bool, count=len(options))
+            book.volatility = np.where(overridden, book.volatility, surface)
+        return book
+        
+    def build_risk_book(self,
+                        spot_prices: Union[float, Dict[str, float]],
+                        risk_free_rate: Union[float, Dict[str, float]],
+                        volatilities: Optional[Union[float, Dict[str, float]]] = None,
+                        dividend_yields: Union[float, Dict[str, float]] = 0.0,
+                        valuation_date: Optional[datetime.date] = None) -> RiskBook:
+        """
+        Snapshot all positions into a columnar risk book.
+        
+        Args:
+            spot_prices: Spot price, or dict of spot prices by underlying (options)
+            risk_free_rate: Risk-free rate, or dict of rates by underlying (options)
+            volatilities: Volatility, dict by underlying, or None for the cached surfaces
+            dividend_yields: Dividend yield, or dict of yields by underlying
+            valuation_date: Valuation date (defaults to today)
+            
+        Returns:
+            RiskBook for scenario revaluation
+        """
+        positions = list(self.positions.values())
+        options = [p for p in positions if p.instrument_type == "option"]
+        option_book = None
+        if options:
+            option_book = self._option_arrays(options, spot_prices, volatilities, risk_free_rate,
+                                              dividend_yields, valuation_date)
+        return RiskBook.from_positions(positions, option_book)
+        
+    def calculate_simulated_var(self,
+                                spot_prices: Union[float, Dict[str, float]],
+                                risk_free_rate: Union[float, Dict[str, float]],
+                                volatilities: Optional[Union[float, Dict[str, float]]] = None,
+                                dividend_yields: Union[float, Dict[str, float]] = 0.0,
+                                factor_history: Optional[pd.DataFrame] = None,
+                                covariance: Optional[pd.DataFrame] = None,
+                                method: str = "historical",
+                                confidence_level: float = 0.95,
+                                time_horizon: int = 1,
+                                num_scenarios: int = 10000,
+                                seed: Optional[int] = None,
+                                max_workers: int = 1,
+                                valuation_date: Optional[datetime.date] = None) -> Dict[str, Any]:
+        """
+        Calculate full-revaluation VaR and ES with component and marginal VaR.
+        
+        Risk factors are named "spot:<underlying>", "vol:<underlying>" and
+        "rate:<currency>" (see risk_engine). Historical scenarios come from
+        factor_history levels; Monte Carlo scenarios from the covariance of
+        daily factor moves, estimated from factor_history when not given.
+        
+        Args:
+            spot_prices: Spot price, or dict of spot prices by underlying (options)
+            risk_free_rate: Risk-free rate, or dict of rates by underlying (options)
+            volatilities: Volatility, dict by underlying, or None for the cached surfaces
+            dividend_yields: Dividend yield, or dict of yields by underlying
+            factor_history: Factor levels, one row per date and one column per factor
+            covariance: Covariance of daily factor moves (Monte Carlo)
+            method: "historical" or "monte_carlo"
+            confidence_level: Confidence level (e.g., 0.95, 0.99)
+            time_horizon: Time horizon in days
+            num_scenarios: Number of Monte Carlo scenarios
+            seed: Random seed for Monte Carlo
+            max_workers: Worker processes for scenario chunks
+            valuation_date: Valuation date (defaults to today)
+            
+        Returns:
+            Dictionary with VaR details
+        """
+        if method == "historical":
+            if factor_history is None:
+                raise ValueError("Historical VaR needs factor_history")
+            scenarios = ScenarioSet.historical(factor_history, time_horizon)
+        elif method == "monte_carlo":
+            if covariance is None:
+                if factor_history is None:
+                    raise ValueError("Monte Carlo VaR needs covariance or factor_history")
+                covariance = factor_changes(factor_history).cov()
+            scenarios = ScenarioSet.monte_carlo(list(covariance.columns), covariance, num_scenarios,
+                                                time_horizon, seed)
+        else:
+            raise ValueError(f"Unknown VaR method: {method}")
+            
+        book = self.build_risk_book(spot_prices, risk_free_rate, volatilities, dividend_yields, valuation_date)
+        engine = ScenarioRiskEngine(max_workers=max_workers)
+        return engine.value_at_risk(book, scenarios, confidence_level)
+        
     def calculate_aggregate_risk_metrics(self) -> Dict[str, Decimal]:
         """
         Calculate aggregate risk metrics for the portfolio.
@@ -569,6 +731,61 @@ class DerivativesRiskManager:
             "run_at": datetime.datetime.now().isoformat()
         }
         
+    def run_stress_grid(self,
+                        scenarios: Union[ScenarioSet, Dict[str, Dict[str, float]]],
+                        spot_prices: Union[float, Dict[str, float]],
+                        risk_free_rate: Union[float, Dict[str, float]],
+                        volatilities: Optional[Union[float, Dict[str, float]]] = None,
+                        dividend_yields: Union[float, Dict[str, float]] = 0.0,
+                        approximate: bool = False,
+                        group_by: str = "underlying",
+                        keep_positions: bool = False,
+                        max_workers: int = 1,
+                        top_n: int = 10,
+                        valuation_date: Optional[datetime.date] = None) -> Dict[str, Any]:
+        """
+        Run a batch of stress scenarios over all positions at once.
+        
+        Scenarios use risk factor names ("spot:<underlying>", "vol:<underlying>",
+        "rate:<currency>"); build shock grids with ScenarioSet.grid or pass
+        named scenarios as {name: {factor: move}}.
+        
+        Args:
+            scenarios: ScenarioSet, or dict of named factor moves
+            spot_prices: Spot price, or dict of spot prices by underlying (options)
+            risk_free_rate: Risk-free rate, or dict of rates by underlying (options)
+            volatilities: Volatility, dict by underlying, or None for the cached surfaces
+            dividend_yields: Dividend yield, or dict of yields by underlying
+            approximate: Delta-gamma-vega instead of full revaluation for options
+            group_by: Position attribute for the result cube columns
+                      ("underlying", "instrument_type", "counterparty" or "position_id")
+            keep_positions: Keep the scenario x position P&L matrix
+            max_workers: Worker processes for scenario chunks
+            top_n: Length of the worst-case rankings
+            valuation_date: Valuation date (defaults to today)
+            
+        Returns:
+            Dictionary with the result cube and worst-case rankings
+        """
+        if not isinstance(scenarios, ScenarioSet):
+            scenarios = ScenarioSet.named(scenarios)
+            
+        book = self.build_risk_book(spot_prices, risk_free_rate, volatilities, dividend_yields, valuation_date)
+        labels = [getattr(self.positions[position_id], group_by) or "unknown" for position_id in book.ids]
+        
+        engine = ScenarioRiskEngine(max_workers=max_workers)
+        grid = engine.stress_grid(book, scenarios, approximate, labels, keep_positions)
+        
+        return {
+            "method": grid.method,
+            "num_scenarios": len(grid.scenario_names),
+            "base_portfolio_value": grid.base_value,
+            "cube": grid,
+            "worst_scenarios": grid.worst_scenarios(top_n),
+            "worst_positions": grid.worst_positions(top_n),
+            "run_at": datetime.datetime.now().isoformat()
+        }
+        
     def _calculate_stressed_position_value(self,
                                          position: DerivativePosition,
                                          market_moves: Dict[str, Dict[str, float]]) -> float:
@@ -14,6 +14,8 @@ import logging
 import uuid
 import numpy as np
 
+from treasury.derivatives.futures_margin import FuturesMarginEngine, SpanParameters
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -158,22 +160,35 @@ class FuturesManager:
     futures contracts and positions.
     """
     
-    def __init__(self):
-        """Initialize the futures manager."""
+    def __init__(self, margin_engine: Optional[FuturesMarginEngine] = None):
+        """
+        Initialize the futures manager.
+        
+        Positions are also aggregated by contract in the margin engine, which
+        holds the current price of each contract; position objects pick up
+        price moves when they are next read through this manager.
+        
+        Args:
+            margin_engine: Margin engine (a new one if not provided)
+        """
         self.contracts: Dict[str, FuturesContract] = {}
         self.positions: Dict[str, FuturesPosition] = {}
         self.margin_calls: Dict[str, MarginCall] = {}
         self.trades: List[Dict] = []
+        self.margin_engine = margin_engine or FuturesMarginEngine()
+        self.margin_engine.subscribe(self._on_margin_call)
         
-    def add_contract(self, contract: FuturesContract) -> None:
+    def add_contract(self, contract: FuturesContract, span_parameters: Optional[SpanParameters] = None) -> None:
         """
         Add a futures contract.
         
         Args:
             contract: Futures contract
+            span_parameters: Exchange margin parameters (optional)
         """
         key = contract.contract_code
         self.contracts[key] = contract
+        self.margin_engine.add_contract(contract, span_parameters)
         logger.info(f"Added futures contract {key} expiring on {contract.expiry_date}")
         
     def get_contract(self, contract_code: str) -> Optional[FuturesContract]:
@@ -196,6 +211,7 @@ class FuturesManager:
             position: Futures position
         """
         self.positions[position.id] = position
+        self.margin_engine.add_position(position)
         
         # Record trade in history
         self.trades.append({
@@ -221,7 +237,31 @@ class FuturesManager:
         Returns:
             Futures position if found, None otherwise
         """
-        return self.positions.get(position_id)
+        position = self.positions.get(position_id)
+        if position is not None:
+            self._sync_position(position)
+        return position
+    
+    def _sync_position(self, position: FuturesPosition) -> None:
+        """
+        Bring a position up to its contract's current price.
+        
+        The variation margin accrued since the position was last synced
+        follows from the price it was last marked at.
+        
+        Args:
+            position: Futures position
+        """
+        price = self.margin_engine.price(position.contract.contract_code)
+        if price != position.current_price:
+            price_diff = price - position.current_price
+            position.variation_margin += position.quantity * position.contract.contract_size * price_diff
+            position.update_price(price)
+    
+    def _sync_positions(self) -> None:
+        """Bring every position up to its contract's current price."""
+        for position in self.positions.values():
+            self._sync_position(position)
         
     def close_position(self, position_id: str, exit_price: Decimal) -> Optional[Decimal]:
         """
@@ -258,6 +298,7 @@ class FuturesManager:
         })
         
         # Remove position
+        self.margin_engine.remove_position(position, exit_price)
         del self.positions[position_id]
         
         logger.info(f"Closed position {position_id} at {exit_price}, " +
@@ -269,6 +310,9 @@ class FuturesManager:
         """
         Update the current price of a position.
         
+        The price is the market price of the position's contract, so every
+        position in that contract is marked to it.
+        
         Args:
             position_id: Position ID
             price: Current market price
@@ -282,15 +326,46 @@ class FuturesManager:
             logger.warning(f"Position {position_id} not found")
             return None
             
-        old_pnl = position.unrealized_pnl
-        position.update_price(price)
-        new_pnl = position.unrealized_pnl
+        self.update_contract_price(position.contract.contract_code, price)
+        self._sync_position(position)
         
-        # Calculate variation margin
-        pnl_change = new_pnl - old_pnl
-        position.variation_margin += pnl_change
+        return position.unrealized_pnl
         
-        return new_pnl
+    def update_contract_price(self, contract_code: str, price: Decimal) -> Decimal:
+        """
+        Mark every position in a contract to a new price.
+        
+        P&L and variation margin move once for the contract's net quantity,
+        and a margin call is raised if equity drops below maintenance.
+        
+        Args:
+            contract_code: Contract code
+            price: Current market price
+            
+        Returns:
+            Change in the contract's unrealized P&L
+        """
+        return self.margin_engine.update_price(contract_code, price)
+        
+    def _on_margin_call(self, event: Dict) -> None:
+        """
+        Record a portfolio margin call raised by the margin engine.
+        
+        Args:
+            event: Margin call event
+        """
+        call = MarginCall(
+            id=str(uuid.uuid4()),
+            position_id=event["account_id"],
+            call_date=event["timestamp"].date(),
+            call_type=MarginType.MAINTENANCE,
+            amount=event["amount"],
+            due_date=self._get_next_business_day(event["timestamp"].date()),
+            notes=(f"Equity {event['equity']} below maintenance requirement "
+                   f"{event['maintenance_requirement']}")
+        )
+        self.margin_calls[call.id] = call
+        logger.info(f"Registered portfolio margin call for {call.amount}")
         
     def register_margin_call(self, 
                            position_id: str,
@@ -340,6 +415,9 @@ class FuturesManager:
         """
         Mark a margin call as satisfied.
         
+        The amount paid to meet a variation call or a portfolio call is
+        posted to the account as collateral.
+        
         Args:
             call_id: Margin call ID
             
@@ -354,11 +432,9 @@ class FuturesManager:
         call.is_satisfied = True
         call.satisfied_date = datetime.date.today()
         
-        # Update position's variation margin if applicable
-        if call.call_type == MarginType.VARIATION:
-            position = self.get_position(call.position_id)
-            if position:
-                position.variation_margin = Decimal("0")  # Reset variation margin
+        # The payment meeting a variation or portfolio call is credited to the account
+        if call.call_type == MarginType.VARIATION or call.position_id == self.margin_engine.account_id:
+            self.margin_engine.post_collateral(call.amount)
                 
         logger.info(f"Satisfied margin call {call_id}")
         
@@ -371,6 +447,7 @@ class FuturesManager:
         Returns:
             List of open positions
         """
+        self._sync_positions()
         return list(self.positions.values())
         
     def get_open_positions_by_type(self, futures_type: FuturesType) -> List[FuturesPosition]:
@@ -383,8 +460,11 @@ class FuturesManager:
         Returns:
             List of matching positions
         """
-        return [p for p in self.positions.values() 
-                if p.contract.futures_type == futures_type]
+        positions = [p for p in self.positions.values() 
+                     if p.contract.futures_type == futures_type]
+        for position in positions:
+            self._sync_position(position)
+        return positions
         
     def get_open_margin_calls(self) -> List[MarginCall]:
         """
@@ -413,7 +493,8 @@ class FuturesManager:
         Calculate total margin requirements for the portfolio.
         
         Returns:
-            Dictionary with margin totals by type
+            Dictionary with margin totals by type, plus the SPAN-style
+            maintenance and initial requirements
         """
         totals = {
             "initial": Decimal("0"),
@@ -421,14 +502,29 @@ class FuturesManager:
             "total": Decimal("0")
         }
         
-        for position in self.positions.values():
-            totals["initial"] += position.initial_margin
-            totals["variation"] += position.variation_margin
+        for contract_totals in self.margin_engine.contract_totals():
+            totals["initial"] += contract_totals["initial_margin"]
+            totals["variation"] += contract_totals["variation_margin"]
             
         totals["total"] = totals["initial"] + totals["variation"]
         
+        span = self.margin_engine.span_margin()
+        totals["span_maintenance"] = span["maintenance_requirement"]
+        totals["span_initial"] = span["initial_requirement"]
+        totals["equity"] = span["equity"]
+        
         return totals
         
+    def calculate_span_margin(self) -> Dict[str, any]:
+        """
+        Calculate the SPAN-style portfolio margin.
+        
+        Returns:
+            Dictionary with scan risk and intra-commodity spread charges per
+            combined commodity and the portfolio requirements
+        """
+        return self.margin_engine.span_margin()
+        
     def calculate_portfolio_value(self) -> Dict[str, Union[Decimal, float]]:
         """
         Calculate total portfolio value and metrics.
@@ -444,14 +540,11 @@ class FuturesManager:
             "short_value": Decimal("0")
         }
         
-        for position in self.positions.values():
-            totals["notional_value"] += position.notional_value
-            totals["unrealized_pnl"] += position.unrealized_pnl
-            
-            if position.quantity > 0:
-                totals["long_value"] += position.notional_value
-            else:
-                totals["short_value"] += position.notional_value
+        for contract_totals in self.margin_engine.contract_totals():
+            totals["notional_value"] += contract_totals["notional_value"]
+            totals["unrealized_pnl"] += contract_totals["unrealized_pnl"]
+            totals["long_value"] += contract_totals["long_value"]
+            totals["short_value"] += contract_totals["short_value"]
                 
         return totals
         
@@ -464,9 +557,9 @@ class FuturesManager:
         """
         exposures = {}
         
-        for position in self.positions.values():
-            futures_type = position.contract.futures_type.value
-            contract_code = position.contract.contract_code
+        for contract_totals in self.margin_engine.contract_totals():
+            contract = contract_totals["contract"]
+            futures_type = contract.futures_type.value
             
             if futures_type not in exposures:
                 exposures[futures_type] = {
@@ -477,21 +570,13 @@ class FuturesManager:
                 }
                 
             exposure = exposures[futures_type]
-            exposure["notional_value"] += position.notional_value
-            
-            if position.quantity > 0:
-                exposure["long_value"] += position.notional_value
-            else:
-                exposure["short_value"] += position.notional_value
-                
-            if contract_code not in exposure["contracts"]:
-                exposure["contracts"][contract_code] = {
-                    "notional_value": Decimal("0"),
-                    "quantity": 0
-                }
-                
-            exposure["contracts"][contract_code]["notional_value"] += position.notional_value
-            exposure["contracts"][contract_code]["quantity"] += position.quantity
+            exposure["notional_value"] += contract_totals["notional_value"]
+            exposure["long_value"] += contract_totals["long_value"]
+            exposure["short_value"] += contract_totals["short_value"]
+            exposure["contracts"][contract.contract_code] = {
+                "notional_value": contract_totals["notional_value"],
+                "quantity": contract_totals["quantity"]
+            }
             
         return exposures
         
@@ -505,6 +590,7 @@ class FuturesManager:
         Returns:
             Dictionary with risk metrics
         """
+        self._sync_positions()
         base_value = sum(float(p.notional_value) for p in self.positions.values())
         new_value = 0.0
         
@@ -562,6 +648,7 @@ class FuturesManager:
             Dictionary with hedge recommendations
         """
         # Calculate current exposures
+        self._sync_positions()
         current_exposure = {}
         for position in self.positions.values():
             futures_type = position.contract.futures_type
@@ -0,0 +1,418 @@
+"""
+Futures margining module for treasury operations.
+
+This module keeps a futures book aggregated by contract rather than by
+position and margins it SPAN-style: every contract carries a risk array of
+losses under a fixed set of price scenarios, the scan risk of each combined
+commodity is the worst scenario of its net risk arrays, and calendar spreads
+inside a combined commodity attract an intra-commodity charge. Price ticks
+and position changes update the aggregates incrementally, and a margin call
+is raised as an event the moment equity falls below the maintenance level.
+"""
+
+import datetime
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from decimal import Decimal
+import logging
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Standard 16 SPAN scenarios as fractions of the price scan range. Each move
+# appears twice (volatility up / down), which coincide for futures; the last
+# two are extreme moves of three scan ranges, covered at a fraction.
+SPAN_PRICE_FRACTIONS = np.array([0, 0, 1/3, 1/3, -1/3, -1/3, 2/3, 2/3, -2/3, -2/3, 1, 1, -1, -1, 3, -3])
+EXTREME_MOVE_COVERAGE = 0.35
+
+MarginCallListener = Callable[[Dict[str, Any]], None]
+
+
+def _to_decimal(value: float) -> Decimal:
+    return Decimal(str(round(float(value), 2)))
+
+
+@dataclass(frozen=True)
+class SpanParameters:
+    """Exchange margin parameters of a futures contract."""
+
+    price_scan_range: Decimal            # Price move covered by the scan, in price points
+    intra_spread_charge: Decimal = Decimal("0")  # Charge per calendar spread
+    combined_commodity: Optional[str] = None     # Defaults to the contract ticker
+
+
+class FuturesMarginEngine:
+    """
+    Columnar futures book with SPAN-style portfolio margin.
+
+    Per contract it holds long and short quantities, cost basis, price,
+    accumulated variation margin and posted initial margin. The scenario
+    losses of each combined commodity are kept as running sums, so a
+    position change costs one risk-array row and a price tick costs a few
+    scalar updates regardless of how many positions share the contract.
+    """
+
+    def __init__(self,
+                 account_id: str = "PORTFOLIO",
+                 initial_to_maintenance: Decimal = Decimal("1.1")):
+        """
+        Initialize the margin engine.
+
+        Args:
+            account_id: Identifier used on margin call events
+            initial_to_maintenance: Initial requirement as a multiple of maintenance
+        """
+        self.account_id = account_id
+        self.initial_to_maintenance = initial_to_maintenance
+        self.collateral = Decimal("0")
+        self._listeners: List[MarginCallListener] = []
+        self._call_outstanding = False
+
+        # Contract columns
+        self.contract_codes: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._contracts: List["FuturesContract"] = []
+        self._parameters: List[Optional[SpanParameters]] = []
+        self._price: List[Decimal] = []
+        self._cost: List[Decimal] = []       # sum of quantity * size * entry price
+        self._variation: List[Decimal] = []
+        self._initial: List[Decimal] = []
+        self._position_count: List[int] = []
+        self._long = np.zeros(0, dtype=np.int64)
+        self._short = np.zeros(0, dtype=np.int64)
+        self._group = np.zeros(0, dtype=np.int64)
+        self._risk_array = np.zeros((0, SPAN_PRICE_FRACTIONS.size))
+
+        # Combined commodity running sums
+        self.groups: List[str] = []
+        self._group_index: Dict[str, int] = {}
+        self._group_loss = np.zeros((0, SPAN_PRICE_FRACTIONS.size))
+        self._group_long = np.zeros(0)
+        self._group_short = np.zeros(0)
+        self._spread_charge = np.zeros(0)
+
+        # Book totals
+        self._total_initial = Decimal("0")
+        self._total_variation = Decimal("0")
+        self._maintenance: Optional[Decimal] = None
+
+    def subscribe(self, listener: MarginCallListener) -> None:
+        """
+        Register a callback for margin call events.
+
+        Args:
+            listener: Called with the margin call event dictionary
+        """
+        self._listeners.append(listener)
+
+    def add_contract(self, contract: "FuturesContract", parameters: Optional[SpanParameters] = None) -> None:
+        """
+        Register a contract (or replace its margin parameters).
+
+        Args:
+            contract: Futures contract
+            parameters: SPAN parameters (no scan risk if None)
+        """
+        code = contract.contract_code
+        if code not in self._index:
+            self._index[code] = len(self.contract_codes)
+            self.contract_codes.append(code)
+            self._contracts.append(contract)
+            self._parameters.append(None)
+            self._price.append(Decimal("0"))
+            self._cost.append(Decimal("0"))
+            self._variation.append(Decimal("0"))
+            self._initial.append(Decimal("0"))
+            self._position_count.append(0)
+            self._long = np.append(self._long, 0)
+            self._short = np.append(self._short, 0)
+            self._group = np.append(self._group, self._group_for(contract.ticker))
+            self._risk_array = np.vstack([self._risk_array, np.zeros(SPAN_PRICE_FRACTIONS.size)])
+
+        if parameters is not None:
+            self.set_parameters(code, parameters)
+
+    def set_parameters(self, contract_code: str, parameters: SpanParameters) -> None:
+        """
+        Set the SPAN parameters of a contract and rebuild its risk array.
+
+        Args:
+            contract_code: Contract code
+            parameters: SPAN parameters
+        """
+        c = self._index[contract_code]
+        contract = self._contracts[c]
+        old_group = int(self._group[c])
+        new_group = self._group_for(parameters.combined_commodity or contract.ticker)
+
+        self._parameters[c] = parameters
+        self._group[c] = new_group
+        self._spread_charge[new_group] = float(parameters.intra_spread_charge)
+
+        weights = np.where(np.abs(SPAN_PRICE_FRACTIONS) > 1, EXTREME_MOVE_COVERAGE, 1.0)
+        self._risk_array[c] = -SPAN_PRICE_FRACTIONS * float(parameters.price_scan_range) * contract.contract_size * weights
+
+        for group in {old_group, new_group}:
+            self._rebuild_group(group)
+        self._maintenance = None
+
+    def _group_for(self, name: str) -> int:
+        if name not in self._group_index:
+            self._group_index[name] = len(self.groups)
+            self.groups.append(name)
+            self._group_loss = np.vstack([self._group_loss, np.zeros(SPAN_PRICE_FRACTIONS.size)])
+            self._group_long = np.append(self._group_long, 0.0)
+            self._group_short = np.append(self._group_short, 0.0)
+            self._spread_charge = np.append(self._spread_charge, 0.0)
+        return self._group_index[name]
+
+    def _rebuild_group(self, group: int) -> None:
+        members = self._group == group
+        net = (self._long - self._short)[members]
+        self._group_loss[group] = net @ self._risk_array[members]
+        self._group_long[group] = np.clip(net, 0, None).sum()
+        self._group_short[group] = np.clip(-net, 0, None).sum()
+
+    def _change_quantity(self, c: int, long_change: int, short_change: int) -> None:
+        """Move a contract's quantities and its group's running sums."""
+        old_net = int(self._long[c] - self._short[c])
+        self._long[c] += long_change
+        self._short[c] += short_change
+        new_net = int(self._long[c] - self._short[c])
+
+        g = self._group[c]
+        self._group_loss[g] += (new_net - old_net) * self._risk_array[c]
+        self._group_long[g] += max(new_net, 0) - max(old_net, 0)
+        self._group_short[g] += max(-new_net, 0) - max(-old_net, 0)
+        self._maintenance = None
+
+    def add_position(self, position: "FuturesPosition") -> None:
+        """
+        Add a position to its contract's aggregates.
+
+        Args:
+            position: Futures position
+        """
+        contract = position.contract
+        if contract.contract_code not in self._index:
+            self.add_contract(contract)
+        c = self._index[contract.contract_code]
+
+        # A position marked at another price accrues variation margin up to
+        # the contract price, as it will when the position object is synced
+        variation = position.variation_margin
+        if self._position_count[c] == 0:
+            self._price[c] = position.current_price
+        else:
+            variation += position.quantity * contract.contract_size * (self._price[c] - position.current_price)
+        self._position_count[c] += 1
+        self._cost[c] += position.quantity * contract.contract_size * position.average_entry_price
+        self._variation[c] += variation
+        self._initial[c] += position.initial_margin
+        self._total_variation += variation
+        self._total_initial += position.initial_margin
+        self._change_quantity(c, max(position.quantity, 0), max(-position.quantity, 0))
+        self.check_margin(contract.contract_code)
+
+    def remove_position(self, position: "FuturesPosition", exit_price: Optional[Decimal] = None) -> Decimal:
+        """
+        Remove a position from its contract's aggregates.
+
+        The position's variation margin is realized: together with the
+        initial margin it had posted, it moves into the account collateral,
+        so closing a position does not change equity beyond the move from
+        the last mark to the exit price.
+
+        Args:
+            position: Futures position (with variation margin brought up to date)
+            exit_price: Price the position is closed at (its current price if None)
+
+        Returns:
+            Realized variation margin
+        """
+        contract = position.contract
+        c = self._index[contract.contract_code]
+
+        realized = position.variation_margin
+        if exit_price is not None:
+            realized += position.quantity * contract.contract_size * (exit_price - position.current_price)
+        self.collateral += realized + position.initial_margin
+
+        self._position_count[c] -= 1
+        self._cost[c] -= position.quantity * contract.contract_size * position.average_entry_price
+        self._variation[c] -= position.variation_margin
+        self._initial[c] -= position.initial_margin
+        self._total_variation -= position.variation_margin
+        self._total_initial -= position.initial_margin
+        self._change_quantity(c, -max(position.quantity, 0), -max(-position.quantity, 0))
+        self.check_margin(contract.contract_code)
+        return realized
+
+    def price(self, contract_code: str) -> Decimal:
+        """Get the current price of a contract."""
+        return self._price[self._index[contract_code]]
+
+    def update_price(self, contract_code: str, price: Decimal) -> Decimal:
+        """
+        Apply a price tick to every position in a contract at once.
+
+        Args:
+            contract_code: Contract code
+            price: New market price
+
+        Returns:
+            Change in the contract's unrealized P&L (and variation margin)
+        """
+        c = self._index[contract_code]
+        net = int(self._long[c] - self._short[c])
+        change = net * self._contracts[c].contract_size * (price - self._price[c])
+
+        self._price[c] = price
+        self._variation[c] += change
+        self._total_variation += change
+        self.check_margin(contract_code)
+        return change
+
+    def adjust_variation(self, contract_code: str, amount: Decimal) -> None:
+        """
+        Adjust a contract's accumulated variation margin (e.g., once it is paid).
+
+        Args:
+            contract_code: Contract code
+            amount: Amount added to the variation margin
+        """
+        self._variation[self._index[contract_code]] += amount
+        self._total_variation += amount
+        self.check_margin(contract_code)
+
+    def post_collateral(self, amount: Decimal) -> None:
+        """
+        Record collateral posted to (or, if negative, withdrawn from) the account.
+
+        Args:
+            amount: Collateral amount
+        """
+        self.collateral += amount
+        self._call_outstanding = False
+        self.check_margin()
+
+    @property
+    def equity(self) -> Decimal:
+        """Account equity: posted initial margin, variation margin and extra collateral."""
+        return self._total_initial + self._total_variation + self.collateral
+
+    def maintenance_requirement(self) -> Decimal:
+        """Portfolio maintenance margin (cached until positions or parameters change)."""
+        if self._maintenance is None:
+            scan = np.clip(self._group_loss.max(axis=1, initial=0.0), 0.0, None)
+            spreads = np.minimum(self._group_long, self._group_short) * self._spread_charge
+            self._maintenance = _to_decimal((scan + spreads).sum())
+        return self._maintenance
+
+    def span_margin(self) -> Dict[str, Any]:
+        """
+        Calculate the SPAN-style portfolio margin.
+
+        Returns:
+            Dictionary with scan risk and intra-commodity charges per combined
+            commodity, the worst scenario of each, and maintenance and
+            initial requirements
+        """
+        scan = np.clip(self._group_loss.max(axis=1, initial=0.0), 0.0, None)
+        spreads = np.minimum(self._group_long, self._group_short)
+        charges = spreads * self._spread_charge
+        worst = self._group_loss.argmax(axis=1) if self.groups else np.zeros(0, dtype=np.int64)
+
+        maintenance = self.maintenance_requirement()
+        return {
+            "combined_commodities": {
+                name: {
+                    "scan_risk": _to_decimal(scan[g]),
+                    "worst_scenario": int(worst[g]),
+                    "calendar_spreads": int(spreads[g]),
+                    "intra_commodity_charge": _to_decimal(charges[g]),
+                    "requirement": _to_decimal(scan[g] + charges[g])
+                }
+                for g, name in enumerate(self.groups)
+                if self._group_long[g] or self._group_short[g]
+            },
+            "maintenance_requirement": maintenance,
+            "initial_requirement": maintenance * self.initial_to_maintenance,
+            "equity": self.equity
+        }
+
+    def scenario_losses(self) -> Dict[str, np.ndarray]:
+        """
+        Get the net risk array of every combined commodity.
+
+        Returns:
+            Dictionary mapping combined commodity to its 16 scenario losses
+        """
+        return {name: self._group_loss[g].copy() for g, name in enumerate(self.groups)}
+
+    def check_margin(self, contract_code: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Raise a margin call if equity is below the maintenance requirement.
+
+        A call restores equity to the initial requirement. Only one call is
+        raised per breach; the next one can follow once collateral has been
+        posted or equity has recovered above maintenance.
+
+        Args:
+            contract_code: Contract whose update triggered the check
+
+        Returns:
+            The margin call event, or None
+        """
+        maintenance = self.maintenance_requirement()
+        equity = self.equity
+        if equity >= maintenance:
+            self._call_outstanding = False
+            return None
+        if self._call_outstanding:
+            return None
+
+        self._call_outstanding = True
+        initial = maintenance * self.initial_to_maintenance
+        event = {
+            "account_id": self.account_id,
+            "timestamp": datetime.datetime.now(),
+            "triggered_by": contract_code,
+            "equity": equity,
+            "maintenance_requirement": maintenance,
+            "initial_requirement": initial,
+            "amount": initial - equity
+        }
+        logger.warning(f"Margin call on {self.account_id}: equity {equity} below maintenance {maintenance}")
+        for listener in self._listeners:
+            listener(event)
+        return event
+
+    def contract_totals(self) -> List[Dict[str, Any]]:
+        """
+        Get the aggregates of every contract with open positions.
+
+        Returns:
+            List of per-contract dictionaries (contract, quantities, price,
+            notional and long/short values, unrealized P&L, margins)
+        """
+        totals = []
+        for c, contract in enumerate(self._contracts):
+            if self._position_count[c] == 0:
+                continue
+            price = self._price[c]
+            unit_value = contract.contract_size * price
+            long_qty, short_qty = int(self._long[c]), int(self._short[c])
+            totals.append({
+                "contract": contract,
+                "quantity": long_qty - short_qty,
+                "price": price,
+                "long_value": long_qty * unit_value,
+                "short_value": short_qty * unit_value,
+                "notional_value": (long_qty + short_qty) * unit_value,
+                "unrealized_pnl": (long_qty - short_qty) * unit_value - self._cost[c],
+                "initial_margin": self._initial[c],
+                "variation_margin": self._variation[c]
+            })
+        return totals
@@ -0,0 +1,438 @@
+"""
+Implied volatility module for treasury operations.
+
+This module solves implied volatilities for whole option chains at once and
+keeps the resulting per-underlying volatility surfaces cached for risk.
+The solver runs a vectorized Newton iteration on vega, safeguarded by a
+per-contract bracket, and hands the rare stragglers to Brent's method.
+"""
+
+import datetime
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+import logging
+import numpy as np
+from scipy.optimize import brentq
+from scipy.special import ndtr
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+# Per-contract solver outcome codes
+STATUS_CONVERGED = 0
+STATUS_NO_TIME_VALUE = 1  # Price at or below intrinsic value; volatility is not identifiable
+STATUS_ABOVE_MAXIMUM = 2  # Price above the no-arbitrage upper bound
+STATUS_NOT_CONVERGED = 3
+STATUS_EXPIRED = 4
+
+STATUS_NAMES = {
+    STATUS_CONVERGED: "converged",
+    STATUS_NO_TIME_VALUE: "no_time_value",
+    STATUS_ABOVE_MAXIMUM: "above_maximum",
+    STATUS_NOT_CONVERGED: "not_converged",
+    STATUS_EXPIRED: "expired"
+}
+
+
+def _price_and_vega(S, K, T, sigma, r, q, sign):
+    """Black-Scholes price and raw vega (per unit of volatility) only."""
+    sqrt_T = np.sqrt(T)
+    sigma_sqrt_T = sigma * sqrt_T
+    d1 = (np.log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / sigma_sqrt_T
+    d2 = d1 - sigma_sqrt_T
+    df_q = S * np.exp(-q * T)
+    df_r = K * np.exp(-r * T)
+    price = sign * (df_q * ndtr(sign * d1) - df_r * ndtr(sign * d2))
+    vega = df_q * sqrt_T * _INV_SQRT_2PI * np.exp(-0.5 * d1 * d1)
+    return price, vega
+
+
+@dataclass
+class ImpliedVolResult:
+    """Implied volatilities and per-contract diagnostics for a chain."""
+
+    volatility: np.ndarray  # NaN where no volatility could be implied
+    status: np.ndarray  # STATUS_* codes
+    iterations: np.ndarray  # Newton iterations used
+    used_fallback: np.ndarray  # True where Brent's method finished the solve
+    price_error: np.ndarray  # Model price minus target at the solution
+
+    @property
+    def converged(self) -> np.ndarray:
+        """Mask of contracts with a converged volatility."""
+        return self.status == STATUS_CONVERGED
+
+    def summary(self) -> Dict[str, int]:
+        """Count contracts per outcome."""
+        codes, counts = np.unique(self.status, return_counts=True)
+        summary = {STATUS_NAMES[int(code)]: int(count) for code, count in zip(codes, counts)}
+        summary["fallback"] = int(self.used_fallback.sum())
+        return summary
+
+
+class ImpliedVolatilitySolver:
+    """
+    Vectorized implied volatility solver.
+
+    Every contract starts from a Corrado-Miller rational approximation and
+    carries a [low, high] bracket that tightens as Newton steps reveal
+    whether the model price is above or below the target. A Newton step
+    that would leave the bracket, or that has no usable vega, is replaced
+    by bisection, so each iteration is one price-and-vega evaluation over
+    the still-active contracts only.
+    """
+
+    def __init__(self,
+                 tolerance: float = 1e-8,
+                 max_iterations: int = 50,
+                 min_volatility: float = 1e-4,
+                 max_volatility: float = 5.0):
+        """
+        Initialize the solver.
+
+        Args:
+            tolerance: Absolute price tolerance (per unit of underlying)
+            max_iterations: Maximum Newton iterations before Brent fallback
+            min_volatility: Lower end of the search bracket
+            max_volatility: Upper end of the search bracket
+        """
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.min_volatility = min_volatility
+        self.max_volatility = max_volatility
+
+    def solve(self,
+              prices: np.ndarray,
+              spot: Union[float, np.ndarray],
+              strike: np.ndarray,
+              time_to_expiry: Union[float, np.ndarray],
+              risk_free_rate: Union[float, np.ndarray],
+              dividend_yield: Union[float, np.ndarray],
+              is_call: Union[bool, np.ndarray]) -> ImpliedVolResult:
+        """
+        Solve implied volatilities for a chain.
+
+        Args:
+            prices: Option prices per unit of underlying (not per contract)
+            spot: Underlying price(s)
+            strike: Strike prices
+            time_to_expiry: Years to expiry
+            risk_free_rate: Risk-free rate(s)
+            dividend_yield: Dividend yield(s)
+            is_call: True for calls, False for puts
+
+        Returns:
+            ImpliedVolResult with volatilities and diagnostics
+        """
+        target, S, K, T, r, q, call = np.broadcast_arrays(
+            np.asarray(prices, dtype=np.float64), np.asarray(spot, dtype=np.float64),
+            np.asarray(strike, dtype=np.float64), np.asarray(time_to_expiry, dtype=np.float64),
+            np.asarray(risk_free_rate, dtype=np.float64), np.asarray(dividend_yield, dtype=np.float64),
+            np.asarray(is_call, dtype=bool)
+        )
+        n = target.shape[0] if target.ndim else 1
+        target, S, K, T, r, q, call = (a.reshape(n).copy() for a in (target, S, K, T, r, q, call))
+        sign = np.where(call, 1.0, -1.0)
+
+        vol = np.full(n, np.nan)
+        status = np.full(n, STATUS_NOT_CONVERGED, dtype=np.int8)
+        iterations = np.zeros(n, dtype=np.int32)
+        used_fallback = np.zeros(n, dtype=bool)
+
+        # No-arbitrage bounds on the discounted forward
+        expired = T <= 0
+        T_safe = np.where(expired, 1.0, T)
+        fwd_spot = S * np.exp(-q * T_safe)
+        disc_strike = K * np.exp(-r * T_safe)
+        lower = np.maximum(sign * (fwd_spot - disc_strike), 0.0)
+        upper = np.where(call, fwd_spot, disc_strike)
+
+        status[expired] = STATUS_EXPIRED
+        below = ~expired & (target <= lower + self.tolerance)
+        above = ~expired & (target >= upper)
+        status[below] = STATUS_NO_TIME_VALUE
+        status[above] = STATUS_ABOVE_MAXIMUM
+        active = ~(expired | below | above)
+
+        sigma = self._initial_guess(target, fwd_spot, disc_strike, T_safe, call)
+        low = np.full(n, self.min_volatility)
+        high = np.full(n, self.max_volatility)
+
+        idx = np.flatnonzero(active)
+        for _ in range(self.max_iterations):
+            if idx.size == 0:
+                break
+            s = sigma[idx]
+            price, vega = _price_and_vega(S[idx], K[idx], T_safe[idx], s, r[idx], q[idx], sign[idx])
+            diff = price - target[idx]
+            iterations[idx] += 1
+
+            done = np.abs(diff) < self.tolerance
+            if done.any():
+                finished = idx[done]
+                vol[finished] = s[done]
+                status[finished] = STATUS_CONVERGED
+
+            # Price is increasing in volatility, so the sign of diff tightens the bracket
+            lo = np.where(diff < 0, s, low[idx])
+            hi = np.where(diff > 0, s, high[idx])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                newton = s - diff / vega
+            outside = ~np.isfinite(newton) | (newton <= lo) | (newton >= hi)
+            s_next = np.where(outside, 0.5 * (lo + hi), newton)
+
+            keep = ~done
+            idx = idx[keep]
+            low[idx] = lo[keep]
+            high[idx] = hi[keep]
+            sigma[idx] = s_next[keep]
+
+        # Brent's method within each straggler's final bracket
+        for i in idx:
+            used_fallback[i] = True
+            try:
+                vol[i] = brentq(
+                    lambda v: _price_and_vega(S[i], K[i], T_safe[i], v, r[i], q[i], sign[i])[0] - target[i],
+                    low[i], high[i], xtol=1e-12, maxiter=200
+                )
+                status[i] = STATUS_CONVERGED
+            except (ValueError, RuntimeError):
+                status[i] = STATUS_NOT_CONVERGED
+
+        price_error = np.full(n, np.nan)
+        solved = status == STATUS_CONVERGED
+        if solved.any():
+            model, _ = _price_and_vega(S[solved], K[solved], T_safe[solved], vol[solved], r[solved], q[solved], sign[solved])
+            price_error[solved] = model - target[solved]
+
+        return ImpliedVolResult(
+            volatility=vol,
+            status=status,
+            iterations=iterations,
+            used_fallback=used_fallback,
+            price_error=price_error
+        )
+
+    def _initial_guess(self, target, fwd_spot, disc_strike, T, call) -> np.ndarray:
+        """Corrado-Miller approximation, with a moneyness-based guess where it breaks down."""
+        # Work with call prices; puts map over by put-call parity
+        call_price = np.where(call, target, target + fwd_spot - disc_strike)
+        half_gap = 0.5 * (fwd_spot - disc_strike)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            radicand = (call_price - half_gap) ** 2 - (fwd_spot - disc_strike) ** 2 / np.pi
+            guess = (np.sqrt(2.0 * np.pi / T) / (fwd_spot + disc_strike)
+                     * (call_price - half_gap + np.sqrt(np.maximum(radicand, 0.0))))
+            fallback = np.sqrt(2.0 * np.abs(np.log(fwd_spot / disc_strike)) / T)
+        guess = np.where(np.isfinite(guess) & (guess > self.min_volatility), guess, fallback)
+        guess = np.where(np.isfinite(guess) & (guess > self.min_volatility), guess, 0.2)
+        return np.clip(guess, self.min_volatility * 2, self.max_volatility / 2)
+
+
+class VolatilitySurface:
+    """
+    Implied volatility surface for one underlying.
+
+    Each expiry slice interpolates volatility linearly in log-moneyness
+    (flat beyond the quoted strikes); between expiries total variance is
+    interpolated linearly in time, which keeps calendar spreads
+    arbitrage-free for well-behaved slices.
+    """
+
+    def __init__(self,
+                 underlying: str,
+                 spot: float,
+                 expiries: np.ndarray,
+                 slices: List[Tuple[np.ndarray, np.ndarray]],
+                 as_of: Optional[datetime.datetime] = None):
+        """
+        Initialize the surface.
+
+        Args:
+            underlying: Underlying identifier
+            spot: Spot price the surface was built against
+            expiries: Sorted expiry times in years, one per slice
+            slices: (log-moneyness, volatility) arrays per expiry, sorted by log-moneyness
+            as_of: Build time
+        """
+        self.underlying = underlying
+        self.spot = spot
+        self.expiries = np.asarray(expiries, dtype=np.float64)
+        self.slices = slices
+        self.as_of = as_of or datetime.datetime.now()
+
+    @classmethod
+    def from_chain(cls,
+                   underlying: str,
+                   spot: float,
+                   strikes: np.ndarray,
+                   time_to_expiry: np.ndarray,
+                   volatilities: np.ndarray,
+                   as_of: Optional[datetime.datetime] = None) -> "VolatilitySurface":
+        """
+        Build a surface from solved chain volatilities (NaNs are skipped).
+
+        Args:
+            underlying: Underlying identifier
+            spot: Spot price
+            strikes: Strike per contract
+            time_to_expiry: Years to expiry per contract
+            volatilities: Implied volatility per contract
+
+        Returns:
+            VolatilitySurface
+        """
+        strikes = np.asarray(strikes, dtype=np.float64)
+        T = np.asarray(time_to_expiry, dtype=np.float64)
+        vols = np.asarray(volatilities, dtype=np.float64)
+        valid = np.isfinite(vols) & (T > 0)
+        if not valid.any():
+            raise ValueError(f"No valid implied volatilities for {underlying}")
+
+        strikes, T, vols = strikes[valid], T[valid], vols[valid]
+        expiries, inverse = np.unique(T, return_inverse=True)
+        slices = []
+        for e in range(len(expiries)):
+            in_slice = inverse == e
+            moneyness = np.log(strikes[in_slice] / spot)
+            order = np.argsort(moneyness)
+            # Average duplicate strikes (e.g. call and put at the same strike)
+            k, first = np.unique(moneyness[order], return_index=True)
+            v = np.add.reduceat(vols[in_slice][order], first) / np.diff(np.append(first, in_slice.sum()))
+            slices.append((k, v))
+        return cls(underlying, spot, expiries, slices, as_of)
+
+    def volatility(self, strike: np.ndarray, time_to_expiry: np.ndarray) -> np.ndarray:
+        """
+        Look up volatilities for arrays of strikes and expiries.
+
+        Args:
+            strike: Strikes
+            time_to_expiry: Years to expiry
+
+        Returns:
+            Interpolated volatilities
+        """
+        strike, T = np.broadcast_arrays(np.asarray(strike, dtype=np.float64),
+                                        np.asarray(time_to_expiry, dtype=np.float64))
+        moneyness = np.log(strike / self.spot)
+        if len(self.expiries) == 1:
+            k, v = self.slices[0]
+            return np.interp(moneyness, k, v)
+
+        # Volatility of every query on every slice: (n_expiries, n_queries)
+        slice_vols = np.vstack([np.interp(moneyness, k, v) for k, v in self.slices])
+        total_var = slice_vols ** 2 * self.expiries[:, None]
+
+        T_clamped = np.clip(T, self.expiries[0], self.expiries[-1])
+        right = np.clip(np.searchsorted(self.expiries, T_clamped), 1, len(self.expiries) - 1)
+        left = right - 1
+        columns = np.arange(T.size)
+        t0, t1 = self.expiries[left], self.expiries[right]
+        w = (T_clamped - t0) / (t1 - t0)
+        var = (1 - w) * total_var[left, columns] + w * total_var[right, columns]
+        return np.sqrt(var / T_clamped)
+
+
+class VolatilitySurfaceCache:
+    """
+    Per-underlying cache of volatility surfaces.
+
+    Surfaces are rebuilt only when a new chain is calibrated; risk reads
+    them through lookup() for whole books at once.
+    """
+
+    def __init__(self, solver: Optional[ImpliedVolatilitySolver] = None, max_age: Optional[datetime.timedelta] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            solver: Implied volatility solver used for calibration
+            max_age: Surfaces older than this are treated as missing (None keeps them)
+        """
+        self.solver = solver or ImpliedVolatilitySolver()
+        self.max_age = max_age
+        self._surfaces: Dict[str, VolatilitySurface] = {}
+        self._diagnostics: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def calibrate(self,
+                  underlying: str,
+                  spot: float,
+                  strikes: np.ndarray,
+                  time_to_expiry: np.ndarray,
+                  prices: np.ndarray,
+                  is_call: np.ndarray,
+                  risk_free_rate: Union[float, np.ndarray] = 0.0,
+                  dividend_yield: Union[float, np.ndarray] = 0.0) -> ImpliedVolResult:
+        """
+        Solve a chain and replace the cached surface for its underlying.
+
+        Returns:
+            ImpliedVolResult for the chain
+        """
+        result = self.solver.solve(prices, spot, strikes, time_to_expiry, risk_free_rate, dividend_yield, is_call)
+        surface = VolatilitySurface.from_chain(underlying, spot, strikes, time_to_expiry, result.volatility)
+        diagnostics = result.summary()
+        with self._lock:
+            self._surfaces[underlying] = surface
+            self._diagnostics[underlying] = diagnostics
+        logger.info(f"Calibrated volatility surface for {underlying}: {diagnostics}")
+        return result
+
+    def put(self, surface: VolatilitySurface) -> None:
+        """Store a prebuilt surface."""
+        with self._lock:
+            self._surfaces[surface.underlying] = surface
+
+    def get(self, underlying: str) -> Optional[VolatilitySurface]:
+        """Get the surface for an underlying, or None if missing or stale."""
+        surface = self._surfaces.get(underlying)
+        if surface is None:
+            return None
+        if self.max_age is not None and datetime.datetime.now() - surface.as_of > self.max_age:
+            return None
+        return surface
+
+    def invalidate(self, underlying: Optional[str] = None) -> None:
+        """Drop one underlying's surface, or all surfaces."""
+        with self._lock:
+            if underlying is None:
+                self._surfaces.clear()
+                self._diagnostics.clear()
+            else:
+                self._surfaces.pop(underlying, None)
+                self._diagnostics.pop(underlying, None)
+
+    def lookup(self, underlyings: np.ndarray, strikes: np.ndarray, time_to_expiry: np.ndarray) -> np.ndarray:
+        """
+        Look up volatilities for a whole book.
+
+        Args:
+            underlyings: Underlying per contract
+            strikes: Strike per contract
+            time_to_expiry: Years to expiry per contract
+
+        Returns:
+            Volatility per contract
+
+        Raises:
+            KeyError: If an underlying has no (fresh) surface
+        """
+        strikes = np.asarray(strikes, dtype=np.float64)
+        T = np.asarray(time_to_expiry, dtype=np.float64)
+        names, inverse = np.unique(np.asarray(underlyings, dtype=object).astype(str), return_inverse=True)
+        vols = np.empty(len(strikes))
+        for u, name in enumerate(names):
+            surface = self.get(name)
+            if surface is None:
+                raise KeyError(f"No volatility surface for {name}")
+            members = inverse == u
+            vols[members] = surface.volatility(strikes[members], T[members])
+        return vols
+
+    def diagnostics(self) -> Dict[str, Dict[str, int]]:
+        """Get calibration diagnostics per underlying."""
+        return dict(self._diagnostics)
@@ -0,0 +1,771 @@
+"""
+Scenario risk engine module for treasury operations.
+
+This module computes full-revaluation Value at Risk and Expected Shortfall
+for a derivatives book. Positions are held in columnar arrays, scenarios are
+matrices of risk-factor moves (historical or correlated Monte Carlo), and the
+book is revalued for a whole chunk of scenarios at a time. Chunks can be fanned
+out over a process pool so large books and scenario sets fit on one machine.
+The same machinery evaluates stress grids (hundreds of shock combinations)
+by full revaluation or a delta-gamma-vega approximation.
+"""
+
+import contextlib
+import datetime
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union, Any, Callable, Iterator, Tuple
+import logging
+import numpy as np
+import pandas as pd
+
+# Local imports - assuming these modules are available
+try:
+    from treasury.derivatives.batch_pricing import OptionArrays, VectorizedBlackScholes
+except ImportError:
+    # For standalone usage during development
+    pass
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Risk factor kinds. Spot moves are relative returns; volatility and rate
+# moves are absolute changes (0.01 = one vol point / 100bp).
+FACTOR_SPOT = "spot"
+FACTOR_VOL = "vol"
+FACTOR_RATE = "rate"
+
+DEFAULT_CURRENCY = "USD"
+
+# Scenario x position cells revalued per chunk
+DEFAULT_CHUNK_CELLS = 1 << 21
+
+
+def factor_name(kind: str, key: str) -> str:
+    """Build a risk factor name such as "spot:AAPL" or "rate:USD"."""
+    return f"{kind}:{key}"
+
+
+def _is_relative(factor: str) -> bool:
+    return factor.startswith(FACTOR_SPOT + ":")
+
+
+def factor_changes(factor_history: pd.DataFrame, horizon_days: int = 1) -> pd.DataFrame:
+    """
+    Convert factor levels into horizon moves.
+
+    Args:
+        factor_history: Factor levels, one row per date and one column per factor
+        horizon_days: Horizon of each move in rows (overlapping windows)
+
+    Returns:
+        DataFrame of moves: returns for spot factors, differences otherwise
+    """
+    history = factor_history.sort_index().astype(np.float64)
+    relative = [column for column in history.columns if _is_relative(column)]
+    changes = history.diff(horizon_days)
+    if relative:
+        changes[relative] = history[relative].pct_change(horizon_days, fill_method=None)
+    return changes.iloc[horizon_days:].dropna(how="any")
+
+
+@dataclass
+class ScenarioSet:
+    """Matrix of risk-factor moves, one row per scenario."""
+
+    factors: List[str]
+    shocks: np.ndarray  # (scenarios, factors)
+    method: str
+    horizon_days: int = 1
+    names: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return self.shocks.shape[0]
+
+    @property
+    def scenario_names(self) -> List[str]:
+        return self.names if self.names is not None else [f"{self.method}_{i}" for i in range(len(self))]
+
+    @classmethod
+    def named(cls, scenarios: Dict[str, Dict[str, float]], horizon_days: int = 0) -> "ScenarioSet":
+        """
+        Build stress scenarios from named factor moves.
+
+        Args:
+            scenarios: Scenario name -> {factor name: move}
+            horizon_days: Days rolled forward (0 for instantaneous shocks)
+
+        Returns:
+            ScenarioSet with one row per named scenario
+        """
+        factors = sorted({factor for moves in scenarios.values() for factor in moves})
+        column = {factor: j for j, factor in enumerate(factors)}
+        shocks = np.zeros((len(scenarios), len(factors)))
+        for i, moves in enumerate(scenarios.values()):
+            for factor, move in moves.items():
+                shocks[i, column[factor]] = move
+        return cls(factors, shocks, "stress", horizon_days, list(scenarios))
+
+    @classmethod
+    def grid(cls, axes: Dict[str, Sequence[float]], horizon_days: int = 0) -> "ScenarioSet":
+        """
+        Build the full shock grid over several factors.
+
+        Axes may also be tuples of factor names, which move together
+        (e.g. a parallel move of every rate factor):
+
+            ScenarioSet.grid({"spot:AAPL": [-0.2, 0, 0.2],
+                              ("rate:USD", "rate:EUR"): [-0.01, 0, 0.01]})
+
+        Args:
+            axes: Factor name (or tuple of names) -> moves along that axis
+            horizon_days: Days rolled forward (0 for instantaneous shocks)
+
+        Returns:
+            ScenarioSet with one row per grid point
+        """
+        keys = [key if isinstance(key, tuple) else (key,) for key in axes]
+        levels = [np.asarray(values, dtype=np.float64) for values in axes.values()]
+        points = np.stack([g.ravel() for g in np.meshgrid(*levels, indexing="ij")], axis=1)
+
+        factors = [factor for key in keys for factor in key]
+        shocks = np.repeat(points, [len(key) for key in keys], axis=1)
+        names = [
+            ",".join(f"{'+'.join(key)}={move:+g}" for key, move in zip(keys, point))
+            for point in points
+        ]
+        return cls(factors, shocks, "stress", horizon_days, names)
+
+    @classmethod
+    def historical(cls, factor_history: pd.DataFrame, horizon_days: int = 1) -> "ScenarioSet":
+        """
+        Build historical scenarios from factor levels.
+
+        Args:
+            factor_history: Factor levels, one row per date and one column per factor
+            horizon_days: Horizon of each scenario in days
+
+        Returns:
+            ScenarioSet with one scenario per historical window
+        """
+        changes = factor_changes(factor_history, horizon_days)
+        if changes.empty:
+            raise ValueError("Factor history is too short for the requested horizon")
+        return cls(list(changes.columns), changes.to_numpy(), "historical", horizon_days)
+
+    @classmethod
+    def monte_carlo(cls,
+                    factors: Sequence[str],
+                    covariance: Union[np.ndarray, pd.DataFrame],
+                    num_scenarios: int,
+                    horizon_days: int = 1,
+                    seed: Optional[int] = None) -> "ScenarioSet":
+        """
+        Build correlated normal scenarios from a daily factor covariance.
+
+        Args:
+            factors: Factor names, in covariance order
+            covariance: Covariance of daily factor moves
+            num_scenarios: Number of scenarios
+            horizon_days: Horizon in days (square-root-of-time scaling)
+            seed: Random seed
+
+        Returns:
+            ScenarioSet of simulated moves
+        """
+        if isinstance(covariance, pd.DataFrame):
+            covariance = covariance.loc[list(factors), list(factors)].to_numpy()
+        factor_root = cholesky_factor(np.asarray(covariance, dtype=np.float64))
+
+        rng = np.random.default_rng(seed)
+        normals = rng.standard_normal((num_scenarios, len(factors)))
+        shocks = normals @ factor_root.T * math.sqrt(horizon_days)
+        return cls(list(factors), shocks, "monte_carlo", horizon_days)
+
+    def aligned(self, factors: Sequence[str]) -> np.ndarray:
+        """
+        Reorder shocks onto a list of factors.
+
+        Factors the scenarios do not cover stay unshocked. A trailing zero
+        column is appended so index -1 means "no factor".
+
+        Args:
+            factors: Target factor order
+
+        Returns:
+            Array of shape (scenarios, len(factors) + 1)
+        """
+        position = {name: i for i, name in enumerate(self.factors)}
+        out = np.zeros((len(self), len(factors) + 1))
+        for j, name in enumerate(factors):
+            i = position.get(name)
+            if i is not None:
+                out[:, j] = self.shocks[:, i]
+        return out
+
+
+def cholesky_factor(covariance: np.ndarray) -> np.ndarray:
+    """
+    Lower-triangular factor of a covariance matrix.
+
+    Estimated covariances are often slightly indefinite; those are repaired by
+    clipping negative eigenvalues before factorizing.
+
+    Args:
+        covariance: Symmetric covariance matrix
+
+    Returns:
+        Lower-triangular L with L @ L.T ~= covariance
+    """
+    covariance = 0.5 * (covariance + covariance.T)
+    try:
+        return np.linalg.cholesky(covariance)
+    except np.linalg.LinAlgError:
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        floor = max(eigenvalues.max(), 0.0) * 1e-12 + 1e-18
+        repaired = (eigenvectors * np.maximum(eigenvalues, floor)) @ eigenvectors.T
+        logger.warning("Covariance matrix not positive definite; clipped negative eigenvalues")
+        return np.linalg.cholesky(0.5 * (repaired + repaired.T))
+
+
+@dataclass
+class RiskBook:
+    """
+    Columnar derivatives book for scenario revaluation.
+
+    Options are fully revalued with Black-Scholes. Other positions are
+    linear in a single factor: their DV01 against the rate factor of their
+    currency when they have one, otherwise their delta (currency exposure)
+    against the spot factor of their underlying.
+    """
+
+    ids: List[str]
+    market_values: np.ndarray
+    factors: List[str]
+
+    options: Optional[OptionArrays]
+    option_columns: np.ndarray  # book column of each option row
+    option_factors: np.ndarray  # (options, 3) spot/vol/rate factor index, -1 for none
+    option_base_price: np.ndarray  # model price per unit at base
+
+    linear_columns: np.ndarray
+    linear_factors: np.ndarray
+    linear_exposure: np.ndarray  # P&L per unit factor move
+    option_greeks: Optional[Dict[str, np.ndarray]] = None  # position-scaled, see with_greeks
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def option_count(self) -> int:
+        return 0 if self.options is None else len(self.options)
+
+    @classmethod
+    def from_positions(cls,
+                       positions: Sequence[Any],
+                       option_book: Optional[OptionArrays] = None) -> "RiskBook":
+        """
+        Build a risk book from DerivativePositions.
+
+        Args:
+            positions: Derivative positions
+            option_book: OptionArrays for the option positions, in the order
+                         they appear in positions (required if there are any)
+
+        Returns:
+            RiskBook
+        """
+        factors: List[str] = []
+        factor_index: Dict[str, int] = {}
+
+        def index_of(name: str) -> int:
+            if name not in factor_index:
+                factor_index[name] = len(factors)
+                factors.append(name)
+            return factor_index[name]
+
+        ids = [position.position_id for position in positions]
+        market_values = np.fromiter((float(p.market_value) for p in positions), dtype=np.float64, count=len(ids))
+
+        option_columns, option_factors = [], []
+        linear_columns, linear_factors, linear_exposure = [], [], []
+
+        for column, position in enumerate(positions):
+            details = position.instrument_details
+            currency = details.get("currency") or (details.get("legs") or [{}])[0].get("currency") or DEFAULT_CURRENCY
+            underlying = position.underlying or details.get("underlying", "unknown")
+
+            if position.instrument_type == "option":
+                option_columns.append(column)
+                option_factors.append((
+                    index_of(factor_name(FACTOR_SPOT, underlying)),
+                    index_of(factor_name(FACTOR_VOL, underlying)),
+                    index_of(factor_name(FACTOR_RATE, currency))
+                ))
+                continue
+
+            dv01 = float(position.risk_metrics.get("dv01", 0))
+            delta = float(position.risk_metrics.get("delta", 0))
+            if dv01:
+                # DV01 is per basis point; rate factor moves are in decimals
+                linear_columns.append(column)
+                linear_factors.append(index_of(factor_name(FACTOR_RATE, currency)))
+                linear_exposure.append(dv01 * 10000)
+            elif delta:
+                linear_columns.append(column)
+                linear_factors.append(index_of(factor_name(FACTOR_SPOT, underlying)))
+                linear_exposure.append(delta)
+
+        if option_columns and (option_book is None or len(option_book) != len(option_columns)):
+            raise ValueError("option_book must cover every option position")
+
+        base_price = np.empty(0)
+        if option_columns:
+            base_price = VectorizedBlackScholes.price(
+                option_book.spot, option_book.strike, option_book.time_to_expiry,
+                option_book.volatility, option_book.rate, option_book.dividend_yield,
+                option_book.is_call
+            )
+
+        return cls(
+            ids=ids,
+            market_values=market_values,
+            factors=factors,
+            options=option_book if option_columns else None,
+            option_columns=np.asarray(option_columns, dtype=np.int64),
+            option_factors=np.asarray(option_factors, dtype=np.int64).reshape(-1, 3),
+            option_base_price=base_price,
+            linear_columns=np.asarray(linear_columns, dtype=np.int64),
+            linear_factors=np.asarray(linear_factors, dtype=np.int64),
+            linear_exposure=np.asarray(linear_exposure, dtype=np.float64)
+        )
+
+    def option_pnl(self, shocks: np.ndarray, horizon_days: int) -> np.ndarray:
+        """
+        Full-revaluation option P&L.
+
+        Args:
+            shocks: Aligned shocks, (scenarios, factors + 1)
+            horizon_days: Days rolled forward before revaluing
+
+        Returns:
+            Array of shape (scenarios, options)
+        """
+        book = self.options
+        spot_ix, vol_ix, rate_ix = self.option_factors.T
+        spot = book.spot * (1.0 + shocks[:, spot_ix])
+        volatility = np.maximum(book.volatility + shocks[:, vol_ix], 0.0)
+        rate = book.rate + shocks[:, rate_ix]
+        time_to_expiry = book.time_to_expiry - horizon_days / 365.0
+
+        price = VectorizedBlackScholes.price(
+            spot, book.strike, time_to_expiry, volatility, rate, book.dividend_yield, book.is_call
+        )
+        price -= self.option_base_price
+        price *= book.contract_size * book.quantity
+        return price
+
+    def with_greeks(self) -> "RiskBook":
+        """Compute base-case option Greeks (scaled by position) for approximate revaluation."""
+        if self.option_greeks is None and self.option_count:
+            self.option_greeks = VectorizedBlackScholes.price_book(self.options)
+        return self
+
+    def option_pnl_approx(self, shocks: np.ndarray, horizon_days: int) -> np.ndarray:
+        """
+        Delta-gamma-vega option P&L (plus rho and theta).
+
+        Args:
+            shocks: Aligned shocks, (scenarios, factors + 1)
+            horizon_days: Days of theta
+
+        Returns:
+            Array of shape (scenarios, options)
+        """
+        greeks = self.with_greeks().option_greeks
+        spot_ix, vol_ix, rate_ix = self.option_factors.T
+        spot_move = self.options.spot * shocks[:, spot_ix]
+        # Vega and rho are quoted per 1% move
+        return (
+            greeks["delta"] * spot_move
+            + 0.5 * greeks["gamma"] * spot_move * spot_move
+            + greeks["vega"] * (shocks[:, vol_ix] * 100.0)
+            + greeks["rho"] * (shocks[:, rate_ix] * 100.0)
+            + greeks["theta"] * horizon_days
+        )
+
+    def position_pnl(self, shocks: np.ndarray, horizon_days: int, approximate: bool = False) -> np.ndarray:
+        """
+        P&L of every position, (scenarios, positions).
+
+        Args:
+            shocks: Aligned shocks, (scenarios, factors + 1)
+            horizon_days: Horizon in days
+            approximate: Use delta-gamma-vega for options instead of full revaluation
+
+        Returns:
+            Array of shape (scenarios, positions)
+        """
+        pnl = np.zeros((shocks.shape[0], len(self)))
+        if self.option_count:
+            option_pnl = self.option_pnl_approx if approximate else self.option_pnl
+            pnl[:, self.option_columns] = option_pnl(shocks, horizon_days)
+        if self.linear_columns.size:
+            pnl[:, self.linear_columns] = self.linear_pnl(shocks)
+        return pnl
+
+    def linear_pnl(self, shocks: np.ndarray) -> np.ndarray:
+        """
+        P&L of linear positions, (scenarios, linear positions).
+
+        Args:
+            shocks: Aligned shocks, (scenarios, factors + 1)
+
+        Returns:
+            Array of shape (scenarios, linear positions)
+        """
+        return shocks[:, self.linear_factors] * self.linear_exposure
+
+
+def evaluate_chunk(book: RiskBook,
+                   shocks: np.ndarray,
+                   horizon_days: int,
+                   weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Revalue the book over a chunk of scenarios.
+
+    Without weights this returns the portfolio P&L per scenario. With a
+    (k, scenarios) weight matrix it returns weights @ position P&L, a
+    (k, positions) array, so per-position tail statistics never need the
+    full scenario x position matrix in one place.
+
+    Args:
+        book: Risk book
+        shocks: Aligned shocks for the chunk
+        horizon_days: Horizon in days
+        weights: Optional scenario weights
+
+    Returns:
+        Portfolio P&L per scenario, or weighted position P&L
+    """
+    if weights is None:
+        pnl = np.zeros(shocks.shape[0])
+        if book.option_count:
+            pnl += book.option_pnl(shocks, horizon_days).sum(axis=1)
+        if book.linear_columns.size:
+            # Linear P&L aggregates per factor before touching scenarios
+            exposure = np.bincount(book.linear_factors, weights=book.linear_exposure,
+                                   minlength=shocks.shape[1])
+            pnl += shocks @ exposure
+        return pnl
+
+    out = np.zeros((weights.shape[0], len(book)))
+    if book.option_count:
+        out[:, book.option_columns] = weights @ book.option_pnl(shocks, horizon_days)
+    if book.linear_columns.size:
+        out[:, book.linear_columns] = weights @ book.linear_pnl(shocks)
+    return out
+
+
+def stress_chunk(book: RiskBook,
+                 shocks: np.ndarray,
+                 horizon_days: int,
+                 approximate: bool,
+                 group_order: np.ndarray,
+                 group_starts: np.ndarray,
+                 keep_positions: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """
+    Evaluate a chunk of stress scenarios.
+
+    Args:
+        book: Risk book
+        shocks: Aligned shocks for the chunk
+        horizon_days: Horizon in days
+        approximate: Delta-gamma-vega instead of full revaluation for options
+        group_order: Book columns sorted by group
+        group_starts: Start offset of each group within group_order
+        keep_positions: Also return the position P&L matrix (as float32)
+
+    Returns:
+        (group P&L, worst P&L per position, chunk-local scenario of that worst,
+         position P&L or None)
+    """
+    pnl = book.position_pnl(shocks, horizon_days, approximate)
+    groups = np.add.reduceat(pnl[:, group_order], group_starts, axis=1)
+    worst_at = pnl.argmin(axis=0)
+    worst = pnl[worst_at, np.arange(pnl.shape[1])]
+    return groups, worst, worst_at, pnl.astype(np.float32) if keep_positions else None
+
+
+# Book installed once per worker process by the pool initializer
+_worker_book: Optional[RiskBook] = None
+
+
+def _install_book(book: RiskBook) -> None:
+    global _worker_book
+    _worker_book = book
+
+
+def _call_in_worker(func: Callable, *args) -> Any:
+    return func(_worker_book, *args)
+
+
+@dataclass
+class StressGridResult:
+    """
+    Result cube of a stress grid: P&L by scenario and position group.
+
+    pnl_by_group has one row per scenario and one column per group; the
+    position P&L matrix is only kept when requested.
+    """
+
+    scenario_names: List[str]
+    groups: List[str]
+    pnl_by_group: np.ndarray  # (scenarios, groups)
+    position_ids: List[str]
+    worst_position_pnl: np.ndarray  # per position, over all scenarios
+    worst_position_scenario: np.ndarray  # scenario index of that worst P&L
+    base_value: float
+    method: str
+    position_pnl: Optional[np.ndarray] = None  # (scenarios, positions), float32
+
+    @property
+    def total_pnl(self) -> np.ndarray:
+        return self.pnl_by_group.sum(axis=1)
+
+    def worst_scenarios(self, count: int = 10) -> List[Dict[str, Any]]:
+        """
+        Rank scenarios by portfolio P&L, worst first.
+
+        Args:
+            count: Number of scenarios
+
+        Returns:
+            List of scenario summaries with their worst group
+        """
+        totals = self.total_pnl
+        ranked = np.argsort(totals, kind="stable")[:count]
+        return [
+            {
+                "scenario_name": self.scenario_names[i],
+                "pnl": float(totals[i]),
+                "percent_change": (float(totals[i]) / self.base_value) * 100 if self.base_value > 0 else 0,
+                "worst_group": self.groups[int(self.pnl_by_group[i].argmin())],
+                "worst_group_pnl": float(self.pnl_by_group[i].min())
+            }
+            for i in ranked
+        ]
+
+    def worst_positions(self, count: int = 10) -> List[Dict[str, Any]]:
+        """
+        Rank positions by their worst P&L anywhere on the grid.
+
+        Args:
+            count: Number of positions
+
+        Returns:
+            List of position summaries with the scenario that hurts most
+        """
+        ranked = np.argsort(self.worst_position_pnl, kind="stable")[:count]
+        return [
+            {
+                "position_id": self.position_ids[j],
+                "pnl": float(self.worst_position_pnl[j]),
+                "scenario_name": self.scenario_names[int(self.worst_position_scenario[j])]
+            }
+            for j in ranked
+        ]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Get the cube as a DataFrame (scenarios x groups, plus a total column)."""
+        frame = pd.DataFrame(self.pnl_by_group, index=self.scenario_names, columns=self.groups)
+        frame["total"] = self.total_pnl
+        return frame
+
+
+class ScenarioRiskEngine:
+    """
+    Full-revaluation VaR/ES engine.
+
+    Component VaR is the Euler allocation estimated from the scenarios
+    around the VaR quantile (rescaled to add up to VaR); component ES is the
+    average position loss over the tail, which adds up to ES exactly.
+    Marginal VaR is component VaR per unit of position market value.
+    """
+
+    def __init__(self, max_workers: int = 1, chunk_cells: int = DEFAULT_CHUNK_CELLS):
+        """
+        Initialize the engine.
+
+        Args:
+            max_workers: Worker processes for scenario chunks (1 runs in-process)
+            chunk_cells: Scenario x option cells revalued per chunk
+        """
+        self.max_workers = max(1, max_workers)
+        self.chunk_cells = chunk_cells
+
+    def _chunks(self, book: RiskBook, num_scenarios: int) -> List[Tuple[int, int]]:
+        size = max(1, self.chunk_cells // max(book.option_count, 1))
+        if self.max_workers > 1:
+            # Keep every worker busy even when the book is small
+            size = min(size, max(1, math.ceil(num_scenarios / (self.max_workers * 4))))
+        return [(start, min(start + size, num_scenarios)) for start in range(0, num_scenarios, size)]
+
+    @contextlib.contextmanager
+    def _runner(self, book: RiskBook) -> Iterator[Callable[[Callable, List[Tuple]], List[Any]]]:
+        if self.max_workers == 1:
+            yield lambda func, tasks: [func(book, *task) for task in tasks]
+            return
+
+        with ProcessPoolExecutor(max_workers=self.max_workers,
+                                 initializer=_install_book, initargs=(book,)) as pool:
+            yield lambda func, tasks: list(pool.map(_call_in_worker, [func] * len(tasks), *zip(*tasks)))
+
+    def portfolio_pnl(self, book: RiskBook, scenarios: ScenarioSet) -> np.ndarray:
+        """
+        Portfolio P&L under every scenario.
+
+        Args:
+            book: Risk book
+            scenarios: Scenario set
+
+        Returns:
+            Array of P&L per scenario
+        """
+        shocks = scenarios.aligned(book.factors)
+        with self._runner(book) as run:
+            results = run(evaluate_chunk, [(shocks[a:b], scenarios.horizon_days, None) for a, b in self._chunks(book, len(shocks))])
+        return np.concatenate(results) if results else np.zeros(0)
+
+    def value_at_risk(self,
+                      book: RiskBook,
+                      scenarios: ScenarioSet,
+                      confidence_level: float = 0.95) -> Dict[str, Any]:
+        """
+        Calculate VaR, ES and their per-position decomposition.
+
+        Args:
+            book: Risk book
+            scenarios: Scenario set
+            confidence_level: Confidence level (e.g., 0.95, 0.99)
+
+        Returns:
+            Dictionary with VaR details; per-position arrays under "positions"
+        """
+        num_scenarios = len(scenarios)
+        if num_scenarios == 0:
+            raise ValueError("Scenario set is empty")
+
+        shocks = scenarios.aligned(book.factors)
+        horizon = scenarios.horizon_days
+
+        with self._runner(book) as run:
+            results = run(evaluate_chunk, [(shocks[a:b], horizon, None) for a, b in self._chunks(book, num_scenarios)])
+            losses = -np.concatenate(results)
+
+            var = float(np.quantile(losses, confidence_level))
+            tail = np.flatnonzero(losses >= var)
+            es = float(losses[tail].mean())
+
+            # Scenarios ranked either side of the VaR quantile estimate the Euler allocation
+            order = np.argsort(losses, kind="stable")
+            rank = min(num_scenarios - 1, max(0, math.ceil(confidence_level * num_scenarios) - 1))
+            half_width = max(1, int(num_scenarios * 0.005))
+            window = order[max(0, rank - half_width):rank + half_width + 1]
+
+            selected = np.union1d(window, tail)
+            weights = np.zeros((2, selected.size))
+            weights[0, np.searchsorted(selected, window)] = 1.0 / window.size
+            weights[1, np.searchsorted(selected, tail)] = 1.0 / tail.size
+
+            selected_shocks = shocks[selected]
+            chunks = self._chunks(book, selected.size)
+            sums = run(evaluate_chunk, [(selected_shocks[a:b], horizon, weights[:, a:b]) for a, b in chunks])
+            position_losses = -np.sum(sums, axis=0)
+
+        component_var = position_losses[0]
+        window_total = component_var.sum()
+        if window_total != 0:
+            component_var = component_var * (var / window_total)
+        component_es = position_losses[1]
+
+        # Euler allocation: component VaR = market value x marginal VaR, shorts included
+        values = book.market_values
+        marginal_var = np.divide(component_var, values, out=np.zeros_like(component_var), where=values != 0)
+
+        total_value = float(book.market_values.sum())
+        logger.info(f"{scenarios.method} VaR over {num_scenarios} scenarios x {len(book)} positions: {var:,.2f}")
+        return {
+            "var": var,
+            "expected_shortfall": es,
+            "confidence_level": confidence_level,
+            "time_horizon": horizon,
+            "method": f"{scenarios.method}_full_revaluation",
+            "num_scenarios": num_scenarios,
+            "total_portfolio_value": total_value,
+            "var_percent": (var / total_value) * 100 if total_value > 0 else 0,
+            "positions": {
+                "position_ids": book.ids,
+                "component_var": component_var,
+                "marginal_var": marginal_var,
+                "component_es": component_es
+            },
+            "calculated_at": datetime.datetime.now().isoformat()
+        }
+
+    def stress_grid(self,
+                    book: RiskBook,
+                    scenarios: ScenarioSet,
+                    approximate: bool = False,
+                    group_by: Optional[Sequence[str]] = None,
+                    keep_positions: bool = False) -> StressGridResult:
+        """
+        Evaluate every position under every stress scenario.
+
+        Args:
+            book: Risk book
+            scenarios: Stress scenarios (see ScenarioSet.grid and ScenarioSet.named)
+            approximate: Delta-gamma-vega instead of full revaluation for options
+            group_by: Group label per book position (defaults to one "portfolio" group)
+            keep_positions: Keep the (scenarios x positions) P&L matrix in the result
+
+        Returns:
+            StressGridResult cube with worst-case rankings
+        """
+        labels = np.asarray(group_by if group_by is not None else ["portfolio"] * len(book), dtype=object)
+        groups, group_index = np.unique(labels.astype(str), return_inverse=True)
+        group_order = np.argsort(group_index, kind="stable")
+        group_starts = np.searchsorted(group_index[group_order], np.arange(len(groups)))
+
+        if approximate:
+            book.with_greeks()
+        shocks = scenarios.aligned(book.factors)
+        chunks = self._chunks(book, len(shocks))
+
+        with self._runner(book) as run:
+            results = run(stress_chunk, [
+                (shocks[a:b], scenarios.horizon_days, approximate, group_order, group_starts, keep_positions)
+                for a, b in chunks
+            ])
+
+        worst = np.full(len(book), np.inf)
+        worst_at = np.zeros(len(book), dtype=np.int64)
+        for (start, _), (_, chunk_worst, chunk_at, _) in zip(chunks, results):
+            better = chunk_worst < worst
+            worst = np.where(better, chunk_worst, worst)
+            worst_at = np.where(better, chunk_at + start, worst_at)
+
+        method = "delta_gamma_vega" if approximate else "full_revaluation"
+        logger.info(f"Stress grid ({method}): {len(shocks)} scenarios x {len(book)} positions")
+        return StressGridResult(
+            scenario_names=scenarios.scenario_names,
+            groups=[str(group) for group in groups],
+            pnl_by_group=np.concatenate([r[0] for r in results]),
+            position_ids=book.ids,
+            worst_position_pnl=worst,
+            worst_position_scenario=worst_at,
+            base_value=float(book.market_values.sum()),
+            method=method,
+            position_pnl=np.concatenate([r[3] for r in results]) if keep_positions else None
+        )
@@ -9,13 +9,17 @@ cash flow calculation, and risk assessment.
 import datetime
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Union, Tuple
+from typing import Dict, List, Optional, Union, Tuple, Iterable, Sequence
 from decimal import Decimal
 import logging
 import math
 import numpy as np
 from scipy import stats
 
+from treasury.curves.discount_curve import DiscountCurve, InterpolationScheme
+from treasury.curves.curve_builder import CurveStore, CurveQuote
+from treasury.curves.curve_risk import CashFlowSchedule, DEFAULT_KEY_TENORS
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -257,6 +261,207 @@ class SwapContract:
         return sorted(future_dates)
 
 
+def _as_curve(yield_curve: Union[Dict[str, float], DiscountCurve]) -> DiscountCurve:
+    return yield_curve if isinstance(yield_curve, DiscountCurve) else DiscountCurve.from_dict(yield_curve)
+
+
+def _leg_periods(leg: SwapLeg, valuation_date: datetime.date) -> Tuple[List[datetime.date], List[datetime.date], np.ndarray]:
+    """Accrual start dates, payment dates and day count factors of a leg's future periods."""
+    starts, ends = [], []
+    previous_date = leg.start_date
+    for payment_date in leg.payment_dates:
+        if payment_date >= valuation_date:
+            starts.append(previous_date)
+            ends.append(payment_date)
+        previous_date = payment_date
+    accruals = np.fromiter(
+        (leg.calculate_day_count_factor(start, end) for start, end in zip(starts, ends)),
+        dtype=np.float64, count=len(ends)
+    )
+    return starts, ends, accruals
+
+
+def _year_fractions(dates: Sequence[datetime.date], valuation_date: datetime.date) -> np.ndarray:
+    ordinals = np.fromiter((d.toordinal() for d in dates), dtype=np.int64, count=len(dates))
+    return (ordinals - valuation_date.toordinal()) / 365.0
+
+
+@dataclass
+class SwapCashflowSchedule:
+    """
+    Future accrual periods of many swap legs, flattened into arrays.
+    
+    The schedule depends only on the contracts and the valuation date, so it
+    is built once and reused across curve and rate updates; pricing the
+    whole book is then a few array expressions and a bincount per leg.
+    """
+    
+    valuation_date: datetime.date
+    leg_keys: List[Tuple[str, int]]  # (swap id, leg index) per leg
+    leg_currencies: List[str]
+    leg_rate_names: List[str]  # reference rate of floating legs ("" for fixed)
+    leg_is_fixed: np.ndarray
+    period_leg: np.ndarray  # leg of each period
+    start_times: np.ndarray
+    end_times: np.ndarray
+    accruals: np.ndarray
+    notionals: np.ndarray
+    fixed_rates: np.ndarray  # 0 on floating legs
+    spreads: np.ndarray  # 0 on fixed legs
+    is_first: np.ndarray  # first future period of its leg
+    
+    @classmethod
+    def build(cls, swaps: Iterable[SwapContract], valuation_date: Optional[datetime.date] = None) -> "SwapCashflowSchedule":
+        """
+        Build the schedule for a set of swaps.
+        
+        Args:
+            swaps: Swap contracts
+            valuation_date: Valuation date (defaults to today)
+            
+        Returns:
+            SwapCashflowSchedule
+        """
+        valuation_date = valuation_date or datetime.date.today()
+        leg_keys, currencies, rate_names, leg_fixed = [], [], [], []
+        period_leg, starts, ends, accruals = [], [], [], []
+        notionals, fixed_rates, spreads, is_first = [], [], [], []
+        
+        for swap in swaps:
+            for leg_index, leg in enumerate(swap.legs):
+                leg_number = len(leg_keys)
+                leg_keys.append((swap.id, leg_index))
+                currencies.append(leg.currency)
+                rate_names.append("" if leg.is_fixed else str(leg.rate))
+                leg_fixed.append(leg.is_fixed)
+                
+                leg_starts, leg_ends, leg_accruals = _leg_periods(leg, valuation_date)
+                count = len(leg_ends)
+                period_leg.extend([leg_number] * count)
+                starts.extend(leg_starts)
+                ends.extend(leg_ends)
+                accruals.append(leg_accruals)
+                notionals.extend([float(leg.notional_amount)] * count)
+                fixed_rates.extend([float(leg.rate) if leg.is_fixed else 0.0] * count)
+                spreads.extend([0.0 if leg.is_fixed else float(leg.spread or 0)] * count)
+                is_first.extend([True] + [False] * (count - 1) if count else [])
+                
+        return cls(
+            valuation_date=valuation_date,
+            leg_keys=leg_keys,
+            leg_currencies=currencies,
+            leg_rate_names=rate_names,
+            leg_is_fixed=np.asarray(leg_fixed, dtype=bool),
+            period_leg=np.asarray(period_leg, dtype=np.int64),
+            start_times=_year_fractions(starts, valuation_date),
+            end_times=_year_fractions(ends, valuation_date),
+            accruals=np.concatenate(accruals) if accruals else np.zeros(0),
+            notionals=np.asarray(notionals, dtype=np.float64),
+            fixed_rates=np.asarray(fixed_rates, dtype=np.float64),
+            spreads=np.asarray(spreads, dtype=np.float64),
+            is_first=np.asarray(is_first, dtype=bool)
+        )
+        
+    def discount_factors(self, curves: Dict[str, DiscountCurve]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Discount factors at period starts and ends, each leg on its currency's curve.
+        
+        Args:
+            curves: Discount curves by currency (missing currencies give NaN)
+            
+        Returns:
+            (start discount factors, end discount factors)
+        """
+        df_start = np.full(self.start_times.shape, np.nan)
+        df_end = np.full(self.end_times.shape, np.nan)
+        leg_currency = np.asarray(self.leg_currencies, dtype=object)
+        period_currency = leg_currency[self.period_leg] if self.period_leg.size else np.empty(0, dtype=object)
+        for currency in set(self.leg_currencies):
+            curve = curves.get(currency)
+            if curve is None:
+                continue
+            mask = period_currency == currency
+            df_start[mask] = curve.discount_factors(self.start_times[mask])
+            df_end[mask] = curve.discount_factors(self.end_times[mask])
+        return df_start, df_end
+        
+    def leg_present_values(self,
+                           curves: Dict[str, DiscountCurve],
+                           reference_rates: Dict[str, float]) -> np.ndarray:
+        """
+        Present value of every leg.
+        
+        Fixed periods pay notional * rate * accrual. The first future floating
+        period pays the current reference rate plus spread; later floating
+        periods pay the curve forward plus spread, which discounts to
+        notional * (DF_start - DF_end) + notional * spread * accrual * DF_end.
+        Legs without a curve or reference rate come back as NaN.
+        
+        Args:
+            curves: Discount curves by currency
+            reference_rates: Current reference rates by name
+            
+        Returns:
+            Array of present values, one per leg
+        """
+        df_start, df_end = self.discount_factors(curves)
+        current_rates = np.array([reference_rates.get(name, np.nan) if name else 0.0
+                                  for name in self.leg_rate_names])
+        fixed = self.leg_is_fixed[self.period_leg]
+        
+        fixed_pv = self.notionals * self.fixed_rates * self.accruals * df_end
+        spread_pv = self.notionals * self.spreads * self.accruals * df_end
+        first_pv = self.notionals * current_rates[self.period_leg] * self.accruals * df_end
+        forward_pv = self.notionals * (df_start - df_end)
+        floating_pv = spread_pv + np.where(self.is_first, first_pv, forward_pv)
+        
+        period_pv = np.where(fixed, fixed_pv, floating_pv)
+        return np.bincount(self.period_leg, weights=period_pv, minlength=len(self.leg_keys))
+
+    def to_cash_flows(self, reference_rates: Dict[str, float]) -> CashFlowSchedule:
+        """
+        Express each swap's value (floating minus fixed) as fixed cash flows.
+
+        On a single curve a projected floating period is worth
+        notional * (DF_start - DF_end), i.e. +notional at its start and
+        -notional at its end, so the whole book becomes a set of fixed flows
+        that curve bumps can revalue without projecting forwards again.
+
+        Args:
+            reference_rates: Current reference rates by name (fixes the first floating period)
+
+        Returns:
+            CashFlowSchedule with one instrument per swap
+        """
+        swap_ids = list(dict.fromkeys(key[0] for key in self.leg_keys))
+        swap_index = {swap_id: index for index, swap_id in enumerate(swap_ids)}
+        leg_swap = np.array([swap_index[key[0]] for key in self.leg_keys], dtype=np.int64)
+        currencies = {}
+        for (swap_id, _), currency, is_fixed in zip(self.leg_keys, self.leg_currencies, self.leg_is_fixed):
+            if is_fixed or swap_id not in currencies:
+                currencies[swap_id] = currency
+
+        current_rates = np.array([reference_rates.get(name, np.nan) if name else 0.0
+                                  for name in self.leg_rate_names])
+        fixed = self.leg_is_fixed[self.period_leg]
+        coupon = np.where(self.is_first, current_rates[self.period_leg] + self.spreads, self.spreads)
+        end_amounts = np.where(
+            fixed,
+            -self.notionals * self.fixed_rates * self.accruals,
+            self.notionals * coupon * self.accruals - np.where(self.is_first, 0.0, self.notionals)
+        )
+        projected = ~fixed & ~self.is_first
+
+        owners = leg_swap[self.period_leg] if self.period_leg.size else np.zeros(0, dtype=np.int64)
+        return CashFlowSchedule(
+            ids=swap_ids,
+            currencies=[currencies[swap_id] for swap_id in swap_ids],
+            flow_instrument=np.concatenate([owners, owners[projected]]),
+            times=np.concatenate([self.end_times, self.start_times[projected]]),
+            amounts=np.concatenate([end_amounts, self.notionals[projected]])
+        )
+
+
 class SwapPricingModel:
     """Base class for swap pricing models."""
     
@@ -264,7 +469,7 @@ class SwapPricingModel:
     def calculate_interest_rate_swap_price(
         fixed_leg: SwapLeg,
         floating_leg: SwapLeg,
-        yield_curve: Dict[str, float],
+        yield_curve: Union[Dict[str, float], DiscountCurve],
         current_floating_rate: float
     ) -> float:
         """
@@ -273,7 +478,7 @@ class SwapPricingModel:
         Args:
             fixed_leg: Fixed leg of the swap
             floating_leg: Floating leg of the swap
-            yield_curve: Dictionary mapping tenors to yields
+            yield_curve: Dictionary mapping tenors to yields, or a compiled DiscountCurve
             current_floating_rate: Current value of the floating rate index
             
         Returns:
@@ -282,15 +487,16 @@ class SwapPricingModel:
         if not fixed_leg.is_fixed or floating_leg.is_fixed:
             raise ValueError("Invalid leg configuration: first leg must be fixed, second must be floating")
             
+        curve = _as_curve(yield_curve)
         fixed_rate = float(fixed_leg.rate)
         notional = float(fixed_leg.notional_amount)
         
         # Calculate present values of both legs
         fixed_pv = SwapPricingModel._calculate_fixed_leg_pv(
-            fixed_leg, yield_curve, notional, fixed_rate)
+            fixed_leg, curve, notional, fixed_rate)
         
         floating_pv = SwapPricingModel._calculate_floating_leg_pv(
-            floating_leg, yield_curve, notional, current_floating_rate, 
+            floating_leg, curve, notional, current_floating_rate, 
             float(floating_leg.spread or 0))
             
         # Return difference (from perspective of fixed rate payer)
@@ -299,129 +505,55 @@ class SwapPricingModel:
     @staticmethod
     def _calculate_fixed_leg_pv(
         leg: SwapLeg,
-        yield_curve: Dict[str, float],
+        yield_curve: Union[Dict[str, float], DiscountCurve],
         notional: float,
         fixed_rate: float
     ) -> float:
         """Calculate present value of fixed leg payments."""
         today = datetime.date.today()
-        pv = 0.0
+        _, payment_dates, accruals = _leg_periods(leg, today)
         
-        payment_dates = [d for d in leg.payment_dates if d >= today]
-        previous_date = leg.start_date
-        
-        for payment_date in payment_dates:
-            # Calculate days and discount factor
-            days_in_period = (payment_date - previous_date).days
-            years_to_payment = (payment_date - today).days / 365.0
-            
-            # Get discount factor from yield curve
-            discount_factor = SwapPricingModel._get_discount_factor(yield_curve, years_to_payment)
-            
-            # Calculate payment amount
-            day_count_factor = leg.calculate_day_count_factor(previous_date, payment_date)
-            payment = notional * fixed_rate * day_count_factor
-            
-            # Calculate present value of this payment
-            pv += payment * discount_factor
-            
-            previous_date = payment_date
-            
-        return pv
+        discount_factors = _as_curve(yield_curve).discount_factors(_year_fractions(payment_dates, today))
+        return float(notional * fixed_rate * np.dot(accruals, discount_factors))
     
     @staticmethod
     def _calculate_floating_leg_pv(
         leg: SwapLeg,
-        yield_curve: Dict[str, float],
+        yield_curve: Union[Dict[str, float], DiscountCurve],
         notional: float,
         current_rate: float,
         spread: float = 0.0
     ) -> float:
         """Calculate present value of floating leg payments."""
         today = datetime.date.today()
-        pv = 0.0
-        
-        payment_dates = [d for d in leg.payment_dates if d >= today]
-        previous_date = leg.start_date
+        start_dates, payment_dates, accruals = _leg_periods(leg, today)
         
         if not payment_dates:
             return 0.0
             
-        # For first payment, we know the rate
-        first_payment_date = payment_dates[0]
-        years_to_payment = (first_payment_date - today).days / 365.0
-        discount_factor = SwapPricingModel._get_discount_factor(yield_curve, years_to_payment)
-        
-        day_count_factor = leg.calculate_day_count_factor(previous_date, first_payment_date)
-        payment = notional * (current_rate + spread) * day_count_factor
-        pv += payment * discount_factor
+        curve = _as_curve(yield_curve)
+        df_start = curve.discount_factors(_year_fractions(start_dates, today))
+        df_end = curve.discount_factors(_year_fractions(payment_dates, today))
         
-        previous_date = first_payment_date
-        
-        # For remaining payments, derive from yield curve
-        for i in range(1, len(payment_dates)):
-            payment_date = payment_dates[i]
-            
-            # Derive forward rate from yield curve
-            period_start_years = (previous_date - today).days / 365.0
-            period_end_years = (payment_date - today).days / 365.0
-            
-            discount_start = SwapPricingModel._get_discount_factor(yield_curve, period_start_years)
-            discount_end = SwapPricingModel._get_discount_factor(yield_curve, period_end_years)
-            
-            day_count_factor = leg.calculate_day_count_factor(previous_date, payment_date)
-            
-            # Calculate implied forward rate
-            forward_rate = (discount_start / discount_end - 1) / day_count_factor
-            
-            # Calculate payment
-            payment = notional * (forward_rate + spread) * day_count_factor
-            
-            # Calculate present value of this payment
-            pv += payment * discount_end
-            
-            previous_date = payment_date
-            
-        return pv
+        # The first payment is fixed at the current rate; later ones use curve forwards
+        pv = notional * current_rate * accruals[0] * df_end[0]
+        pv += notional * np.sum(df_start[1:] - df_end[1:])
+        pv += notional * spread * np.dot(accruals, df_end)
+        return float(pv)
     
     @staticmethod
-    def _get_discount_factor(yield_curve: Dict[str, float], years: float) -> float:
+    def _get_discount_factor(yield_curve: Union[Dict[str, float], DiscountCurve], years: float) -> float:
         """
         Get discount factor from yield curve.
         
         Args:
-            yield_curve: Dictionary mapping tenors (in years) to yields
+            yield_curve: Dictionary mapping tenors (in years) to yields, or a compiled DiscountCurve
             years: Target tenor
             
         Returns:
             Discount factor for the specified tenor
         """
-        # Convert tenor keys to floats
-        tenors = sorted([float(t) for t in yield_curve.keys()])
-        
-        if years <= 0:
-            return 1.0
-            
-        # If exact tenor exists
-        if years in tenors:
-            rate = yield_curve[str(years)]
-            return math.exp(-rate * years)
-            
-        # Linear interpolation
-        lower_tenor = max([t for t in tenors if t < years], default=tenors[0])
-        upper_tenor = min([t for t in tenors if t >= years], default=tenors[-1])
-        
-        lower_rate = yield_curve[str(lower_tenor)]
-        upper_rate = yield_curve[str(upper_tenor)]
-        
-        # Interpolate rate
-        if upper_tenor == lower_tenor:
-            rate = lower_rate
-        else:
-            rate = lower_rate + (upper_rate - lower_rate) * (years - lower_tenor) / (upper_tenor - lower_tenor)
-            
-        # Calculate discount factor
-        return math.exp(-rate * years)
+        return _as_curve(yield_curve).discount_factor(years)
     
     @staticmethod
     def calculate_par_swap_rate(
@@ -429,7 +561,7 @@ class SwapPricingModel:
         maturity_date: datetime.date,
         payment_frequency: PaymentFrequency,
         day_count_convention: DayCountConvention,
-        yield_curve: Dict[str, float]
+        yield_curve: Union[Dict[str, float], DiscountCurve]
     ) -> float:
         """
         Calculate the par swap rate.
@@ -439,12 +571,13 @@ class SwapPricingModel:
             maturity_date: Maturity date of the swap
             payment_frequency: Payment frequency
             day_count_convention: Day count convention
-            yield_curve: Dictionary mapping tenors to yields
+            yield_curve: Dictionary mapping tenors to yields, or a compiled DiscountCurve
             
         Returns:
             Par swap rate
         """
         today = datetime.date.today()
+        curve = _as_curve(yield_curve)
         
         # Create a dummy swap leg to generate payment dates
         dummy_leg = SwapLeg(
@@ -459,24 +592,12 @@ class SwapPricingModel:
         )
         
         # Calculate PV of a basis point (PVBP)
-        payment_dates = [d for d in dummy_leg.payment_dates if d >= today]
-        previous_date = start_date
-        
-        pvbp = 0.0
-        annuity = 0.0
+        _, payment_dates, accruals = _leg_periods(dummy_leg, today)
+        pvbp = float(np.dot(accruals, curve.discount_factors(_year_fractions(payment_dates, today))))
         
-        for payment_date in payment_dates:
-            years_to_payment = (payment_date - today).days / 365.0
-            discount_factor = SwapPricingModel._get_discount_factor(yield_curve, years_to_payment)
-            
-            day_count_factor = dummy_leg.calculate_day_count_factor(previous_date, payment_date)
-            pvbp += day_count_factor * discount_factor
-            
-            previous_date = payment_date
-            
         # Calculate par swap rate
         years_to_maturity = (maturity_date - today).days / 365.0
-        final_discount = SwapPricingModel._get_discount_factor(yield_curve, years_to_maturity)
+        final_discount = curve.discount_factor(years_to_maturity)
         
         if pvbp == 0:
             return 0.0
@@ -494,11 +615,24 @@ class SwapManager:
     swap contracts.
     """
     
-    def __init__(self):
-        """Initialize the swap manager."""
+    def __init__(self,
+                 interpolation: InterpolationScheme = InterpolationScheme.LINEAR_ZERO,
+                 curve_store: Optional[CurveStore] = None):
+        """
+        Initialize the swap manager.
+        
+        Args:
+            interpolation: Interpolation scheme for compiled discount curves
+            curve_store: Store of bootstrapped curves (shared with other books)
+        """
         self.swaps: Dict[str, SwapContract] = {}
         self.yield_curves: Dict[str, Dict[str, float]] = {}
         self.reference_rates: Dict[str, float] = {}
+        self.interpolation = interpolation
+        # Compiled curves, keyed by currency, remembering which curve dict they came from
+        self._compiled_curves: Dict[str, Tuple[Dict[str, float], DiscountCurve]] = {}
+        self._schedule: Optional[SwapCashflowSchedule] = None
+        self.curve_store = curve_store if curve_store is not None else CurveStore()
     
     def add_swap(self, swap: SwapContract) -> None:
         """
@@ -508,6 +642,7 @@ class SwapManager:
             swap: Swap contract
         """
         self.swaps[swap.id] = swap
+        self._schedule = None
         logger.info(f"Added swap {swap.id} ({swap.swap_type.value}) with {len(swap.legs)} legs")
     
     def get_swap(self, swap_id: str) -> Optional[SwapContract]:
@@ -531,8 +666,55 @@ class SwapManager:
             curve_data: Dictionary mapping tenors (in years as strings) to yields
         """
         self.yield_curves[currency] = curve_data.copy()
+        self._compiled_curves.pop(currency, None)
         logger.info(f"Updated yield curve for {currency} with {len(curve_data)} points")
     
+    def update_curve_quotes(self,
+                            currency: str,
+                            quotes: Iterable[CurveQuote],
+                            valuation_date: Optional[datetime.date] = None) -> DiscountCurve:
+        """
+        Bootstrap the discount curve for a currency from market quotes.
+        
+        Args:
+            currency: Currency code
+            quotes: Deposit, FRA, swap and bond quotes
+            valuation_date: Curve date (defaults to today)
+            
+        Returns:
+            Bootstrapped DiscountCurve
+        """
+        return self.curve_store.build(currency, valuation_date or datetime.date.today(), quotes)
+    
+    def get_discount_curve(self, currency: str,
+                           valuation_date: Optional[datetime.date] = None) -> Optional[DiscountCurve]:
+        """
+        Get the discount curve for a currency.
+        
+        A curve bootstrapped for the valuation date takes precedence over the
+        compiled yield curve dictionary.
+        
+        Args:
+            currency: Currency code
+            valuation_date: Curve date (defaults to today)
+            
+        Returns:
+            DiscountCurve, or None if there is no curve for the currency
+        """
+        bootstrapped = self.curve_store.get(currency, valuation_date or datetime.date.today())
+        if bootstrapped is not None:
+            return bootstrapped
+            
+        curve_data = self.yield_curves.get(currency)
+        if curve_data is None:
+            return None
+            
+        cached = self._compiled_curves.get(currency)
+        if cached is None or cached[0] is not curve_data:
+            cached = (curve_data, DiscountCurve.from_dict(curve_data, self.interpolation))
+            self._compiled_curves[currency] = cached
+        return cached[1]
+    
     def update_reference_rate(self, rate_name: str, value: float) -> None:
         """
         Update a reference interest rate.
@@ -568,8 +750,115 @@ class SwapManager:
             logger.warning(f"Valuation not implemented for swap type: {swap.swap_type.value}")
             return {"error": f"Valuation not implemented for {swap.swap_type.value} swaps"}
     
-    def _value_interest_rate_swap(self, swap: SwapContract) -> Dict[str, float]:
-        """Value an interest rate swap."""
+    def value_swaps(self,
+                    swap_ids: Optional[Sequence[str]] = None,
+                    valuation_date: Optional[datetime.date] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Value many interest rate swaps in one pass over a shared cash-flow schedule.
+        
+        Args:
+            swap_ids: Swaps to value (defaults to all active interest rate swaps)
+            valuation_date: Valuation date (defaults to today)
+            
+        Returns:
+            Dictionary mapping swap ID to value, fixed_pv, floating_pv and currency
+            (or an error entry when a curve or reference rate is missing)
+        """
+        valuation_date = valuation_date or datetime.date.today()
+        if swap_ids is None:
+            swaps = [s for s in self.swaps.values() if s.is_active and s.swap_type == SwapType.INTEREST_RATE]
+        else:
+            swaps = [self.swaps[swap_id] for swap_id in swap_ids if swap_id in self.swaps]
+            
+        schedule = self._get_schedule(swaps, valuation_date)
+        curves = self._curves_for(schedule.leg_currencies, valuation_date)
+        leg_pvs = schedule.leg_present_values(curves, self.reference_rates)
+        
+        fixed_pv: Dict[str, float] = {}
+        floating_pv: Dict[str, float] = {}
+        currencies: Dict[str, str] = {}
+        for (swap_id, _), pv, is_fixed, currency in zip(schedule.leg_keys, leg_pvs.tolist(),
+                                                        schedule.leg_is_fixed, schedule.leg_currencies):
+            side = fixed_pv if is_fixed else floating_pv
+            side[swap_id] = side.get(swap_id, 0.0) + pv
+            if is_fixed:
+                currencies[swap_id] = currency
+                
+        results = {}
+        for swap in swaps:
+            fixed, floating = fixed_pv.get(swap.id), floating_pv.get(swap.id)
+            if fixed is None or floating is None or len(swap.legs) != 2:
+                results[swap.id] = {"error": "Interest rate swap must have one fixed and one floating leg"}
+            elif math.isnan(fixed) or math.isnan(floating):
+                results[swap.id] = {"error": f"Missing yield curve or reference rate for {swap.id}"}
+            else:
+                results[swap.id] = {
+                    "value": floating - fixed,
+                    "fixed_pv": fixed,
+                    "floating_pv": floating,
+                    "currency": currencies[swap.id]
+                }
+        return results
+    
+    def calculate_curve_sensitivities(self,
+                                      swap_ids: Optional[Sequence[str]] = None,
+                                      valuation_date: Optional[datetime.date] = None,
+                                      key_tenors: Sequence[float] = DEFAULT_KEY_TENORS,
+                                      bump: float = 0.0001) -> Dict[str, object]:
+        """
+        Parallel and key-rate PV01 of interest rate swaps.
+        
+        Every bump revalues the cached cash-flow schedule; neither payment
+        dates nor the curve are rebuilt per bump.
+        
+        Args:
+            swap_ids: Swaps to include (defaults to all active interest rate swaps)
+            valuation_date: Valuation date (defaults to today)
+            key_tenors: Key-rate tenors in years
+            bump: Zero rate bump (e.g., 0.0001 for 1bp)
+            
+        Returns:
+            Dictionary with swap_ids, key_tenors, per-swap value, pv01 and
+            key_rate_pv01 arrays, and book totals (NaN where a curve or
+            reference rate is missing)
+        """
+        valuation_date = valuation_date or datetime.date.today()
+        if swap_ids is None:
+            swaps = [s for s in self.swaps.values() if s.is_active and s.swap_type == SwapType.INTEREST_RATE]
+        else:
+            swaps = [self.swaps[swap_id] for swap_id in swap_ids if swap_id in self.swaps]
+            
+        flows = self._get_schedule(swaps, valuation_date).to_cash_flows(self.reference_rates)
+        risk = flows.sensitivities(self._curves_for(flows.currencies, valuation_date),
+                                   key_tenors=key_tenors, bump=bump)
+        
+        return {
+            "swap_ids": flows.ids,
+            "key_tenors": list(key_tenors),
+            "value": risk["present_value"],
+            "pv01": risk["pv01"],
+            "key_rate_pv01": risk["key_rate_pv01"],
+            "total_pv01": float(np.nansum(risk["pv01"])),
+            "total_key_rate_pv01": np.nansum(risk["key_rate_pv01"], axis=0)
+        }
+    
+    def _get_schedule(self, swaps: List[SwapContract], valuation_date: datetime.date) -> SwapCashflowSchedule:
+        """Get the cached cash-flow schedule, rebuilding it if the swaps or date changed."""
+        schedule = self._schedule
+        if (schedule is None or schedule.valuation_date != valuation_date
+                or {key[0] for key in schedule.leg_keys} != {swap.id for swap in swaps}):
+            schedule = SwapCashflowSchedule.build(swaps, valuation_date)
+            self._schedule = schedule
+        return schedule
+    
+    def _curves_for(self, currencies: Iterable[str], valuation_date: datetime.date) -> Dict[str, DiscountCurve]:
+        """Discount curves for the given currencies, skipping currencies without one."""
+        curves = {currency: self.get_discount_curve(currency, valuation_date) for currency in set(currencies)}
+        return {currency: curve for currency, curve in curves.items() if curve is not None}
+    
+    def _value_interest_rate_swap(self, swap: SwapContract,
+                                  curve: Optional[DiscountCurve] = None) -> Dict[str, float]:
+        """Value an interest rate swap, optionally on a given (e.g. bumped) curve."""
         if len(swap.legs) != 2:
             return {"error": "Interest rate swap must have exactly 2 legs"}
             
@@ -588,8 +877,9 @@ class SwapManager:
             
         # Get yield curve and reference rate
         currency = fixed_leg.currency
+        curve = curve or self.get_discount_curve(currency)
         
-        if currency not in self.yield_curves:
+        if curve is None:
             return {"error": f"No yield curve available for {currency}"}
             
         rate_name = str(floating_leg.rate)
@@ -603,7 +893,7 @@ class SwapManager:
         value = SwapPricingModel.calculate_interest_rate_swap_price(
             fixed_leg,
             floating_leg,
-            self.yield_curves[currency],
+            curve,
             current_rate
         )
         
@@ -617,7 +907,7 @@ class SwapManager:
             swap.maturity_date,
             fixed_leg.payment_frequency,
             fixed_leg.day_count_convention,
-            self.yield_curves[currency]
+            curve
         )
         
         return {
@@ -727,20 +1017,10 @@ class SwapManager:
             # Calculate current value
             base_value = self._value_interest_rate_swap(swap).get("value", 0)
             
-            # Calculate value with rates +1bp
-            for currency in self.yield_curves:
-                bumped_curve = {}
-                for tenor, rate in self.yield_curves[currency].items():
-                    bumped_curve[tenor] = rate + 0.0001  # +1bp
-                
-                # Store original curve
-                original_curve = self.yield_curves[currency].copy()
-                
-                # Set bumped curve
-                self.yield_curves[currency] = bumped_curve
-                
-                # Calculate bumped value
-                bumped_value = self._value_interest_rate_swap(swap).get("value", 0)
+            # Calculate value with the swap's curve +1bp
+            curve = self.get_discount_curve(swap.legs[0].currency)
+            if curve is not None:
+                bumped_value = self._value_interest_rate_swap(swap, curve.shifted(0.0001)).get("value", 0)
                 
                 # Calculate DV01
                 dv01 = bumped_value - base_value
@@ -750,9 +1030,6 @@ class SwapManager:
                 notional = float(swap.legs[0].notional_amount)
                 if notional > 0:
                     results["duration"] = -dv01 * 10000 / notional  # Convert to percent
-                
-                # Restore original curve
-                self.yield_curves[currency] = original_curve
         
         return results
     
@@ -0,0 +1,3 @@
+"""
+Treasury derivatives tests package.
+"""
@@ -0,0 +1,159 @@
+"""
+Batch Options Pricing Tests - Treasury
+
+This module checks the vectorized Black-Scholes pricer against the scalar
+BlackScholes model it replaces for whole-book revaluation.
+"""
+import datetime
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from ..options_pricing import Option, OptionType, OptionStyle, BlackScholes
+from ..batch_pricing import VectorizedBlackScholes, arrays_from_options, arrays_from_positions
+from ..derivatives_risk import DerivativePosition
+
+
+def make_options(count=40):
+    """Build a mixed book of calls and puts across strikes and expiries."""
+    today = datetime.date.today()
+    return [
+        Option(
+            id=f"OPT{i}",
+            underlying=f"U{i % 3}",
+            option_type=OptionType.CALL if i % 2 else OptionType.PUT,
+            style=OptionStyle.EUROPEAN,
+            strike_price=Decimal(80 + i),
+            expiry_date=today + datetime.timedelta(days=15 + 17 * i),
+            contract_size=100
+        )
+        for i in range(count)
+    ]
+
+
+class TestVectorizedBlackScholes(unittest.TestCase):
+    """Test cases for the vectorized Black-Scholes pricer."""
+
+    def setUp(self):
+        self.options = make_options()
+        self.spots = {"U0": 95.0, "U1": 100.0, "U2": 110.0}
+
+    def test_matches_scalar_price_and_greeks(self):
+        """Test that every price and Greek matches BlackScholes.price_option."""
+        book = arrays_from_options(self.options, self.spots, 0.25, 0.05)
+        result = VectorizedBlackScholes.price_book(book)
+
+        for i, option in enumerate(self.options):
+            expected = BlackScholes.price_option(option, self.spots[option.underlying], 0.05, 0.25)
+            for greek, value in expected.items():
+                self.assertAlmostEqual(result[greek][i], value, delta=1e-8 * max(1.0, abs(value)),
+                                       msg=f"{greek} of {option.id}")
+
+    def test_dividend_yield_matches_scalar_price_and_delta(self):
+        """Test prices and deltas with a dividend yield (the scalar gamma omits exp(-qT))."""
+        book = arrays_from_options(self.options, self.spots, 0.25, 0.05, 0.02)
+        result = VectorizedBlackScholes.price_book(book)
+
+        for i, option in enumerate(self.options):
+            expected = BlackScholes.price_option(option, self.spots[option.underlying], 0.05, 0.25, 0.02)
+            self.assertAlmostEqual(result["price"][i], expected["price"], delta=1e-8 * max(1.0, expected["price"]))
+            self.assertAlmostEqual(result["delta"][i], expected["delta"], delta=1e-8 * max(1.0, abs(expected["delta"])))
+
+        # Gamma against a central difference of delta
+        bump = 1e-3
+        up = VectorizedBlackScholes.price_and_greeks(
+            book.spot + bump, book.strike, book.time_to_expiry, book.volatility,
+            book.rate, book.dividend_yield, book.is_call, book.contract_size)["delta"]
+        down = VectorizedBlackScholes.price_and_greeks(
+            book.spot - bump, book.strike, book.time_to_expiry, book.volatility,
+            book.rate, book.dividend_yield, book.is_call, book.contract_size)["delta"]
+        np.testing.assert_allclose(result["gamma"], (up - down) / (2 * bump), rtol=1e-4, atol=1e-8)
+
+    def test_price_only_matches_full_pass(self):
+        """Test that the price-only path agrees with price_and_greeks per unit."""
+        book = arrays_from_options(self.options, self.spots, 0.3, 0.04)
+        full = VectorizedBlackScholes.price_and_greeks(
+            book.spot, book.strike, book.time_to_expiry, book.volatility,
+            book.rate, book.dividend_yield, book.is_call
+        )
+        prices = VectorizedBlackScholes.price(
+            book.spot, book.strike, book.time_to_expiry, book.volatility,
+            book.rate, book.dividend_yield, book.is_call
+        )
+        np.testing.assert_allclose(prices, full["price"], rtol=1e-12, atol=1e-12)
+
+    def test_price_broadcasts_scenario_grid(self):
+        """Test that a (scenarios x options) spot grid prices in one call."""
+        book = arrays_from_options(self.options, self.spots, 0.2, 0.03)
+        grid = book.spot[None, :] * np.array([0.9, 1.0, 1.1])[:, None]
+
+        prices = VectorizedBlackScholes.price(
+            grid, book.strike, book.time_to_expiry, book.volatility,
+            book.rate, book.dividend_yield, book.is_call
+        )
+
+        self.assertEqual(prices.shape, (3, len(self.options)))
+        np.testing.assert_allclose(prices[1], VectorizedBlackScholes.price(
+            book.spot, book.strike, book.time_to_expiry, book.volatility,
+            book.rate, book.dividend_yield, book.is_call
+        ))
+
+    def test_expired_and_zero_volatility_options(self):
+        """Test that dead contracts are priced at (discounted) intrinsic value."""
+        result = VectorizedBlackScholes.price_and_greeks(
+            spot=np.array([110.0, 90.0, 110.0]),
+            strike=100.0,
+            time_to_expiry=np.array([0.0, 0.0, 1.0]),
+            volatility=np.array([0.2, 0.2, 0.0]),
+            risk_free_rate=0.05,
+            dividend_yield=0.0,
+            is_call=np.array([True, False, True])
+        )
+
+        np.testing.assert_allclose(result["price"], [10.0, 10.0, 110.0 - 100.0 * np.exp(-0.05)])
+        np.testing.assert_allclose(result["delta"], [1.0, -1.0, 1.0])
+        np.testing.assert_allclose(result["gamma"], 0.0)
+        np.testing.assert_allclose(result["vega"], 0.0)
+
+    def test_quantity_scales_outputs(self):
+        """Test that signed position quantities scale every output."""
+        book = arrays_from_options(self.options[:4], self.spots, 0.25, 0.05, quantities=[2, -1, 3, 0])
+        unit = arrays_from_options(self.options[:4], self.spots, 0.25, 0.05)
+
+        scaled = VectorizedBlackScholes.price_book(book)["delta"]
+        base = VectorizedBlackScholes.price_book(unit)["delta"]
+
+        np.testing.assert_allclose(scaled, base * [2, -1, 3, 0])
+
+    def test_missing_spot_raises(self):
+        """Test that an underlying without a spot price is rejected."""
+        with self.assertRaises(ValueError):
+            arrays_from_options(self.options, {"U0": 95.0}, 0.25, 0.05)
+
+
+class TestArraysFromPositions(unittest.TestCase):
+    """Test cases for building option arrays from derivative positions."""
+
+    def make_position(self, position_id, **details):
+        details.setdefault("option_type", "call")
+        details.setdefault("strike_price", 100.0)
+        details.setdefault("expiry_date", (datetime.date.today() + datetime.timedelta(days=90)).isoformat())
+        return DerivativePosition(position_id, "option", details, Decimal("0"), underlying="U0")
+
+    def test_implied_volatility_detail_takes_precedence(self):
+        """Test that a position's own implied volatility overrides the market input."""
+        positions = [self.make_position("P1"), self.make_position("P2", implied_volatility=0.4)]
+
+        book = arrays_from_positions(positions, 100.0, 0.2, 0.05)
+
+        np.testing.assert_allclose(book.volatility, [0.2, 0.4])
+
+    def test_missing_volatility_raises(self):
+        """Test that positions without any volatility are rejected."""
+        with self.assertRaises(ValueError):
+            arrays_from_positions([self.make_position("P1")], 100.0, None, 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,205 @@
+"""
+Futures Margin Tests - Treasury
+
+This module checks the contract-level futures book against per-position
+sums, the SPAN-style requirement against risk arrays summed by hand, and
+the margin calls and collateral moves of the margin engine.
+"""
+import datetime
+import logging
+import random
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from ..futures_management import FuturesContract, FuturesManager, FuturesPosition, FuturesType, MarginType
+from ..futures_margin import (
+    FuturesMarginEngine, SpanParameters, SPAN_PRICE_FRACTIONS, EXTREME_MOVE_COVERAGE
+)
+
+EXPIRY = datetime.date(2030, 12, 20)
+
+CONTRACTS = [
+    FuturesContract("ES", "DEC", FuturesType.EQUITY_INDEX, "CME", Decimal("0.25"), Decimal("12.5"), 50, "USD", EXPIRY),
+    FuturesContract("ES", "MAR", FuturesType.EQUITY_INDEX, "CME", Decimal("0.25"), Decimal("12.5"), 50, "USD", EXPIRY),
+    FuturesContract("NQ", "DEC", FuturesType.EQUITY_INDEX, "CME", Decimal("0.25"), Decimal("5"), 20, "USD", EXPIRY)
+]
+
+PARAMETERS = {
+    "ES DEC": SpanParameters(Decimal("150"), Decimal("400")),
+    "ES MAR": SpanParameters(Decimal("160"), Decimal("400")),
+    "NQ DEC": SpanParameters(Decimal("600"))
+}
+
+
+def brute_force_span(positions):
+    """Maintenance requirement from each position's scenario losses."""
+    weights = np.where(np.abs(SPAN_PRICE_FRACTIONS) > 1, EXTREME_MOVE_COVERAGE, 1.0)
+    net = {}
+    for position in positions:
+        code = position.contract.contract_code
+        net[code] = net.get(code, 0) + position.quantity
+
+    total = 0.0
+    for ticker in {code.split()[0] for code in net}:
+        codes = [code for code in net if code.startswith(ticker + " ")]
+        loss = np.zeros(SPAN_PRICE_FRACTIONS.size)
+        for code, contract in ((c.contract_code, c) for c in CONTRACTS if c.contract_code in codes):
+            loss += net[code] * -SPAN_PRICE_FRACTIONS * float(PARAMETERS[code].price_scan_range) * contract.contract_size * weights
+        longs = sum(max(net[code], 0) for code in codes)
+        shorts = sum(max(-net[code], 0) for code in codes)
+        total += max(loss.max(), 0.0) + min(longs, shorts) * float(PARAMETERS[codes[0]].intra_spread_charge)
+    return total
+
+
+class TestFuturesMargin(unittest.TestCase):
+    """Test cases for the futures margin engine through FuturesManager."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        logging.disable(logging.INFO)
+        self.manager = FuturesManager()
+        for contract in CONTRACTS:
+            self.manager.add_contract(contract, PARAMETERS[contract.contract_code])
+
+    def tearDown(self):
+        """Re-enable logging."""
+        logging.disable(logging.NOTSET)
+
+    def add(self, position_id, contract, quantity, price, initial="20000"):
+        position = FuturesPosition(position_id, contract, quantity, Decimal(price), Decimal(price), Decimal(initial))
+        self.manager.add_position(position)
+        return position
+
+    def random_book(self, count=30, seed=0):
+        rng = random.Random(seed)
+        for i in range(count):
+            contract = rng.choice(CONTRACTS)
+            quantity = rng.choice([-1, 1]) * rng.randint(1, 10)
+            self.add(f"P{i}", contract, quantity, str(rng.randint(4900, 5100)), str(rng.randint(5, 50) * 1000))
+        for code, price in (("ES DEC", "5050"), ("NQ DEC", "4950"), ("ES DEC", "4975")):
+            self.manager.update_contract_price(code, Decimal(price))
+
+    def test_portfolio_value_matches_position_sums(self):
+        """Test contract aggregates against summing the synced positions."""
+        self.random_book()
+        positions = self.manager.get_open_positions()
+
+        value = self.manager.calculate_portfolio_value()
+        margin = self.manager.calculate_portfolio_margin()
+
+        self.assertEqual(value["unrealized_pnl"], sum(p.unrealized_pnl for p in positions))
+        self.assertEqual(value["notional_value"], sum(p.notional_value for p in positions))
+        self.assertEqual(value["long_value"] - value["short_value"],
+                         sum(p.quantity * p.contract.contract_size * p.current_price for p in positions))
+        self.assertEqual(margin["initial"], sum(p.initial_margin for p in positions))
+        self.assertEqual(margin["variation"], sum(p.variation_margin for p in positions))
+
+    def test_span_margin_matches_risk_arrays(self):
+        """Test the maintenance requirement against hand-summed scenario losses."""
+        self.random_book()
+        span = self.manager.calculate_span_margin()
+
+        self.assertAlmostEqual(float(span["maintenance_requirement"]),
+                               brute_force_span(self.manager.get_open_positions()), places=2)
+        self.assertEqual(span["initial_requirement"], span["maintenance_requirement"] * Decimal("1.1"))
+
+    def test_calendar_spread_charge(self):
+        """Test that offsetting months net their scan risk and pay the spread charge."""
+        self.add("long", CONTRACTS[0], 10, "5000")
+        self.add("short", CONTRACTS[1], -8, "5010")
+
+        es = self.manager.calculate_span_margin()["combined_commodities"]["ES"]
+
+        self.assertEqual(es["calendar_spreads"], 8)
+        self.assertEqual(es["intra_commodity_charge"], Decimal("3200.00"))
+        # Worst move is the extreme one down, 3 scan ranges at 35%: long 10 x 150, short 8 x 160, 50 per point
+        self.assertEqual(es["scan_risk"], Decimal("11550.00"))
+        self.assertEqual(es["requirement"], Decimal("14750.00"))
+
+    def test_removing_positions_matches_fresh_book(self):
+        """Test that incremental removals leave the same aggregates as rebuilding."""
+        self.random_book()
+        for position_id in ("P3", "P7", "P11", "P20"):
+            self.manager.close_position(position_id, self.manager.margin_engine.price(
+                self.manager.positions[position_id].contract.contract_code))
+
+        remaining = self.manager.get_open_positions()
+        fresh = FuturesMarginEngine()
+        for contract in CONTRACTS:
+            fresh.add_contract(contract, PARAMETERS[contract.contract_code])
+        for position in remaining:
+            fresh.add_position(position)
+
+        self.assertEqual(self.manager.margin_engine.maintenance_requirement(), fresh.maintenance_requirement())
+        self.assertAlmostEqual(float(fresh.maintenance_requirement()), brute_force_span(remaining), places=2)
+
+    def test_closing_realizes_variation_margin_into_collateral(self):
+        """Test that closing moves variation and initial margin into collateral."""
+        self.add("p1", CONTRACTS[0], 10, "5000", "60000")
+        self.manager.update_contract_price("ES DEC", Decimal("4990"))
+        engine = self.manager.margin_engine
+        equity = engine.equity
+
+        realized_pnl = self.manager.close_position("p1", Decimal("4980"))
+
+        self.assertEqual(realized_pnl, Decimal("-10000"))
+        self.assertEqual(engine.collateral, Decimal("60000") + Decimal("-10000"))
+        self.assertEqual(engine.equity, equity + 10 * 50 * Decimal("-10"))
+        self.assertEqual(self.manager.calculate_portfolio_margin()["initial"], 0)
+        self.assertIsNone(self.manager.close_position("p1", Decimal("4980")))
+
+    def test_remove_position_returns_realized_variation(self):
+        """Test realized variation margin at the mark and at an exit price."""
+        engine = FuturesMarginEngine()
+        engine.add_contract(CONTRACTS[2], PARAMETERS["NQ DEC"])
+        position = FuturesPosition("p", CONTRACTS[2], -5, Decimal("100"), Decimal("90"), Decimal("1000"),
+                                   variation_margin=Decimal("1000"))
+        engine.add_position(position)
+
+        self.assertEqual(engine.remove_position(position, Decimal("95")), Decimal("500"))
+        self.assertEqual(engine.collateral, Decimal("1500"))
+        self.assertEqual(engine.maintenance_requirement(), 0)
+
+    def test_margin_call_raised_once_per_breach(self):
+        """Test margin call events, recorded calls and satisfying them."""
+        events = []
+        self.manager.margin_engine.subscribe(events.append)
+        self.add("p1", CONTRACTS[0], 10, "5000", "80000")
+
+        self.manager.update_contract_price("ES DEC", Decimal("4950"))
+        self.manager.update_contract_price("ES DEC", Decimal("4940"))
+
+        self.assertEqual(len(events), 1)
+        calls = self.manager.get_open_margin_calls()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0].call_type, MarginType.MAINTENANCE)
+        self.assertEqual(calls[0].amount, events[0]["initial_requirement"] - events[0]["equity"])
+        self.assertEqual(events[0]["triggered_by"], "ES DEC")
+
+        self.manager.satisfy_margin_call(calls[0].id)
+        self.assertGreaterEqual(self.manager.margin_engine.equity, self.manager.margin_engine.maintenance_requirement())
+        self.manager.update_contract_price("ES DEC", Decimal("4700"))
+        self.assertEqual(len(events), 2)
+
+    def test_satisfied_variation_call_restores_equity(self):
+        """Test that paying a variation call brings equity back to maintenance."""
+        self.add("p1", CONTRACTS[0], 10, "5000", "80000")
+        self.manager.update_contract_price("ES DEC", Decimal("4940"))
+        engine = self.manager.margin_engine
+        before = engine.equity
+        shortfall = engine.maintenance_requirement() - before
+        self.assertGreater(shortfall, 0)
+
+        call_id = self.manager.register_margin_call("p1", MarginType.VARIATION, shortfall)
+        self.assertTrue(self.manager.satisfy_margin_call(call_id))
+
+        self.assertEqual(engine.equity, before + shortfall)
+        self.assertGreaterEqual(engine.equity, engine.maintenance_requirement())
+        self.assertTrue(self.manager.margin_calls[call_id].is_satisfied)
+        self.assertFalse(self.manager.satisfy_margin_call("missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Implied Volatility Tests - Treasury
+
+This module checks the vectorized implied volatility solver and the cached
+volatility surfaces against the scalar Black-Scholes model.
+"""
+import datetime
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from ..options_pricing import Option, OptionType, OptionStyle, BlackScholes
+from ..batch_pricing import VectorizedBlackScholes
+from ..implied_volatility import (
+    ImpliedVolatilitySolver,
+    VolatilitySurface,
+    VolatilitySurfaceCache,
+    STATUS_CONVERGED,
+    STATUS_NO_TIME_VALUE,
+    STATUS_ABOVE_MAXIMUM,
+    STATUS_EXPIRED
+)
+
+
+class TestImpliedVolatilitySolver(unittest.TestCase):
+    """Test cases for the vectorized implied volatility solver."""
+
+    def setUp(self):
+        self.solver = ImpliedVolatilitySolver()
+
+    def test_recovers_volatilities_of_model_prices(self):
+        """Test that solving model prices returns the volatilities used to price them."""
+        rng = np.random.default_rng(7)
+        n = 2000
+        strike = rng.uniform(60, 160, n)
+        expiry = rng.uniform(0.05, 3.0, n)
+        vol = rng.uniform(0.05, 1.2, n)
+        call = rng.random(n) < 0.5
+        prices = VectorizedBlackScholes.price(100.0, strike, expiry, vol, 0.03, 0.01, call)
+
+        result = self.solver.solve(prices, 100.0, strike, expiry, 0.03, 0.01, call)
+
+        # Deep out-of-the-money contracts carry too little vega to pin down volatility
+        vega = VectorizedBlackScholes.price_and_greeks(100.0, strike, expiry, vol, 0.03, 0.01, call)["vega"]
+        identifiable = vega > 1e-4
+        self.assertTrue(result.converged[identifiable].all())
+        np.testing.assert_allclose(result.volatility[identifiable], vol[identifiable], atol=1e-5)
+        self.assertLess(np.abs(result.price_error[result.converged]).max(), 1e-6)
+
+    def test_matches_scalar_implied_volatility(self):
+        """Test agreement with BlackScholes.implied_volatility for single options."""
+        today = datetime.date.today()
+        for days, strike, option_type, price in [(365, 100, OptionType.CALL, 10.0),
+                                                 (90, 110, OptionType.PUT, 12.5),
+                                                 (730, 80, OptionType.CALL, 27.0)]:
+            option = Option("X", "U", option_type, OptionStyle.EUROPEAN, Decimal(strike),
+                            today + datetime.timedelta(days=days))
+            expected = BlackScholes.implied_volatility(option, 100.0, 0.03, price, precision=1e-8)
+
+            result = self.solver.solve(np.array([price]), 100.0, np.array([float(strike)]),
+                                       option.years_to_expiry, 0.03, 0.0, option.is_call)
+
+            self.assertEqual(result.status[0], STATUS_CONVERGED)
+            self.assertAlmostEqual(result.volatility[0], expected, places=5)
+
+    def test_prices_outside_no_arbitrage_bounds(self):
+        """Test the status codes of prices volatility cannot explain."""
+        result = self.solver.solve(
+            prices=np.array([5.0, 150.0, 5.0, 12.0]),
+            spot=100.0,
+            strike=np.array([90.0, 100.0, 100.0, 100.0]),
+            time_to_expiry=np.array([1.0, 1.0, 0.0, 1.0]),
+            risk_free_rate=0.0,
+            dividend_yield=0.0,
+            is_call=np.array([True, True, True, True])
+        )
+
+        self.assertEqual(result.status.tolist(),
+                         [STATUS_NO_TIME_VALUE, STATUS_ABOVE_MAXIMUM, STATUS_EXPIRED, STATUS_CONVERGED])
+        self.assertTrue(np.isnan(result.volatility[:3]).all())
+        summary = result.summary()
+        self.assertEqual(summary["converged"], 1)
+        self.assertEqual(summary["no_time_value"], 1)
+
+
+class TestVolatilitySurface(unittest.TestCase):
+    """Test cases for volatility surfaces and the surface cache."""
+
+    def setUp(self):
+        self.strikes = np.tile(np.linspace(70, 130, 13), 3)
+        self.expiries = np.repeat([0.25, 1.0, 2.0], 13)
+        self.smile = 0.2 + 0.3 * np.log(self.strikes / 100.0) ** 2
+        self.calls = np.ones_like(self.strikes, dtype=bool)
+        self.prices = VectorizedBlackScholes.price(100.0, self.strikes, self.expiries, self.smile,
+                                                   0.02, 0.0, self.calls)
+
+    def test_surface_reproduces_quoted_points(self):
+        """Test that the surface returns the solved volatilities at quoted strikes and expiries."""
+        cache = VolatilitySurfaceCache()
+        cache.calibrate("U", 100.0, self.strikes, self.expiries, self.prices, self.calls, 0.02)
+
+        vols = cache.lookup(np.array(["U"] * len(self.strikes), dtype=object), self.strikes, self.expiries)
+
+        np.testing.assert_allclose(vols, self.smile, atol=1e-6)
+        self.assertEqual(cache.diagnostics()["U"]["converged"], len(self.strikes))
+
+    def test_interpolates_total_variance_between_expiries(self):
+        """Test that volatility between expiries comes from linear total variance."""
+        term_structure = self.smile + 0.05 * self.expiries
+        surface = VolatilitySurface.from_chain("U", 100.0, self.strikes, self.expiries, term_structure)
+
+        vol = surface.volatility(np.array([100.0]), np.array([0.5]))[0]
+
+        # At the money: 21.25% at 3 months and 25% at 1 year, one third of the way between
+        variance = (2 / 3) * 0.2125 ** 2 * 0.25 + (1 / 3) * 0.25 ** 2 * 1.0
+        self.assertAlmostEqual(vol, np.sqrt(variance / 0.5), places=10)
+
+    def test_missing_or_stale_surface_raises(self):
+        """Test that lookups fail for underlyings without a fresh surface."""
+        cache = VolatilitySurfaceCache(max_age=datetime.timedelta(minutes=5))
+        surface = VolatilitySurface.from_chain("U", 100.0, self.strikes, self.expiries, self.smile,
+                                               as_of=datetime.datetime.now() - datetime.timedelta(hours=1))
+        cache.put(surface)
+
+        with self.assertRaises(KeyError):
+            cache.lookup(np.array(["U"], dtype=object), np.array([100.0]), np.array([1.0]))
+        with self.assertRaises(ValueError):
+            VolatilitySurface.from_chain("V", 100.0, np.array([100.0]), np.array([1.0]), np.array([np.nan]))
+
+
+if __name__ == "__main__":
+    unittest.main()
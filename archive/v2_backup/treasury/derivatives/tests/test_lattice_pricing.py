@@ -0,0 +1,97 @@
+"""
+Lattice Pricing Tests - Treasury
+
+This module checks the rolling-array lattice pricer against Black-Scholes
+for European exercise and against the legacy BinomialTree model.
+"""
+import datetime
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from ..options_pricing import Option, OptionType, OptionStyle, BinomialTree
+from ..batch_pricing import VectorizedBlackScholes
+from ..lattice_pricing import LatticePricer, LatticeModel
+
+
+class TestLatticePricer(unittest.TestCase):
+    """Test cases for the lattice option pricer."""
+
+    def test_european_prices_converge_to_black_scholes(self):
+        """Test every lattice scheme against the closed form for European options."""
+        expected = VectorizedBlackScholes.price(100.0, 105.0, 1.0, 0.2, 0.05, 0.01, np.array([True, False]))
+        tolerances = {LatticeModel.CRR: 5e-3, LatticeModel.LEISEN_REIMER: 1e-5, LatticeModel.TRINOMIAL: 5e-3}
+
+        for model, tolerance in tolerances.items():
+            result = LatticePricer(model, 1001).price(100.0, 105.0, 1.0, 0.2, 0.05, 0.01,
+                                                       np.array([True, False]), early_exercise=False)
+            np.testing.assert_allclose(result["price"], expected, atol=tolerance, err_msg=model.value)
+
+    def test_matches_legacy_binomial_tree(self):
+        """Test that a CRR lattice reproduces BinomialTree.price_option at the same steps."""
+        option = Option("X", "U", OptionType.PUT, OptionStyle.AMERICAN, Decimal("110"),
+                        datetime.date.today() + datetime.timedelta(days=365), contract_size=100)
+
+        expected = BinomialTree.price_option(option, 100.0, 0.06, 0.25, 0.01, steps=50)
+        result = LatticePricer(LatticeModel.CRR, 50).price_option(option, 100.0, 0.06, 0.25, 0.01)
+
+        # Theta is per calendar day over two steps here; the legacy tree uses one step
+        for greek in ("price", "delta", "gamma"):
+            self.assertAlmostEqual(result[greek], expected[greek], places=8, msg=greek)
+
+    def test_exercise_styles_are_ordered(self):
+        """Test European <= Bermudan <= American for an in-the-money put."""
+        pricer = LatticePricer(LatticeModel.CRR, 800)
+        args = (100.0, 110.0, 1.0, 0.25, 0.06, 0.0, False)
+
+        european = pricer.price(*args, early_exercise=False)["price"][0]
+        bermudan = pricer.price(*args, early_exercise=True, exercise_times=[0.25, 0.5, 0.75])["price"][0]
+        american = pricer.price(*args, early_exercise=True)["price"][0]
+
+        self.assertLess(european, bermudan)
+        self.assertLess(bermudan, american)
+
+    def test_american_call_without_dividends_is_european(self):
+        """Test that early exercise is never optimal for a call without dividends."""
+        pricer = LatticePricer(LatticeModel.LEISEN_REIMER, 301)
+
+        american = pricer.price(100.0, 95.0, 0.5, 0.3, 0.04, 0.0, True, early_exercise=True)
+        european = pricer.price(100.0, 95.0, 0.5, 0.3, 0.04, 0.0, True, early_exercise=False)
+
+        np.testing.assert_allclose(american["price"], european["price"], rtol=1e-12)
+
+    def test_batch_matches_single_pricing(self):
+        """Test that a batch prices each option as it would alone (including expired ones)."""
+        rng = np.random.default_rng(11)
+        spot = rng.uniform(80, 120, 12)
+        expiry = np.append(rng.uniform(0.1, 2.0, 11), 0.0)
+        vol = rng.uniform(0.1, 0.5, 12)
+        call = rng.random(12) < 0.5
+        pricer = LatticePricer(LatticeModel.TRINOMIAL, 200)
+
+        batch = pricer.price(spot, 100.0, expiry, vol, 0.03, 0.0, call, True)
+
+        for i in range(12):
+            single = pricer.price(spot[i], 100.0, expiry[i], vol[i], 0.03, 0.0, call[i], True)
+            for greek, values in single.items():
+                self.assertAlmostEqual(batch[greek][i], values[0], places=10)
+        self.assertEqual(batch["price"][-1], max(0.0, (1 if call[-1] else -1) * (spot[-1] - 100.0)))
+
+    def test_invalid_configuration_raises(self):
+        """Test rejection of too-small lattices and Bermudans without dates."""
+        with self.assertRaises(ValueError):
+            LatticePricer(LatticeModel.CRR, 1)
+
+        option = Option("X", "U", OptionType.PUT, OptionStyle.BERMUDAN, Decimal("100"),
+                        datetime.date.today() + datetime.timedelta(days=365))
+        with self.assertRaises(ValueError):
+            LatticePricer().price_option(option, 100.0, 0.05, 0.2)
+
+    def test_leisen_reimer_uses_odd_steps(self):
+        """Test that Leisen-Reimer lattices are rounded up to an odd step count."""
+        self.assertEqual(LatticePricer(LatticeModel.LEISEN_REIMER, 200).steps, 201)
+
+
+if __name__ == "__main__":
+    unittest.main()
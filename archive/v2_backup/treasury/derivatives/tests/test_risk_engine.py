@@ -0,0 +1,212 @@
+"""
+Scenario Risk Engine Tests - Treasury
+
+This module checks full-revaluation VaR and ES against a brute-force
+revaluation of every position with the scalar Black-Scholes model.
+"""
+import datetime
+import logging
+import unittest
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from ..options_pricing import Option, OptionType, OptionStyle, BlackScholes
+from ..derivatives_risk import DerivativesRiskManager, DerivativePosition
+from ..risk_engine import ScenarioRiskEngine, ScenarioSet, cholesky_factor, factor_changes
+
+UNDERLYINGS = ["AAPL", "MSFT"]
+SPOTS = {"AAPL": 100.0, "MSFT": 250.0}
+VOLS = {"AAPL": 0.3, "MSFT": 0.25}
+RATE = 0.04
+
+
+def make_manager():
+    """Build a book of long and short options plus a swap and a future."""
+    today = datetime.date.today()
+    manager = DerivativesRiskManager()
+    for i in range(6):
+        underlying = UNDERLYINGS[i % 2]
+        quantity = [5, -3, 2, -4, 1, 6][i]
+        manager.positions[f"OPT{i}"] = DerivativePosition(
+            f"OPT{i}", "option",
+            {
+                "option_type": "call" if i % 3 else "put",
+                "strike_price": SPOTS[underlying] * (0.9 + 0.05 * i),
+                "expiry_date": (today + datetime.timedelta(days=30 + 60 * i)).isoformat(),
+                "contract_size": 100,
+                "quantity": quantity
+            },
+            Decimal(1000 * quantity),
+            underlying=underlying
+        )
+    manager.positions["SWAP"] = DerivativePosition(
+        "SWAP", "swap", {"legs": [{"currency": "USD"}]}, Decimal("50000"), {"dv01": Decimal("250")})
+    manager.positions["FUT"] = DerivativePosition(
+        "FUT", "future", {}, Decimal("0"), {"delta": Decimal("200000")}, underlying="AAPL")
+    return manager
+
+
+def make_history(days=120, seed=5):
+    """Random-walk factor levels for the book's risk factors."""
+    rng = np.random.default_rng(seed)
+    history = pd.DataFrame(index=pd.bdate_range("2025-01-01", periods=days))
+    for underlying in UNDERLYINGS:
+        history[f"spot:{underlying}"] = SPOTS[underlying] * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+        history[f"vol:{underlying}"] = VOLS[underlying] + np.cumsum(rng.normal(0, 0.01, days))
+    history["rate:USD"] = RATE + np.cumsum(rng.normal(0, 0.0005, days))
+    return history
+
+
+def brute_force_pnl(manager, changes, horizon_days=1):
+    """Revalue each position under each scenario, one scalar price at a time."""
+    pnl = np.zeros((len(changes), len(manager.positions)))
+    for column, position in enumerate(manager.positions.values()):
+        details = position.instrument_details
+        if position.instrument_type != "option":
+            if "dv01" in position.risk_metrics:
+                pnl[:, column] = float(position.risk_metrics["dv01"]) * 10000 * changes["rate:USD"]
+            else:
+                pnl[:, column] = float(position.risk_metrics["delta"]) * changes[f"spot:{position.underlying}"]
+            continue
+
+        expiry = datetime.date.fromisoformat(details["expiry_date"])
+        option_type = OptionType.CALL if details["option_type"] == "call" else OptionType.PUT
+        base = Option("B", position.underlying, option_type, OptionStyle.EUROPEAN,
+                      Decimal(str(details["strike_price"])), expiry, details["contract_size"])
+        rolled = Option("R", position.underlying, option_type, OptionStyle.EUROPEAN,
+                        Decimal(str(details["strike_price"])), expiry - datetime.timedelta(days=horizon_days),
+                        details["contract_size"])
+        spot, vol = SPOTS[position.underlying], VOLS[position.underlying]
+        base_price = BlackScholes.price_option(base, spot, RATE, vol)["price"]
+        for row, (_, move) in enumerate(changes.iterrows()):
+            shocked = BlackScholes.price_option(
+                rolled,
+                spot * (1 + move[f"spot:{position.underlying}"]),
+                RATE + move["rate:USD"],
+                vol + move[f"vol:{position.underlying}"]
+            )["price"]
+            pnl[row, column] = (shocked - base_price) * details["quantity"]
+    return pnl
+
+
+class TestScenarioVaR(unittest.TestCase):
+    """Test cases for full-revaluation VaR and ES."""
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.INFO)
+        cls.manager = make_manager()
+        cls.history = make_history()
+        cls.result = cls.manager.calculate_simulated_var(
+            SPOTS, RATE, VOLS, factor_history=cls.history, confidence_level=0.95)
+        cls.losses = -brute_force_pnl(cls.manager, factor_changes(cls.history))
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def test_var_and_es_match_brute_force(self):
+        """Test VaR and ES against the quantile and tail of scalar revaluation."""
+        portfolio = self.losses.sum(axis=1)
+        var = np.quantile(portfolio, 0.95)
+
+        self.assertAlmostEqual(self.result["var"], var, delta=1e-6 * abs(var))
+        self.assertAlmostEqual(self.result["expected_shortfall"], portfolio[portfolio >= var].mean(),
+                               delta=1e-6 * abs(var))
+        self.assertEqual(self.result["num_scenarios"], len(portfolio))
+
+    def test_components_add_up(self):
+        """Test that component VaR and component ES add up to VaR and ES."""
+        positions = self.result["positions"]
+
+        self.assertAlmostEqual(positions["component_var"].sum(), self.result["var"], places=6)
+        self.assertAlmostEqual(positions["component_es"].sum(), self.result["expected_shortfall"], places=6)
+
+    def test_component_es_matches_brute_force_tail(self):
+        """Test component ES against the average position loss over the tail scenarios."""
+        portfolio = self.losses.sum(axis=1)
+        tail = portfolio >= np.quantile(portfolio, 0.95)
+
+        np.testing.assert_allclose(self.result["positions"]["component_es"], self.losses[tail].mean(axis=0),
+                                   rtol=1e-6, atol=1e-6)
+
+    def test_marginal_var_is_signed_per_market_value(self):
+        """Test marginal VaR keeps the sign of short positions and skips zero market values."""
+        positions = self.result["positions"]
+        values = np.array([float(p.market_value) for p in self.manager.positions.values()])
+        nonzero = values != 0
+
+        np.testing.assert_allclose(positions["marginal_var"][nonzero] * values[nonzero],
+                                   positions["component_var"][nonzero])
+        self.assertEqual(positions["marginal_var"][~nonzero].tolist(), [0.0])
+
+    def test_worker_pool_matches_in_process(self):
+        """Test that fanning scenario chunks out to workers gives the same answer."""
+        pooled = self.manager.calculate_simulated_var(
+            SPOTS, RATE, VOLS, factor_history=self.history, confidence_level=0.95, max_workers=2)
+
+        self.assertAlmostEqual(pooled["var"], self.result["var"], places=8)
+        np.testing.assert_allclose(pooled["positions"]["component_es"], self.result["positions"]["component_es"])
+
+    def test_monte_carlo_is_reproducible_by_seed(self):
+        """Test that Monte Carlo VaR is repeatable for a seed."""
+        runs = [
+            self.manager.calculate_simulated_var(SPOTS, RATE, VOLS, factor_history=self.history,
+                                                 method="monte_carlo", num_scenarios=2000, seed=seed)["var"]
+            for seed in (1, 1, 2)
+        ]
+
+        self.assertEqual(runs[0], runs[1])
+        self.assertNotEqual(runs[0], runs[2])
+
+    def test_invalid_inputs_raise(self):
+        """Test the error paths of the VaR entry points."""
+        with self.assertRaises(ValueError):
+            self.manager.calculate_simulated_var(SPOTS, RATE, VOLS)
+        with self.assertRaises(ValueError):
+            self.manager.calculate_simulated_var(SPOTS, RATE, VOLS, factor_history=self.history, method="parametric")
+        with self.assertRaises(ValueError):
+            ScenarioSet.historical(self.history.iloc[:1])
+        book = self.manager.build_risk_book(SPOTS, RATE, VOLS)
+        with self.assertRaises(ValueError):
+            ScenarioRiskEngine().value_at_risk(book, ScenarioSet(book.factors, np.zeros((0, len(book.factors))), "empty"))
+
+
+class TestScenarioSets(unittest.TestCase):
+    """Test cases for scenario construction."""
+
+    def test_grid_moves_tupled_factors_together(self):
+        """Test that a tuple axis shocks its factors by the same move."""
+        grid = ScenarioSet.grid({"spot:AAPL": [-0.1, 0.1], ("rate:USD", "rate:EUR"): [-0.01, 0.0, 0.01]})
+
+        self.assertEqual(len(grid), 6)
+        np.testing.assert_array_equal(grid.shocks[:, 1], grid.shocks[:, 2])
+        self.assertEqual(grid.scenario_names[0], "spot:AAPL=-0.1,rate:USD+rate:EUR=-0.01")
+
+    def test_aligned_leaves_uncovered_factors_unshocked(self):
+        """Test reordering shocks onto a book's factors."""
+        scenarios = ScenarioSet.named({"crash": {"spot:AAPL": -0.2, "vol:AAPL": 0.1}})
+
+        aligned = scenarios.aligned(["vol:AAPL", "rate:USD", "spot:AAPL"])
+
+        np.testing.assert_array_equal(aligned, [[0.1, 0.0, -0.2, 0.0]])
+
+    def test_cholesky_repairs_indefinite_covariance(self):
+        """Test that a slightly indefinite covariance is still factorized."""
+        covariance = np.array([[1.0, 0.9, 0.7], [0.9, 1.0, 0.99], [0.7, 0.99, 1.0]])
+        self.assertLess(np.linalg.eigvalsh(covariance).min(), 0)
+
+        logging.disable(logging.WARNING)
+        try:
+            root = cholesky_factor(covariance)
+        finally:
+            logging.disable(logging.NOTSET)
+
+        np.testing.assert_allclose(root @ root.T, covariance, atol=0.05)
+        np.testing.assert_array_equal(np.triu(root, 1), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
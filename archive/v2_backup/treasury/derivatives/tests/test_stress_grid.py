@@ -0,0 +1,129 @@
+"""
+Stress Grid Tests - Treasury
+
+This module checks scenario-grid stress testing against scalar revaluation
+and the volatility sources used to build the risk book.
+"""
+import logging
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ..implied_volatility import VolatilitySurface
+from ..risk_engine import ScenarioSet
+from .test_risk_engine import SPOTS, VOLS, RATE, make_manager, brute_force_pnl
+
+
+class TestStressGrid(unittest.TestCase):
+    """Test cases for scenario-grid stress testing."""
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.INFO)
+        cls.manager = make_manager()
+        cls.grid = ScenarioSet.grid({
+            ("spot:AAPL", "spot:MSFT"): [-0.2, -0.05, 0.0, 0.1],
+            ("vol:AAPL", "vol:MSFT"): [-0.05, 0.0, 0.1],
+            "rate:USD": [-0.01, 0.01]
+        })
+        cls.result = cls.manager.run_stress_grid(cls.grid, SPOTS, RATE, VOLS, keep_positions=True)
+        cls.cube = cls.result["cube"]
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def test_full_revaluation_matches_scalar_pricing(self):
+        """Test every scenario and position against scalar Black-Scholes revaluation."""
+        changes = pd.DataFrame(self.grid.shocks, columns=self.grid.factors)
+
+        expected = brute_force_pnl(self.manager, changes, horizon_days=0)
+
+        self.assertEqual(self.cube.position_pnl.shape, (24, len(self.manager.positions)))
+        np.testing.assert_allclose(self.cube.position_pnl, expected, rtol=1e-5, atol=1e-2)
+
+    def test_groups_add_up_to_positions(self):
+        """Test that the by-underlying cube sums the position P&L of each group."""
+        underlyings = np.array([p.underlying or "unknown" for p in self.manager.positions.values()])
+
+        for g, group in enumerate(self.cube.groups):
+            np.testing.assert_allclose(self.cube.pnl_by_group[:, g],
+                                       self.cube.position_pnl[:, underlyings == group].sum(axis=1),
+                                       rtol=1e-5, atol=1e-2)
+        self.assertEqual(self.cube.groups, ["AAPL", "MSFT", "unknown"])
+
+    def test_worst_case_rankings(self):
+        """Test that rankings point at the worst scenario and each position's worst cell."""
+        worst = self.result["worst_scenarios"]
+        totals = self.cube.total_pnl
+
+        self.assertEqual([w["pnl"] for w in worst], sorted(totals)[:len(worst)])
+        self.assertEqual(worst[0]["scenario_name"], self.cube.scenario_names[int(np.argmin(totals))])
+        for entry in self.result["worst_positions"]:
+            column = self.cube.position_ids.index(entry["position_id"])
+            self.assertAlmostEqual(entry["pnl"], self.cube.position_pnl[:, column].min(), delta=1e-2)
+
+    def test_approximation_tracks_full_revaluation_for_small_moves(self):
+        """Test that delta-gamma-vega P&L is close to full revaluation near the base."""
+        small = ScenarioSet.grid({("spot:AAPL", "spot:MSFT"): [-0.01, 0.01], ("vol:AAPL", "vol:MSFT"): [-0.005, 0.005]})
+
+        full = self.manager.run_stress_grid(small, SPOTS, RATE, VOLS)["cube"].total_pnl
+        approx = self.manager.run_stress_grid(small, SPOTS, RATE, VOLS, approximate=True)
+        self.assertEqual(approx["method"], "delta_gamma_vega")
+
+        np.testing.assert_allclose(approx["cube"].total_pnl, full, rtol=0.02)
+
+    def test_worker_pool_matches_in_process(self):
+        """Test that the grid fanned out to workers gives the same cube."""
+        pooled = self.manager.run_stress_grid(self.grid, SPOTS, RATE, VOLS, max_workers=2)
+
+        np.testing.assert_allclose(pooled["cube"].pnl_by_group, self.cube.pnl_by_group)
+
+    def test_named_scenarios(self):
+        """Test that a dict of named scenarios is accepted."""
+        result = self.manager.run_stress_grid({"crash": {"spot:AAPL": -0.3}, "calm": {}}, SPOTS, RATE, VOLS,
+                                              group_by="instrument_type")
+
+        self.assertEqual(result["cube"].scenario_names, ["crash", "calm"])
+        self.assertEqual(result["worst_scenarios"][0]["scenario_name"], "crash")
+        np.testing.assert_allclose(result["cube"].pnl_by_group[1], 0.0, atol=1e-6)
+
+
+class TestRiskBookVolatilities(unittest.TestCase):
+    """Test cases for the volatility sources of option positions."""
+
+    def setUp(self):
+        self.manager = make_manager()
+        self.position = self.manager.positions["OPT0"]
+        self.position.instrument_details["implied_volatility"] = 0.55
+        for underlying, spot in SPOTS.items():
+            strikes = spot * np.array([0.5, 1.0, 1.5, 0.5, 1.0, 1.5])
+            expiries = np.array([0.1, 0.1, 0.1, 2.0, 2.0, 2.0])
+            self.manager.volatility_surfaces.put(VolatilitySurface.from_chain(
+                underlying, spot, strikes, expiries, np.full(6, VOLS[underlying] + 0.1)))
+
+    def test_position_volatility_overrides_surface(self):
+        """Test that an explicit implied volatility wins over the surface lookup."""
+        book = self.manager.build_risk_book(SPOTS, RATE)
+
+        expected = [0.55] + [VOLS[p.underlying] + 0.1 for p in list(self.manager.positions.values())[1:6]]
+        np.testing.assert_allclose(book.options.volatility, expected)
+
+    def test_position_volatility_overrides_market_input(self):
+        """Test that an explicit implied volatility wins over the volatilities argument."""
+        book = self.manager.build_risk_book(SPOTS, RATE, VOLS)
+
+        self.assertEqual(book.options.volatility[0], 0.55)
+        self.assertEqual(book.options.volatility[1], VOLS["MSFT"])
+
+    def test_missing_surface_raises(self):
+        """Test that a book needing an uncalibrated surface is rejected."""
+        self.manager.volatility_surfaces.invalidate("MSFT")
+
+        with self.assertRaises(KeyError):
+            self.manager.build_risk_book(SPOTS, RATE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+"""
+Swap Valuation Tests - Treasury
+
+This module checks compiled-curve and book-level swap valuation against a
+period-by-period reference that mirrors the original pricing loops.
+"""
+import datetime
+import logging
+import math
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from treasury.curves.discount_curve import DiscountCurve, InterpolationScheme
+from ..swap_operations import SwapManager, SwapPricingModel, PaymentFrequency, DayCountConvention
+
+CURVE = {"0.25": 0.0425, "0.5": 0.044, "1": 0.0455, "2": 0.0465, "3": 0.047, "5": 0.048, "7": 0.0485, "10": 0.049}
+
+
+def reference_discount_factor(years):
+    """Linear zero-rate interpolation with flat ends, one lookup at a time."""
+    if years <= 0:
+        return 1.0
+    points = sorted((float(t), r) for t, r in CURVE.items())
+    lower = max((p for p in points if p[0] < years), default=points[0])
+    upper = min((p for p in points if p[0] >= years), default=points[-1])
+    if upper[0] == lower[0]:
+        rate = lower[1]
+    else:
+        rate = lower[1] + (upper[1] - lower[1]) * (years - lower[0]) / (upper[0] - lower[0])
+    return math.exp(-rate * years)
+
+
+def reference_swap_value(swap, current_rate):
+    """Floating minus fixed leg value, one period at a time."""
+    today = datetime.date.today()
+    fixed_leg = next(leg for leg in swap.legs if leg.is_fixed)
+    floating_leg = next(leg for leg in swap.legs if not leg.is_fixed)
+
+    fixed_pv, previous = 0.0, fixed_leg.start_date
+    for payment_date in [d for d in fixed_leg.payment_dates if d >= today]:
+        accrual = fixed_leg.calculate_day_count_factor(previous, payment_date)
+        fixed_pv += float(fixed_leg.notional_amount) * float(fixed_leg.rate) * accrual * \
+            reference_discount_factor((payment_date - today).days / 365.0)
+        previous = payment_date
+
+    spread = float(floating_leg.spread or 0)
+    floating_pv, previous = 0.0, floating_leg.start_date
+    for i, payment_date in enumerate(d for d in floating_leg.payment_dates if d >= today):
+        accrual = floating_leg.calculate_day_count_factor(previous, payment_date)
+        df_end = reference_discount_factor((payment_date - today).days / 365.0)
+        if i == 0:
+            rate = current_rate
+        else:
+            df_start = reference_discount_factor((previous - today).days / 365.0)
+            rate = (df_start / df_end - 1) / accrual
+        floating_pv += float(floating_leg.notional_amount) * (rate + spread) * accrual * df_end
+        previous = payment_date
+    return floating_pv - fixed_pv
+
+
+class TestSwapValuation(unittest.TestCase):
+    """Test cases for interest rate swap valuation."""
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.today = datetime.date.today()
+        self.manager = SwapManager()
+        self.manager.update_yield_curve("USD", CURVE)
+        self.manager.update_reference_rate("SOFR", 0.043)
+        for i, years in enumerate([1, 3, 5, 10]):
+            self.manager.create_interest_rate_swap(
+                id=f"S{i}",
+                effective_date=self.today - datetime.timedelta(days=20),
+                maturity_date=self.today.replace(year=self.today.year + years),
+                fixed_rate=Decimal("0.0465"),
+                floating_rate_index="SOFR",
+                notional=Decimal("10000000"),
+                currency="USD",
+                payment_frequency=PaymentFrequency.QUARTERLY,
+                day_count_convention=[DayCountConvention.ACT_360, DayCountConvention.THIRTY_360][i % 2],
+                floating_spread=Decimal("0.001") if i % 2 else None,
+                pay_fixed=bool(i % 2)
+            )
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_value_swap_matches_reference(self):
+        """Test single-swap valuation against the period-by-period reference."""
+        for swap_id, swap in self.manager.swaps.items():
+            expected = reference_swap_value(swap, 0.043)
+            self.assertAlmostEqual(self.manager.value_swap(swap_id)["value"], expected, delta=1e-6)
+
+    def test_book_valuation_matches_single_swaps(self):
+        """Test that value_swaps prices the book like value_swap prices each swap."""
+        book = self.manager.value_swaps()
+
+        for swap_id in self.manager.swaps:
+            self.assertAlmostEqual(book[swap_id]["value"], self.manager.value_swap(swap_id)["value"], delta=1e-6)
+            self.assertAlmostEqual(book[swap_id]["floating_pv"] - book[swap_id]["fixed_pv"],
+                                   book[swap_id]["value"], delta=1e-6)
+
+    def test_book_valuation_follows_rate_updates(self):
+        """Test that the cached schedule is repriced with new reference rates."""
+        before = self.manager.value_swaps()["S0"]["value"]
+        self.manager.update_reference_rate("SOFR", 0.05)
+        after = self.manager.value_swaps()["S0"]["value"]
+
+        self.assertNotAlmostEqual(before, after, places=2)
+        self.assertAlmostEqual(after, reference_swap_value(self.manager.swaps["S0"], 0.05), delta=1e-6)
+
+    def test_missing_market_data_is_reported_per_swap(self):
+        """Test error entries for swaps without a curve or reference rate."""
+        self.manager.create_interest_rate_swap(
+            id="EUR1", effective_date=self.today, maturity_date=self.today.replace(year=self.today.year + 2),
+            fixed_rate=Decimal("0.03"), floating_rate_index="ESTR", notional=Decimal("1000000"), currency="EUR",
+            payment_frequency=PaymentFrequency.ANNUALLY, day_count_convention=DayCountConvention.ACT_360)
+
+        book = self.manager.value_swaps()
+
+        self.assertIn("error", book["EUR1"])
+        self.assertIn("value", book["S0"])
+        self.assertIn("error", self.manager.value_swap("EUR1"))
+
+    def test_swap_risk_bumps_without_mutating_curves(self):
+        """Test that DV01 matches a manual 1bp bump and leaves the stored curve alone."""
+        risk = self.manager.calculate_swap_risk("S2")
+
+        bumped = SwapManager()
+        bumped.update_yield_curve("USD", {tenor: rate + 0.0001 for tenor, rate in CURVE.items()})
+        bumped.update_reference_rate("SOFR", 0.043)
+        bumped.add_swap(self.manager.swaps["S2"])
+        expected = bumped.value_swap("S2")["value"] - self.manager.value_swap("S2")["value"]
+
+        self.assertAlmostEqual(risk["dv01"], expected, delta=1e-6)
+        self.assertEqual(self.manager.yield_curves["USD"], CURVE)
+
+    def test_curve_sensitivities_match_revaluation(self):
+        """Test parallel PV01 and key-rate PV01 against full revaluation."""
+        sensitivities = self.manager.calculate_curve_sensitivities()
+
+        for index, swap_id in enumerate(sensitivities["swap_ids"]):
+            base = self.manager.value_swaps()[swap_id]["value"]
+            self.assertAlmostEqual(sensitivities["value"][index], base, delta=1e-4)
+            self.assertAlmostEqual(sensitivities["key_rate_pv01"][index].sum(), sensitivities["pv01"][index],
+                                   delta=0.01 * abs(sensitivities["pv01"][index]) + 1e-6)
+
+    def test_par_swap_rate_matches_reference_annuity(self):
+        """Test the par rate against (1 - final DF) / annuity from the reference lookup."""
+        maturity = self.today.replace(year=self.today.year + 5)
+        par = SwapPricingModel.calculate_par_swap_rate(self.today, maturity, PaymentFrequency.ANNUALLY,
+                                                       DayCountConvention.ACT_365, CURVE)
+
+        annuity, previous = 0.0, self.today
+        for year in range(1, 6):
+            payment_date = self.today.replace(year=self.today.year + year)
+            annuity += (payment_date - previous).days / 365.0 * \
+                reference_discount_factor((payment_date - self.today).days / 365.0)
+            previous = payment_date
+        final = reference_discount_factor((maturity - self.today).days / 365.0)
+        self.assertAlmostEqual(par, (1 - final) / annuity, places=10)
+
+
+class TestDiscountCurve(unittest.TestCase):
+    """Test cases for compiled discount curves."""
+
+    def test_linear_zero_matches_reference_lookup(self):
+        """Test vectorized discount factors against the one-at-a-time reference."""
+        curve = DiscountCurve.from_dict(CURVE)
+        times = np.array([0.0, 0.1, 0.25, 0.4, 1.0, 2.7, 6.0, 10.0, 30.0])
+
+        np.testing.assert_allclose(curve.discount_factors(times), [reference_discount_factor(t) for t in times])
+        self.assertEqual(curve.discount_factor(-1.0), 1.0)
+
+    def test_schemes_agree_at_curve_tenors(self):
+        """Test that every interpolation scheme reproduces the quoted zero rates."""
+        tenors = np.array([float(t) for t in CURVE])
+        rates = np.array(list(CURVE.values()))
+
+        for scheme in InterpolationScheme:
+            curve = DiscountCurve.from_dict(CURVE, scheme)
+            np.testing.assert_allclose(curve.zero_rates(tenors), rates, err_msg=scheme.value)
+
+    def test_log_linear_discount_factors_give_flat_forwards(self):
+        """Test that forwards are constant between tenors under log-linear DFs."""
+        curve = DiscountCurve.from_dict(CURVE, InterpolationScheme.LOG_LINEAR_DF)
+        times = np.linspace(2.0, 3.0, 6)
+        log_dfs = np.log(curve.discount_factors(times))
+
+        forwards = -np.diff(log_dfs) / np.diff(times)
+        np.testing.assert_allclose(forwards, forwards[0])
+
+    def test_monotone_cubic_does_not_overshoot(self):
+        """Test that PCHIP interpolation stays within neighbouring quotes."""
+        curve = DiscountCurve([1.0, 2.0, 5.0, 10.0], [0.04, 0.05, 0.05, 0.045], InterpolationScheme.MONOTONE_CUBIC)
+        rates = curve.zero_rates(np.linspace(2.0, 5.0, 31))
+
+        np.testing.assert_allclose(rates, 0.05)
+
+    def test_invalid_curve_raises(self):
+        """Test that empty or mismatched curves are rejected."""
+        with self.assertRaises(ValueError):
+            DiscountCurve([], [])
+        with self.assertRaises(ValueError):
+            DiscountCurve([1.0, 2.0], [0.04])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,6 +11,7 @@ from typing import Dict, List, Optional, Tuple, Any
 from decimal import Decimal
 import logging
 import json
+import threading
 import requests
 import pandas as pd
 import numpy as np
@@ -49,6 +50,252 @@ class ExchangeRate:
         return None
 
 
+# Route markers in RateGraphSnapshot.via (other values are pivot indexes)
+DIRECT_ROUTE = -1
+NO_ROUTE = -2
+
+
+@dataclass(frozen=True)
+class RateGraphSnapshot:
+    """
+    Immutable view of every cross rate at one point in time.
+
+    The matrices are indexed [from currency, to currency]. A published
+    snapshot is never modified, so readers can take a reference and use
+    it without locking while a writer builds and publishes the next one.
+    """
+
+    currencies: Tuple[str, ...]
+    index: Dict[str, int]
+    bid: np.ndarray     # Best rate for selling the row currency (0 if no route)
+    ask: np.ndarray     # Best rate for buying the row currency (0 if no route)
+    via: np.ndarray     # Pivot index, DIRECT_ROUTE or NO_ROUTE
+    rates: np.ndarray   # ExchangeRate per pair (None if no route)
+
+    def lookup(self, base_currency: str, quote_currency: str) -> Optional[ExchangeRate]:
+        """Get the exchange rate for a pair, or None if there is no route."""
+        i = self.index.get(base_currency)
+        j = self.index.get(quote_currency)
+        if i is None or j is None:
+            return None
+        return self.rates[i, j]
+
+
+def _grow(matrix: np.ndarray, size: int, fill: Any) -> np.ndarray:
+    """Copy a square matrix into a larger one, filling the new cells."""
+    grown = np.full((size, size), fill, dtype=matrix.dtype)
+    grown[:matrix.shape[0], :matrix.shape[1]] = matrix
+    return grown
+
+
+def _empty_snapshot() -> RateGraphSnapshot:
+    return RateGraphSnapshot(
+        currencies=(),
+        index={},
+        bid=np.zeros((0, 0)),
+        ask=np.zeros((0, 0)),
+        via=np.zeros((0, 0), dtype=np.int64),
+        rates=np.empty((0, 0), dtype=object)
+    )
+
+
+class RateGraph:
+    """
+    Cross-rate index over every quoted currency pair.
+
+    Quotes are edges of a currency graph. A quoted pair (or its inverse)
+    is used as is; any other pair is triangulated through the pivot giving
+    the best executable rate, using only legs whose bid/ask spread is
+    within the liquidity limit. An update to one pair can only change
+    routes that start or end in one of its two currencies, so just those
+    rows and columns of the matrices are recomputed.
+    """
+
+    def __init__(self,
+                max_pivot_spread: Optional[float] = 0.01,
+                pivot_currencies: Optional[List[str]] = None):
+        """
+        Initialize the rate graph.
+
+        Args:
+            max_pivot_spread: Largest relative spread of a triangulation leg
+                              (None for no limit)
+            pivot_currencies: Currencies allowed as pivots (None for any)
+        """
+        self.max_pivot_spread = max_pivot_spread
+        self.pivot_currencies = set(pivot_currencies) if pivot_currencies else None
+        self.snapshot = _empty_snapshot()
+        self._lock = threading.Lock()
+
+        # Writer-side state: executable rate, liquidity and ExchangeRate of each edge
+        self._quotes: Dict[Tuple[str, str], ExchangeRate] = {}
+        self._edge_bid = np.zeros((0, 0))
+        self._edge_liquid = np.zeros((0, 0), dtype=bool)
+        self._edge_rates = np.empty((0, 0), dtype=object)
+        self._pivot_mask = np.zeros(0, dtype=bool)
+
+    def update(self, exchange_rate: ExchangeRate) -> RateGraphSnapshot:
+        """
+        Add or replace a quote and publish a new snapshot.
+
+        Args:
+            exchange_rate: Quoted rate
+
+        Returns:
+            The published snapshot
+        """
+        base = exchange_rate.base_currency
+        quote = exchange_rate.quote_currency
+        if base == quote:
+            return self.snapshot
+
+        with self._lock:
+            current = self.snapshot
+            currencies = current.currencies
+            index = current.index
+            bid, ask, via, rates = current.bid, current.ask, current.via, current.rates
+
+            new_currencies = [c for c in dict.fromkeys((base, quote)) if c not in index]
+            if new_currencies:
+                currencies = currencies + tuple(new_currencies)
+                index = {currency: i for i, currency in enumerate(currencies)}
+                size = len(currencies)
+                bid, ask = _grow(bid, size, 0.0), _grow(ask, size, 0.0)
+                via, rates = _grow(via, size, NO_ROUTE), _grow(rates, size, None)
+                self._edge_bid = _grow(self._edge_bid, size, 0.0)
+                self._edge_liquid = _grow(self._edge_liquid, size, False)
+                self._edge_rates = _grow(self._edge_rates, size, None)
+                self._pivot_mask = np.array([self.pivot_currencies is None or c in self.pivot_currencies
+                                             for c in currencies], dtype=bool)
+            else:
+                bid, ask, via, rates = bid.copy(), ask.copy(), via.copy(), rates.copy()
+
+            a, b = index[base], index[quote]
+            self._quotes[(base, quote)] = exchange_rate
+            self._set_edge(currencies, a, b)
+            self._set_edge(currencies, b, a)
+
+            self._reroute(currencies, [a, b], bid, ask, via, rates)
+
+            self.snapshot = RateGraphSnapshot(currencies, index, bid, ask, via, rates)
+            return self.snapshot
+
+    def _set_edge(self, currencies: Tuple[str, ...], i: int, j: int) -> None:
+        """Derive edge i->j from the direct quote, else from the inverse quote."""
+        base, quote = currencies[i], currencies[j]
+        direct = self._quotes.get((base, quote))
+        inverse = self._quotes.get((quote, base))
+
+        if direct is not None:
+            edge = direct
+        elif inverse is not None and inverse.rate != 0:
+            edge = ExchangeRate(
+                base_currency=base,
+                quote_currency=quote,
+                rate=inverse.inverse_rate,
+                timestamp=inverse.timestamp,
+                bid=Decimal('1') / inverse.ask if inverse.ask else None,
+                ask=Decimal('1') / inverse.bid if inverse.bid else None,
+                source=inverse.source
+            )
+        else:
+            edge = None
+
+        self._edge_rates[i, j] = edge
+        self._edge_bid[i, j] = float(edge.bid or edge.rate) if edge is not None else 0.0
+        spread = edge.spread if edge is not None else None
+        self._edge_liquid[i, j] = edge is not None and (
+            spread is None or self.max_pivot_spread is None or float(spread) <= self.max_pivot_spread
+        )
+
+    def _reroute(self,
+                currencies: Tuple[str, ...],
+                touched: List[int],
+                bid: np.ndarray,
+                ask: np.ndarray,
+                via: np.ndarray,
+                rates: np.ndarray) -> None:
+        """Recompute every pair in the touched rows and columns, in place."""
+        n = len(currencies)
+        legs = np.where(self._edge_liquid, self._edge_bid, 0.0)
+        first_legs = legs * self._pivot_mask[None, :]
+
+        # Two-leg rate through each pivot k: first_legs[i, k] * legs[k, j]
+        row_paths = first_legs[touched][:, :, None] * legs[None, :, :]
+        col_paths = first_legs[:, :, None] * legs[:, touched][None, :, :]
+
+        best = np.zeros((n, n))
+        pivot = np.full((n, n), NO_ROUTE, dtype=np.int64)
+        best[touched, :] = row_paths.max(axis=1)
+        pivot[touched, :] = row_paths.argmax(axis=1)
+        best[:, touched] = col_paths.max(axis=1)
+        pivot[:, touched] = col_paths.argmax(axis=1)
+        pivot[best <= 0] = NO_ROUTE
+
+        # Quoted pairs (direct or inverse) take precedence over triangulation
+        quoted = self._edge_bid > 0
+        best = np.where(quoted, self._edge_bid, best)
+        pivot = np.where(quoted, DIRECT_ROUTE, pivot)
+
+        bid[touched, :] = best[touched, :]
+        bid[:, touched] = best[:, touched]
+        via[touched, :] = pivot[touched, :]
+        via[:, touched] = pivot[:, touched]
+        ask[touched, :] = np.divide(1.0, bid[:, touched].T, out=np.zeros((len(touched), n)), where=bid[:, touched].T > 0)
+        ask[:, touched] = np.divide(1.0, bid[touched, :].T, out=np.zeros((n, len(touched))), where=bid[touched, :].T > 0)
+
+        pairs = {(t, j) for t in touched for j in range(n)} | {(i, t) for t in touched for i in range(n)}
+        for i, j in pairs:
+            rates[i, j] = self._route_rate(currencies, i, j, via)
+
+    def _route_rate(self,
+                   currencies: Tuple[str, ...],
+                   i: int,
+                   j: int,
+                   via: np.ndarray) -> Optional[ExchangeRate]:
+        """Build the ExchangeRate of pair i->j along its route."""
+        route = via[i, j]
+        if i == j or route == NO_ROUTE:
+            return None
+        if route == DIRECT_ROUTE:
+            return self._edge_rates[i, j]
+
+        first = self._edge_rates[i, route]
+        second = self._edge_rates[route, j]
+        rate = first.rate * second.rate
+
+        # Bid along this route; ask is the inverse of the best reverse route's bid
+        bid = None
+        if first.bid is not None or second.bid is not None:
+            bid = (first.bid or first.rate) * (second.bid or second.rate)
+
+        ask = None
+        reverse = via[j, i]
+        if reverse == DIRECT_ROUTE:
+            back = self._edge_rates[j, i]
+            back_bid = back.bid
+        elif reverse != NO_ROUTE:
+            back_first = self._edge_rates[j, reverse]
+            back_second = self._edge_rates[reverse, i]
+            back_bid = None
+            if back_first.bid is not None or back_second.bid is not None:
+                back_bid = (back_first.bid or back_first.rate) * (back_second.bid or back_second.rate)
+        else:
+            back_bid = None
+        if back_bid:
+            ask = Decimal('1') / back_bid
+
+        return ExchangeRate(
+            base_currency=currencies[i],
+            quote_currency=currencies[j],
+            rate=rate,
+            timestamp=max(first.timestamp, second.timestamp),
+            bid=bid,
+            ask=ask,
+            source=f"Triangulated via {currencies[route]}"
+        )
+
+
 class ExchangeRateManager:
     """
     Manages exchange rate data for various currency pairs.
@@ -57,15 +304,23 @@ class ExchangeRateManager:
     forecast exchange rates.
     """
     
-    def __init__(self, base_currency: str = "USD"):
+    def __init__(self, 
+                base_currency: str = "USD",
+                max_pivot_spread: Optional[float] = 0.01,
+                pivot_currencies: Optional[List[str]] = None):
         """
         Initialize the exchange rate manager.
         
         Args:
             base_currency: Default base currency
+            max_pivot_spread: Largest relative bid/ask spread of a quote used
+                              as a triangulation leg (None for no limit)
+            pivot_currencies: Currencies cross rates may be triangulated
+                              through (None for any quoted currency)
         """
         self.base_currency = base_currency
         self.current_rates: Dict[str, Dict[str, ExchangeRate]] = {}
+        self.rate_graph = RateGraph(max_pivot_spread, pivot_currencies)
         self.historical_rates: Dict[datetime.date, Dict[str, Dict[str, Decimal]]] = {}
         self.api_keys: Dict[str, str] = {}
         self._data_directory = None
@@ -217,6 +472,7 @@ class ExchangeRateManager:
         
         # Store the rate
         self.current_rates[base_currency][quote_currency] = exchange_rate
+        self.rate_graph.update(exchange_rate)
         
         # Add to historical data (daily resolution)
         date = timestamp.date()
@@ -234,6 +490,9 @@ class ExchangeRateManager:
         """
         Get the current exchange rate for a currency pair.
         
+        Quoted pairs and their inverses are returned as quoted; other pairs
+        are triangulated through the best liquid pivot currency.
+        
         Args:
             base_currency: Base currency code
             quote_currency: Quote currency code
@@ -241,51 +500,25 @@ class ExchangeRateManager:
         Returns:
             Exchange rate or None if not available
         """
-        # Direct lookup
-        if base_currency in self.current_rates and quote_currency in self.current_rates[base_currency]:
-            return self.current_rates[base_currency][quote_currency]
-        
-        # Try inverse rate
-        if quote_currency in self.current_rates and base_currency in self.current_rates[quote_currency]:
-            inverse = self.current_rates[quote_currency][base_currency]
-            return ExchangeRate(
-                base_currency=base_currency,
-                quote_currency=quote_currency,
-                rate=inverse.inverse_rate,
-                timestamp=inverse.timestamp,
-                source=inverse.source
-            )
+        return self.rate_graph.snapshot.lookup(base_currency, quote_currency)
+    
+    def get_rate_snapshot(self) -> RateGraphSnapshot:
+        """
+        Get a consistent view of all current cross rates.
         
-        # Try triangulation via common currency (e.g., USD)
-        common_currencies = [self.base_currency]
-        for common in common_currencies:
-            if (common != base_currency and common != quote_currency and
-                base_currency in self.current_rates and common in self.current_rates[base_currency] and
-                common in self.current_rates and quote_currency in self.current_rates[common]):
-                
-                rate1 = self.current_rates[base_currency][common]
-                rate2 = self.current_rates[common][quote_currency]
-                
-                # Calculate triangulated rate
-                triangulated_rate = rate1.rate * rate2.rate
-                
-                # Use most recent timestamp
-                timestamp = max(rate1.timestamp, rate2.timestamp)
-                
-                return ExchangeRate(
-                    base_currency=base_currency,
-                    quote_currency=quote_currency,
-                    rate=triangulated_rate,
-                    timestamp=timestamp,
-                    source=f"Triangulated via {common}"
-                )
+        The snapshot does not change when rates are updated afterwards, so
+        a batch of conversions can be priced off one set of rates.
         
-        return None
+        Returns:
+            RateGraphSnapshot
+        """
+        return self.rate_graph.snapshot
     
     def convert_amount(self, 
                      amount: Decimal, 
                      from_currency: str, 
-                     to_currency: str) -> Optional[Decimal]:
+                     to_currency: str,
+                     side: str = "mid") -> Optional[Decimal]:
         """
         Convert an amount between currencies.
         
@@ -293,6 +526,9 @@ class ExchangeRateManager:
             amount: Amount to convert
             from_currency: Source currency code
             to_currency: Target currency code
+            side: Rate to convert at: "mid", "bid" (selling the source
+                  currency) or "ask" (buying it); bid and ask fall back to
+                  mid when the route has no two-way quotes
             
         Returns:
             Converted amount or None if conversion not possible
@@ -300,8 +536,12 @@ class ExchangeRateManager:
         if from_currency == to_currency:
             return amount
             
-        rate = self.get_rate(from_currency, to_currency)
+        rate = self.rate_graph.snapshot.lookup(from_currency, to_currency)
         if rate:
+            if side == "bid" and rate.bid is not None:
+                return amount * rate.bid
+            if side == "ask" and rate.ask is not None:
+                return amount * rate.ask
             return amount * rate.rate
         
         logger.warning(f"No exchange rate available for {from_currency}/{to_currency}")
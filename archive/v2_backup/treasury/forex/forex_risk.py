@@ -12,11 +12,15 @@ from typing import Dict, List, Optional, Union, Tuple, Any
 from decimal import Decimal
 import logging
 import math
+import os
 import numpy as np
 import pandas as pd
 from scipy import stats
 import matplotlib.pyplot as plt
 
+from treasury.forex.rate_history import RateHistoryStore
+from treasury.forex.fx_monte_carlo import FxMonteCarloEngine
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -62,19 +66,28 @@ class ForexRiskManager:
     foreign exchange risk exposure.
     """
     
-    def __init__(self, base_currency: str = "USD"):
+    def __init__(self, base_currency: str = "USD", history_directory: Optional[str] = None,
+                 monte_carlo_workers: int = 1, monte_carlo_seed: Optional[int] = 42):
         """
         Initialize the forex risk manager.
         
         Args:
             base_currency: Base currency for risk calculations
+            history_directory: Directory for memory-mapped rate history
+                               (one subdirectory per base currency; in memory if None)
+            monte_carlo_workers: Worker processes for Monte Carlo simulation
+            monte_carlo_seed: Default Monte Carlo seed (None for fresh entropy per run)
         """
         self.base_currency = base_currency
+        self.history_directory = history_directory
         self.risk_limits: List[RiskLimit] = []
         self.historical_rates: Dict[str, Dict[datetime.date, Dict[str, float]]] = {}
+        self.rate_history: Dict[str, RateHistoryStore] = {}
         self.current_positions: Dict[str, Decimal] = {}
         self.volatility_data: Dict[str, float] = {}
         self.correlation_matrix: Optional[pd.DataFrame] = None
+        self.monte_carlo_engine = FxMonteCarloEngine(max_workers=monte_carlo_workers)
+        self.monte_carlo_seed = monte_carlo_seed
     
     def set_risk_limit(self, metric: RiskMetricType,
                       limit_value: Decimal,
@@ -141,8 +154,42 @@ class ForexRiskManager:
                 
             self.historical_rates[base_currency][date][quote_currency] = rate
             
+        self.get_rate_history(base_currency).add_series(quote_currency, rates_data)
         logger.info(f"Added {len(rates_data)} historical rates for {base_currency}/{quote_currency}")
     
+    def add_rate_fixings(self, base_currency: str,
+                         date: datetime.date,
+                         rates: Dict[str, float]) -> None:
+        """
+        Add one date's fixings, updating cached return statistics incrementally.
+        
+        Args:
+            base_currency: Base currency code
+            date: Fixing date
+            rates: Dictionary mapping quote currencies to rates
+        """
+        day = self.historical_rates.setdefault(base_currency, {}).setdefault(date, {})
+        day.update(rates)
+        self.get_rate_history(base_currency).add_fixings(date, rates)
+    
+    def get_rate_history(self, base_currency: str) -> RateHistoryStore:
+        """
+        Get the columnar rate history for a base currency, creating it if needed.
+        
+        Args:
+            base_currency: Base currency code
+            
+        Returns:
+            RateHistoryStore
+        """
+        store = self.rate_history.get(base_currency)
+        if store is None:
+            directory = (os.path.join(self.history_directory, base_currency)
+                         if self.history_directory else None)
+            store = RateHistoryStore(base_currency, directory)
+            self.rate_history[base_currency] = store
+        return store
+    
     def calculate_volatility(self, currency_pair: Tuple[str, str],
                            days: int = 30,
                            annualized: bool = True) -> float:
@@ -160,39 +207,17 @@ class ForexRiskManager:
         base, quote = currency_pair
         
         # Check if we have historical data
-        if base not in self.historical_rates:
+        store = self.rate_history.get(base)
+        if store is None:
             logger.warning(f"No historical data for {base}")
             return 0.0
             
-        # Get dates in descending order
-        dates = sorted([d for d in self.historical_rates[base].keys() 
-                      if quote in self.historical_rates[base][d]], reverse=True)
-        
-        if len(dates) < 2:
+        if quote not in store.currencies or store.series(quote).size < 2:
             logger.warning(f"Insufficient data for {base}/{quote}")
             return 0.0
             
-        # Use at most the requested number of days
-        dates = dates[:days]
-        
-        # Get rates
-        rates = [self.historical_rates[base][date][quote] for date in dates]
-        
-        # Calculate daily returns
-        returns = []
-        for i in range(1, len(rates)):
-            returns.append(math.log(rates[i-1] / rates[i]))
-            
-        # Calculate standard deviation
-        if not returns:
-            return 0.0
-            
-        std_dev = np.std(returns, ddof=1)
+        std_dev = store.volatility(quote, days=days, annualized=annualized)
         
-        # Annualize if requested
-        if annualized:
-            std_dev *= math.sqrt(252)  # Approximately 252 trading days in a year
-            
         # Store volatility
         pair_key = f"{base}/{quote}"
         self.volatility_data[pair_key] = std_dev
@@ -211,37 +236,22 @@ class ForexRiskManager:
         Returns:
             Pandas DataFrame with correlation matrix
         """
-        # Prepare data for correlation calculation
+        # Prepare data for correlation calculation, from each base's cached returns
         returns_data = {}
         
         for base in currencies:
-            if base not in self.historical_rates:
+            store = self.rate_history.get(base)
+            if store is None:
                 continue
                 
-            for quote in currencies:
-                if base == quote:
-                    continue
-                    
-                # Get dates where this pair has data
-                dates = sorted([d for d in self.historical_rates[base].keys() 
-                              if quote in self.historical_rates[base][d]], reverse=True)
-                
-                if len(dates) < 2:
-                    continue
-                    
-                # Use at most the requested number of days
-                dates = dates[:days]
-                
-                # Get rates and calculate returns
-                rates = [self.historical_rates[base][date][quote] for date in dates]
-                returns = []
+            quotes = [quote for quote in currencies if quote != base and quote in store.currencies]
+            if not quotes:
+                continue
                 
-                for i in range(1, len(rates)):
-                    returns.append(math.log(rates[i-1] / rates[i]))
-                    
-                if returns:
-                    pair_key = f"{base}/{quote}"
-                    returns_data[pair_key] = returns
+            returns = store.log_returns(quotes, days=days)
+            for quote, column in zip(quotes, returns.T):
+                if np.isfinite(column).any():
+                    returns_data[f"{base}/{quote}"] = column
         
         # Create DataFrame from returns
         df = pd.DataFrame(returns_data)
@@ -315,32 +325,19 @@ class ForexRiskManager:
         # Use historical rates against base currency
         base = self.base_currency
         
-        if base not in self.historical_rates:
+        if base not in self.rate_history:
             logger.warning(f"No historical data for {base}")
             return 0.0
         
-        # Get dates where we have the currency rate
-        dates = sorted([d for d in self.historical_rates[base].keys() 
-                      if currency in self.historical_rates[base][d]], reverse=True)
-        
-        if len(dates) < 2:
+        returns = self._simple_returns(base, currency)
+        if returns.size == 0:
             logger.warning(f"Insufficient data for {base}/{currency}")
             return 0.0
         
-        # Get rates and calculate returns
-        rates = [self.historical_rates[base][date][currency] for date in dates]
-        returns = []
-        
-        for i in range(1, len(rates)):
-            returns.append(rates[i-1] / rates[i] - 1)  # Simple return
-        
-        if not returns:
-            return 0.0
-        
         # Calculate VaR
         returns.sort()
         index = int(len(returns) * (1 - confidence_level))
-        var_return = abs(returns[index])
+        var_return = abs(float(returns[index]))
         
         # Scale for time horizon
         var_return *= math.sqrt(days)
@@ -350,6 +347,14 @@ class ForexRiskManager:
         
         return var
     
+    def _simple_returns(self, base: str, currency: str) -> np.ndarray:
+        """Simple daily returns of a pair over its whole history (empty if too short)."""
+        store = self.rate_history.get(base)
+        if store is None or currency not in store.currencies:
+            return np.zeros(0)
+        rates = store.series(currency)
+        return rates[1:] / rates[:-1] - 1
+    
     def _calculate_parametric_var(self, currency: str,
                                position_value: float,
                                confidence_level: float,
@@ -379,23 +384,53 @@ class ForexRiskManager:
         pair = (self.base_currency, currency)
         volatility = self.calculate_volatility(pair, days=30, annualized=True)
         
-        # Run simulation
-        simulations = 10000
+        # Run simulation on the shared engine, with its own seeded stream
         daily_vol = volatility / math.sqrt(252)
+        result = self.monte_carlo_engine.value_at_risk(
+            {currency: position_value}, np.array([[daily_vol ** 2]]),
+            confidence_level=confidence_level, days=days, num_paths=10000, seed=self.monte_carlo_seed
+        )
         
-        np.random.seed(42)  # for reproducibility
-        z = np.random.normal(0, 1, simulations)
-        simulated_returns = np.exp(z * daily_vol * math.sqrt(days) - 0.5 * daily_vol**2 * days) - 1
-        
-        # Calculate VaR
-        simulated_returns.sort()
-        index = int(simulations * (1 - confidence_level))
-        var_return = abs(simulated_returns[index])
+        return max(result["var"], 0.0)
+    
+    def calculate_monte_carlo_var(self,
+                                  confidence_level: float = 0.99,
+                                  days: int = 10,
+                                  num_paths: int = 100_000,
+                                  seed: Optional[int] = None,
+                                  interval: float = 0.95) -> Dict[str, Any]:
+        """
+        Calculate Monte Carlo VaR for all currency positions jointly.
         
-        # Calculate VaR in base currency
-        var = position_value * var_return
+        Paths are correlated through the EWMA covariance of the base
+        currency's rate history.
         
-        return var
+        Args:
+            confidence_level: Confidence level
+            days: Time horizon in days
+            num_paths: Number of simulated paths
+            seed: Seed (defaults to the manager's Monte Carlo seed)
+            interval: Coverage of the confidence intervals on VaR and ES
+            
+        Returns:
+            Dictionary with var, expected_shortfall, confidence intervals,
+            standard errors and run details
+        """
+        store = self.rate_history.get(self.base_currency)
+        if store is None:
+            raise ValueError(f"No rate history for base currency {self.base_currency}")
+            
+        exposures = {currency: float(position) for currency, position in self.current_positions.items()
+                     if currency in store.currencies}
+        missing = set(self.current_positions) - set(exposures)
+        if missing:
+            logger.warning(f"No rate history for {', '.join(sorted(missing))}; excluded from Monte Carlo VaR")
+            
+        return self.monte_carlo_engine.value_at_risk(
+            exposures, store.ewma_covariance(list(exposures)),
+            confidence_level=confidence_level, days=days, num_paths=num_paths,
+            seed=self.monte_carlo_seed if seed is None else seed, interval=interval
+        )
     
     def calculate_expected_shortfall(self, currency: str,
                                   position_amount: Optional[Decimal] = None,
@@ -433,7 +468,7 @@ class ForexRiskManager:
         # Use historical rates against base currency
         base = self.base_currency
         
-        if base not in self.historical_rates:
+        if base not in self.rate_history:
             logger.warning(f"No historical data for {base}")
             return RiskMetric(
                 name=f"ES_{currency}",
@@ -444,11 +479,9 @@ class ForexRiskManager:
                 currency=currency
             )
         
-        # Get dates where we have the currency rate
-        dates = sorted([d for d in self.historical_rates[base].keys() 
-                      if currency in self.historical_rates[base][d]], reverse=True)
+        returns = self._simple_returns(base, currency)
         
-        if len(dates) < 2:
+        if returns.size == 0:
             logger.warning(f"Insufficient data for {base}/{currency}")
             return RiskMetric(
                 name=f"ES_{currency}",
@@ -459,28 +492,11 @@ class ForexRiskManager:
                 currency=currency
             )
         
-        # Get rates and calculate returns
-        rates = [self.historical_rates[base][date][currency] for date in dates]
-        returns = []
-        
-        for i in range(1, len(rates)):
-            returns.append(rates[i-1] / rates[i] - 1)  # Simple return
-        
-        if not returns:
-            return RiskMetric(
-                name=f"ES_{currency}",
-                value=Decimal('0'),
-                timestamp=datetime.datetime.now(),
-                confidence_level=confidence_level,
-                time_horizon=days,
-                currency=currency
-            )
-        
         # Calculate ES
         returns.sort()
         var_index = int(len(returns) * (1 - confidence_level))
-        es_returns = returns[:var_index]
-        es_return = abs(sum(es_returns) / len(es_returns))
+        es_returns = returns[:max(var_index, 1)]
+        es_return = abs(float(es_returns.mean()))
         
         # Scale for time horizon
         es_return *= math.sqrt(days)
@@ -499,13 +515,18 @@ class ForexRiskManager:
     
     def calculate_portfolio_var(self, 
                               confidence_level: float = 0.99,
-                              days: int = 10) -> RiskMetric:
+                              days: int = 10,
+                              method: str = 'ewma') -> RiskMetric:
         """
         Calculate Value at Risk for the entire currency portfolio.
         
         Args:
             confidence_level: Confidence level
             days: Time horizon in days
+            method: 'ewma' for parametric VaR on the cached EWMA covariance of
+                    the base currency's rate history, 'monte_carlo' to simulate
+                    all positions jointly on that covariance, or 'historical'
+                    to combine single-currency VaRs through the correlation matrix
             
         Returns:
             RiskMetric with calculated portfolio VaR
@@ -521,6 +542,30 @@ class ForexRiskManager:
                 time_horizon=days
             )
         
+        store = self.rate_history.get(self.base_currency)
+        if method == 'monte_carlo' and store is not None:
+            result = self.calculate_monte_carlo_var(confidence_level, days)
+            return RiskMetric(
+                name="Portfolio_VaR",
+                value=Decimal(str(result["var"])),
+                timestamp=datetime.datetime.now(),
+                confidence_level=confidence_level,
+                time_horizon=days
+            )
+            
+        if method == 'ewma' and store is not None:
+            positions = {currency: float(position) for currency, position in self.current_positions.items()}
+            missing = [currency for currency in positions if currency not in store.currencies]
+            if missing:
+                logger.warning(f"No rate history for {', '.join(missing)}; excluded from portfolio VaR")
+            return RiskMetric(
+                name="Portfolio_VaR",
+                value=Decimal(str(store.portfolio_var(positions, confidence_level, days))),
+                timestamp=datetime.datetime.now(),
+                confidence_level=confidence_level,
+                time_horizon=days
+            )
+        
         # Check if we need to calculate correlation matrix
         currencies = list(self.current_positions.keys())
         if self.correlation_matrix is None or not all(curr in self.correlation_matrix for curr in currencies):
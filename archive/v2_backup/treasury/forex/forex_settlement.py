@@ -11,9 +11,12 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, List, Optional, Set, Tuple
 from decimal import Decimal
+import bisect
 import logging
 import uuid
 
+from treasury.forex.settlement_netting import SettlementNettingEngine
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -68,10 +71,23 @@ class FxSettlementManager:
     including netting, confirmation, and settlement tracking.
     """
     
-    def __init__(self):
-        """Initialize the forex settlement manager."""
+    def __init__(self, netting_engine: Optional[SettlementNettingEngine] = None):
+        """
+        Initialize the forex settlement manager.
+        
+        Args:
+            netting_engine: Running net positions of executed trades; pass the
+                            same engine to FxTradeManager to keep it updated
+        """
         self.settlements: Dict[str, Settlement] = {}
         self.settlement_history: List[Dict] = []
+        self.netting_engine = netting_engine or SettlementNettingEngine()
+        
+        # Secondary indexes of settlement IDs
+        self._by_counterparty: Dict[str, List[str]] = {}
+        self._by_date: Dict[datetime.date, List[str]] = {}
+        self._dates: List[datetime.date] = []  # sorted keys of _by_date
+        self._by_trade: Dict[str, List[str]] = {}
         
     def create_settlement(self,
                         settlement_date: datetime.date,
@@ -106,7 +122,12 @@ class FxSettlementManager:
         )
         
         self.settlements[settlement.id] = settlement
-        
+        self._index_settlement(settlement)
+
+        # Settled trades leave their positions so they are not netted again
+        for trade_id in settlement.trade_ids:
+            self.netting_engine.remove_trade(trade_id)
+
         self._add_settlement_history(
             settlement, 
             "created", 
@@ -115,6 +136,24 @@ class FxSettlementManager:
         
         logger.info(f"Created settlement {settlement.id} for {counterparty} on {settlement_date}")
         return settlement
+    
+    def _index_settlement(self, settlement: Settlement) -> None:
+        """
+        Add a settlement to the counterparty, date and trade indexes.
+        
+        Args:
+            settlement: Settlement object
+        """
+        self._by_counterparty.setdefault(settlement.counterparty, []).append(settlement.id)
+        
+        date = settlement.settlement_date
+        if date not in self._by_date:
+            self._by_date[date] = []
+            bisect.insort(self._dates, date)
+        self._by_date[date].append(settlement.id)
+        
+        for trade_id in settlement.trade_ids:
+            self._by_trade.setdefault(trade_id, []).append(settlement.id)
         
     def confirm_settlement(self, settlement_id: str, 
                          confirmation_id: str) -> bool:
@@ -329,9 +368,12 @@ class FxSettlementManager:
         Returns:
             List of matching settlements
         """
+        first = bisect.bisect_left(self._dates, start_date)
+        last = bisect.bisect_right(self._dates, end_date)
         return [
-            s for s in self.settlements.values()
-            if start_date <= s.settlement_date <= end_date
+            self.settlements[settlement_id]
+            for date in self._dates[first:last]
+            for settlement_id in self._by_date[date]
         ]
         
     def get_settlements_by_counterparty(self, counterparty: str) -> List[Settlement]:
@@ -344,10 +386,7 @@ class FxSettlementManager:
         Returns:
             List of matching settlements
         """
-        return [
-            s for s in self.settlements.values()
-            if s.counterparty == counterparty
-        ]
+        return [self.settlements[settlement_id] for settlement_id in self._by_counterparty.get(counterparty, [])]
         
     def get_settlements_by_trade(self, trade_id: str) -> List[Settlement]:
         """
@@ -359,10 +398,7 @@ class FxSettlementManager:
         Returns:
             List of matching settlements
         """
-        return [
-            s for s in self.settlements.values()
-            if trade_id in s.trade_ids
-        ]
+        return [self.settlements[settlement_id] for settlement_id in self._by_trade.get(trade_id, [])]
         
     def get_settlement_history(self, settlement_id: str) -> List[Dict]:
         """
@@ -458,6 +494,68 @@ class FxSettlementManager:
         logger.info(f"Created netted settlement {settlement.id} with {len(net_by_currency)} currencies")
         return settlement
         
+    def create_netted_settlements(self,
+                                value_date: datetime.date,
+                                multilateral: bool = False,
+                                settlement_system: str = "CLS") -> List[Settlement]:
+        """
+        Create netted settlements for every position on a value date.
+        
+        Positions come from the netting engine, which is kept up to date as
+        trades are executed, so no trade list has to be re-aggregated. The
+        positions are released from the engine once settlements exist.
+        Trades that net off completely still get a settlement, with zero
+        amounts in their currencies, so every trade is accounted for.
+        
+        Args:
+            value_date: Value date to settle
+            multilateral: Create one settlement with the settlement system
+                          instead of one per counterparty
+            settlement_system: Counterparty name of the multilateral settlement
+            
+        Returns:
+            List of created settlements
+        """
+        netting = self.netting_engine.net_value_date(value_date)
+        settlements = []
+        
+        if multilateral:
+            trade_ids = [trade_id for item in netting["bilateral"] for trade_id in item["trade_ids"]]
+            if trade_ids:
+                payments = netting["multilateral"]
+                if not payments:
+                    currencies = {currency for item in netting["bilateral"] for currency in item["currencies"]}
+                    payments = {currency: Decimal('0') for currency in sorted(currencies)}
+                notes = (f"Multilateral netted settlement for {len(trade_ids)} trades "
+                         f"across {len(netting['bilateral'])} counterparties")
+                settlements.append(self.create_settlement(
+                    settlement_date=value_date,
+                    counterparty=settlement_system,
+                    trade_ids=trade_ids,
+                    settlements_by_currency=payments,
+                    notes=notes if netting["multilateral"] else f"{notes}, netted off with no payments due"
+                ))
+        else:
+            for item in netting["bilateral"]:
+                notes = f"Netted settlement for {len(item['trade_ids'])} trades"
+                payments = item["payments"]
+                if not payments:
+                    payments = {currency: Decimal('0') for currency in item["currencies"]}
+                    notes = f"{notes}, netted off with no payments due"
+                settlements.append(self.create_settlement(
+                    settlement_date=value_date,
+                    counterparty=item["counterparty"],
+                    trade_ids=item["trade_ids"],
+                    settlements_by_currency=payments,
+                    notes=notes
+                ))
+        
+        self.netting_engine.clear_value_date(value_date)
+        
+        logger.info(f"Created {len(settlements)} {'multilateral' if multilateral else 'bilateral'} "
+                   f"netted settlements for {value_date}: {netting['gross_payment_count']} gross payments")
+        return settlements
+        
     def _get_next_business_day(self, date: datetime.date) -> datetime.date:
         """
         Get the next business day after the given date.
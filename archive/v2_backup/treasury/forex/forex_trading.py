@@ -13,6 +13,8 @@ from decimal import Decimal
 import logging
 import uuid
 
+from treasury.forex.settlement_netting import SettlementNettingEngine
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -78,10 +80,17 @@ class FxTradeManager:
     foreign exchange trades.
     """
     
-    def __init__(self):
-        """Initialize the foreign exchange trade manager."""
+    def __init__(self, netting_engine: Optional[SettlementNettingEngine] = None):
+        """
+        Initialize the foreign exchange trade manager.
+        
+        Args:
+            netting_engine: Engine that executed trades are posted to (the one
+                            FxSettlementManager nets from)
+        """
         self.trades: Dict[str, FxTrade] = {}
         self.trade_history: List[Dict] = []
+        self.netting_engine = netting_engine
     
     def create_trade(self, 
                     trade_type: TradeType, 
@@ -164,6 +173,10 @@ class FxTradeManager:
         # Update trade status
         trade.status = TradeStatus.EXECUTED
         
+        # Post to the running settlement positions
+        if self.netting_engine is not None:
+            self.netting_engine.add_trade(trade)
+        
         # Add to history
         self._add_trade_history(trade, "executed", execution_notes or "Trade executed")
         
@@ -196,6 +209,10 @@ class FxTradeManager:
         if settlement_id:
             trade.settlement_id = settlement_id
         
+        # A trade settled on its own no longer belongs in a netted position
+        if self.netting_engine is not None:
+            self.netting_engine.remove_trade(trade_id)
+        
         # Add to history
         self._add_trade_history(
             trade, 
@@ -230,6 +247,9 @@ class FxTradeManager:
         # Update trade status
         trade.status = TradeStatus.CANCELLED
         
+        if self.netting_engine is not None:
+            self.netting_engine.remove_trade(trade_id)
+        
         # Add to history
         self._add_trade_history(trade, "cancelled", f"Trade cancelled: {reason}")
         
@@ -0,0 +1,417 @@
+"""
+Rate history module for treasury operations.
+
+This module stores exchange rate fixings against one base currency as a
+dense date x currency matrix, in memory or memory-mapped on disk, and
+keeps log returns, rolling volatility sums and an EWMA covariance matrix
+up to date as fixings arrive, so risk queries read cached arrays instead
+of re-sorting dates and rebuilding return series.
+"""
+
+import datetime
+import json
+import os
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence
+import logging
+import math
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Approximately 252 trading days in a year
+TRADING_DAYS = 252
+
+_INITIAL_ROWS = 256
+_INITIAL_COLUMNS = 8
+
+
+class RateHistoryStore:
+    """
+    Columnar history of base/quote fixings.
+
+    Rows are fixing dates in ascending order and columns are quote
+    currencies; missing fixings are NaN. Appending a fixing for a new
+    latest date updates the cached statistics in O(currencies^2); fixings
+    inserted before the latest date mark them stale and they are rebuilt,
+    vectorized, on the next query.
+
+    When a directory is given the rate and date matrices are .npy memory
+    maps inside it (with the currency list in a small JSON file), and an
+    existing store in that directory is reopened.
+    """
+
+    def __init__(self,
+                 base_currency: str,
+                 directory: Optional[str] = None,
+                 vol_window: int = 30,
+                 ewma_lambda: float = 0.94):
+        """
+        Initialize the store.
+
+        Args:
+            base_currency: Base currency of every fixing
+            directory: Directory for memory-mapped storage (in memory if None)
+            vol_window: Number of returns in the cached rolling volatility
+            ewma_lambda: Decay factor of the EWMA covariance (RiskMetrics 0.94)
+        """
+        self.base_currency = base_currency
+        self.directory = directory
+        self.vol_window = vol_window
+        self.ewma_lambda = ewma_lambda
+
+        self.currencies: List[str] = []
+        self._columns: Dict[str, int] = {}
+        self._rows = 0
+        self._dates = np.zeros(0, dtype=np.int64)  # date ordinals, 0 for unused rows
+        self._rates = np.zeros((0, 0))
+
+        if directory and os.path.exists(self._path("currencies.json")):
+            self._open()
+        else:
+            self._dates, self._rates = self._allocate(_INITIAL_ROWS, _INITIAL_COLUMNS)
+
+        self._stale = True
+        # Log returns live in the leading rows of a buffer that grows by doubling
+        self._return_buffer = np.zeros((0, 0))
+        self._return_rows = 0
+        self._window_sum = np.zeros(0)
+        self._window_sumsq = np.zeros(0)
+        self._window_count = np.zeros(0)
+        self._ewma = np.zeros((0, 0))
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _open(self) -> None:
+        with open(self._path("currencies.json")) as handle:
+            self.currencies = json.load(handle)["currencies"]
+        self._columns = {currency: i for i, currency in enumerate(self.currencies)}
+        self._dates = np.load(self._path("dates.npy"), mmap_mode="r+")
+        self._rates = np.load(self._path("rates.npy"), mmap_mode="r+")
+        self._rows = int(np.count_nonzero(self._dates))
+        logger.info(f"Opened {self.base_currency} rate history with {self._rows} dates "
+                    f"and {len(self.currencies)} currencies")
+
+    def _allocate(self, rows: int, columns: int):
+        """Allocate date and rate arrays, copying the current contents."""
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            dates = np.lib.format.open_memmap(self._path("dates.npy.tmp"), mode="w+", dtype=np.int64, shape=(rows,))
+            rates = np.lib.format.open_memmap(self._path("rates.npy.tmp"), mode="w+", dtype=np.float64,
+                                              shape=(rows, columns))
+        else:
+            dates = np.zeros(rows, dtype=np.int64)
+            rates = np.empty((rows, columns))
+
+        dates[:] = 0
+        rates[:] = np.nan
+        old_rows, old_columns = self._rates.shape
+        dates[:min(rows, self._dates.size)] = self._dates[:rows]
+        rates[:min(rows, old_rows), :min(columns, old_columns)] = self._rates[:rows, :columns]
+
+        if self.directory:
+            dates.flush()
+            rates.flush()
+            del dates, rates
+            self._dates = self._rates = None
+            os.replace(self._path("dates.npy.tmp"), self._path("dates.npy"))
+            os.replace(self._path("rates.npy.tmp"), self._path("rates.npy"))
+            dates = np.load(self._path("dates.npy"), mmap_mode="r+")
+            rates = np.load(self._path("rates.npy"), mmap_mode="r+")
+        return dates, rates
+
+    def _column(self, currency: str) -> int:
+        """Column of a currency, adding it (and growing the matrix) if new."""
+        column = self._columns.get(currency)
+        if column is not None:
+            return column
+
+        column = len(self.currencies)
+        if column >= self._rates.shape[1]:
+            self._dates, self._rates = self._allocate(self._rates.shape[0], 2 * self._rates.shape[1])
+        self.currencies.append(currency)
+        self._columns[currency] = column
+        if self.directory:
+            with open(self._path("currencies.json"), "w") as handle:
+                json.dump({"base_currency": self.base_currency, "currencies": self.currencies}, handle)
+        self._stale = True
+        return column
+
+    def _rows_for(self, ordinals: np.ndarray) -> np.ndarray:
+        """Rows of the given dates, inserting any that are new."""
+        existing = self._dates[:self._rows]
+        if self._rows == 0 or ordinals.min() > existing[-1]:
+            new = np.unique(ordinals)  # all after the latest date (the usual case)
+        else:
+            new = np.setdiff1d(ordinals, existing)
+        if new.size:
+            needed = self._rows + new.size
+            if needed > self._dates.size:
+                self._dates, self._rates = self._allocate(max(needed, 2 * self._dates.size), self._rates.shape[1])
+                existing = self._dates[:self._rows]
+
+            if self._rows == 0 or new[0] > existing[-1]:
+                self._dates[self._rows:needed] = new
+            else:
+                # Back-filled dates: merge into date order and restate history
+                merged = np.union1d(existing, new)
+                old_rates = np.array(self._rates[:self._rows])
+                self._rates[:needed] = np.nan
+                self._rates[np.searchsorted(merged, existing)] = old_rates
+                self._dates[:needed] = merged
+                self._stale = True
+            self._rows = needed
+
+        return np.searchsorted(self._dates[:self._rows], ordinals)
+
+    def flush(self) -> None:
+        """Flush memory-mapped arrays to disk."""
+        if self.directory:
+            self._dates.flush()
+            self._rates.flush()
+
+    def add_series(self, currency: str, rates_data: Dict[datetime.date, float]) -> None:
+        """
+        Add fixings for one currency over many dates.
+
+        Args:
+            currency: Quote currency code
+            rates_data: Dictionary mapping dates to rates
+        """
+        if not rates_data:
+            return
+        column = self._column(currency)
+        ordinals = np.fromiter((d.toordinal() for d in rates_data), dtype=np.int64, count=len(rates_data))
+        values = np.fromiter(rates_data.values(), dtype=np.float64, count=len(rates_data))
+        rows = self._rows_for(ordinals)
+        self._rates[rows, column] = values
+        self._stale = True
+
+    def add_fixings(self, date: datetime.date, rates: Dict[str, float]) -> None:
+        """
+        Add the fixings of one date for any number of currencies.
+
+        Fixings for a date after the latest one are folded into the cached
+        returns, rolling sums and EWMA covariance incrementally.
+
+        Args:
+            date: Fixing date
+            rates: Dictionary mapping quote currencies to rates
+        """
+        columns = [self._column(currency) for currency in rates]
+        ordinal = date.toordinal()
+        appended = self._rows == 0 or ordinal > self._dates[self._rows - 1]
+        row = int(self._rows_for(np.array([ordinal], dtype=np.int64))[0])
+        self._rates[row, columns] = list(rates.values())
+
+        if not appended or row != self._rows - 1:
+            self._stale = True
+        elif not self._stale and row > 0:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self._append_return(np.log(self._rates[row, :len(self.currencies)]
+                                           / self._rates[row - 1, :len(self.currencies)]))
+
+    @property
+    def _returns(self) -> np.ndarray:
+        return self._return_buffer[:self._return_rows]
+
+    def _append_return(self, returns: np.ndarray) -> None:
+        """Fold one new row of log returns into the cached statistics."""
+        if self._return_rows == self._return_buffer.shape[0]:
+            grown = np.empty((max(_INITIAL_ROWS, 2 * self._return_rows), returns.size))
+            grown[:self._return_rows] = self._returns
+            self._return_buffer = grown
+        self._return_buffer[self._return_rows] = returns
+        self._return_rows += 1
+
+        valid = np.isfinite(returns)
+        clean = np.where(valid, returns, 0.0)
+
+        self._window_sum += clean
+        self._window_sumsq += clean * clean
+        self._window_count += valid
+        leaving = self._return_rows - 1 - self.vol_window
+        if leaving >= 0:
+            old = self._returns[leaving]
+            old_valid = np.isfinite(old)
+            old_clean = np.where(old_valid, old, 0.0)
+            self._window_sum -= old_clean
+            self._window_sumsq -= old_clean * old_clean
+            self._window_count -= old_valid
+
+        self._ewma *= self.ewma_lambda
+        self._ewma += (1.0 - self.ewma_lambda) * np.outer(clean, clean)
+
+    def _refresh(self) -> None:
+        """Rebuild the cached statistics from the full history."""
+        if not self._stale:
+            return
+        count = len(self.currencies)
+        rates = self._rates[:self._rows, :count]
+        self._return_rows = max(0, self._rows - 1)
+        self._return_buffer = np.empty((max(_INITIAL_ROWS, 2 * self._return_rows), count))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            np.log(rates[1:] / rates[:-1], out=self._return_buffer[:self._return_rows])
+
+        window = self._returns[-self.vol_window:] if self.vol_window else self._returns[:0]
+        valid = np.isfinite(window)
+        clean = np.where(valid, window, 0.0)
+        self._window_sum = clean.sum(axis=0)
+        self._window_sumsq = (clean * clean).sum(axis=0)
+        self._window_count = valid.sum(axis=0).astype(np.float64)
+
+        # S_T = sum_t (1 - lambda) * lambda^(T - 1 - t) * r_t r_t', the recursion from S = 0
+        all_clean = np.nan_to_num(self._returns, nan=0.0)
+        weights = (1.0 - self.ewma_lambda) * self.ewma_lambda ** np.arange(all_clean.shape[0] - 1, -1, -1)
+        self._ewma = (all_clean * weights[:, None]).T @ all_clean
+        self._stale = False
+
+    def __len__(self) -> int:
+        return self._rows
+
+    @property
+    def dates(self) -> List[datetime.date]:
+        """Fixing dates in ascending order."""
+        return [datetime.date.fromordinal(int(o)) for o in self._dates[:self._rows]]
+
+    def _indices(self, currencies: Optional[Sequence[str]]) -> np.ndarray:
+        if currencies is None:
+            return np.arange(len(self.currencies))
+        return np.array([self._columns[currency] for currency in currencies], dtype=np.int64)
+
+    def rates(self, currencies: Optional[Sequence[str]] = None, days: Optional[int] = None) -> np.ndarray:
+        """
+        Rate matrix (dates x currencies), most recent row last.
+
+        Args:
+            currencies: Columns to return (defaults to all)
+            days: Number of most recent dates (defaults to all)
+
+        Returns:
+            Array of rates (NaN where there is no fixing)
+        """
+        start = 0 if days is None else max(0, self._rows - days)
+        return np.asarray(self._rates[start:self._rows][:, self._indices(currencies)])
+
+    def log_returns(self, currencies: Optional[Sequence[str]] = None, days: Optional[int] = None) -> np.ndarray:
+        """
+        Cached daily log returns (dates - 1 x currencies), most recent row last.
+
+        Args:
+            currencies: Columns to return (defaults to all)
+            days: Number of most recent dates the returns span (defaults to all)
+
+        Returns:
+            Array of log returns (NaN next to missing fixings)
+        """
+        self._refresh()
+        start = 0 if days is None else max(0, self._returns.shape[0] - (days - 1))
+        return self._returns[start:][:, self._indices(currencies)]
+
+    def series(self, currency: str) -> np.ndarray:
+        """
+        Fixings of one currency on the dates it has them, oldest first.
+
+        Args:
+            currency: Quote currency code
+
+        Returns:
+            Array of rates
+        """
+        column = np.asarray(self._rates[:self._rows, self._columns[currency]])
+        return column[np.isfinite(column)]
+
+    def volatility(self, currency: str, days: int = 30, annualized: bool = True) -> float:
+        """
+        Volatility of log returns over a currency's last `days` fixings.
+
+        Args:
+            currency: Quote currency code
+            days: Number of fixings to include
+            annualized: Whether to annualize the volatility
+
+        Returns:
+            Volatility as decimal (0.0 with fewer than two returns)
+        """
+        if currency not in self._columns:
+            return 0.0
+        returns = np.diff(np.log(self.series(currency)[-days:]))
+        if returns.size < 2:
+            return 0.0
+        std_dev = float(np.std(returns, ddof=1))
+        return std_dev * math.sqrt(TRADING_DAYS) if annualized else std_dev
+
+    def rolling_volatility(self, currencies: Optional[Sequence[str]] = None, annualized: bool = True) -> np.ndarray:
+        """
+        Cached volatility over the last vol_window return rows.
+
+        Args:
+            currencies: Columns to return (defaults to all)
+            annualized: Whether to annualize the volatility
+
+        Returns:
+            Array of volatilities (NaN with fewer than two returns in the window)
+        """
+        self._refresh()
+        index = self._indices(currencies)
+        count = self._window_count[index]
+        total = self._window_sum[index]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variance = (self._window_sumsq[index] - total * total / count) / (count - 1)
+        vol = np.sqrt(np.where(count > 1, np.maximum(variance, 0.0), np.nan))
+        return vol * math.sqrt(TRADING_DAYS) if annualized else vol
+
+    def ewma_covariance(self, currencies: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        Cached EWMA covariance of daily log returns.
+
+        Args:
+            currencies: Rows and columns to return (defaults to all)
+
+        Returns:
+            Covariance matrix
+        """
+        self._refresh()
+        index = self._indices(currencies)
+        return self._ewma[np.ix_(index, index)]
+
+    def ewma_correlation(self, currencies: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        Correlation matrix implied by the EWMA covariance.
+
+        Args:
+            currencies: Rows and columns to return (defaults to all)
+
+        Returns:
+            Correlation matrix
+        """
+        covariance = self.ewma_covariance(currencies)
+        scale = np.sqrt(np.diag(covariance))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return covariance / np.outer(scale, scale)
+
+    def portfolio_var(self,
+                      positions: Dict[str, float],
+                      confidence_level: float = 0.99,
+                      days: int = 1) -> float:
+        """
+        Parametric portfolio VaR from the cached EWMA covariance.
+
+        Args:
+            positions: Base currency exposure by quote currency
+            confidence_level: Confidence level
+            days: Time horizon in days (square-root-of-time scaling)
+
+        Returns:
+            VaR in the base currency (currencies without history are ignored)
+        """
+        held = [currency for currency in positions if currency in self._columns]
+        if not held:
+            return 0.0
+        exposure = np.array([positions[currency] for currency in held], dtype=np.float64)
+        covariance = self.ewma_covariance(held)
+        variance = float(exposure @ covariance @ exposure)
+        z_score = NormalDist().inv_cdf(confidence_level)
+        return z_score * math.sqrt(max(variance, 0.0) * days)
@@ -0,0 +1,197 @@
+"""
+Settlement Netting module for treasury operations.
+
+This module keeps running net settlement positions per counterparty,
+value date and currency as FX trades are executed, so that the netted
+payment instructions for a value date are read off the positions instead
+of being re-aggregated from the trade list.
+"""
+
+import datetime
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+from decimal import Decimal
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class _TradeLegs:
+    """Settlement flows of one trade: receive the buy leg, pay the sell leg."""
+
+    counterparty: str
+    value_date: datetime.date
+    buy_currency: str
+    buy_amount: Decimal
+    sell_currency: str
+    sell_amount: Decimal
+
+
+class SettlementNettingEngine:
+    """
+    Running net positions per (counterparty, value date, currency).
+
+    Amounts are signed from our side: positive is received, negative is
+    paid. Each trade's legs are remembered so that a cancelled or
+    individually settled trade can be backed out of its position.
+    """
+
+    def __init__(self):
+        """Initialize the netting engine."""
+        self._positions: Dict[Tuple[str, datetime.date], Dict[str, Decimal]] = {}
+        self._position_trades: Dict[Tuple[str, datetime.date], Set[str]] = {}
+        self._counterparties_by_date: Dict[datetime.date, Set[str]] = {}
+        self._trades: Dict[str, _TradeLegs] = {}
+
+    def add_trade(self, trade) -> None:
+        """
+        Add an executed trade to its counterparty's position.
+
+        Args:
+            trade: FxTrade (or any object with the same settlement fields)
+        """
+        if trade.id in self._trades:
+            return
+
+        legs = _TradeLegs(
+            counterparty=trade.counterparty,
+            value_date=trade.value_date,
+            buy_currency=trade.buy_currency,
+            buy_amount=trade.buy_amount,
+            sell_currency=trade.sell_currency,
+            sell_amount=trade.sell_amount
+        )
+        self._trades[trade.id] = legs
+
+        key = (legs.counterparty, legs.value_date)
+        self._apply(key, legs, Decimal('1'))
+        self._position_trades.setdefault(key, set()).add(trade.id)
+        self._counterparties_by_date.setdefault(legs.value_date, set()).add(legs.counterparty)
+
+    def remove_trade(self, trade_id: str) -> bool:
+        """
+        Back a trade out of its position.
+
+        Args:
+            trade_id: Trade ID
+
+        Returns:
+            True if the trade was held in a position
+        """
+        legs = self._trades.pop(trade_id, None)
+        if legs is None:
+            return False
+
+        key = (legs.counterparty, legs.value_date)
+        self._apply(key, legs, Decimal('-1'))
+        trades = self._position_trades[key]
+        trades.discard(trade_id)
+        if not trades:
+            self._drop_position(key)
+        return True
+
+    def _apply(self, key: Tuple[str, datetime.date], legs: _TradeLegs, sign: Decimal) -> None:
+        position = self._positions.setdefault(key, {})
+        position[legs.buy_currency] = position.get(legs.buy_currency, Decimal('0')) + sign * legs.buy_amount
+        position[legs.sell_currency] = position.get(legs.sell_currency, Decimal('0')) - sign * legs.sell_amount
+
+    def _drop_position(self, key: Tuple[str, datetime.date]) -> None:
+        counterparty, value_date = key
+        self._positions.pop(key, None)
+        self._position_trades.pop(key, None)
+        counterparties = self._counterparties_by_date.get(value_date)
+        if counterparties is not None:
+            counterparties.discard(counterparty)
+            if not counterparties:
+                del self._counterparties_by_date[value_date]
+
+    def get_position(self, counterparty: str, value_date: datetime.date) -> Dict[str, Decimal]:
+        """
+        Get the net position with a counterparty for a value date.
+
+        Args:
+            counterparty: Counterparty name
+            value_date: Value date
+
+        Returns:
+            Dictionary mapping currency to non-zero net amount
+        """
+        position = self._positions.get((counterparty, value_date), {})
+        return {currency: amount for currency, amount in position.items() if amount != 0}
+
+    def get_value_dates(self) -> List[datetime.date]:
+        """Get the value dates that have open positions, in order."""
+        return sorted(self._counterparties_by_date)
+
+    def net_value_date(self, value_date: datetime.date) -> Dict:
+        """
+        Produce bilateral and multilateral netted instructions for a value date.
+
+        Both sets come from one pass over the date's positions: each
+        counterparty's net amounts are its bilateral instructions, and
+        their sum per currency is the single multilateral net payment.
+
+        Args:
+            value_date: Value date
+
+        Returns:
+            Dictionary with bilateral instructions per counterparty (trade
+            IDs, currencies traded and non-zero net payments), multilateral
+            net amounts per currency, and payment counts
+        """
+        bilateral = []
+        multilateral: Dict[str, Decimal] = {}
+        gross_payments = 0
+
+        for counterparty in sorted(self._counterparties_by_date.get(value_date, ())):
+            key = (counterparty, value_date)
+            trade_ids = sorted(self._position_trades[key])
+            gross_payments += 2 * len(trade_ids)
+
+            payments = {}
+            for currency, amount in self._positions[key].items():
+                multilateral[currency] = multilateral.get(currency, Decimal('0')) + amount
+                if amount != 0:
+                    payments[currency] = amount
+
+            bilateral.append({
+                "counterparty": counterparty,
+                "trade_ids": trade_ids,
+                "currencies": sorted(self._positions[key]),
+                "payments": payments
+            })
+
+        multilateral = {currency: amount for currency, amount in multilateral.items() if amount != 0}
+        bilateral_payments = sum(len(item["payments"]) for item in bilateral)
+
+        return {
+            "value_date": value_date,
+            "bilateral": bilateral,
+            "multilateral": multilateral,
+            "gross_payment_count": gross_payments,
+            "bilateral_payment_count": bilateral_payments,
+            "multilateral_payment_count": len(multilateral)
+        }
+
+    def clear_value_date(self, value_date: datetime.date, counterparty: Optional[str] = None) -> List[str]:
+        """
+        Release positions once their settlements have been created.
+
+        Args:
+            value_date: Value date
+            counterparty: Only release this counterparty's position
+
+        Returns:
+            IDs of the trades released
+        """
+        counterparties = [counterparty] if counterparty else list(self._counterparties_by_date.get(value_date, ()))
+        released = []
+        for name in counterparties:
+            key = (name, value_date)
+            for trade_id in self._position_trades.get(key, ()):
+                self._trades.pop(trade_id, None)
+                released.append(trade_id)
+            self._drop_position(key)
+        return released
@@ -0,0 +1,3 @@
+"""
+Treasury forex tests package.
+"""
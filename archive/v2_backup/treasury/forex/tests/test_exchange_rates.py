@@ -0,0 +1,200 @@
+"""
+Exchange Rate Tests - Treasury
+
+This module checks the cross-rate graph: quoted and triangulated rates
+against a brute-force search over pivots, incremental updates against a
+freshly built graph, and conversions off published snapshots.
+"""
+import datetime
+import itertools
+import logging
+import random
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from ..exchange_rates import ExchangeRate, ExchangeRateManager, RateGraph, DIRECT_ROUTE, NO_ROUTE
+
+NOW = datetime.datetime(2026, 10, 1, 12, 0)
+
+
+def random_quotes(count=80, currencies=15, seed=1):
+    """Random mid, bid and ask quotes, some one-way and some with wide spreads."""
+    rng = random.Random(seed)
+    names = [f"C{i}" for i in range(currencies)]
+    quotes = {}
+    for _ in range(count):
+        base, quote = rng.sample(names, 2)
+        mid = rng.uniform(0.5, 2.0)
+        spread = rng.choice([None, 0.001, 0.02])
+        bid = ask = None
+        if spread:
+            bid = Decimal(str(round(mid * (1 - spread / 2), 6)))
+            ask = Decimal(str(round(mid * (1 + spread / 2), 6)))
+        quotes[(base, quote)] = (Decimal(str(round(mid, 6))), bid, ask)
+    return names, quotes
+
+
+def brute_force_bid(quotes, base, quote, currencies, max_spread):
+    """Best executable rate: the quote or its inverse, else the best liquid two-leg route."""
+    def edge(a, b):
+        if (a, b) in quotes:
+            rate, bid, ask = quotes[(a, b)]
+            spread = None if bid is None else (ask - bid) / bid
+            return float(bid or rate), spread
+        if (b, a) in quotes:
+            rate, bid, ask = quotes[(b, a)]
+            spread = None if bid is None else (ask - bid) / bid
+            return (1 / float(ask) if ask else 1 / float(rate)), spread
+        return None
+
+    direct = edge(base, quote)
+    if direct:
+        return direct[0]
+    best = 0.0
+    for pivot in currencies:
+        if pivot in (base, quote):
+            continue
+        first, second = edge(base, pivot), edge(pivot, quote)
+        if first and second and all(leg[1] is None or leg[1] <= max_spread for leg in (first, second)):
+            best = max(best, first[0] * second[0])
+    return best
+
+
+class TestExchangeRateManager(unittest.TestCase):
+    """Test cases for quoted, inverse and triangulated rates."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        logging.disable(logging.INFO)
+        self.manager = ExchangeRateManager("USD")
+        self.manager._add_rate("USD", "EUR", Decimal("0.85"), NOW, bid=Decimal("0.849"), ask=Decimal("0.851"))
+        self.manager._add_rate("USD", "GBP", Decimal("0.75"), NOW)
+        self.manager._add_rate("USD", "JPY", Decimal("110.25"), NOW)
+
+    def tearDown(self):
+        """Re-enable logging."""
+        logging.disable(logging.NOTSET)
+
+    def test_quoted_and_inverse_rates(self):
+        """Test that a quote is used as is and its inverse swaps bid and ask."""
+        direct = self.manager.get_rate("USD", "EUR")
+        inverse = self.manager.get_rate("EUR", "USD")
+
+        self.assertEqual(direct.rate, Decimal("0.85"))
+        self.assertEqual(inverse.rate, Decimal("1") / Decimal("0.85"))
+        self.assertEqual(inverse.bid, Decimal("1") / Decimal("0.851"))
+        self.assertEqual(inverse.ask, Decimal("1") / Decimal("0.849"))
+
+    def test_cross_rate_is_triangulated(self):
+        """Test a pair without a quote priced through the shared currency."""
+        cross = self.manager.get_rate("JPY", "GBP")
+
+        self.assertEqual(cross.rate, Decimal("1") / Decimal("110.25") * Decimal("0.75"))
+        self.assertEqual(cross.source, "Triangulated via USD")
+        self.assertIsNone(cross.bid)
+        self.assertIsNone(self.manager.get_rate("JPY", "CHF"))
+
+    def test_quote_replaces_triangulation(self):
+        """Test that quoting a cross pair takes precedence over its route."""
+        self.manager._add_rate("EUR", "GBP", Decimal("0.88"), NOW)
+
+        self.assertEqual(self.manager.get_rate("EUR", "GBP").rate, Decimal("0.88"))
+        snapshot = self.manager.get_rate_snapshot()
+        self.assertEqual(snapshot.via[snapshot.index["EUR"], snapshot.index["GBP"]], DIRECT_ROUTE)
+
+    def test_convert_amount_sides(self):
+        """Test mid, bid and ask conversions and their fallbacks."""
+        amount = Decimal("1000")
+
+        self.assertEqual(self.manager.convert_amount(amount, "USD", "EUR"), Decimal("850.00"))
+        self.assertEqual(self.manager.convert_amount(amount, "USD", "EUR", side="bid"), Decimal("849.000"))
+        self.assertEqual(self.manager.convert_amount(amount, "USD", "EUR", side="ask"), Decimal("851.000"))
+        self.assertEqual(self.manager.convert_amount(amount, "USD", "GBP", side="bid"), Decimal("750.00"))
+        self.assertEqual(self.manager.convert_amount(amount, "USD", "USD"), amount)
+        self.assertIsNone(self.manager.convert_amount(amount, "USD", "CHF"))
+
+    def test_published_snapshot_does_not_change(self):
+        """Test that readers keep a consistent view while rates are updated."""
+        snapshot = self.manager.get_rate_snapshot()
+        rate = snapshot.lookup("USD", "EUR")
+
+        self.manager._add_rate("USD", "EUR", Decimal("0.90"), NOW)
+        self.manager._add_rate("CHF", "USD", Decimal("1.10"), NOW)
+
+        self.assertIs(snapshot.lookup("USD", "EUR"), rate)
+        self.assertIsNone(snapshot.lookup("CHF", "USD"))
+        self.assertEqual(self.manager.get_rate("USD", "EUR").rate, Decimal("0.90"))
+
+
+class TestRateGraph(unittest.TestCase):
+    """Test cases for the cross-rate graph against brute force."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        logging.disable(logging.INFO)
+        self.currencies, self.quotes = random_quotes()
+
+    def tearDown(self):
+        """Re-enable logging."""
+        logging.disable(logging.NOTSET)
+
+    def build(self, quotes, **settings):
+        graph = RateGraph(**settings)
+        for (base, quote), (rate, bid, ask) in quotes.items():
+            graph.update(ExchangeRate(base, quote, rate, NOW, bid=bid, ask=ask))
+        return graph
+
+    def test_best_rates_match_brute_force(self):
+        """Test every pair's executable rate and route against a search over pivots."""
+        snapshot = self.build(self.quotes, max_pivot_spread=0.01).snapshot
+
+        for base, quote in itertools.permutations(snapshot.currencies, 2):
+            expected = brute_force_bid(self.quotes, base, quote, self.currencies, 0.01)
+            i, j = snapshot.index[base], snapshot.index[quote]
+            self.assertAlmostEqual(snapshot.bid[i, j], expected, places=12, msg=f"{base}/{quote}")
+            self.assertEqual(snapshot.lookup(base, quote) is None, expected == 0)
+            self.assertEqual(snapshot.via[i, j] == NO_ROUTE, expected == 0)
+            if expected and snapshot.lookup(base, quote).bid is not None:
+                self.assertAlmostEqual(float(snapshot.lookup(base, quote).bid), expected, places=9)
+            if snapshot.bid[j, i] > 0:
+                self.assertAlmostEqual(snapshot.ask[i, j], 1 / snapshot.bid[j, i])
+
+    def test_incremental_updates_match_fresh_graph(self):
+        """Test that rerouting only touched rows and columns gives the full result."""
+        graph = self.build(self.quotes)
+        rng = random.Random(2)
+        final = dict(self.quotes)
+        for base, quote in rng.sample(sorted(self.quotes), 20):
+            rate = Decimal(str(round(rng.uniform(0.5, 2.0), 6)))
+            final[(base, quote)] = (rate, None, None)
+            graph.update(ExchangeRate(base, quote, rate, NOW))
+
+        fresh = self.build(final).snapshot
+        order = [graph.snapshot.index[c] for c in fresh.currencies]
+        np.testing.assert_allclose(graph.snapshot.bid[np.ix_(order, order)], fresh.bid)
+        np.testing.assert_allclose(graph.snapshot.ask[np.ix_(order, order)], fresh.ask)
+
+    def test_pivot_limits(self):
+        """Test that illiquid legs and non-pivot currencies are not triangulated through."""
+        quotes = {("A", "B"): (Decimal("2"), Decimal("1.9"), Decimal("2.1")),
+                  ("B", "C"): (Decimal("3"), None, None),
+                  ("A", "D"): (Decimal("5"), None, None),
+                  ("D", "C"): (Decimal("1"), None, None)}
+
+        liquid = self.build(quotes, max_pivot_spread=None).snapshot
+        limited = self.build(quotes, max_pivot_spread=0.01).snapshot
+        pivots = self.build(quotes, max_pivot_spread=None, pivot_currencies=["D"]).snapshot
+
+        self.assertEqual(liquid.lookup("A", "C").rate, Decimal("6"))
+        self.assertEqual(liquid.lookup("A", "C").source, "Triangulated via B")
+        self.assertEqual(limited.lookup("A", "C").rate, Decimal("5"))
+        self.assertEqual(limited.lookup("A", "C").source, "Triangulated via D")
+        self.assertEqual(pivots.lookup("A", "C").source, "Triangulated via D")
+        self.assertIsNone(self.build({("A", "B"): quotes[("A", "B")], ("B", "C"): quotes[("B", "C")]},
+                                     max_pivot_spread=0.01).snapshot.lookup("A", "C"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+"""
+FX Monte Carlo Tests - Treasury
+
+This module checks the chunked Monte Carlo VaR engine: reproducibility
+from a seed, agreement with the closed-form lognormal quantile, and the
+confidence intervals it reports.
+"""
+import logging
+import math
+import unittest
+from decimal import Decimal
+from statistics import NormalDist
+
+import numpy as np
+
+from ..forex_risk import ForexRiskManager
+from ..fx_monte_carlo import FxMonteCarloEngine, simulate_chunk
+from .test_rate_history import CURRENCIES, make_paths
+
+
+def make_book(count=8, seed=3):
+    """Random exposures and a positive definite daily covariance."""
+    rng = np.random.default_rng(seed)
+    a = rng.normal(size=(count, count))
+    covariance = (a @ a.T / count + np.eye(count) * 0.5) * 1e-5
+    exposures = {f"C{i}": float(rng.normal() * 1e6) for i in range(count)}
+    return exposures, covariance
+
+
+class TestFxMonteCarloEngine(unittest.TestCase):
+    """Test cases for FxMonteCarloEngine."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        logging.disable(logging.INFO)
+        self.exposures, self.covariance = make_book()
+
+    def tearDown(self):
+        """Re-enable logging."""
+        logging.disable(logging.NOTSET)
+
+    def test_seed_reproduces_run(self):
+        """Test that a seed, or the reported entropy, reproduces the estimates."""
+        engine = FxMonteCarloEngine(chunk_paths=5000)
+        first = engine.value_at_risk(self.exposures, self.covariance, num_paths=30_000, seed=7)
+        again = engine.value_at_risk(self.exposures, self.covariance, num_paths=30_000, seed=7)
+        other = engine.value_at_risk(self.exposures, self.covariance, num_paths=30_000, seed=8)
+        unseeded = engine.value_at_risk(self.exposures, self.covariance, num_paths=30_000)
+        replayed = engine.value_at_risk(self.exposures, self.covariance, num_paths=30_000,
+                                        seed=unseeded["seed_entropy"])
+
+        self.assertEqual(first["var"], again["var"])
+        self.assertEqual(first["expected_shortfall"], again["expected_shortfall"])
+        self.assertNotEqual(first["var"], other["var"])
+        self.assertEqual(unseeded["var"], replayed["var"])
+
+    def test_process_pool_matches_in_process(self):
+        """Test that chunks give the same numbers wherever they run."""
+        local = FxMonteCarloEngine(chunk_paths=5000).value_at_risk(
+            self.exposures, self.covariance, num_paths=20_000, seed=11)
+        pooled = FxMonteCarloEngine(max_workers=2, chunk_paths=5000).value_at_risk(
+            self.exposures, self.covariance, num_paths=20_000, seed=11)
+
+        self.assertEqual(local["var"], pooled["var"])
+        self.assertEqual(local["es_confidence_interval"], pooled["es_confidence_interval"])
+
+    def test_path_counts(self):
+        """Test that a partial last chunk is simulated and rounded up to whole pairs."""
+        engine = FxMonteCarloEngine(chunk_paths=1001)
+        pnl, _ = engine.simulate_pnl(list(self.exposures.values()), self.covariance, num_paths=2501, seed=1)
+
+        self.assertEqual(engine.chunk_paths, 1002)
+        self.assertEqual(pnl.size, 2502)
+        self.assertEqual(FxMonteCarloEngine(antithetic=False).simulate_pnl(
+            [1.0], np.array([[1e-4]]), num_paths=2501, seed=1)[0].size, 2501)
+
+    def test_antithetic_pairs_mirror_each_other(self):
+        """Test that paired draws have log returns symmetric about the drift."""
+        variance = 1e-4
+        pnl = simulate_chunk(np.random.SeedSequence(5), 1000, np.array([[math.sqrt(variance)]]),
+                             np.array([1.0]), 10, True)
+        returns = np.log1p(pnl).reshape(-1, 2)
+
+        np.testing.assert_allclose(returns.sum(axis=1), -variance * 10, atol=1e-12)
+
+    def test_single_currency_matches_lognormal_quantile(self):
+        """Test VaR and ES against closed forms, inside the reported intervals."""
+        exposure, daily_vol, days = 1e6, 0.01, 10
+        sigma = daily_vol * math.sqrt(days)
+        mu = -0.5 * sigma ** 2
+        z = NormalDist().inv_cdf(0.01)
+        expected_var = exposure * (1 - math.exp(mu + sigma * z))
+        # E[loss | r < q] for a lognormal tail
+        tail = NormalDist().cdf(z - sigma) / 0.01
+        expected_es = exposure * (1 - math.exp(mu + 0.5 * sigma ** 2) * tail)
+
+        result = FxMonteCarloEngine().value_at_risk({"EUR": exposure}, np.array([[daily_vol ** 2]]),
+                                                    days=days, num_paths=200_000, seed=2)
+
+        low, high = result["var_confidence_interval"]
+        self.assertLess(low, result["var"])
+        self.assertLess(result["var"], high)
+        self.assertAlmostEqual(result["var"], expected_var, delta=4 * result["var_standard_error"])
+        self.assertAlmostEqual(result["expected_shortfall"], expected_es, delta=4 * result["es_standard_error"])
+        self.assertGreater(result["expected_shortfall"], result["var"])
+
+    def test_interval_matches_spread_across_seeds(self):
+        """Test that the batch standard error is the right size."""
+        engine = FxMonteCarloEngine()
+        estimates = [engine.value_at_risk(self.exposures, self.covariance, num_paths=10_000, seed=s)["var"]
+                     for s in range(20)]
+        reported = engine.value_at_risk(self.exposures, self.covariance, num_paths=10_000, seed=0)
+
+        ratio = np.std(estimates, ddof=1) / reported["var_standard_error"]
+        self.assertGreater(ratio, 0.4)
+        self.assertLess(ratio, 2.5)
+
+    def test_non_positive_definite_covariance(self):
+        """Test that a singular covariance is factored through its eigenvalues."""
+        covariance = np.array([[1e-4, 1e-4], [1e-4, 1e-4]])
+        result = FxMonteCarloEngine().value_at_risk({"EUR": 1e6, "GBP": -1e6}, covariance,
+                                                    num_paths=10_000, seed=1)
+
+        self.assertAlmostEqual(result["var"], 0.0, delta=1e-6)
+
+
+class TestForexRiskMonteCarlo(unittest.TestCase):
+    """Test cases for Monte Carlo VaR through ForexRiskManager."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        logging.disable(logging.INFO)
+        dates, paths = make_paths()
+        self.manager = ForexRiskManager("USD")
+        for j, currency in enumerate(CURRENCIES):
+            self.manager.add_historical_rates("USD", currency, {d: float(paths[i, j]) for i, d in enumerate(dates)})
+            self.manager.update_position(currency, Decimal(str(1e6 * (j + 1) * (-1) ** j)))
+
+    def tearDown(self):
+        """Re-enable logging."""
+        logging.disable(logging.NOTSET)
+
+    def test_portfolio_var_is_seeded(self):
+        """Test that Monte Carlo portfolio VaR repeats under the manager's seed."""
+        first = self.manager.calculate_portfolio_var(method="monte_carlo")
+        second = self.manager.calculate_portfolio_var(method="monte_carlo")
+
+        self.assertEqual(first.value, second.value)
+        self.assertEqual(first.value, Decimal(str(self.manager.calculate_monte_carlo_var()["var"])))
+        self.assertAlmostEqual(float(first.value) / float(self.manager.calculate_portfolio_var().value), 1.0,
+                               delta=0.05)
+
+    def test_positions_without_history_are_excluded(self):
+        """Test that currencies without rates are left out of the simulation."""
+        self.manager.update_position("XXX", Decimal("1000000"))
+
+        result = self.manager.calculate_monte_carlo_var(num_paths=10_000)
+
+        self.assertEqual(result["currencies"], CURRENCIES)
+
+    def test_missing_base_history_raises(self):
+        """Test Monte Carlo VaR without rate history for the base currency."""
+        manager = ForexRiskManager("EUR")
+        manager.update_position("USD", Decimal("1000000"))
+
+        with self.assertRaises(ValueError):
+            manager.calculate_monte_carlo_var()
+
+    def test_single_currency_var_is_seeded(self):
+        """Test single-currency Monte Carlo VaR."""
+        first = self.manager.calculate_var("C01", method="monte_carlo")
+        second = self.manager.calculate_var("C01", method="monte_carlo")
+
+        self.assertEqual(first.value, second.value)
+        self.assertGreater(first.value, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Rate History Tests - Treasury
+
+This module checks the columnar rate history store: its incremental
+statistics against full rebuilds, and volatilities against the
+dictionary-of-dates calculation it replaced.
+"""
+import datetime
+import logging
+import math
+import shutil
+import tempfile
+import unittest
+from decimal import Decimal
+from statistics import NormalDist
+
+import numpy as np
+
+from ..forex_risk import ForexRiskManager
+from ..rate_history import RateHistoryStore
+
+TODAY = datetime.date(2026, 10, 1)
+CURRENCIES = [f"C{i:02d}" for i in range(6)]
+
+
+def make_paths(days=200, seed=0):
+    """Random-walk rates and their dates, oldest first."""
+    rng = np.random.default_rng(seed)
+    paths = np.exp(np.cumsum(rng.normal(0, 0.006, (days, len(CURRENCIES))), axis=0))
+    dates = [TODAY - datetime.timedelta(days=days - 1 - i) for i in range(days)]
+    return dates, paths
+
+
+def legacy_volatility(historical_rates, currency, days=30):
+    """Volatility as computed from the date-keyed rate dictionaries."""
+    dates = sorted([d for d in historical_rates if currency in historical_rates[d]], reverse=True)[:days]
+    rates = [historical_rates[d][currency] for d in dates]
+    returns = [math.log(rates[i - 1] / rates[i]) for i in range(1, len(rates))]
+    return float(np.std(returns, ddof=1)) * math.sqrt(252)
+
+
+class TestRateHistoryStore(unittest.TestCase):
+    """Test cases for RateHistoryStore."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        logging.disable(logging.INFO)
+        self.dates, self.paths = make_paths()
+        self.store = RateHistoryStore("USD")
+        for j, currency in enumerate(CURRENCIES):
+            self.store.add_series(currency, {d: float(self.paths[i, j]) for i, d in enumerate(self.dates)})
+
+    def tearDown(self):
+        """Re-enable logging."""
+        logging.disable(logging.NOTSET)
+
+    def test_ewma_covariance_matches_recursion(self):
+        """Test the vectorized EWMA against the RiskMetrics recursion."""
+        returns = np.diff(np.log(self.paths), axis=0)
+        expected = np.zeros((len(CURRENCIES), len(CURRENCIES)))
+        for row in returns:
+            expected = 0.94 * expected + 0.06 * np.outer(row, row)
+
+        np.testing.assert_allclose(self.store.ewma_covariance(), expected, rtol=1e-10)
+        correlation = self.store.ewma_correlation(CURRENCIES[:2])
+        self.assertAlmostEqual(correlation[0, 1], expected[0, 1] / math.sqrt(expected[0, 0] * expected[1, 1]))
+
+    def test_rolling_volatility_matches_window(self):
+        """Test the cached rolling volatility against the last vol_window returns."""
+        returns = np.diff(np.log(self.paths), axis=0)[-30:]
+
+        np.testing.assert_allclose(self.store.rolling_volatility(),
+                                   returns.std(axis=0, ddof=1) * math.sqrt(252), rtol=1e-9)
+
+    def test_appended_fixings_match_full_rebuild(self):
+        """Test that incrementally folded fixings give the rebuilt statistics."""
+        self.store.ewma_covariance()
+        rng = np.random.default_rng(1)
+        for k in range(40):
+            rates = self.paths[-1] * np.exp(rng.normal(0, 0.006, len(CURRENCIES)))
+            fixings = dict(zip(CURRENCIES, rates.tolist()))
+            if k % 5 == 0:
+                del fixings[CURRENCIES[2]]
+            self.store.add_fixings(TODAY + datetime.timedelta(days=k + 1), fixings)
+        self.assertFalse(self.store._stale)
+
+        incremental = (self.store.ewma_covariance().copy(), self.store.rolling_volatility().copy())
+        self.store._stale = True
+
+        np.testing.assert_allclose(incremental[0], self.store.ewma_covariance(), rtol=1e-9, atol=1e-15)
+        np.testing.assert_allclose(incremental[1], self.store.rolling_volatility(), rtol=1e-9)
+        self.assertEqual(len(self.store), len(self.dates) + 40)
+
+    def test_backdated_fixing_marks_statistics_stale(self):
+        """Test that a fixing before the latest date forces a rebuild."""
+        self.store.ewma_covariance()
+        self.store.add_fixings(self.dates[0] - datetime.timedelta(days=1), {CURRENCIES[0]: 1.0})
+
+        self.assertTrue(self.store._stale)
+        self.assertEqual(self.store.dates[0], self.dates[0] - datetime.timedelta(days=1))
+        self.assertEqual(self.store.log_returns(CURRENCIES[:1]).shape, (len(self.dates), 1))
+        self.assertTrue(np.isnan(self.store.log_returns(CURRENCIES[1:2])[0, 0]))
+
+    def test_portfolio_var_is_parametric_on_ewma(self):
+        """Test portfolio VaR against the EWMA covariance formula; unknown currencies are ignored."""
+        positions = {"C00": 1e6, "C01": -5e5, "XXX": 1e9}
+        exposure = np.array([1e6, -5e5])
+        variance = exposure @ self.store.ewma_covariance(["C00", "C01"]) @ exposure
+
+        self.assertAlmostEqual(self.store.portfolio_var(positions, 0.99, 10),
+                               NormalDist().inv_cdf(0.99) * math.sqrt(variance * 10))
+        self.assertEqual(self.store.portfolio_var({"XXX": 1e6}), 0.0)
+
+    def test_memory_mapped_store_reopens(self):
+        """Test that a store in a directory survives being reopened and grown."""
+        directory = tempfile.mkdtemp()
+        try:
+            store = RateHistoryStore("USD", directory)
+            for j, currency in enumerate(CURRENCIES * 2):
+                name = currency if j < len(CURRENCIES) else f"D{j}"
+                store.add_series(name, {d: float(self.paths[i, j % len(CURRENCIES)])
+                                        for i, d in enumerate(self.dates)})
+            store.flush()
+            del store
+
+            reopened = RateHistoryStore("USD", directory)
+            self.assertEqual(len(reopened), len(self.dates))
+            self.assertEqual(len(reopened.currencies), 2 * len(CURRENCIES))
+            np.testing.assert_allclose(reopened.rates(["C03"])[:, 0], self.paths[:, 3])
+        finally:
+            shutil.rmtree(directory)
+
+
+class TestForexRiskHistory(unittest.TestCase):
+    """Test cases for ForexRiskManager on the rate history store."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        logging.disable(logging.INFO)
+        self.dates, self.paths = make_paths()
+        self.manager = ForexRiskManager("USD")
+        for j, currency in enumerate(CURRENCIES):
+            # One currency misses every seventh fixing
+            self.manager.add_historical_rates("USD", currency, {
+                d: float(self.paths[i, j]) for i, d in enumerate(self.dates) if not (j == 3 and i % 7 == 0)
+            })
+            self.manager.update_position(currency, Decimal(str(1e6 * (j + 1) * (-1) ** j)))
+
+    def tearDown(self):
+        """Re-enable logging."""
+        logging.disable(logging.NOTSET)
+
+    def test_volatility_matches_legacy_calculation(self):
+        """Test volatilities against the date-keyed dictionary calculation, gaps included."""
+        history = self.manager.historical_rates["USD"]
+        for currency in CURRENCIES:
+            for days in (10, 30, 90):
+                self.assertAlmostEqual(self.manager.calculate_volatility(("USD", currency), days),
+                                       legacy_volatility(history, currency, days), places=12)
+
+    def test_volatility_without_history_is_zero(self):
+        """Test unknown bases and quotes."""
+        self.assertEqual(self.manager.calculate_volatility(("EUR", "C00")), 0.0)
+        self.assertEqual(self.manager.calculate_volatility(("USD", "XXX")), 0.0)
+
+    def test_rate_fixings_update_history_and_dictionaries(self):
+        """Test that add_rate_fixings keeps both representations in step."""
+        date = TODAY + datetime.timedelta(days=1)
+        self.manager.add_rate_fixings("USD", date, {"C00": 1.25, "C01": 0.8})
+
+        self.assertEqual(self.manager.historical_rates["USD"][date], {"C00": 1.25, "C01": 0.8})
+        self.assertEqual(self.manager.get_rate_history("USD").series("C00")[-1], 1.25)
+
+    def test_portfolio_var_uses_cached_covariance(self):
+        """Test that the default portfolio VaR is the store's EWMA VaR."""
+        store = self.manager.get_rate_history("USD")
+        positions = {currency: float(amount) for currency, amount in self.manager.current_positions.items()}
+
+        self.assertAlmostEqual(float(self.manager.calculate_portfolio_var().value),
+                               store.portfolio_var(positions, 0.99, 10), places=4)
+
+    def test_correlation_matrix_of_returns(self):
+        """Test the correlation matrix built from cached returns."""
+        correlation = self.manager.calculate_correlation_matrix(["USD", "C00", "C01"], days=60)
+        returns = np.diff(np.log(self.paths[-60:, :2]), axis=0)
+
+        self.assertEqual(list(correlation.columns), ["USD/C00", "USD/C01"])
+        self.assertAlmostEqual(correlation.iloc[0, 1], np.corrcoef(returns.T)[0, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+"""
+Settlement Netting Tests - Treasury
+
+This module checks the running netting positions against aggregating the
+trade list directly, and the netted settlements created from them.
+"""
+import datetime
+import logging
+import random
+import unittest
+from decimal import Decimal
+
+from ..forex_settlement import FxSettlementManager
+from ..forex_trading import FxTradeManager, TradeType
+
+VALUE_DATE = datetime.date.today() + datetime.timedelta(days=2)
+
+
+def aggregate(trades, value_date):
+    """Net amounts per counterparty and currency, summed over the trade list."""
+    positions = {}
+    for trade in trades:
+        if trade.value_date != value_date:
+            continue
+        position = positions.setdefault(trade.counterparty, {})
+        position[trade.buy_currency] = position.get(trade.buy_currency, 0) + trade.buy_amount
+        position[trade.sell_currency] = position.get(trade.sell_currency, 0) - trade.sell_amount
+    return {counterparty: {currency: amount for currency, amount in position.items() if amount}
+            for counterparty, position in positions.items()}
+
+
+class TestSettlementNetting(unittest.TestCase):
+    """Test cases for netting positions and netted settlements."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        logging.disable(logging.INFO)
+        self.settlements = FxSettlementManager()
+        self.trades = FxTradeManager(self.settlements.netting_engine)
+
+    def tearDown(self):
+        """Re-enable logging."""
+        logging.disable(logging.NOTSET)
+
+    def trade(self, buy, sell, buy_amount, sell_amount, counterparty, value_date=VALUE_DATE):
+        trade = self.trades.create_trade(TradeType.SPOT, buy, sell, Decimal(buy_amount), Decimal(sell_amount),
+                                         Decimal("1"), value_date, counterparty, "trader")
+        self.trades.execute_trade(trade.id)
+        return trade
+
+    def random_book(self, count=300, seed=0):
+        rng = random.Random(seed)
+        book = []
+        for _ in range(count):
+            buy, sell = rng.sample(["USD", "EUR", "GBP", "JPY"], 2)
+            book.append(self.trade(buy, sell, rng.randint(1, 1000), rng.randint(1, 1000), rng.choice("ABCDE"),
+                                   VALUE_DATE + datetime.timedelta(days=rng.randint(0, 1))))
+        for trade in book[:20]:
+            self.trades.cancel_trade(trade.id, "cancelled")
+        for trade in book[20:30]:
+            self.trades.settle_trade(trade.id)
+        return book[30:]
+
+    def test_positions_match_aggregated_trades(self):
+        """Test bilateral and multilateral nets against summing the live trades."""
+        live = self.random_book()
+        expected = aggregate(live, VALUE_DATE)
+
+        netting = self.settlements.netting_engine.net_value_date(VALUE_DATE)
+
+        self.assertEqual({item["counterparty"]: item["payments"] for item in netting["bilateral"]}, expected)
+        multilateral = {}
+        for position in expected.values():
+            for currency, amount in position.items():
+                multilateral[currency] = multilateral.get(currency, 0) + amount
+        self.assertEqual(netting["multilateral"], {c: a for c, a in multilateral.items() if a})
+        on_date = [trade for trade in live if trade.value_date == VALUE_DATE]
+        self.assertEqual(netting["gross_payment_count"], 2 * len(on_date))
+        self.assertEqual(sorted(i for item in netting["bilateral"] for i in item["trade_ids"]),
+                         sorted(trade.id for trade in on_date))
+        for counterparty, position in expected.items():
+            self.assertEqual(self.settlements.netting_engine.get_position(counterparty, VALUE_DATE), position)
+
+    def test_cancelled_and_settled_trades_are_backed_out(self):
+        """Test that a position disappears with its last trade."""
+        first = self.trade("EUR", "USD", "100", "110", "A")
+        second = self.trade("USD", "EUR", "50", "45", "A")
+        engine = self.settlements.netting_engine
+
+        self.trades.cancel_trade(first.id, "error")
+        self.assertEqual(engine.get_position("A", VALUE_DATE), {"USD": Decimal("50"), "EUR": Decimal("-45")})
+        self.trades.settle_trade(second.id)
+        self.assertEqual(engine.get_position("A", VALUE_DATE), {})
+        self.assertEqual(engine.get_value_dates(), [])
+        self.assertFalse(engine.remove_trade(second.id))
+
+    def test_bilateral_settlements_release_positions(self):
+        """Test one settlement per counterparty and that the date is cleared."""
+        live = self.random_book()
+        expected = aggregate(live, VALUE_DATE)
+
+        created = self.settlements.create_netted_settlements(VALUE_DATE)
+
+        self.assertEqual({s.counterparty: s.settlements_by_currency for s in created}, expected)
+        self.assertEqual(self.settlements.netting_engine.get_value_dates(), [VALUE_DATE + datetime.timedelta(days=1)])
+        self.assertEqual(self.settlements.get_settlements_by_trade(created[0].trade_ids[0]), [created[0]])
+        self.assertEqual(len(self.settlements.get_settlements_by_date_range(VALUE_DATE, VALUE_DATE)), len(created))
+
+    def test_multilateral_settlement(self):
+        """Test a single settlement with the settlement system for the whole date."""
+        self.trade("EUR", "USD", "100", "110", "A")
+        self.trade("USD", "EUR", "120", "100", "B")
+
+        created = self.settlements.create_netted_settlements(VALUE_DATE, multilateral=True)
+
+        self.assertEqual(len(created), 1)
+        self.assertEqual(created[0].counterparty, "CLS")
+        self.assertEqual(created[0].settlements_by_currency, {"USD": Decimal("10")})
+        self.assertEqual(len(created[0].trade_ids), 2)
+
+    def test_trades_that_net_off_still_settle(self):
+        """Test zero-amount settlements for positions with nothing to pay."""
+        self.trade("EUR", "USD", "100", "110", "A")
+        self.trade("USD", "EUR", "110", "100", "A")
+
+        created = self.settlements.create_netted_settlements(VALUE_DATE)
+
+        self.assertEqual(len(created), 1)
+        self.assertEqual(created[0].settlements_by_currency, {"EUR": Decimal("0"), "USD": Decimal("0")})
+        self.assertEqual(len(created[0].trade_ids), 2)
+        self.assertTrue(created[0].notes.endswith(", netted off with no payments due"))
+
+    def test_multilateral_settlement_that_nets_off(self):
+        """Test that a date netting off across counterparties still settles every trade."""
+        self.trade("EUR", "USD", "100", "110", "A")
+        self.trade("USD", "EUR", "110", "100", "B")
+
+        created = self.settlements.create_netted_settlements(VALUE_DATE, multilateral=True)
+
+        self.assertEqual(created[0].settlements_by_currency, {"EUR": Decimal("0"), "USD": Decimal("0")})
+        self.assertTrue(created[0].notes.endswith(", netted off with no payments due"))
+        self.assertEqual(self.settlements.create_netted_settlements(VALUE_DATE), [])
+
+    def test_directly_settled_trades_are_not_netted_again(self):
+        """Test that trades settled on their own are left out of the netted settlements."""
+        first = self.trade("EUR", "USD", "100", "110", "A")
+        second = self.trade("USD", "EUR", "50", "45", "A")
+        third = self.trade("GBP", "USD", "10", "13", "B")
+
+        self.settlements.create_settlement(VALUE_DATE, "A", [first.id], {"EUR": Decimal("100"), "USD": Decimal("-110")})
+        self.settlements.create_netted_settlement([third.id], [{"currency": "GBP", "amount": Decimal("10")}], "B",
+                                                  VALUE_DATE)
+        created = self.settlements.create_netted_settlements(VALUE_DATE)
+
+        self.assertEqual([(s.counterparty, s.trade_ids) for s in created], [("A", [second.id])])
+        self.assertEqual(created[0].settlements_by_currency, {"USD": Decimal("50"), "EUR": Decimal("-45")})
+        for trade in (first, second, third):
+            self.assertEqual(len(self.settlements.get_settlements_by_trade(trade.id)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
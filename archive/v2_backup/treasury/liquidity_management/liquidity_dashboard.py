@@ -7,8 +7,9 @@ including cash positions, regulatory ratios, and liquidity projections.
 
 import datetime
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 from decimal import Decimal
+import io
 import logging
 import json
 import matplotlib.pyplot as plt
@@ -16,9 +17,14 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from treasury.liquidity_management.snapshot_store import LiquiditySnapshotStore, FIELDS
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Rendered charts kept in the cache (oldest dropped first)
+CHART_CACHE_SIZE = 32
+
 @dataclass
 class LiquiditySnapshot:
     """Represents a snapshot of the bank's liquidity position at a point in time."""
@@ -51,12 +57,14 @@ class LiquiditySnapshot:
 class LiquidityDashboard:
     """Dashboard for monitoring and visualizing liquidity metrics."""
     
-    def __init__(self, bank_name: str):
+    def __init__(self, bank_name: str, store_directory: Optional[str] = None):
         """
         Initialize a liquidity dashboard.
         
         Args:
             bank_name: Name of the bank for reporting purposes
+            store_directory: Directory for the memory-mapped metric store
+                             (in memory if None)
         """
         self.bank_name = bank_name
         self.snapshots: Dict[datetime.date, LiquiditySnapshot] = {}
@@ -65,6 +73,10 @@ class LiquidityDashboard:
         self.cash_reserve_target = Decimal('0.15')  # 15% of total assets
         self.total_assets = Decimal('0')
         
+        # Date-indexed metric columns, and rendered charts by (chart, window, ...)
+        self.store = LiquiditySnapshotStore(store_directory)
+        self._chart_cache: Dict[Tuple, bytes] = {}
+        
     def add_snapshot(self, snapshot: LiquiditySnapshot) -> None:
         """
         Add a liquidity snapshot to the dashboard.
@@ -73,6 +85,14 @@ class LiquidityDashboard:
             snapshot: The liquidity snapshot to add
         """
         self.snapshots[snapshot.date] = snapshot
+        
+        values = {name: getattr(snapshot, name) for name in FIELDS}
+        self.store.put(snapshot.date, values)
+        
+        # Drop cached charts whose window covers the new snapshot
+        for key in [key for key in self._chart_cache if key[1] <= snapshot.date <= key[2]]:
+            del self._chart_cache[key]
+            
         logger.info(f"Added liquidity snapshot for {snapshot.date}")
         
     def get_latest_snapshot(self) -> Optional[LiquiditySnapshot]:
@@ -85,7 +105,10 @@ class LiquidityDashboard:
         if not self.snapshots:
             return None
             
-        latest_date = max(self.snapshots.keys())
+        latest_date = self.store.latest_date()
+        if latest_date not in self.snapshots:
+            # Store reopened from disk with dates this dashboard has no snapshot for
+            latest_date = max(self.snapshots.keys())
         return self.snapshots[latest_date]
         
     def get_historical_snapshots(self, 
@@ -107,8 +130,30 @@ class LiquidityDashboard:
         end = end_date or datetime.date.today()
         start = end - datetime.timedelta(days=days)
         
-        return {date: snapshot for date, snapshot in self.snapshots.items() 
-                if start <= date <= end}
+        return {date: self.snapshots[date] for date in self.store.dates(start, end)
+                if date in self.snapshots}
+    
+    def get_metric_aggregates(self,
+                            metric: str,
+                            resolution: str = "week",
+                            days: int = 365,
+                            end_date: Optional[datetime.date] = None) -> Dict[str, Any]:
+        """
+        Get downsampled LCR or NSFR values.
+        
+        Args:
+            metric: "lcr" or "nsfr"
+            resolution: "day", "week" or "month"
+            days: Number of days to cover
+            end_date: End date (default: today)
+            
+        Returns:
+            Dictionary of per-bucket start dates and count, mean, min, max
+            and last values
+        """
+        end = end_date or datetime.date.today()
+        start = end - datetime.timedelta(days=days)
+        return self.store.aggregates(metric, resolution, start, end)
     
     def get_liquidity_alerts(self) -> List[str]:
         """
@@ -189,8 +234,8 @@ class LiquidityDashboard:
         if len(snapshots) < 2:
             return "insufficient_data"
             
-        # Sort snapshots by date
-        sorted_dates = sorted(snapshots.keys())
+        # Dates come back in order from the store
+        sorted_dates = list(snapshots.keys())
         
         # Get oldest and newest values
         oldest = getattr(snapshots[sorted_dates[0]], metric_name)
@@ -212,59 +257,98 @@ class LiquidityDashboard:
         else:
             return "insufficient_data"
             
-    def generate_lcr_nsfr_chart(self,days: int = 90,output_path: Optional[str] = None) -> Optional[str]:
+    def _chart(self,
+              key: Tuple,
+              draw: Callable[[], None],
+              output_path: Optional[str]) -> Optional[str]:
+        """
+        Save a chart through the render cache, or show it.
+        
+        Saved renders are cached by key plus file format, so asking again for
+        the same chart and window only writes the cached bytes. The key
+        starts with (chart name, window start, window end) so add_snapshot
+        can drop renders that a new snapshot affects.
+        
+        Args:
+            key: Cache key (chart name, window start, window end, ...)
+            draw: Draws the chart on a new current figure
+            output_path: Path to save the chart (shown instead if None)
+            
+        Returns:
+            Path to the saved chart file, or None if shown
+        """
+        if not output_path:
+            draw()
+            plt.show()
+            plt.close()
+            return None
+            
+        image_format = Path(output_path).suffix.lstrip('.').lower() or 'png'
+        cache_key = key + (image_format,)
+        image = self._chart_cache.get(cache_key)
+        if image is None:
+            draw()
+            buffer = io.BytesIO()
+            plt.savefig(buffer, format=image_format)
+            plt.close()
+            image = buffer.getvalue()
+            self._chart_cache[cache_key] = image
+            while len(self._chart_cache) > CHART_CACHE_SIZE:
+                del self._chart_cache[next(iter(self._chart_cache))]
+            
+        with open(output_path, 'wb') as f:
+            f.write(image)
+        return output_path
+            
+    def generate_lcr_nsfr_chart(self,
+                              days: int = 90,
+                              output_path: Optional[str] = None,
+                              resolution: str = "day") -> Optional[str]:
         """
         Generate a chart of LCR and NSFR trends.
         
         Args:
             days: Number of days to include in the chart
             output_path: Path to save the chart (optional)
+            resolution: "day" for every snapshot, or "week"/"month" to plot
+                        bucket averages
             
         Returns:
             Path to the saved chart file, or None if no data available
         """
-        snapshots = self.get_historical_snapshots(days)
+        end = datetime.date.today()
+        start = end - datetime.timedelta(days=days)
         
-        if len(snapshots) < 2:
+        if resolution == "day":
+            dates, lcr_values = self.store.series("lcr", start, end)
+            _, nsfr_values = self.store.series("nsfr", start, end)
+        else:
+            lcr = self.store.aggregates("lcr", resolution, start, end)
+            nsfr = self.store.aggregates("nsfr", resolution, start, end)
+            dates, lcr_values, nsfr_values = lcr["start"], lcr["mean"], nsfr["mean"]
+        
+        if len(dates) < 2:
             logger.warning("Insufficient data for chart generation")
             return None
             
-        # Prepare data
-        dates = []
-        lcr_values = []
-        nsfr_values = []
-        
-        for date in sorted(snapshots.keys()):
-            snapshot = snapshots[date]
-            dates.append(date)
-            lcr_values.append(float(snapshot.lcr))
-            nsfr_values.append(float(snapshot.nsfr))
-            
-        # Create chart
-        plt.figure(figsize=(10, 6))
-        plt.plot(dates, lcr_values, 'b-', label='LCR')
-        plt.plot(dates, nsfr_values, 'g-', label='NSFR')
-        
-        # Add threshold lines
-        plt.axhline(y=float(self.lcr_threshold), color='b', linestyle='--', alpha=0.7)
-        plt.axhline(y=float(self.nsfr_threshold), color='g', linestyle='--', alpha=0.7)
-        
-        # Formatting
-        plt.title(f'{self.bank_name} - Liquidity Ratios Trend')
-        plt.xlabel('Date')
-        plt.ylabel('Ratio')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        
-        # Save or show
-        if output_path:
-            plt.savefig(output_path)
-            plt.close()
-            return output_path
-        else:
-            plt.show()
-            plt.close()
-            return None
+        def draw() -> None:
+            plt.figure(figsize=(10, 6))
+            plt.plot(dates, lcr_values, 'b-', label='LCR')
+            plt.plot(dates, nsfr_values, 'g-', label='NSFR')
+            
+            # Add threshold lines
+            plt.axhline(y=float(self.lcr_threshold), color='b', linestyle='--', alpha=0.7)
+            plt.axhline(y=float(self.nsfr_threshold), color='g', linestyle='--', alpha=0.7)
+            
+            # Formatting
+            plt.title(f'{self.bank_name} - Liquidity Ratios Trend')
+            plt.xlabel('Date')
+            plt.ylabel('Ratio')
+            plt.legend()
+            plt.grid(True, alpha=0.3)
+            
+        key = ("lcr_nsfr", start, end, resolution, float(self.lcr_threshold), float(self.nsfr_threshold))
+        return self._chart(key, draw, output_path)
             
     def generate_cash_position_chart(self, days: int = 90,output_path: Optional[str] = None) -> Optional[str]:
         """
@@ -277,49 +361,33 @@ class LiquidityDashboard:
         Returns:
             Path to the saved chart file, or None if no data available
         """
-        snapshots = self.get_historical_snapshots(days)
+        end = datetime.date.today()
+        start = end - datetime.timedelta(days=days)
+        dates, cash_values = self.store.series("total_cash", start, end)
+        _, hqla_values = self.store.series("high_quality_liquid_assets", start, end)
         
-        if len(snapshots) < 2:
+        if len(dates) < 2:
             logger.warning("Insufficient data for chart generation")
             return None
             
-        # Prepare data
-        dates = []
-        cash_values = []
-        hqla_values = []
-        
-        for date in sorted(snapshots.keys()):
-            snapshot = snapshots[date]
-            dates.append(date)
-            cash_values.append(float(snapshot.total_cash))
-            hqla_values.append(float(snapshot.high_quality_liquid_assets))
-            
-        # Create chart
-        plt.figure(figsize=(10, 6))
-        plt.plot(dates, cash_values, 'b-', label='Total Cash')
-        plt.plot(dates, hqla_values, 'r-', label='HQLA')
-        
-        # Formatting
-        plt.title(f'{self.bank_name} - Cash Position Trend')
-        plt.xlabel('Date')
-        plt.ylabel('Amount')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        
-        # Format y-axis with appropriate scale
-        plt.gca().get_yaxis().set_major_formatter(
-            plt.matplotlib.ticker.FuncFormatter(lambda x, loc: f"${x/1000000:.1f}M" if x >= 1000000 
-                                                else f"${x/1000:.1f}K"))
-        
-        # Save or show
-        if output_path:
-            plt.savefig(output_path)
-            plt.close()
-            return output_path
-        else:
-            plt.show()
-            plt.close()
-            return None
+        def draw() -> None:
+            plt.figure(figsize=(10, 6))
+            plt.plot(dates, cash_values, 'b-', label='Total Cash')
+            plt.plot(dates, hqla_values, 'r-', label='HQLA')
+            
+            # Formatting
+            plt.title(f'{self.bank_name} - Cash Position Trend')
+            plt.xlabel('Date')
+            plt.ylabel('Amount')
+            plt.legend()
+            plt.grid(True, alpha=0.3)
+            
+            # Format y-axis with appropriate scale
+            plt.gca().get_yaxis().set_major_formatter(
+                plt.matplotlib.ticker.FuncFormatter(lambda x, loc: f"${x/1000000:.1f}M" if x >= 1000000 
+                                                    else f"${x/1000:.1f}K"))
+        
+        return self._chart(("cash_position", start, end), draw, output_path)
             
     def generate_currency_breakdown_chart(self,
                                         date: Optional[datetime.date] = None,
@@ -350,22 +418,14 @@ class LiquidityDashboard:
         currencies = list(snapshot.currency_breakdown.keys())
         values = [float(snapshot.currency_breakdown[c]) for c in currencies]
         
-        # Create chart
-        plt.figure(figsize=(8, 8))
-        plt.pie(values, labels=currencies, autopct='%1.1f%%')
-        
-        # Formatting
-        plt.title(f'{self.bank_name} - Currency Breakdown ({snapshot.date.isoformat()})')
+        def draw() -> None:
+            plt.figure(figsize=(8, 8))
+            plt.pie(values, labels=currencies, autopct='%1.1f%%')
+            
+            # Formatting
+            plt.title(f'{self.bank_name} - Currency Breakdown ({snapshot.date.isoformat()})')
         
-        # Save or show
-        if output_path:
-            plt.savefig(output_path)
-            plt.close()
-            return output_path
-        else:
-            plt.show()
-            plt.close()
-            return None
+        return self._chart(("currency_breakdown", snapshot.date, snapshot.date), draw, output_path)
     
     def export_dashboard_data(self, output_path: str, format: str = 'json') -> str:
         """
@@ -0,0 +1,301 @@
+"""
+Liquidity snapshot store for treasury operations.
+
+This module keeps daily liquidity snapshots as columns of a date-ordered
+array, in memory or memory-mapped on disk, so that date-range queries are
+binary searches over the date index and metric series are array slices.
+Bucketed LCR/NSFR aggregates (count, mean, min, max, last) are maintained
+at daily, weekly and monthly resolution as snapshots arrive.
+"""
+
+import datetime
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+import logging
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Stored columns, in order
+FIELDS = (
+    "total_cash",
+    "high_quality_liquid_assets",
+    "short_term_obligations",
+    "stable_funding",
+    "required_stable_funding",
+    "lcr",
+    "nsfr"
+)
+
+# Metrics with bucketed aggregates
+AGGREGATED_METRICS = ("lcr", "nsfr")
+
+RESOLUTIONS = ("day", "week", "month")
+
+_INITIAL_ROWS = 512
+
+# Aggregate slots per bucket and metric
+_COUNT, _SUM, _MIN, _MAX, _LAST = range(5)
+
+
+def _bucket(ordinal: int, resolution: str) -> int:
+    """Bucket key of a date ordinal: the day, its week's Monday, or year * 12 + month."""
+    if resolution == "day":
+        return ordinal
+    if resolution == "week":
+        return ordinal - (ordinal - 1) % 7  # ordinal 1 (0001-01-01) is a Monday
+    if resolution == "month":
+        date = datetime.date.fromordinal(ordinal)
+        return date.year * 12 + date.month - 1
+    raise ValueError(f"Unknown resolution: {resolution}")
+
+
+def _bucket_start(key: int, resolution: str) -> datetime.date:
+    if resolution == "month":
+        return datetime.date(key // 12, key % 12 + 1, 1)
+    return datetime.date.fromordinal(key)
+
+
+class LiquiditySnapshotStore:
+    """
+    Columnar, date-indexed store of liquidity snapshot values.
+
+    Snapshots for a date after the latest one are appended and folded into
+    the bucket aggregates in O(1); a snapshot for an earlier or existing
+    date is merged into date order and only its buckets are recomputed.
+    With a directory, the arrays are .npy memory maps that are reopened by
+    the next store created on the same directory.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory for memory-mapped storage (in memory if None)
+        """
+        self.directory = directory
+        self._rows = 0
+        self._dates = np.zeros(0, dtype=np.int64)  # date ordinals, 0 for unused rows
+        self._values = np.zeros((0, len(FIELDS)))
+        self._buckets: Dict[str, Dict[int, np.ndarray]] = {resolution: {} for resolution in RESOLUTIONS}
+        self._metric_columns = [FIELDS.index(metric) for metric in AGGREGATED_METRICS]
+
+        if directory and os.path.exists(self._path("store.json")):
+            self._open()
+        else:
+            self._dates, self._values = self._allocate(_INITIAL_ROWS)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _open(self) -> None:
+        with open(self._path("store.json")) as handle:
+            if tuple(json.load(handle)["fields"]) != FIELDS:
+                raise ValueError(f"Snapshot store in {self.directory} has different fields")
+        self._dates = np.load(self._path("dates.npy"), mmap_mode="r+")
+        self._values = np.load(self._path("values.npy"), mmap_mode="r+")
+        self._rows = int(np.count_nonzero(self._dates))
+        for resolution in RESOLUTIONS:
+            self._rebuild_buckets(resolution, self._dates[:self._rows])
+        logger.info(f"Opened liquidity snapshot store with {self._rows} snapshots")
+
+    def _allocate(self, rows: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Allocate date and value arrays, copying the current contents."""
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            dates = np.lib.format.open_memmap(self._path("dates.npy.tmp"), mode="w+", dtype=np.int64, shape=(rows,))
+            values = np.lib.format.open_memmap(self._path("values.npy.tmp"), mode="w+", dtype=np.float64,
+                                               shape=(rows, len(FIELDS)))
+        else:
+            dates = np.zeros(rows, dtype=np.int64)
+            values = np.empty((rows, len(FIELDS)))
+
+        dates[:] = 0
+        values[:] = np.nan
+        dates[:self._rows] = self._dates[:self._rows]
+        values[:self._rows] = self._values[:self._rows]
+
+        if self.directory:
+            dates.flush()
+            values.flush()
+            del dates, values
+            self._dates = self._values = None
+            os.replace(self._path("dates.npy.tmp"), self._path("dates.npy"))
+            os.replace(self._path("values.npy.tmp"), self._path("values.npy"))
+            with open(self._path("store.json"), "w") as handle:
+                json.dump({"fields": list(FIELDS)}, handle)
+            dates = np.load(self._path("dates.npy"), mmap_mode="r+")
+            values = np.load(self._path("values.npy"), mmap_mode="r+")
+        return dates, values
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def flush(self) -> None:
+        """Flush memory-mapped arrays to disk."""
+        if self.directory:
+            self._dates.flush()
+            self._values.flush()
+
+    def put(self, date: datetime.date, values: Dict[str, float]) -> None:
+        """
+        Store the values of one date, replacing any already stored for it.
+
+        Args:
+            date: Snapshot date
+            values: Value of every field in FIELDS
+        """
+        ordinal = date.toordinal()
+        row_values = np.array([float(values[name]) for name in FIELDS])
+        dates = self._dates[:self._rows]
+
+        if self._rows == 0 or ordinal > dates[-1]:
+            if self._rows == self._dates.size:
+                self._dates, self._values = self._allocate(2 * self._dates.size)
+            self._dates[self._rows] = ordinal
+            self._values[self._rows] = row_values
+            self._rows += 1
+            self._fold(ordinal, row_values)
+            return
+
+        row = int(np.searchsorted(dates, ordinal))
+        if dates[row] != ordinal:
+            # Back-filled date: shift later rows up by one
+            if self._rows == self._dates.size:
+                self._dates, self._values = self._allocate(2 * self._dates.size)
+            self._dates[row + 1:self._rows + 1] = np.array(self._dates[row:self._rows])
+            self._values[row + 1:self._rows + 1] = np.array(self._values[row:self._rows])
+            self._dates[row] = ordinal
+            self._rows += 1
+        self._values[row] = row_values
+        for resolution in RESOLUTIONS:
+            self._rebuild_buckets(resolution, np.array([ordinal]))
+
+    def _fold(self, ordinal: int, row_values: np.ndarray) -> None:
+        """Fold a newly appended row into the bucket aggregates."""
+        metrics = row_values[self._metric_columns]
+        for resolution in RESOLUTIONS:
+            key = _bucket(ordinal, resolution)
+            aggregate = self._buckets[resolution].get(key)
+            if aggregate is None:
+                aggregate = np.empty((len(AGGREGATED_METRICS), 5))
+                aggregate[:, _COUNT] = 0
+                aggregate[:, _SUM] = 0
+                aggregate[:, _MIN] = np.inf
+                aggregate[:, _MAX] = -np.inf
+                self._buckets[resolution][key] = aggregate
+            aggregate[:, _COUNT] += 1
+            aggregate[:, _SUM] += metrics
+            np.minimum(aggregate[:, _MIN], metrics, out=aggregate[:, _MIN])
+            np.maximum(aggregate[:, _MAX], metrics, out=aggregate[:, _MAX])
+            aggregate[:, _LAST] = metrics
+
+    def _rebuild_buckets(self, resolution: str, ordinals: np.ndarray) -> None:
+        """Recompute the buckets containing the given dates from the stored rows."""
+        dates = self._dates[:self._rows]
+        for key in {_bucket(int(ordinal), resolution) for ordinal in ordinals}:
+            start = _bucket_start(key, resolution).toordinal()
+            if resolution == "day":
+                end = start + 1
+            elif resolution == "week":
+                end = start + 7
+            else:
+                end = _bucket_start(key + 1, resolution).toordinal()
+            first, last = np.searchsorted(dates, [start, end])
+            if first == last:
+                self._buckets[resolution].pop(key, None)
+                continue
+            block = np.array(self._values[first:last][:, self._metric_columns])
+            aggregate = np.empty((len(AGGREGATED_METRICS), 5))
+            aggregate[:, _COUNT] = last - first
+            aggregate[:, _SUM] = block.sum(axis=0)
+            aggregate[:, _MIN] = block.min(axis=0)
+            aggregate[:, _MAX] = block.max(axis=0)
+            aggregate[:, _LAST] = block[-1]
+            self._buckets[resolution][key] = aggregate
+
+    def _range(self, start: Optional[datetime.date], end: Optional[datetime.date]) -> Tuple[int, int]:
+        """Row bounds [first, last) of the dates within [start, end]."""
+        dates = self._dates[:self._rows]
+        first = int(np.searchsorted(dates, start.toordinal(), "left")) if start else 0
+        last = int(np.searchsorted(dates, end.toordinal(), "right")) if end else self._rows
+        return first, max(first, last)
+
+    def latest_date(self) -> Optional[datetime.date]:
+        """Get the latest stored date, or None if the store is empty."""
+        return datetime.date.fromordinal(int(self._dates[self._rows - 1])) if self._rows else None
+
+    def dates(self,
+              start: Optional[datetime.date] = None,
+              end: Optional[datetime.date] = None) -> List[datetime.date]:
+        """
+        Get the stored dates within a range.
+
+        Args:
+            start: First date (inclusive, open if None)
+            end: Last date (inclusive, open if None)
+
+        Returns:
+            Ascending list of dates
+        """
+        first, last = self._range(start, end)
+        return [datetime.date.fromordinal(int(o)) for o in self._dates[first:last]]
+
+    def series(self,
+               field: str,
+               start: Optional[datetime.date] = None,
+               end: Optional[datetime.date] = None) -> Tuple[List[datetime.date], np.ndarray]:
+        """
+        Get one field over a date range.
+
+        Args:
+            field: Name of a field in FIELDS
+            start: First date (inclusive, open if None)
+            end: Last date (inclusive, open if None)
+
+        Returns:
+            (dates, values) in date order
+        """
+        first, last = self._range(start, end)
+        dates = [datetime.date.fromordinal(int(o)) for o in self._dates[first:last]]
+        return dates, np.array(self._values[first:last, FIELDS.index(field)])
+
+    def aggregates(self,
+                   metric: str,
+                   resolution: str = "week",
+                   start: Optional[datetime.date] = None,
+                   end: Optional[datetime.date] = None) -> Dict[str, np.ndarray]:
+        """
+        Get the bucketed aggregates of a ratio over a date range.
+
+        Buckets are included if their start date lies within the range.
+
+        Args:
+            metric: "lcr" or "nsfr"
+            resolution: "day", "week" or "month"
+            start: First date (inclusive, open if None)
+            end: Last date (inclusive, open if None)
+
+        Returns:
+            Dictionary of per-bucket arrays: start (bucket start dates),
+            count, mean, min, max and last
+        """
+        buckets = self._buckets[resolution]
+        low = _bucket(start.toordinal(), resolution) if start else None
+        high = _bucket(end.toordinal(), resolution) if end else None
+        keys = sorted(key for key in buckets
+                      if (low is None or key >= low) and (high is None or key <= high))
+
+        m = AGGREGATED_METRICS.index(metric)
+        table = np.array([buckets[key][m] for key in keys]).reshape(len(keys), 5)
+        return {
+            "start": [_bucket_start(key, resolution) for key in keys],
+            "count": table[:, _COUNT].astype(np.int64),
+            "mean": table[:, _SUM] / np.maximum(table[:, _COUNT], 1),
+            "min": table[:, _MIN],
+            "max": table[:, _MAX],
+            "last": table[:, _LAST]
+        }
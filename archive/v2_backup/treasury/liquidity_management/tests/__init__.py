@@ -0,0 +1,3 @@
+"""
+Treasury liquidity management tests package.
+"""
@@ -0,0 +1,192 @@
+"""
+Liquidity Snapshot Store Tests - Treasury
+
+This module checks the date-indexed snapshot store and its bucketed
+LCR/NSFR aggregates against grouping the snapshots directly, and the
+dashboard queries and chart cache built on it.
+"""
+import collections
+import datetime
+import json
+import logging
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from ..snapshot_store import LiquiditySnapshotStore, FIELDS
+from ..liquidity_dashboard import LiquidityDashboard, LiquiditySnapshot
+
+BASE_DATE = datetime.date(2024, 1, 1)
+
+
+def bucket_start(date, resolution):
+    return {"day": date,
+            "week": date - datetime.timedelta(days=date.weekday()),
+            "month": date.replace(day=1)}[resolution]
+
+
+def fill(store, seed=1, days=800):
+    """Put snapshots out of order, back-filled and replaced; return the final values by date."""
+    rng = random.Random(seed)
+    order = list(range(days))
+    rng.shuffle(order)
+    expected = {}
+    for offset in order[:300] + sorted(order[300:]) + order[:50]:
+        date = BASE_DATE + datetime.timedelta(days=offset)
+        values = {name: rng.random() for name in FIELDS}
+        store.put(date, values)
+        expected[date] = values
+    return expected
+
+
+class TestLiquiditySnapshotStore(unittest.TestCase):
+    """Test cases for LiquiditySnapshotStore."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        logging.disable(logging.INFO)
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the store directory and re-enable logging."""
+        shutil.rmtree(self.directory)
+        logging.disable(logging.NOTSET)
+
+    def assert_aggregates_match(self, store, expected, start=None, end=None):
+        for resolution in ("day", "week", "month"):
+            groups = collections.defaultdict(list)
+            for date in sorted(expected):
+                key = bucket_start(date, resolution)
+                if (start is None or key >= bucket_start(start, resolution)) and \
+                        (end is None or key <= bucket_start(end, resolution)):
+                    groups[key].append(expected[date]["lcr"])
+
+            aggregates = store.aggregates("lcr", resolution, start, end)
+
+            self.assertEqual(aggregates["start"], sorted(groups), resolution)
+            for i, key in enumerate(aggregates["start"]):
+                values = groups[key]
+                self.assertEqual(aggregates["count"][i], len(values))
+                self.assertAlmostEqual(aggregates["mean"][i], np.mean(values))
+                self.assertEqual(aggregates["min"][i], min(values))
+                self.assertEqual(aggregates["max"][i], max(values))
+                self.assertEqual(aggregates["last"][i], values[-1])
+
+    def test_aggregates_match_grouped_snapshots(self):
+        """Test day, week and month buckets after appends, back-fills and replacements."""
+        for directory in (None, self.directory):
+            store = LiquiditySnapshotStore(directory)
+            expected = fill(store)
+
+            self.assertEqual(len(store), len(expected))
+            self.assertEqual(store.dates(), sorted(expected))
+            self.assert_aggregates_match(store, expected)
+            self.assert_aggregates_match(store, expected, datetime.date(2024, 3, 13), datetime.date(2025, 2, 2))
+
+    def test_range_queries(self):
+        """Test inclusive date ranges on dates and series."""
+        store = LiquiditySnapshotStore()
+        expected = fill(store, days=100)
+        start, end = BASE_DATE + datetime.timedelta(days=10), BASE_DATE + datetime.timedelta(days=20)
+
+        dates, values = store.series("nsfr", start, end)
+
+        self.assertEqual(dates, [d for d in sorted(expected) if start <= d <= end])
+        np.testing.assert_array_equal(values, [expected[d]["nsfr"] for d in dates])
+        self.assertEqual(store.dates(end, start), [])
+        self.assertEqual(store.latest_date(), max(expected))
+        self.assertIsNone(LiquiditySnapshotStore().latest_date())
+
+    def test_reopened_store_rebuilds_aggregates(self):
+        """Test that a memory-mapped store is reopened with its aggregates."""
+        store = LiquiditySnapshotStore(self.directory)
+        expected = fill(store, days=600)
+        store.flush()
+        del store
+
+        reopened = LiquiditySnapshotStore(self.directory)
+
+        self.assertEqual(reopened.dates(), sorted(expected))
+        self.assert_aggregates_match(reopened, expected)
+
+    def test_store_with_other_fields_is_rejected(self):
+        """Test reopening a store written with a different column layout."""
+        LiquiditySnapshotStore(self.directory).put(BASE_DATE, {name: 1.0 for name in FIELDS})
+        with open(os.path.join(self.directory, "store.json"), "w") as handle:
+            json.dump({"fields": ["total_cash"]}, handle)
+
+        with self.assertRaises(ValueError):
+            LiquiditySnapshotStore(self.directory)
+
+
+class TestLiquidityDashboardStore(unittest.TestCase):
+    """Test cases for the dashboard queries served by the store."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        logging.disable(logging.INFO)
+        self.dashboard = LiquidityDashboard("Test Bank")
+        self.today = datetime.date.today()
+        rng = random.Random(3)
+        days = list(range(120))
+        rng.shuffle(days)
+        for offset in days:
+            self.dashboard.add_snapshot(self.snapshot(self.today - datetime.timedelta(days=offset), rng))
+
+    def tearDown(self):
+        """Re-enable logging."""
+        logging.disable(logging.NOTSET)
+
+    def snapshot(self, date, rng):
+        return LiquiditySnapshot(
+            date=date,
+            total_cash=Decimal(str(rng.randint(100, 200))),
+            high_quality_liquid_assets=Decimal(str(rng.randint(80, 160))),
+            short_term_obligations=Decimal(str(rng.randint(90, 110))),
+            stable_funding=Decimal(str(rng.randint(80, 160))),
+            required_stable_funding=Decimal("100")
+        )
+
+    def test_historical_snapshots_match_date_filter(self):
+        """Test the window query against filtering the snapshot dictionary."""
+        end = self.today - datetime.timedelta(days=15)
+        start = end - datetime.timedelta(days=30)
+
+        history = self.dashboard.get_historical_snapshots(30, end)
+
+        self.assertEqual(list(history), sorted(d for d in self.dashboard.snapshots if start <= d <= end))
+        self.assertEqual(self.dashboard.get_latest_snapshot().date, self.today)
+
+    def test_metric_aggregates_use_snapshot_ratios(self):
+        """Test that stored LCRs are the snapshot ratios."""
+        aggregates = self.dashboard.get_metric_aggregates("lcr", "day", days=10)
+        dates = sorted(d for d in self.dashboard.snapshots if d >= self.today - datetime.timedelta(days=10))
+
+        np.testing.assert_allclose(aggregates["last"], [float(self.dashboard.snapshots[d].lcr) for d in dates])
+
+    def test_chart_cache_is_invalidated_by_new_snapshots(self):
+        """Test that a cached render is reused until a snapshot lands in its window."""
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "ratios.png")
+            self.assertEqual(self.dashboard.generate_lcr_nsfr_chart(30, path), path)
+            self.assertEqual(len(self.dashboard._chart_cache), 1)
+
+            self.dashboard.generate_lcr_nsfr_chart(30, path)
+            self.assertEqual(len(self.dashboard._chart_cache), 1)
+
+            self.dashboard.add_snapshot(self.snapshot(self.today - datetime.timedelta(days=200), random.Random(4)))
+            self.assertEqual(len(self.dashboard._chart_cache), 1)
+            self.dashboard.add_snapshot(self.snapshot(self.today, random.Random(5)))
+            self.assertEqual(self.dashboard._chart_cache, {})
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
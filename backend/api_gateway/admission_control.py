@@ -0,0 +1,268 @@
+"""
+Admission Control for CBS Platform V2.0 API Gateway
+Priority classes, per-class concurrency budgets and queue-time load shedding.
+"""
+
+import asyncio
+import logging
+import math
+import re
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, Deque, List, Optional, Tuple
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, priority_class: str, reason: str, retry_after: int):
+        super().__init__(f"{priority_class} request shed: {reason}")
+        self.priority_class = priority_class
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class PriorityClass:
+    """
+    Concurrency budget and wait queue for one priority class.
+
+    Requests beyond ``max_concurrency`` wait in a FIFO queue. Queue time is
+    policed CoDel-style: while the queue has drained below ``target_delay``
+    within the last ``interval``, waiters may queue for up to
+    ``max_queue_time``; once the queue has stayed above target for a whole
+    interval the class is overloaded, and new waiters only get
+    ``target_delay`` before being shed. A standing queue therefore turns
+    into fast 503s instead of latency every client pays.
+    """
+
+    def __init__(self, name: str, rank: int, settings: Dict[str, Any]):
+        self.name = name
+        self.rank = rank
+        self.max_concurrency = int(settings.get("max_concurrency", 100))
+        self.max_queue = int(settings.get("max_queue", self.max_concurrency * 2))
+        self.target_delay = settings.get("target_delay_ms", 50) / 1000.0
+        self.interval = settings.get("interval_ms", 500) / 1000.0
+        self.max_queue_time = settings.get("max_queue_time_ms", 2000) / 1000.0
+        self.retry_after = int(settings.get("retry_after_seconds", 1))
+
+        self.in_flight = 0
+        self._waiters: Deque[Tuple[asyncio.Future, float]] = deque()
+        self._below_target_at = time.monotonic()
+
+        self.metrics = {
+            "admitted": 0,
+            "queued": 0,
+            "dequeued": 0,
+            "shed_queue_full": 0,
+            "shed_queue_timeout": 0,
+            "total_queue_time": 0.0,
+            "max_queue_time": 0.0
+        }
+
+    def overloaded(self, now: Optional[float] = None) -> bool:
+        """Whether the queue has stayed above target delay for a full interval."""
+        now = time.monotonic() if now is None else now
+        return bool(self._waiters) and now - self._below_target_at > self.interval
+
+    async def acquire(self) -> float:
+        """Take a slot, queueing if the budget is spent. Returns the time spent queued."""
+        now = time.monotonic()
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            self._below_target_at = now
+            self.metrics["admitted"] += 1
+            return 0.0
+
+        if len(self._waiters) >= self.max_queue:
+            self.metrics["shed_queue_full"] += 1
+            raise AdmissionRejected(self.name, "queue_full", self._retry_after())
+
+        timeout = self.target_delay if self.overloaded(now) else self.max_queue_time
+        future = asyncio.get_running_loop().create_future()
+        entry = (future, now)
+        self._waiters.append(entry)
+        self.metrics["queued"] += 1
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # A slot was handed over as the timer fired; keep it
+                return self._admitted(future.result())
+            self._remove(entry)
+            self.metrics["shed_queue_timeout"] += 1
+            raise AdmissionRejected(self.name, "queue_timeout", self._retry_after())
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                self._remove(entry)
+            raise
+        return self._admitted(future.result())
+
+    def release(self):
+        """Return a slot, handing it straight to the oldest live waiter."""
+        now = time.monotonic()
+        while self._waiters:
+            future, enqueued_at = self._waiters.popleft()
+            if future.done():
+                continue
+            sojourn = now - enqueued_at
+            if sojourn < self.target_delay:
+                self._below_target_at = now
+            future.set_result(sojourn)
+            return
+        self.in_flight -= 1
+        self._below_target_at = now
+
+    def _admitted(self, queue_time: float) -> float:
+        self.metrics["admitted"] += 1
+        self.metrics["dequeued"] += 1
+        self.metrics["total_queue_time"] += queue_time
+        self.metrics["max_queue_time"] = max(self.metrics["max_queue_time"], queue_time)
+        return queue_time
+
+    def _remove(self, entry: Tuple[asyncio.Future, float]):
+        try:
+            self._waiters.remove(entry)
+        except ValueError:
+            pass
+
+    def _retry_after(self) -> int:
+        # Back off longer the deeper the backlog relative to the budget (up to 4x)
+        backlog = len(self._waiters) / max(self.max_concurrency, 1)
+        return math.ceil(self.retry_after * min(1 + backlog, 4))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get metrics for this class."""
+        dequeued = self.metrics["dequeued"]
+        return {
+            "rank": self.rank,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queue_depth": len(self._waiters),
+            "overloaded": self.overloaded(),
+            "admitted": self.metrics["admitted"],
+            "queued": self.metrics["queued"],
+            "shed_queue_full": self.metrics["shed_queue_full"],
+            "shed_queue_timeout": self.metrics["shed_queue_timeout"],
+            "avg_queue_time_ms": (self.metrics["total_queue_time"] / dequeued * 1000) if dequeued else 0,
+            "max_queue_time_ms": self.metrics["max_queue_time"] * 1000
+        }
+
+
+class AdmissionController:
+    """
+    Gateway-facing admission control.
+
+    Each request is classified by "METHOD /path" against the configured
+    route patterns (highest priority class first) and must get a slot in
+    its class's budget before it is routed. Budgets are per class, so a
+    storm of statement exports exhausts only the reporting budget and never
+    queues payment traffic behind it.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.enabled = config.enabled
+        self.default_class = config.default_class
+        self.exempt_routes = [re.compile(pattern) for pattern in config.exempt_routes]
+        self.classes: Dict[str, PriorityClass] = {
+            name: PriorityClass(name, rank, settings)
+            for rank, (name, settings) in enumerate(config.priority_classes.items())
+        }
+        # Match higher priority classes first so overlapping patterns resolve upward
+        self.class_patterns: List[Tuple[str, re.Pattern]] = [
+            (name, re.compile(pattern))
+            for name in self.classes
+            for pattern in config.class_routes.get(name, [])
+        ]
+
+    def is_exempt(self, path: str) -> bool:
+        """Check whether a path bypasses admission control (health, metrics, docs)."""
+        return any(pattern.match(path) for pattern in self.exempt_routes)
+
+    def classify(self, method: str, path: str) -> str:
+        """Get the priority class for a request."""
+        target = f"{method.upper()} {path}"
+        for name, pattern in self.class_patterns:
+            if pattern.match(target):
+                return name
+        return self.default_class
+
+    async def admit(self, priority_class: str) -> float:
+        """Admit a request into its class; raises AdmissionRejected when shed."""
+        return await self.classes[priority_class].acquire()
+
+    def release(self, priority_class: str):
+        """Release a request's slot."""
+        self.classes[priority_class].release()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get admission control metrics."""
+        classes = {name: cls.get_metrics() for name, cls in self.classes.items()}
+        return {
+            "enabled": self.enabled,
+            "classes": classes,
+            "shed_total": sum(c["shed_queue_full"] + c["shed_queue_timeout"] for c in classes.values()),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+
+class AdmissionControlMiddleware(BaseHTTPMiddleware):
+    """
+    Admission control middleware: admit, queue or shed with a fast 503.
+    """
+
+    def __init__(self, app, controller: AdmissionController):
+        super().__init__(app)
+        self.controller = controller
+
+    async def dispatch(self, request: Request, call_next):
+        """Admit the request into its priority class before routing it."""
+        path = request.url.path
+        if not self.controller.enabled or self.controller.is_exempt(path):
+            return await call_next(request)
+
+        priority_class = self.controller.classify(request.method, path)
+        try:
+            queue_time = await self.controller.admit(priority_class)
+        except AdmissionRejected as e:
+            # Shed counts are in the metrics; a storm must not also flood the logs
+            logger.debug(f"Shed {request.method} {path} ({e.priority_class}, {e.reason})")
+            return JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={
+                    "error": "Service temporarily overloaded",
+                    "priority_class": e.priority_class,
+                    "reason": e.reason,
+                    "retry_after": e.retry_after
+                },
+                headers={"Retry-After": str(e.retry_after)}
+            )
+
+        request.state.priority_class = priority_class
+        try:
+            response = await call_next(request)
+        finally:
+            self.controller.release(priority_class)
+
+        response.headers["X-Priority-Class"] = priority_class
+        response.headers["X-Queue-Time"] = f"{queue_time * 1000:.1f}ms"
+        return response
+
+
+__all__ = [
+    "AdmissionRejected",
+    "PriorityClass",
+    "AdmissionController",
+    "AdmissionControlMiddleware"
+]
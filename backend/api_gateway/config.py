@@ -82,6 +82,7 @@ class CORSConfig:
         "X-Request-Signature",
         "X-Client-Key",
         "X-User-Agent",
+        "Idempotency-Key",
         "Accept",
         "Accept-Language",
         "Cache-Control"
@@ -135,6 +136,91 @@ class CacheConfig:
         "Last-Modified"
     ])
 
+@dataclass
+class CoalescingConfig:
+    """Request coalescing (single-flight) configuration for hot reads."""
+    enabled: bool = True
+    max_wait_ms: int = 2000  # Followers fall back to their own upstream call after this
+    coalescable_methods: List[str] = field(default_factory=lambda: ["GET", "HEAD"])
+    coalescable_routes: List[str] = field(default_factory=lambda: [
+        r"/api/v1/accounts/[^/]+/balance$",
+        r"/api/v1/accounts/[^/]+$",
+        r"/api/v1/customers/[^/]+$",
+        r"/api/v1/customers/[^/]+/accounts$",
+        r"/api/v1/customers/[^/]+/overview$",
+    ])
+    vary_headers: List[str] = field(default_factory=lambda: [
+        "Accept",
+        "Accept-Language"
+    ])
+
+@dataclass
+class AdmissionControlConfig:
+    """Admission control: priority classes, concurrency budgets and load shedding."""
+    enabled: bool = True
+    # Priority classes, highest first. Queue waits are capped at max_queue_time_ms,
+    # or at target_delay_ms once the queue has stayed above target for interval_ms.
+    priority_classes: Dict[str, Dict[str, Any]] = field(default_factory=lambda: {
+        "critical": {
+            "max_concurrency": 256,
+            "max_queue": 1024,
+            "target_delay_ms": 100,
+            "interval_ms": 500,
+            "max_queue_time_ms": 5000,
+            "retry_after_seconds": 1
+        },
+        "standard": {
+            "max_concurrency": 128,
+            "max_queue": 256,
+            "target_delay_ms": 50,
+            "interval_ms": 500,
+            "max_queue_time_ms": 2000,
+            "retry_after_seconds": 2
+        },
+        "reporting": {
+            "max_concurrency": 32,
+            "max_queue": 64,
+            "target_delay_ms": 50,
+            "interval_ms": 500,
+            "max_queue_time_ms": 1000,
+            "retry_after_seconds": 5
+        },
+        "analytics": {
+            "max_concurrency": 16,
+            "max_queue": 32,
+            "target_delay_ms": 50,
+            "interval_ms": 500,
+            "max_queue_time_ms": 500,
+            "retry_after_seconds": 10
+        }
+    })
+    # Patterns are matched against "METHOD /path"
+    class_routes: Dict[str, List[str]] = field(default_factory=lambda: {
+        "critical": [
+            r"\w+ /api/v1/payments(/.*)?$",
+            r"\w+ /api/v1/upi(/.*)?$",
+            r"POST /api/v1/accounts/[^/]+/(transfer|deposit|withdraw)$",
+            r"POST /api/v1/transactions/?$",
+        ],
+        "reporting": [
+            r"\w+ /api/v1/accounts/[^/]+/statements?(/.*)?$",
+            r"\w+ /api/v1/reports(/.*)?$",
+            r"\w+ /api/v1/.*/exports?(/.*)?$",
+        ],
+        "analytics": [
+            r"\w+ /api/v1/analytics(/.*)?$",
+            r"\w+ /api/v1/dashboards?(/.*)?$",
+        ]
+    })
+    default_class: str = "standard"
+    exempt_routes: List[str] = field(default_factory=lambda: [
+        r"/health",
+        r"/metrics",
+        r"/docs",
+        r"/redoc",
+        r"/openapi.json"
+    ])
+
 @dataclass
 class LoadBalancingConfig:
     """Load balancing and circuit breaker configuration."""
@@ -285,6 +371,8 @@ class GatewayConfig:
     cors: CORSConfig = field(default_factory=CORSConfig)
     rate_limiting: RateLimitingConfig = field(default_factory=RateLimitingConfig)
     cache: CacheConfig = field(default_factory=CacheConfig)
+    coalescing: CoalescingConfig = field(default_factory=CoalescingConfig)
+    admission_control: AdmissionControlConfig = field(default_factory=AdmissionControlConfig)
     load_balancing: LoadBalancingConfig = field(default_factory=LoadBalancingConfig)
     monitoring: MonitoringConfig = field(default_factory=MonitoringConfig)
     services: ServiceConfig = field(default_factory=ServiceConfig)
@@ -330,6 +418,18 @@ class GatewayConfig:
         config.cache.backend = os.getenv("CBS_CACHE_BACKEND", config.cache.backend)
         config.cache.cache_url = os.getenv("CBS_CACHE_URL")
         
+        # Request coalescing from environment
+        config.coalescing.enabled = os.getenv("CBS_COALESCING_ENABLED", "true").lower() == "true"
+        config.coalescing.max_wait_ms = int(os.getenv("CBS_COALESCING_MAX_WAIT_MS", str(config.coalescing.max_wait_ms)))
+        
+        # Admission control from environment (e.g. CBS_ADMISSION_REPORTING_MAX_CONCURRENCY=16)
+        config.admission_control.enabled = os.getenv("CBS_ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+        for class_name, settings in config.admission_control.priority_classes.items():
+            for setting in ("max_concurrency", "max_queue", "target_delay_ms", "max_queue_time_ms"):
+                env_value = os.getenv(f"CBS_ADMISSION_{class_name.upper()}_{setting.upper()}")
+                if env_value:
+                    settings[setting] = int(env_value)
+        
         # Monitoring config from environment
         config.monitoring.log_level = os.getenv("CBS_LOG_LEVEL", config.monitoring.log_level)
         config.monitoring.metrics_enabled = os.getenv("CBS_METRICS_ENABLED", "true").lower() == "true"
@@ -379,7 +479,8 @@ class GatewayConfig:
         for key, value in data.items():
             if hasattr(self, key):
                 if isinstance(getattr(self, key), (EncryptionConfig, SecurityConfig, CORSConfig, 
-                                                  RateLimitingConfig, CacheConfig, LoadBalancingConfig,
+                                                  RateLimitingConfig, CacheConfig, CoalescingConfig,
+                                                  AdmissionControlConfig, LoadBalancingConfig,
                                                   MonitoringConfig, ServiceConfig, ServerConfig, 
                                                   SSLConfig, DatabaseConfig)):
                     # Update nested config object
@@ -445,6 +546,22 @@ class GatewayConfig:
         if self.rate_limiting.enabled and self.rate_limiting.default_rate < 1:
             issues.append("Rate limiting default rate must be at least 1")
         
+        # Validate request coalescing
+        if self.coalescing.enabled and self.coalescing.max_wait_ms < 1:
+            issues.append("Request coalescing max wait must be at least 1 ms")
+        
+        # Validate admission control
+        if self.admission_control.enabled:
+            classes = self.admission_control.priority_classes
+            if self.admission_control.default_class not in classes:
+                issues.append(f"Admission control default class {self.admission_control.default_class} is not defined")
+            for class_name in self.admission_control.class_routes:
+                if class_name not in classes:
+                    issues.append(f"Admission control routes reference undefined class {class_name}")
+            for class_name, settings in classes.items():
+                if settings.get("max_concurrency", 0) < 1:
+                    issues.append(f"Admission class {class_name} max_concurrency must be at least 1")
+        
         return issues
     
     def is_development(self) -> bool:
@@ -549,6 +666,8 @@ __all__ = [
     "CORSConfig",
     "RateLimitingConfig",
     "CacheConfig", 
+    "CoalescingConfig",
+    "AdmissionControlConfig",
     "LoadBalancingConfig",
     "MonitoringConfig",
     "ServiceConfig",
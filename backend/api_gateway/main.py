@@ -12,6 +12,12 @@ import os
 from typing import Optional
 
 from ..shared.database import init_database, check_database_health
+from ..shared.serialization import PreSerializedJSONResponse, dumps as fast_json_dumps, loads as fast_json_loads
+from .request_coalescing import RequestCoalescer, UpstreamResult
+from .admission_control import AdmissionController, AdmissionControlMiddleware
+
+# Headers describing the upstream body encoding; the gateway sets its own
+HOP_BY_HOP_HEADERS = {"content-length", "content-encoding", "transfer-encoding", "connection"}
 
 app = FastAPI(
     title="Core Banking API Gateway",
@@ -78,6 +84,12 @@ client = httpx.AsyncClient(timeout=30.0)
             encryption_service=self.encryption_service
         )
         
+        # Initialize single-flight coalescing for hot read endpoints
+        self.request_coalescer = RequestCoalescer(config.coalescing)
+        
+        # Initialize admission control (priority classes and load shedding)
+        self.admission_controller = AdmissionController(config.admission_control)
+        
         # Initialize event bus
         self.event_bus = EventBus()
         self.event_bus.subscribe_all(LoggingEventHandler())
@@ -199,13 +211,19 @@ client = httpx.AsyncClient(timeout=30.0)
             service_router=self.service_router
         )
         
-        # 11. Metrics Middleware
+        # 11. Admission Control Middleware (sheds before any per-request work below it)
+        app.add_middleware(
+            AdmissionControlMiddleware,
+            controller=self.admission_controller
+        )
+        
+        # 12. Metrics Middleware
         app.add_middleware(
             MetricsMiddleware,
             config=self.config.monitoring
         )
         
-        # 12. Logging Middleware (Applied last to capture all requests)
+        # 13. Logging Middleware (Applied last to capture all requests)
         app.add_middleware(
             LoggingMiddleware,
             config=self.config.monitoring,
@@ -247,7 +265,9 @@ client = httpx.AsyncClient(timeout=30.0)
                 "gateway_metrics": {
                     "uptime_seconds": time.time() - self.start_time,
                     "requests_processed": self.requests_processed,
-                    "encrypted_requests": self.encrypted_requests
+                    "encrypted_requests": self.encrypted_requests,
+                    "request_coalescing": self.request_coalescer.get_metrics(),
+                    "admission_control": self.admission_controller.get_metrics()
                 }
             }
 
@@ -618,6 +638,11 @@ client = httpx.AsyncClient(timeout=30.0)
                 "X-Gateway-Version": "2.0.0",
                 "X-Encryption-Enabled": "true"
             }
+            
+            # Forward the client's Idempotency-Key so retried postings are deduplicated downstream
+            idempotency_key = request.headers.get("Idempotency-Key")
+            if idempotency_key:
+                headers["Idempotency-Key"] = idempotency_key
 
             # Get request body and encrypt if needed
             body = await request.body()
@@ -641,38 +666,54 @@ client = httpx.AsyncClient(timeout=30.0)
                     # Body is not JSON, pass as-is
                     pass
 
-            # Route request to service
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.request(
-                    method=request.method,
-                    url=f"{service_url}/{path}",
-                    headers=headers,
-                    content=body,
-                    params=request.query_params
-                )
+            async def call_upstream() -> UpstreamResult:
+                # Route request to service
+                async with httpx.AsyncClient(timeout=30.0) as client:
+                    response = await client.request(
+                        method=request.method,
+                        url=f"{service_url}/{path}",
+                        headers=headers,
+                        content=body,
+                        params=request.query_params
+                    )
 
-                # Decrypt response if needed
-                response_data = response.content
-                if response.headers.get("X-Encryption-Enabled") == "true":
-                    try:
-                        response_json = json.loads(response_data.decode())
-                        if response_json.get("encrypted"):
-                            response_data = await self.encryption_service.decrypt_response(response_json)
-                            response_data = json.dumps(response_data).encode()
-                    except (json.JSONDecodeError, KeyError):
-                        # Response is not encrypted JSON, pass as-is
-                        pass
-
-                # Increment metrics
-                self.requests_processed += 1
-                if request.headers.get("X-Encryption-Enabled"):
-                    self.encrypted_requests += 1
+                    # Decrypt response if needed
+                    response_data = response.content
+                    if response.headers.get("X-Encryption-Enabled") == "true":
+                        try:
+                            response_json = fast_json_loads(response_data)
+                            if response_json.get("encrypted"):
+                                response_data = await self.encryption_service.decrypt_response(response_json)
+                                response_data = fast_json_dumps(response_data)
+                        except (ValueError, KeyError, AttributeError):
+                            # Response is not encrypted JSON, pass as-is
+                            pass
+
+                    return UpstreamResult(
+                        status_code=response.status_code,
+                        content=response_data,
+                        headers=dict(response.headers)
+                    )
 
-                return JSONResponse(
-                    content=json.loads(response_data.decode()) if response_data else {},
-                    status_code=response.status_code,
-                    headers=dict(response.headers)
-                )
+            # Identical concurrent hot reads share one upstream call
+            upstream = await self.request_coalescer.execute(
+                service_name, request, str(token_data.user_id), call_upstream
+            )
+
+            # Increment metrics
+            self.requests_processed += 1
+            if request.headers.get("X-Encryption-Enabled"):
+                self.encrypted_requests += 1
+
+            # Upstream JSON is passed through as bytes rather than parsed and re-serialized
+            return PreSerializedJSONResponse(
+                content=upstream.content or b"{}",
+                status_code=upstream.status_code,
+                headers={
+                    name: value for name, value in upstream.headers.items()
+                    if name.lower() not in HOP_BY_HOP_HEADERS
+                }
+            )
 
         except httpx.RequestError as e:
             logger.error(f"Service routing failed for {service_name}: {str(e)}")
@@ -0,0 +1,189 @@
+"""
+Request Coalescing (Single-Flight) for CBS Platform V2.0 API Gateway
+Concurrent identical idempotent reads share one upstream call and its result.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Any, Callable, Awaitable, Tuple
+
+from fastapi import Request
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class UpstreamResult:
+    """Immutable upstream response shared between coalesced callers."""
+    status_code: int
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls that share a key.
+
+    The first caller for a key (the leader) runs the upstream call; callers
+    arriving while it is in flight (followers) await the same future. A
+    follower that waits longer than ``max_wait`` stops waiting and runs its
+    own call, so a slow leader never holds followers hostage.
+    """
+
+    def __init__(self, max_wait: float = 2.0):
+        self.max_wait = max_wait
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.metrics = {
+            "leader_calls": 0,
+            "coalesced_requests": 0,
+            "wait_timeouts": 0,
+            "leader_errors": 0,
+            "coalesced_by_route": {}
+        }
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]], route: str = "") -> Tuple[Any, bool]:
+        """
+        Run ``fn`` once per key among concurrent callers.
+
+        Returns:
+            Tuple of (result, shared) where shared is True for followers.
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            try:
+                # Shield so a timed-out follower never cancels the leader's call
+                result = await asyncio.wait_for(asyncio.shield(future), timeout=self.max_wait)
+                self.metrics["coalesced_requests"] += 1
+                by_route = self.metrics["coalesced_by_route"]
+                by_route[route] = by_route.get(route, 0) + 1
+                return result, True
+            except asyncio.TimeoutError:
+                self.metrics["wait_timeouts"] += 1
+                logger.warning(f"Coalesced wait exceeded {self.max_wait}s for {route}, calling upstream directly")
+                return await fn(), False
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # Leader's client went away; this follower still needs an answer
+                return await fn(), False
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self.metrics["leader_calls"] += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            self.metrics["leader_errors"] += 1
+            future.set_exception(e)
+            # Followers re-raise the leader's error; mark it retrieved when nobody waits
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def in_flight(self) -> int:
+        """Number of keys currently being fetched upstream."""
+        return len(self._in_flight)
+
+
+class RequestCoalescer:
+    """
+    Gateway-facing coalescing layer for hot read endpoints.
+
+    Only idempotent methods on configured routes are coalesced. The key
+    covers method, path, normalized query parameters, the principal scope
+    and any configured vary headers, so callers only ever share responses
+    they would have received individually.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.enabled = config.enabled
+        self.methods = {m.upper() for m in config.coalescable_methods}
+        self.route_patterns = [re.compile(pattern) for pattern in config.coalescable_routes]
+        self.vary_headers = [h.lower() for h in config.vary_headers]
+        self.single_flight = SingleFlight(max_wait=config.max_wait_ms / 1000.0)
+        self.requests_seen = 0
+
+    def is_coalescable(self, request: Request) -> bool:
+        """Check whether a request may share an upstream call."""
+        if not self.enabled or request.method.upper() not in self.methods:
+            return False
+        path = request.url.path
+        return any(pattern.match(path) for pattern in self.route_patterns)
+
+    def route_label(self, request: Request) -> str:
+        """
+        Get the metrics label of a request's route.
+
+        The matched route template is used rather than the path, which
+        carries account and customer numbers; requests outside a routed
+        app fall back to the configured pattern they matched.
+        """
+        route = request.scope.get("route")
+        if getattr(route, "path", None):
+            return route.path
+        path = request.url.path
+        for pattern in self.route_patterns:
+            if pattern.match(path):
+                return pattern.pattern
+        return "other"
+
+    def build_key(self, service_name: str, request: Request, principal_scope: str) -> str:
+        """Build the coalescing key for a request."""
+        params = sorted(request.query_params.multi_items())
+        vary = [(h, request.headers.get(h, "")) for h in self.vary_headers]
+        key_data = f"{service_name}|{request.method.upper()}|{request.url.path}|{params}|{principal_scope}|{vary}"
+        return hashlib.sha256(key_data.encode()).hexdigest()
+
+    async def execute(
+        self,
+        service_name: str,
+        request: Request,
+        principal_scope: str,
+        fn: Callable[[], Awaitable[UpstreamResult]]
+    ) -> UpstreamResult:
+        """Run the upstream call, coalescing with identical in-flight requests."""
+        if not self.is_coalescable(request):
+            return await fn()
+
+        self.requests_seen += 1
+        key = self.build_key(service_name, request, principal_scope)
+        result, _ = await self.single_flight.do(key, fn, route=self.route_label(request))
+        return result
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get coalescing metrics."""
+        metrics = self.single_flight.metrics
+        coalesced = metrics["coalesced_requests"]
+        return {
+            "enabled": self.enabled,
+            "coalescable_requests": self.requests_seen,
+            "leader_calls": metrics["leader_calls"],
+            "coalesced_requests": coalesced,
+            "coalescing_ratio": coalesced / self.requests_seen if self.requests_seen else 0,
+            "wait_timeouts": metrics["wait_timeouts"],
+            "leader_errors": metrics["leader_errors"],
+            "in_flight": self.single_flight.in_flight(),
+            "coalesced_by_route": dict(metrics["coalesced_by_route"]),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+
+__all__ = [
+    "UpstreamResult",
+    "SingleFlight",
+    "RequestCoalescer"
+]
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""
+Benchmark: serializing a 10k-row account statement.
+
+Compares the existing response paths with the precompiled encoders in
+backend.shared.serialization:
+
+- pydantic:  TransactionResponse per row, then FastAPI's JSON rendering
+- float:     dict per row with float() amounts, then json.dumps
+- compiled:  precompiled row encoder, then orjson with exact Decimals
+
+Usage:
+    python -m backend.benchmarks.statement_serialization [rows] [repeats]
+"""
+
+import enum
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel
+
+from backend.shared.serialization import TRANSACTION_ENCODER, encode_rows, dumps
+
+class TransactionResponse(BaseModel):
+    """Mirror of the account service response model"""
+    transaction_id: str
+    account_number: str
+    transaction_type: str
+    amount: Decimal
+    balance_before: Decimal
+    balance_after: Decimal
+    description: str
+    status: str
+    created_at: datetime
+    processed_at: Optional[datetime] = None
+
+class TransactionType(enum.Enum):
+    DEPOSIT = "DEPOSIT"
+    WITHDRAWAL = "WITHDRAWAL"
+
+class TransactionStatus(enum.Enum):
+    COMPLETED = "COMPLETED"
+
+class StatementRow:
+    """Stand-in for an ORM Transaction row (plain attribute access)"""
+    __slots__ = ("transaction_id", "transaction_type", "amount", "balance_before", "balance_after",
+                 "description", "status", "created_at", "processed_at")
+
+def make_rows(count: int):
+    rows = []
+    balance = Decimal("100000.00")
+    start = datetime(2025, 1, 1)
+    for i in range(count):
+        row = StatementRow()
+        amount = Decimal(f"{(i % 977) + 1}.{i % 100:02d}")
+        row.transaction_id = f"TXN-20250101-{i:08d}"
+        row.transaction_type = TransactionType.DEPOSIT if i % 2 else TransactionType.WITHDRAWAL
+        row.amount = amount
+        row.balance_before = balance
+        balance = balance + amount if i % 2 else balance - amount
+        row.balance_after = balance
+        row.description = f"Statement line {i}"
+        row.status = TransactionStatus.COMPLETED
+        row.created_at = start + timedelta(minutes=i)
+        row.processed_at = row.created_at
+        rows.append(row)
+    return rows
+
+def via_pydantic(rows, account_number):
+    from fastapi.encoders import jsonable_encoder
+    models = [
+        TransactionResponse(
+            transaction_id=r.transaction_id,
+            account_number=account_number,
+            transaction_type=r.transaction_type.value,
+            amount=r.amount,
+            balance_before=r.balance_before,
+            balance_after=r.balance_after,
+            description=r.description,
+            status=r.status.value,
+            created_at=r.created_at,
+            processed_at=r.processed_at
+        )
+        for r in rows
+    ]
+    return json.dumps(jsonable_encoder(models)).encode()
+
+def via_float_dicts(rows, account_number):
+    return json.dumps([
+        {
+            "transaction_id": r.transaction_id,
+            "account_number": account_number,
+            "transaction_type": r.transaction_type.value,
+            "amount": float(r.amount),
+            "balance_before": float(r.balance_before),
+            "balance_after": float(r.balance_after),
+            "description": r.description,
+            "status": r.status.value,
+            "created_at": r.created_at.isoformat(),
+            "processed_at": r.processed_at.isoformat()
+        }
+        for r in rows
+    ]).encode()
+
+def via_compiled(rows, account_number):
+    return dumps(encode_rows(TRANSACTION_ENCODER, rows, account_number=account_number))
+
+def _best_of(fn, rows, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(rows, "AC-20250101-000001")
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rows = make_rows(count)
+
+    results = {}
+    results["compiled"] = _best_of(via_compiled, rows, repeats)
+    results["float"] = _best_of(via_float_dicts, rows, repeats)
+    results["pydantic"] = _best_of(via_pydantic, rows, repeats)
+
+    baseline = results["pydantic"]
+    print(f"Serializing a {count}-row statement (best of {repeats}):")
+    for name, seconds in results.items():
+        print(f"  {name:<10} {seconds * 1000:8.2f} ms  ({baseline / seconds:5.1f}x vs pydantic)")
+
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,15 @@ Handles transaction operations with encryption for sensitive data.
 import logging
 from flask import request, jsonify, session
 from datetime import datetime, timedelta
+from decimal import Decimal
 import json
 import uuid
 
+from ..shared.idempotency import (
+    idempotency_manager, IdempotencyConflictError, IdempotencyInProgressError,
+    IDEMPOTENCY_HEADER, REPLAYED_HEADER
+)
+
 logger = logging.getLogger(__name__)
 
 class TransactionsController:
@@ -148,42 +154,61 @@ class TransactionsController:
             if missing_fields:
                 return jsonify({'error': f'Missing required fields: {missing_fields}'}), 400
             
-            # Generate transaction ID and reference number
-            transaction_id = f"TXN{uuid.uuid4().hex[:8].upper()}"
-            reference_number = f"REF{uuid.uuid4().hex[:10].upper()}"
-            
-            # Encrypt sensitive data
-            encrypted_reference = self.encryption_service.encrypt_data(reference_number)
-            encrypted_from_account = self.encryption_service.encrypt_data(data['from_account'])
-            encrypted_to_account = self.encryption_service.encrypt_data(data['to_account'])
-            
-            # Create transaction record
-            transaction = {
-                'transaction_id': transaction_id,
-                'from_account': encrypted_from_account,
-                'to_account': encrypted_to_account,
-                'amount': float(data['amount']),
-                'currency': data.get('currency', 'USD'),
-                'description': data['description'],
-                'type': 'transfer',
-                'status': 'pending',
-                'created_at': datetime.utcnow().isoformat(),
-                'reference_number': encrypted_reference,
-                'user_id': user_id
-            }
-            
-            logger.info(f"Created transaction {transaction_id} for user {user_id}")
+            # Replays of the same Idempotency-Key return the stored response
+            try:
+                result = idempotency_manager.execute(
+                    request.headers.get(IDEMPOTENCY_HEADER),
+                    str(user_id),
+                    idempotency_manager.fingerprint(request.method, request.path, data),
+                    lambda: self._post_transaction(data, user_id)
+                )
+            except IdempotencyConflictError as e:
+                return jsonify({'error': str(e)}), 422
+            except IdempotencyInProgressError as e:
+                return jsonify({'error': str(e)}), 409
             
-            return jsonify({
-                'success': True,
-                'transaction': transaction,
-                'message': 'Transaction created successfully'
-            }), 201
+            response = jsonify(result.body)
+            response.headers[REPLAYED_HEADER] = 'true' if result.replayed else 'false'
+            return response, result.status_code
             
         except Exception as e:
             logger.error(f"Create transaction error: {e}")
             return jsonify({'error': 'Failed to create transaction'}), 500
     
+    def _post_transaction(self, data, user_id):
+        """Post a new transaction and return (status_code, body)."""
+        # Generate transaction ID and reference number
+        transaction_id = f"TXN{uuid.uuid4().hex[:8].upper()}"
+        reference_number = f"REF{uuid.uuid4().hex[:10].upper()}"
+        
+        # Encrypt sensitive data
+        encrypted_reference = self.encryption_service.encrypt_data(reference_number)
+        encrypted_from_account = self.encryption_service.encrypt_data(data['from_account'])
+        encrypted_to_account = self.encryption_service.encrypt_data(data['to_account'])
+        
+        # Create transaction record
+        transaction = {
+            'transaction_id': transaction_id,
+            'from_account': encrypted_from_account,
+            'to_account': encrypted_to_account,
+            'amount': Decimal(str(data['amount'])),
+            'currency': data.get('currency', 'USD'),
+            'description': data['description'],
+            'type': 'transfer',
+            'status': 'pending',
+            'created_at': datetime.utcnow().isoformat(),
+            'reference_number': encrypted_reference,
+            'user_id': user_id
+        }
+        
+        logger.info(f"Created transaction {transaction_id} for user {user_id}")
+        
+        return 201, {
+            'success': True,
+            'transaction': transaction,
+            'message': 'Transaction created successfully'
+        }
+    
     def get_transaction_history(self):
         """Get detailed transaction history."""
         try:
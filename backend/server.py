@@ -11,6 +11,7 @@ import sys
 import logging
 from pathlib import Path
 from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from datetime import datetime
 import json
@@ -25,6 +26,7 @@ fix_path()
 
 # Import encryption service
 from backend.encryption.encryption_service import EncryptionService
+from backend.shared.serialization import dumps as fast_json_dumps, loads as fast_json_loads
 
 # Import configuration
 from config import DATABASE_CONFIG, API_CONFIG, SECURITY_CONFIG
@@ -39,9 +41,19 @@ logger = logging.getLogger(__name__)
 # Initialize encryption service
 encryption_service = EncryptionService()
 
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify() backed by orjson with exact Decimal encoding."""
+    
+    def dumps(self, obj, **kwargs):
+        return fast_json_dumps(obj).decode("utf-8")
+    
+    def loads(self, s, **kwargs):
+        return fast_json_loads(s)
+
 def create_app():
     """Create and configure the Flask application."""
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     
     # Configure CORS
     CORS(app, origins=['http://localhost:3000', 'http://127.0.0.1:3000'])
@@ -19,6 +19,7 @@ from ..models.account import Account, AccountType
 from ..models.customer import Customer
 from ..models.transaction import Transaction, TransactionType, TransactionStatus
 from ..database.connection import get_db_session
+from ...shared.serialization import STATEMENT_LINE_ENCODER, encode_rows
 
 class AccountService:
     """Account management service."""
@@ -273,14 +274,14 @@ class AccountService:
         transactions = query.limit(limit).all()
         
         # Calculate summary
-        total_credits = sum(t.amount for t in transactions if t.transaction_type in [TransactionType.DEPOSIT])
-        total_debits = sum(t.amount for t in transactions if t.transaction_type in [TransactionType.WITHDRAWAL, TransactionType.TRANSFER])
+        total_credits = sum((t.amount for t in transactions if t.transaction_type in [TransactionType.DEPOSIT]), Decimal('0.00'))
+        total_debits = sum((t.amount for t in transactions if t.transaction_type in [TransactionType.WITHDRAWAL, TransactionType.TRANSFER]), Decimal('0.00'))
         
         return {
             "account": {
                 "account_number": account.account_number,
                 "account_type": account.account_type.value,
-                "current_balance": float(account.balance),
+                "current_balance": account.balance,
                 "currency": account.currency
             },
             "statement_period": {
@@ -288,23 +289,12 @@ class AccountService:
                 "end_date": end_date.isoformat()
             },
             "summary": {
-                "total_credits": float(total_credits),
-                "total_debits": float(total_debits),
+                "total_credits": total_credits,
+                "total_debits": total_debits,
                 "transaction_count": len(transactions)
             },
-            "transactions": [
-                {
-                    "transaction_id": t.transaction_id,
-                    "date": t.transaction_date.isoformat(),
-                    "type": t.transaction_type.value,
-                    "amount": float(t.amount),
-                    "description": t.description,
-                    "reference_number": t.reference_number,
-                    "status": t.status.value,
-                    "to_account": t.to_account_number
-                }
-                for t in transactions
-            ]
+            # Amounts stay Decimal; the JSON layer encodes them exactly
+            "transactions": encode_rows(STATEMENT_LINE_ENCODER, transactions)
         }
     
     def update_account_limits(self, account_number: str, daily_withdrawal_limit: Decimal = None,
@@ -4,8 +4,9 @@ Account Service for Core Banking System V3.0
 This service handles account management, balance operations, and account-related transactions.
 """
 
-from fastapi import FastAPI, Depends, HTTPException, status, Query
+from fastapi import FastAPI, Depends, HTTPException, status, Query, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc
@@ -17,13 +18,19 @@ import random
 import string
 
 from ..shared.database import get_db_session
+from ..shared.serialization import FastJSONResponse, TRANSACTION_ENCODER, encode_rows
+from ..shared.idempotency import (
+    idempotency_manager, IdempotencyConflictError, IdempotencyInProgressError,
+    IDEMPOTENCY_HEADER, REPLAYED_HEADER
+)
 from ..shared.models import Account, Customer, Transaction, AccountType, AccountStatus, TransactionType, TransactionStatus
 from ..auth_service.main import get_current_user, User
 
 app = FastAPI(
     title="Account Service",
     description="Core Banking Account Management Service",
-    version="3.0.0"
+    version="3.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # CORS
@@ -108,6 +115,45 @@ def generate_transaction_id() -> str:
     random_part = ''.join(random.choices(string.digits + string.ascii_uppercase, k=8))
     return f"{prefix}-{date_part}-{random_part}"
 
+def to_transaction_response(transaction: Transaction, account_number: str) -> TransactionResponse:
+    """Build transaction response from a transaction row"""
+    return TransactionResponse(
+        transaction_id=transaction.transaction_id,
+        account_number=account_number,
+        transaction_type=transaction.transaction_type.value,
+        amount=transaction.amount,
+        balance_before=transaction.balance_before,
+        balance_after=transaction.balance_after,
+        description=transaction.description,
+        status=transaction.status.value,
+        created_at=transaction.created_at,
+        processed_at=transaction.processed_at
+    )
+
+async def run_idempotent(idempotency_key: Optional[str], current_user: User, path: str,
+                         payload: BaseModel, operation) -> FastJSONResponse:
+    """
+    Run a money-moving operation at most once per Idempotency-Key.
+    
+    Duplicates of a completed request get the stored response back; duplicates
+    of a request that is still posting wait for it instead of posting again.
+    """
+    fingerprint = idempotency_manager.fingerprint("POST", path, jsonable_encoder(payload))
+    try:
+        result = await idempotency_manager.execute_async(
+            idempotency_key, current_user.username, fingerprint, operation
+        )
+    except IdempotencyConflictError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except IdempotencyInProgressError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    
+    return FastJSONResponse(
+        content=result.body,
+        status_code=result.status_code,
+        headers={REPLAYED_HEADER: "true" if result.replayed else "false"}
+    )
+
 # Account Endpoints
 @app.post("/accounts", response_model=AccountResponse)
 async def create_account(
@@ -248,9 +294,19 @@ async def deposit_money(
     account_number: str,
     request: DepositRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db_session)
+    db: Session = Depends(get_db_session),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)
 ):
     """Deposit money to account"""
+    async def post_deposit():
+        return status.HTTP_200_OK, jsonable_encoder(_post_deposit(account_number, request, current_user, db))
+    
+    return await run_idempotent(
+        idempotency_key, current_user, f"/accounts/{account_number}/deposit", request, post_deposit
+    )
+
+def _post_deposit(account_number: str, request: DepositRequest, current_user: User, db: Session) -> TransactionResponse:
+    """Post a deposit"""
     # Check permissions
     if not current_user.is_employee():
         raise HTTPException(
@@ -299,27 +355,26 @@ async def deposit_money(
     db.commit()
     db.refresh(transaction)
     
-    return TransactionResponse(
-        transaction_id=transaction.transaction_id,
-        account_number=account.account_number,
-        transaction_type=transaction.transaction_type.value,
-        amount=transaction.amount,
-        balance_before=transaction.balance_before,
-        balance_after=transaction.balance_after,
-        description=transaction.description,
-        status=transaction.status.value,
-        created_at=transaction.created_at,
-        processed_at=transaction.processed_at
-    )
+    return to_transaction_response(transaction, account.account_number)
 
 @app.post("/accounts/{account_number}/withdraw", response_model=TransactionResponse)
 async def withdraw_money(
     account_number: str,
     request: WithdrawalRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db_session)
+    db: Session = Depends(get_db_session),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)
 ):
     """Withdraw money from account"""
+    async def post_withdrawal():
+        return status.HTTP_200_OK, jsonable_encoder(_post_withdrawal(account_number, request, current_user, db))
+    
+    return await run_idempotent(
+        idempotency_key, current_user, f"/accounts/{account_number}/withdraw", request, post_withdrawal
+    )
+
+def _post_withdrawal(account_number: str, request: WithdrawalRequest, current_user: User, db: Session) -> TransactionResponse:
+    """Post a withdrawal"""
     # Check permissions
     if not current_user.is_employee():
         raise HTTPException(
@@ -375,18 +430,7 @@ async def withdraw_money(
     db.commit()
     db.refresh(transaction)
     
-    return TransactionResponse(
-        transaction_id=transaction.transaction_id,
-        account_number=account.account_number,
-        transaction_type=transaction.transaction_type.value,
-        amount=transaction.amount,
-        balance_before=transaction.balance_before,
-        balance_after=transaction.balance_after,
-        description=transaction.description,
-        status=transaction.status.value,
-        created_at=transaction.created_at,
-        processed_at=transaction.processed_at
-    )
+    return to_transaction_response(transaction, account.account_number)
 
 @app.get("/accounts/{account_number}/transactions", response_model=List[TransactionResponse])
 async def get_account_transactions(
@@ -408,21 +452,10 @@ async def get_account_transactions(
         Transaction.account_id == account.id
     ).order_by(desc(Transaction.created_at)).offset(offset).limit(limit).all()
     
-    return [
-        TransactionResponse(
-            transaction_id=txn.transaction_id,
-            account_number=account.account_number,
-            transaction_type=txn.transaction_type.value,
-            amount=txn.amount,
-            balance_before=txn.balance_before,
-            balance_after=txn.balance_after,
-            description=txn.description,
-            status=txn.status.value,
-            created_at=txn.created_at,
-            processed_at=txn.processed_at
-        )
-        for txn in transactions
-    ]
+    # Rows go straight to JSON through the precompiled encoder, skipping per-row model validation
+    return FastJSONResponse(
+        content=encode_rows(TRANSACTION_ENCODER, transactions, account_number=account.account_number)
+    )
 
 @app.get("/health")
 async def health_check():
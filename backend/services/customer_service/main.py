@@ -8,20 +8,23 @@ from fastapi import FastAPI, Depends, HTTPException, status, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, EmailStr, Field
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import and_, or_, desc, func
 from typing import List, Optional
 from datetime import datetime, date
 import random
 import string
 
 from ..shared.database import get_db_session
+from ..shared.serialization import FastJSONResponse, CUSTOMER_ENCODER, ACCOUNT_SUMMARY_ENCODER, encode_rows
 from ..shared.models import Customer, Account, Gender, CustomerStatus, AccountType
+from ..shared.read_models import DEFAULT_TRANSACTIONS_PER_ACCOUNT, load_customer_360
 from ..auth_service.main import get_current_user, User
 
 app = FastAPI(
     title="Customer Service",
     description="Core Banking Customer Management Service",
-    version="3.0.0"
+    version="3.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # CORS
@@ -256,29 +259,8 @@ async def get_customer(
             detail="Customer not found"
         )
     
-    return CustomerResponse(
-        id=customer.id,
-        customer_id=customer.customer_id,
-        first_name=customer.first_name,
-        last_name=customer.last_name,
-        full_name=customer.get_full_name(),
-        date_of_birth=customer.date_of_birth,
-        age=customer.get_age(),
-        gender=customer.gender.value,
-        email=customer.email,
-        phone=customer.phone,
-        pan_number=customer.pan_number,
-        aadhar_number=customer.aadhar_number,
-        address_line1=customer.address_line1,
-        address_line2=customer.address_line2,
-        city=customer.city,
-        state=customer.state,
-        postal_code=customer.postal_code,
-        country=customer.country,
-        status=customer.status.value,
-        created_at=customer.created_at,
-        updated_at=customer.updated_at
-    )
+    # Hot profile read: encode the row directly instead of building a CustomerResponse
+    return FastJSONResponse(content=CUSTOMER_ENCODER(customer))
 
 @app.put("/customers/{customer_id}", response_model=CustomerResponse)
 async def update_customer(
@@ -379,10 +361,16 @@ async def search_customers(
     offset = (page - 1) * per_page
     customers = base_query.offset(offset).limit(per_page).all()
     
-    # Get account counts for each customer
+    # Get account counts for the whole page in one grouped query
+    account_counts = dict(
+        db.query(Account.customer_id, func.count(Account.id)).filter(
+            Account.customer_id.in_([customer.id for customer in customers])
+        ).group_by(Account.customer_id).all()
+    ) if customers else {}
+    
     customer_summaries = []
     for customer in customers:
-        account_count = db.query(Account).filter(Account.customer_id == customer.id).count()
+        account_count = account_counts.get(customer.id, 0)
         customer_summaries.append(CustomerSummaryResponse(
             id=customer.id,
             customer_id=customer.customer_id,
@@ -420,17 +408,24 @@ async def get_customer_accounts(
     
     accounts = db.query(Account).filter(Account.customer_id == customer.id).all()
     
-    return [
-        {
-            "account_number": acc.account_number,
-            "account_type": acc.account_type.value,
-            "balance": acc.balance,
-            "currency": acc.currency,
-            "status": acc.status.value,
-            "created_at": acc.created_at
-        }
-        for acc in accounts
-    ]
+    return FastJSONResponse(content=encode_rows(ACCOUNT_SUMMARY_ENCODER, accounts))
+
+@app.get("/customers/{customer_id}/overview")
+async def get_customer_overview(
+    customer_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db_session),
+    transactions_per_account: int = Query(DEFAULT_TRANSACTIONS_PER_ACCOUNT, ge=0, le=50)
+):
+    """Get customer with accounts, balances and recent transactions (fixed query count)"""
+    overview = load_customer_360(db, customer_id, transactions_per_account)
+    if overview is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Customer not found"
+        )
+    
+    return FastJSONResponse(content=overview)
 
 @app.patch("/customers/{customer_id}/status")
 async def update_customer_status(
@@ -0,0 +1,39 @@
+"""
+Idempotency Package for Core Banking System V3.0
+
+This package provides Idempotency-Key handling for money-moving endpoints.
+"""
+
+from .stores import (
+    IdempotencyStore,
+    InMemoryIdempotencyStore,
+    RedisIdempotencyStore,
+    DatabaseIdempotencyStore,
+    StoredResponse
+)
+from .manager import (
+    IDEMPOTENCY_HEADER,
+    REPLAYED_HEADER,
+    IdempotencyConflictError,
+    IdempotencyInProgressError,
+    IdempotentResult,
+    IdempotencyManager,
+    create_idempotency_store,
+    idempotency_manager
+)
+
+__all__ = [
+    "IdempotencyStore",
+    "InMemoryIdempotencyStore",
+    "RedisIdempotencyStore",
+    "DatabaseIdempotencyStore",
+    "StoredResponse",
+    "IDEMPOTENCY_HEADER",
+    "REPLAYED_HEADER",
+    "IdempotencyConflictError",
+    "IdempotencyInProgressError",
+    "IdempotentResult",
+    "IdempotencyManager",
+    "create_idempotency_store",
+    "idempotency_manager"
+]
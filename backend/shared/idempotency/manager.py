@@ -0,0 +1,169 @@
+"""
+Idempotency Manager for Core Banking System V3.0
+
+This module honours the Idempotency-Key header on money-moving endpoints.
+The first request for a key runs the posting path and stores its response;
+duplicates get the stored response back, and duplicates that arrive while
+the first request is still posting wait for it instead of posting again.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, Tuple, Union
+
+from ..serialization import json_default
+from .stores import (
+    IdempotencyStore,
+    InMemoryIdempotencyStore,
+    RedisIdempotencyStore,
+    DatabaseIdempotencyStore,
+    StoredResponse
+)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+class IdempotencyConflictError(Exception):
+    """Raised when an Idempotency-Key is reused with a different request payload"""
+
+class IdempotencyInProgressError(Exception):
+    """Raised when a duplicate waited too long for the original request to finish"""
+
+@dataclass
+class IdempotentResult:
+    """Response produced by, or replayed for, an idempotent request"""
+    status_code: int
+    body: Any
+    replayed: bool = False
+
+class IdempotencyManager:
+    """Coordinates idempotent execution of money-moving operations."""
+
+    def __init__(self, store: IdempotencyStore, ttl_seconds: int = 86400,
+                 lock_ttl_seconds: int = 60, wait_timeout: float = 10.0,
+                 poll_interval: float = 0.01):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        # A claim outlives a crashed worker by at most this long
+        self.lock_ttl_seconds = lock_ttl_seconds
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+
+    @staticmethod
+    def fingerprint(method: str, path: str, body: Union[bytes, str, dict, None]) -> str:
+        """Fingerprint a request so a reused key with a different payload is rejected."""
+        if isinstance(body, dict):
+            body = json.dumps(body, sort_keys=True, default=str)
+        if isinstance(body, str):
+            body = body.encode()
+        digest = hashlib.sha256(f"{method.upper()}:{path}:".encode())
+        digest.update(body or b"")
+        return digest.hexdigest()
+
+    def execute(self, key: Optional[str], scope: str, fingerprint: str,
+                operation: Callable[[], Tuple[int, Any]]) -> IdempotentResult:
+        """Run a synchronous operation at most once per (scope, key)."""
+        if not key:
+            status_code, body = operation()
+            return IdempotentResult(status_code, body)
+
+        scoped_key = self._scoped_key(scope, key)
+        deadline = time.monotonic() + self.wait_timeout
+        delay = self.poll_interval
+        while True:
+            existing = self._claim(scoped_key, fingerprint)
+            if existing is None:
+                break
+            if existing.is_completed:
+                return self._replay(existing)
+            self._check_deadline(deadline, key)
+            time.sleep(delay)
+            delay = min(delay * 2, 0.25)
+
+        try:
+            status_code, body = operation()
+        except BaseException:
+            self.store.release(scoped_key)
+            raise
+        return self._store(scoped_key, fingerprint, status_code, body)
+
+    async def execute_async(self, key: Optional[str], scope: str, fingerprint: str,
+                            operation: Callable[[], Awaitable[Tuple[int, Any]]]) -> IdempotentResult:
+        """Run an async operation at most once per (scope, key)."""
+        if not key:
+            status_code, body = await operation()
+            return IdempotentResult(status_code, body)
+
+        scoped_key = self._scoped_key(scope, key)
+        deadline = time.monotonic() + self.wait_timeout
+        delay = self.poll_interval
+        while True:
+            existing = self._claim(scoped_key, fingerprint)
+            if existing is None:
+                break
+            if existing.is_completed:
+                return self._replay(existing)
+            self._check_deadline(deadline, key)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.25)
+
+        try:
+            status_code, body = await operation()
+        except BaseException:
+            self.store.release(scoped_key)
+            raise
+        return self._store(scoped_key, fingerprint, status_code, body)
+
+    def _claim(self, scoped_key: str, fingerprint: str) -> Optional[StoredResponse]:
+        existing = self.store.begin(scoped_key, fingerprint, self.lock_ttl_seconds)
+        if existing is not None and existing.fingerprint != fingerprint:
+            raise IdempotencyConflictError(
+                f"{IDEMPOTENCY_HEADER} was already used with a different request payload"
+            )
+        return existing
+
+    def _store(self, scoped_key: str, fingerprint: str, status_code: int, body: Any) -> IdempotentResult:
+        # Encoded with the same Decimal/datetime rules as responses so a replay renders identically
+        try:
+            encoded = json.dumps(body, separators=(',', ':'), default=json_default)
+        except (TypeError, ValueError):
+            # Nothing can be replayed, so free the key rather than leave it claimed until the TTL
+            self.store.release(scoped_key)
+            raise
+        self.store.complete(scoped_key, fingerprint, status_code, encoded, self.ttl_seconds)
+        return IdempotentResult(status_code, body)
+
+    @staticmethod
+    def _replay(entry: StoredResponse) -> IdempotentResult:
+        return IdempotentResult(entry.status_code, json.loads(entry.body), replayed=True)
+
+    @staticmethod
+    def _check_deadline(deadline: float, key: str):
+        if time.monotonic() >= deadline:
+            raise IdempotencyInProgressError(
+                f"Request with {IDEMPOTENCY_HEADER} {key} is still being processed"
+            )
+
+    @staticmethod
+    def _scoped_key(scope: str, key: str) -> str:
+        return f"{scope}:{key}"
+
+def create_idempotency_store() -> IdempotencyStore:
+    """Create the idempotency store configured by IDEMPOTENCY_BACKEND (memory, redis, database)."""
+    backend = os.getenv("IDEMPOTENCY_BACKEND", "memory").lower()
+    if backend == "redis":
+        return RedisIdempotencyStore(url=os.getenv("IDEMPOTENCY_REDIS_URL"))
+    if backend == "database":
+        return DatabaseIdempotencyStore()
+    return InMemoryIdempotencyStore(max_entries=int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000")))
+
+# Global idempotency manager instance
+idempotency_manager = IdempotencyManager(
+    store=create_idempotency_store(),
+    ttl_seconds=int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400")),
+    wait_timeout=float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", "10"))
+)
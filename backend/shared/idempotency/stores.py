@@ -0,0 +1,254 @@
+"""
+Idempotency Key Stores for Core Banking System V3.0
+
+This module provides the key -> response stores behind the Idempotency-Key
+header: an in-memory LRU for tests and single-process deployments, and
+Redis / database stores for production.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+IN_PROGRESS = "IN_PROGRESS"
+COMPLETED = "COMPLETED"
+
+@dataclass
+class StoredResponse:
+    """State of one idempotency key"""
+    fingerprint: str
+    state: str = IN_PROGRESS
+    status_code: Optional[int] = None
+    body: Optional[str] = None  # JSON-encoded response body
+    expires_at: float = 0.0
+
+    @property
+    def is_completed(self) -> bool:
+        return self.state == COMPLETED
+
+    def to_json(self) -> str:
+        return json.dumps(self.__dict__, separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, data) -> "StoredResponse":
+        return cls(**json.loads(data))
+
+class IdempotencyStore:
+    """
+    Base class for idempotency stores.
+
+    ``begin`` must be atomic: exactly one caller claims a missing key, every
+    other caller gets the existing entry back.
+    """
+
+    def begin(self, key: str, fingerprint: str, ttl: float) -> Optional[StoredResponse]:
+        """Claim a key. Returns None if claimed, else the existing entry."""
+        raise NotImplementedError
+
+    def complete(self, key: str, fingerprint: str, status_code: int, body: str, ttl: float):
+        """Store the final response for a claimed key."""
+        raise NotImplementedError
+
+    def release(self, key: str):
+        """Drop a claim so the request can be retried (used when posting fails)."""
+        raise NotImplementedError
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        """Get the entry for a key, if any."""
+        raise NotImplementedError
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """Bounded in-process LRU store with per-entry TTL"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, StoredResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def begin(self, key: str, fingerprint: str, ttl: float) -> Optional[StoredResponse]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                self._entries.move_to_end(key)
+                return entry
+
+            self._entries[key] = StoredResponse(fingerprint=fingerprint, expires_at=now + ttl)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._evict(now)
+            return None
+
+    def complete(self, key: str, fingerprint: str, status_code: int, body: str, ttl: float):
+        with self._lock:
+            self._entries[key] = StoredResponse(
+                fingerprint=fingerprint,
+                state=COMPLETED,
+                status_code=status_code,
+                body=body,
+                expires_at=time.time() + ttl
+            )
+            self._entries.move_to_end(key)
+
+    def release(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self, now: float):
+        """Evict the least recently used entry, never an in-flight claim that is still live."""
+        for key, entry in self._entries.items():
+            if entry.is_completed or entry.expires_at <= now:
+                del self._entries[key]
+                return
+
+class RedisIdempotencyStore(IdempotencyStore):
+    """Redis-backed store; claims use SET NX so they are atomic across gateway replicas"""
+
+    def __init__(self, url: str = None, client=None, prefix: str = "idempotency:"):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url or "redis://localhost:6379/0")
+        self.client = client
+        self.prefix = prefix
+
+    def begin(self, key: str, fingerprint: str, ttl: float) -> Optional[StoredResponse]:
+        entry = StoredResponse(fingerprint=fingerprint, expires_at=time.time() + ttl)
+        if self.client.set(self.prefix + key, entry.to_json(), nx=True, px=int(ttl * 1000)):
+            return None
+        existing = self.get(key)
+        if existing is None:
+            # Expired between SET and GET; try once more
+            if self.client.set(self.prefix + key, entry.to_json(), nx=True, px=int(ttl * 1000)):
+                return None
+            existing = self.get(key)
+        return existing
+
+    def complete(self, key: str, fingerprint: str, status_code: int, body: str, ttl: float):
+        entry = StoredResponse(
+            fingerprint=fingerprint,
+            state=COMPLETED,
+            status_code=status_code,
+            body=body,
+            expires_at=time.time() + ttl
+        )
+        self.client.set(self.prefix + key, entry.to_json(), px=int(ttl * 1000))
+
+    def release(self, key: str):
+        self.client.delete(self.prefix + key)
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        data = self.client.get(self.prefix + key)
+        return StoredResponse.from_json(data) if data else None
+
+class DatabaseIdempotencyStore(IdempotencyStore):
+    """Database-backed store on the idempotency_keys table; claims rely on the primary key"""
+
+    def __init__(self, session_factory=None):
+        if session_factory is None:
+            from ..database import db_manager
+            session_factory = db_manager.get_session
+        self.session_factory = session_factory
+
+    def begin(self, key: str, fingerprint: str, ttl: float) -> Optional[StoredResponse]:
+        from sqlalchemy.exc import IntegrityError
+        from ..models import IdempotencyRecord
+
+        now = datetime.utcnow()
+        session = self.session_factory()
+        try:
+            for _ in range(2):
+                session.add(IdempotencyRecord(
+                    key=key,
+                    fingerprint=fingerprint,
+                    state=IN_PROGRESS,
+                    created_at=now,
+                    expires_at=now + timedelta(seconds=ttl)
+                ))
+                try:
+                    session.commit()
+                    return None
+                except IntegrityError:
+                    session.rollback()
+
+                record = session.get(IdempotencyRecord, key)
+                if record is None:
+                    continue
+                if record.expires_at > now:
+                    return self._to_entry(record)
+                # Stale claim or expired response: replace it
+                session.delete(record)
+                session.commit()
+            return self._to_entry(session.get(IdempotencyRecord, key))
+        finally:
+            session.close()
+
+    def complete(self, key: str, fingerprint: str, status_code: int, body: str, ttl: float):
+        from ..models import IdempotencyRecord
+
+        session = self.session_factory()
+        try:
+            record = session.get(IdempotencyRecord, key)
+            if record is None:
+                record = IdempotencyRecord(key=key, created_at=datetime.utcnow())
+                session.add(record)
+            record.fingerprint = fingerprint
+            record.state = COMPLETED
+            record.status_code = status_code
+            record.response_body = body
+            record.expires_at = datetime.utcnow() + timedelta(seconds=ttl)
+            session.commit()
+        finally:
+            session.close()
+
+    def release(self, key: str):
+        from ..models import IdempotencyRecord
+
+        session = self.session_factory()
+        try:
+            session.query(IdempotencyRecord).filter(IdempotencyRecord.key == key).delete()
+            session.commit()
+        finally:
+            session.close()
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        from ..models import IdempotencyRecord
+
+        session = self.session_factory()
+        try:
+            record = session.get(IdempotencyRecord, key)
+            if record is None or record.expires_at <= datetime.utcnow():
+                return None
+            return self._to_entry(record)
+        finally:
+            session.close()
+
+    @staticmethod
+    def _to_entry(record) -> Optional[StoredResponse]:
+        if record is None:
+            return None
+        return StoredResponse(
+            fingerprint=record.fingerprint,
+            state=record.state,
+            status_code=record.status_code,
+            body=record.response_body,
+            # Columns hold naive UTC; without tzinfo .timestamp() would read them as local time
+            expires_at=record.expires_at.replace(tzinfo=timezone.utc).timestamp()
+        )
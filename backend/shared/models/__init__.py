@@ -10,6 +10,7 @@ from .customer import Customer, Gender, CustomerStatus
 from .account import Account, AccountType, AccountStatus
 from .transaction import Transaction, TransactionType, TransactionStatus, TransactionChannel
 from .branch import Branch
+from .idempotency import IdempotencyRecord
 
 __all__ = [
     "Base",
@@ -27,5 +28,6 @@ __all__ = [
     "TransactionType",
     "TransactionStatus",
     "TransactionChannel",
-    "Branch"
+    "Branch",
+    "IdempotencyRecord"
 ]
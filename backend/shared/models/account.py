@@ -54,7 +54,11 @@ class Account(BaseModel):
     
     # Relationships
     customer = relationship("Customer", back_populates="accounts")
-    transactions = relationship("Transaction", back_populates="account", lazy="dynamic")
+    # Transaction has two FKs to accounts; this side is the owning account only
+    transactions = relationship(
+        "Transaction", back_populates="account", lazy="dynamic",
+        foreign_keys="Transaction.account_id"
+    )
     
     def can_withdraw(self, amount: Decimal) -> bool:
         """Check if withdrawal amount is allowed"""
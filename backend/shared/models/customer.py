@@ -51,7 +51,8 @@ class Customer(BaseModel):
     status = Column(Enum(CustomerStatus), default=CustomerStatus.ACTIVE)
     
     # Relationships
-    accounts = relationship("Account", back_populates="customer", lazy="dynamic")
+    # Plain lazy loading so read paths can batch it with selectinload()
+    accounts = relationship("Account", back_populates="customer")
     
     def get_full_name(self):
         """Get customer's full name"""
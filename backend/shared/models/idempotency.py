@@ -0,0 +1,23 @@
+"""
+Idempotency Key Model for Core Banking System V3.0
+"""
+
+from sqlalchemy import Column, String, Integer, Text, DateTime
+
+from .base import Base
+
+class IdempotencyRecord(Base):
+    """Stored response for an Idempotency-Key on a money-moving endpoint"""
+    __tablename__ = "idempotency_keys"
+
+    # Scoped key: "<principal>:<Idempotency-Key header>"
+    key = Column(String(200), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)  # SHA-256 of method, path and body
+
+    # IN_PROGRESS while the first request is posting, COMPLETED once the response is stored
+    state = Column(String(12), nullable=False, default="IN_PROGRESS")
+    status_code = Column(Integer)
+    response_body = Column(Text)
+
+    created_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
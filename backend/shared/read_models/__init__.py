@@ -0,0 +1,17 @@
+"""
+Read Models Package for Core Banking System V3.0
+
+This package provides query-optimized aggregate views for read endpoints.
+"""
+
+from .customer_360 import (
+    DEFAULT_TRANSACTIONS_PER_ACCOUNT,
+    load_recent_transactions,
+    load_customer_360
+)
+
+__all__ = [
+    "DEFAULT_TRANSACTIONS_PER_ACCOUNT",
+    "load_recent_transactions",
+    "load_customer_360"
+]
@@ -0,0 +1,80 @@
+"""
+Customer 360 Read Model for Core Banking System V3.0
+
+This module loads "customer with accounts, balances and last N transactions"
+in a fixed number of queries, however many accounts the customer holds:
+
+1. the customer row
+2. all of the customer's accounts (selectinload)
+3. the last N transactions of every account (ROW_NUMBER() window per account)
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+
+from ..models import Customer, Account, Transaction
+from ..serialization import ACCOUNT_ENCODER, CUSTOMER_ENCODER, TRANSACTION_ENCODER
+
+DEFAULT_TRANSACTIONS_PER_ACCOUNT = 5
+
+def load_recent_transactions(db: Session, account_ids: List[int], limit: int) -> Dict[int, List[Transaction]]:
+    """Load the latest `limit` transactions of each account in one query."""
+    if not account_ids or limit <= 0:
+        return {}
+
+    ranked = db.query(
+        Transaction.id.label("id"),
+        func.row_number().over(
+            partition_by=Transaction.account_id,
+            order_by=(Transaction.created_at.desc(), Transaction.id.desc())
+        ).label("position")
+    ).filter(Transaction.account_id.in_(account_ids)).subquery()
+
+    rows = db.query(Transaction).join(ranked, ranked.c.id == Transaction.id).filter(
+        ranked.c.position <= limit
+    ).order_by(Transaction.account_id, ranked.c.position).all()
+
+    by_account: Dict[int, List[Transaction]] = defaultdict(list)
+    for transaction in rows:
+        by_account[transaction.account_id].append(transaction)
+    return by_account
+
+def load_customer_360(db: Session, customer_id: str,
+                      transactions_per_account: int = DEFAULT_TRANSACTIONS_PER_ACCOUNT) -> Optional[Dict[str, Any]]:
+    """
+    Build the customer 360 view for a customer number.
+
+    Returns None when the customer does not exist. Amounts stay Decimal;
+    the JSON layer encodes them exactly.
+    """
+    customer = db.query(Customer).options(
+        selectinload(Customer.accounts)
+    ).filter(Customer.customer_id == customer_id).first()
+    if not customer:
+        return None
+
+    accounts = sorted(customer.accounts, key=lambda account: account.id)
+    recent = load_recent_transactions(db, [account.id for account in accounts], transactions_per_account)
+
+    balances: Dict[str, Decimal] = defaultdict(lambda: Decimal('0.00'))
+    account_views = []
+    for account in accounts:
+        balances[account.currency] += account.balance
+        view = ACCOUNT_ENCODER(account)
+        view["recent_transactions"] = [
+            TRANSACTION_ENCODER(transaction) for transaction in recent.get(account.id, ())
+        ]
+        account_views.append(view)
+
+    return {
+        "customer": CUSTOMER_ENCODER(customer),
+        "accounts": account_views,
+        "summary": {
+            "account_count": len(accounts),
+            "total_balance_by_currency": dict(balances)
+        }
+    }
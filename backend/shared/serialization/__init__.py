@@ -0,0 +1,34 @@
+"""
+Serialization Package for Core Banking System V3.0
+
+This package provides fast JSON responses and precompiled row encoders.
+"""
+
+from .encoders import (
+    json_default,
+    dumps,
+    loads,
+    compile_row_encoder,
+    encode_rows,
+    ACCOUNT_ENCODER,
+    ACCOUNT_SUMMARY_ENCODER,
+    TRANSACTION_ENCODER,
+    STATEMENT_LINE_ENCODER,
+    CUSTOMER_ENCODER
+)
+from .responses import FastJSONResponse, PreSerializedJSONResponse
+
+__all__ = [
+    "json_default",
+    "dumps",
+    "loads",
+    "compile_row_encoder",
+    "encode_rows",
+    "ACCOUNT_ENCODER",
+    "ACCOUNT_SUMMARY_ENCODER",
+    "TRANSACTION_ENCODER",
+    "STATEMENT_LINE_ENCODER",
+    "CUSTOMER_ENCODER",
+    "FastJSONResponse",
+    "PreSerializedJSONResponse"
+]
@@ -0,0 +1,164 @@
+"""
+Fast JSON Encoders for Core Banking System V3.0
+
+This module provides orjson-backed serialization with exact Decimal encoding
+and precompiled row -> dict encoders for ORM rows, so hot read endpoints can
+skip per-field Pydantic validation on output.
+"""
+
+import enum
+import json
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in backend/requirements.txt
+    orjson = None
+
+FieldSpec = Union[str, Callable[[Any], Any]]
+
+def json_default(value: Any) -> Any:
+    """
+    Encode types the JSON backends do not handle natively.
+
+    Decimals are emitted as strings so amounts survive exactly (the same
+    representation Pydantic uses for Decimal fields in response models).
+    """
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(content, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=json_default, separators=(',', ':'), ensure_ascii=False
+    ).encode("utf-8")
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON bytes or text."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def compile_row_encoder(fields: Dict[str, FieldSpec], name: str = "row") -> Callable[[Any], Dict[str, Any]]:
+    """
+    Compile a row -> dict encoder for a fixed output schema.
+
+    Each field maps an output key to either an attribute path on the row
+    ("balance", "account.account_number") or a callable taking the row.
+    The encoder is generated once as a single dict literal, so encoding a
+    row costs one function call instead of a Pydantic model build.
+    """
+    namespace: Dict[str, Any] = {}
+    items = []
+    for index, (key, spec) in enumerate(fields.items()):
+        if callable(spec):
+            helper = f"_f{index}"
+            namespace[helper] = spec
+            items.append(f"{key!r}: {helper}(row)")
+        else:
+            path = ".".join(part for part in spec.split(".") if part.isidentifier())
+            if path != spec:
+                raise ValueError(f"Invalid attribute path for field {key!r}: {spec!r}")
+            items.append(f"{key!r}: row.{path}")
+
+    func_name = f"encode_{name}"
+    source = f"def {func_name}(row):\n    return {{{', '.join(items)}}}\n"
+    exec(compile(source, f"<row encoder {name}>", "exec"), namespace)
+    encoder = namespace[func_name]
+    encoder.fields = tuple(fields)
+    return encoder
+
+def encode_rows(encoder: Callable[[Any], Dict[str, Any]], rows: Iterable[Any], **constants) -> List[Dict[str, Any]]:
+    """Encode many rows, adding constant fields (e.g. the owning account number) to each."""
+    if not constants:
+        return [encoder(row) for row in rows]
+    encoded = []
+    for row in rows:
+        item = encoder(row)
+        item.update(constants)
+        encoded.append(item)
+    return encoded
+
+# Precompiled encoders for the service response schemas
+
+ACCOUNT_ENCODER = compile_row_encoder({
+    "id": "id",
+    "account_number": "account_number",
+    "account_type": "account_type",
+    "balance": "balance",
+    "available_balance": "available_balance",
+    "currency": "currency",
+    "status": "status",
+    "customer_id": "customer_id",
+    "branch_code": "branch_code",
+    "ifsc_code": "ifsc_code",
+    "created_at": "created_at"
+}, name="account")
+
+ACCOUNT_SUMMARY_ENCODER = compile_row_encoder({
+    "account_number": "account_number",
+    "account_type": "account_type",
+    "balance": "balance",
+    "currency": "currency",
+    "status": "status",
+    "created_at": "created_at"
+}, name="account_summary")
+
+TRANSACTION_ENCODER = compile_row_encoder({
+    "transaction_id": "transaction_id",
+    "transaction_type": "transaction_type",
+    "amount": "amount",
+    "balance_before": "balance_before",
+    "balance_after": "balance_after",
+    "description": "description",
+    "status": "status",
+    "created_at": "created_at",
+    "processed_at": "processed_at"
+}, name="transaction")
+
+STATEMENT_LINE_ENCODER = compile_row_encoder({
+    "transaction_id": "transaction_id",
+    "date": "transaction_date",
+    "type": "transaction_type",
+    "amount": "amount",
+    "description": "description",
+    "reference_number": "reference_number",
+    "status": "status",
+    "to_account": "to_account_number"
+}, name="statement_line")
+
+CUSTOMER_ENCODER = compile_row_encoder({
+    "id": "id",
+    "customer_id": "customer_id",
+    "first_name": "first_name",
+    "last_name": "last_name",
+    "full_name": lambda c: f"{c.first_name} {c.last_name}",
+    "date_of_birth": "date_of_birth",
+    "age": lambda c: c.get_age(),
+    "gender": "gender",
+    "email": "email",
+    "phone": "phone",
+    "pan_number": "pan_number",
+    "aadhar_number": "aadhar_number",
+    "address_line1": "address_line1",
+    "address_line2": "address_line2",
+    "city": "city",
+    "state": "state",
+    "postal_code": "postal_code",
+    "country": "country",
+    "status": "status",
+    "created_at": "created_at",
+    "updated_at": "updated_at"
+}, name="customer")
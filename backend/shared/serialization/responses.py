@@ -0,0 +1,23 @@
+"""
+Fast JSON Response Classes for Core Banking System V3.0
+"""
+
+from typing import Any
+
+from starlette.responses import JSONResponse, Response
+
+from .encoders import dumps
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson and exact Decimal encoding"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+class PreSerializedJSONResponse(Response):
+    """Response for a body that is already serialized JSON (passed through untouched)"""
+    media_type = "application/json"
+
+    def __init__(self, content: bytes, status_code: int = 200, headers=None, **kwargs):
+        super().__init__(content=content, status_code=status_code, headers=headers, **kwargs)
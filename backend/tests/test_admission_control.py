@@ -0,0 +1,144 @@
+"""
+Tests for priority-class admission control in the API gateway.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api_gateway.admission_control import (
+    AdmissionController, AdmissionControlMiddleware, AdmissionRejected, PriorityClass
+)
+from backend.api_gateway.config import AdmissionControlConfig
+
+def make_class(**settings):
+    defaults = {"max_concurrency": 1, "max_queue": 2, "target_delay_ms": 10,
+                "interval_ms": 50, "max_queue_time_ms": 200, "retry_after_seconds": 1}
+    defaults.update(settings)
+    return PriorityClass("reporting", 2, defaults)
+
+def test_requests_within_budget_are_admitted_without_queueing():
+    async def run():
+        cls = make_class(max_concurrency=2)
+        waits = [await cls.acquire(), await cls.acquire()]
+        return cls, waits
+
+    cls, waits = asyncio.run(run())
+
+    assert waits == [0.0, 0.0]
+    assert cls.in_flight == 2
+
+def test_release_hands_slot_to_oldest_waiter():
+    async def run():
+        cls = make_class()
+        await cls.acquire()
+        first = asyncio.ensure_future(cls.acquire())
+        second = asyncio.ensure_future(cls.acquire())
+        await asyncio.sleep(0)
+        cls.release()
+        await asyncio.wait_for(first, timeout=1)
+        second_waiting = not second.done()
+        cls.release()
+        await asyncio.wait_for(second, timeout=1)
+        cls.release()
+        return cls, second_waiting
+
+    cls, second_waiting = asyncio.run(run())
+
+    assert second_waiting
+    assert cls.in_flight == 0
+    assert cls.get_metrics()["queue_depth"] == 0
+
+def test_full_queue_is_shed_immediately():
+    async def run():
+        cls = make_class(max_queue=1)
+        await cls.acquire()
+        waiter = asyncio.ensure_future(cls.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as excinfo:
+            await cls.acquire()
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        return cls, excinfo.value
+
+    cls, rejected = asyncio.run(run())
+
+    assert rejected.reason == "queue_full"
+    assert rejected.priority_class == "reporting"
+    assert rejected.retry_after == 2
+    assert cls.metrics["shed_queue_full"] == 1
+    assert cls.get_metrics()["queue_depth"] == 0
+
+def test_waiter_is_shed_after_max_queue_time():
+    async def run():
+        cls = make_class(max_queue_time_ms=20)
+        await cls.acquire()
+        with pytest.raises(AdmissionRejected) as excinfo:
+            await cls.acquire()
+        return cls, excinfo.value
+
+    cls, rejected = asyncio.run(run())
+
+    assert rejected.reason == "queue_timeout"
+    assert cls.in_flight == 1
+    assert cls.get_metrics()["queue_depth"] == 0
+
+def test_standing_queue_shrinks_wait_to_target_delay():
+    async def run():
+        cls = make_class(max_queue=4, target_delay_ms=10, interval_ms=20, max_queue_time_ms=1000)
+        await cls.acquire()
+        standing = asyncio.ensure_future(cls.acquire())
+        await asyncio.sleep(0.05)
+        assert cls.overloaded()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with pytest.raises(AdmissionRejected):
+            await cls.acquire()
+        waited = loop.time() - started
+        standing.cancel()
+        await asyncio.gather(standing, return_exceptions=True)
+        return waited
+
+    assert asyncio.run(run()) < 0.5
+
+def test_routes_are_classified_by_priority():
+    controller = AdmissionController(AdmissionControlConfig())
+
+    assert controller.classify("POST", "/api/v1/payments/neft") == "critical"
+    assert controller.classify("post", "/api/v1/accounts/AC1/transfer") == "critical"
+    assert controller.classify("GET", "/api/v1/accounts/AC1/statements") == "reporting"
+    assert controller.classify("GET", "/api/v1/analytics/summary") == "analytics"
+    assert controller.classify("GET", "/api/v1/accounts/AC1") == "standard"
+    assert controller.is_exempt("/health/detailed")
+    assert not controller.is_exempt("/api/v1/payments")
+
+def test_middleware_sheds_with_503_and_retry_after():
+    config = AdmissionControlConfig()
+    config.priority_classes["reporting"]["max_concurrency"] = 0
+    config.priority_classes["reporting"]["max_queue"] = 0
+    controller = AdmissionController(config)
+
+    app = FastAPI()
+    app.add_middleware(AdmissionControlMiddleware, controller=controller)
+
+    @app.get("/api/v1/reports/daily")
+    async def report():
+        return {"ok": True}
+
+    @app.get("/api/v1/accounts/{number}")
+    async def account(number: str):
+        return {"account_number": number}
+
+    client = TestClient(app)
+    shed = client.get("/api/v1/reports/daily")
+    admitted = client.get("/api/v1/accounts/AC1")
+
+    assert shed.status_code == 503
+    assert shed.headers["Retry-After"] == "5"
+    assert shed.json()["reason"] == "queue_full"
+    assert admitted.status_code == 200
+    assert admitted.headers["X-Priority-Class"] == "standard"
+    assert controller.get_metrics()["shed_total"] == 1
+    assert controller.classes["standard"].in_flight == 0
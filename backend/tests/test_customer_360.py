@@ -0,0 +1,128 @@
+"""
+Query-count regression tests for the customer 360 read model.
+"""
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.shared.models import (
+    Base, Customer, Account, Transaction, Gender, AccountType,
+    TransactionType, TransactionStatus, TransactionChannel
+)
+from backend.shared.read_models import load_customer_360
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+@pytest.fixture
+def query_counter(engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+def seed_customer(db, account_count, transactions_per_account, customer_number="CUS-20250101-00001"):
+    customer = Customer(
+        customer_id=customer_number,
+        first_name="Asha",
+        last_name="Rao",
+        date_of_birth=date(1990, 4, 12),
+        gender=Gender.FEMALE,
+        email=f"{customer_number}@example.com",
+        phone="9876543210",
+        address_line1="12 MG Road, Indiranagar",
+        city="Bengaluru",
+        state="Karnataka",
+        postal_code="560038"
+    )
+    db.add(customer)
+    db.flush()
+
+    start = datetime(2025, 1, 1)
+    for a in range(account_count):
+        account = Account(
+            account_number=f"AC-{customer.id:04d}-{a:05d}",
+            account_type=AccountType.SAVINGS,
+            customer_id=customer.id,
+            balance=Decimal("1000.00") * (a + 1),
+            available_balance=Decimal("1000.00") * (a + 1),
+            branch_code="BLR001",
+            ifsc_code="CBSB0000001"
+        )
+        db.add(account)
+        db.flush()
+        for t in range(transactions_per_account):
+            db.add(Transaction(
+                transaction_id=f"TXN-{account.id:04d}-{t:05d}",
+                account_id=account.id,
+                transaction_type=TransactionType.DEPOSIT,
+                amount=Decimal("10.00") + t,
+                balance_before=Decimal("0.00"),
+                balance_after=Decimal("10.00") + t,
+                status=TransactionStatus.COMPLETED,
+                channel=TransactionChannel.ONLINE,
+                description=f"Deposit {t}",
+                created_at=start + timedelta(hours=t)
+            ))
+    db.commit()
+    db.expunge_all()
+    return customer_number
+
+@pytest.mark.parametrize("account_count", [1, 3, 25])
+def test_query_count_is_independent_of_account_count(db, query_counter, account_count):
+    customer_number = seed_customer(db, account_count, transactions_per_account=8)
+    query_counter.clear()
+
+    overview = load_customer_360(db, customer_number, transactions_per_account=5)
+
+    assert len(query_counter) == 3
+    assert overview["summary"]["account_count"] == account_count
+
+def test_returns_latest_transactions_per_account_newest_first(db, query_counter):
+    customer_number = seed_customer(db, account_count=2, transactions_per_account=8)
+
+    overview = load_customer_360(db, customer_number, transactions_per_account=3)
+
+    for account in overview["accounts"]:
+        ids = [t["transaction_id"] for t in account["recent_transactions"]]
+        prefix = ids[0][:9]
+        assert ids == [f"{prefix}{t:05d}" for t in (7, 6, 5)]
+
+def test_summary_totals_balances_by_currency(db):
+    customer_number = seed_customer(db, account_count=3, transactions_per_account=0)
+
+    overview = load_customer_360(db, customer_number)
+
+    assert overview["summary"]["total_balance_by_currency"] == {"INR": Decimal("6000.00")}
+    assert all(account["recent_transactions"] == [] for account in overview["accounts"])
+
+def test_customer_without_accounts_skips_transaction_query(db, query_counter):
+    customer_number = seed_customer(db, account_count=0, transactions_per_account=0)
+    query_counter.clear()
+
+    overview = load_customer_360(db, customer_number)
+
+    assert len(query_counter) == 2
+    assert overview["accounts"] == []
+
+def test_unknown_customer_returns_none(db, query_counter):
+    assert load_customer_360(db, "CUS-MISSING") is None
+    assert len(query_counter) == 1
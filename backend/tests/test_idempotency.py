@@ -0,0 +1,151 @@
+"""
+Tests for Idempotency-Key handling on money-moving operations.
+"""
+
+import asyncio
+import time
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.shared.models import Base
+from backend.shared.idempotency import (
+    IdempotencyManager, InMemoryIdempotencyStore, DatabaseIdempotencyStore,
+    IdempotencyConflictError, IdempotencyInProgressError
+)
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+@pytest.fixture(params=["memory", "database"])
+def manager(request, session_factory):
+    if request.param == "memory":
+        store = InMemoryIdempotencyStore()
+    else:
+        store = DatabaseIdempotencyStore(session_factory)
+    return IdempotencyManager(store, wait_timeout=0.05, poll_interval=0.005)
+
+def posting(result=(200, {"amount": Decimal("100.50")})):
+    calls = []
+
+    def operation():
+        calls.append(1)
+        return result
+
+    return operation, calls
+
+def test_requests_without_key_always_post(manager):
+    operation, calls = posting()
+
+    manager.execute(None, "teller", "fp", operation)
+    manager.execute(None, "teller", "fp", operation)
+
+    assert len(calls) == 2
+
+def test_duplicate_key_replays_stored_response(manager):
+    operation, calls = posting()
+    fingerprint = manager.fingerprint("POST", "/accounts/AC1/deposit", {"amount": "100.50"})
+
+    first = manager.execute("key-1", "teller", fingerprint, operation)
+    second = manager.execute("key-1", "teller", fingerprint, operation)
+
+    assert len(calls) == 1
+    assert not first.replayed and second.replayed
+    assert second.status_code == 200
+    assert second.body == {"amount": "100.50"}
+
+def test_keys_are_scoped_per_principal(manager):
+    operation, calls = posting()
+
+    manager.execute("key-1", "teller-a", "fp", operation)
+    manager.execute("key-1", "teller-b", "fp", operation)
+
+    assert len(calls) == 2
+
+def test_reused_key_with_different_payload_is_rejected(manager):
+    operation, calls = posting()
+    manager.execute("key-1", "teller", manager.fingerprint("POST", "/p", {"amount": "1"}), operation)
+
+    with pytest.raises(IdempotencyConflictError):
+        manager.execute("key-1", "teller", manager.fingerprint("POST", "/p", {"amount": "2"}), operation)
+    assert len(calls) == 1
+
+def test_failed_posting_releases_key_for_retry(manager):
+    def fail():
+        raise RuntimeError("ledger unavailable")
+
+    with pytest.raises(RuntimeError):
+        manager.execute("key-1", "teller", "fp", fail)
+
+    operation, calls = posting()
+    result = manager.execute("key-1", "teller", "fp", operation)
+    assert len(calls) == 1 and not result.replayed
+
+def test_unserializable_response_releases_key(manager):
+    operation, calls = posting((200, {"account": object()}))
+
+    with pytest.raises(TypeError):
+        manager.execute("key-1", "teller", "fp", operation)
+
+    operation, calls = posting()
+    result = manager.execute("key-1", "teller", "fp", operation)
+    assert len(calls) == 1 and not result.replayed
+
+def test_database_expiry_is_read_as_utc(session_factory, monkeypatch):
+    store = DatabaseIdempotencyStore(session_factory)
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        store.begin("teller:key-1", "fp", ttl=60)
+        entry = store.get("teller:key-1")
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+    assert entry.expires_at == pytest.approx(time.time() + 60, abs=5)
+
+def test_duplicate_of_request_in_progress_times_out(manager):
+    manager.store.begin("teller:key-1", "fp", ttl=60)
+    operation, calls = posting()
+
+    with pytest.raises(IdempotencyInProgressError):
+        manager.execute("key-1", "teller", "fp", operation)
+    assert calls == []
+
+def test_concurrent_async_duplicates_post_once():
+    manager = IdempotencyManager(InMemoryIdempotencyStore(), poll_interval=0.001)
+    calls = []
+
+    async def operation():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return 201, {"transaction_id": "TXN-1"}
+
+    async def run():
+        return await asyncio.gather(*(
+            manager.execute_async("key-1", "teller", "fp", operation) for _ in range(5)
+        ))
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert all(result.body == {"transaction_id": "TXN-1"} for result in results)
+    assert sum(result.replayed for result in results) == 4
+
+def test_memory_store_eviction_keeps_live_claims():
+    store = InMemoryIdempotencyStore(max_entries=2)
+    store.begin("in-flight", "fp", ttl=60)
+    store.begin("done", "fp", ttl=60)
+    store.complete("done", "fp", 200, "{}", ttl=60)
+
+    store.begin("new", "fp", ttl=60)
+
+    assert store.get("in-flight") is not None
+    assert store.get("done") is None
+    assert len(store) == 2
@@ -0,0 +1,145 @@
+"""
+Tests for single-flight request coalescing in the API gateway.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from starlette.requests import Request
+
+from backend.api_gateway.config import CoalescingConfig
+from backend.api_gateway.request_coalescing import RequestCoalescer, SingleFlight, UpstreamResult
+
+def make_request(path, method="GET", query="", headers=None, route=None):
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    }
+    if route is not None:
+        scope["route"] = SimpleNamespace(path=route)
+    return Request(scope)
+
+def test_concurrent_calls_share_one_upstream_call():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "balance"
+
+    async def run():
+        flight = SingleFlight(max_wait=1.0)
+        results = await asyncio.gather(*(flight.do("k", fetch) for _ in range(10)))
+        return flight, results
+
+    flight, results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert [result for result, _ in results] == ["balance"] * 10
+    assert sum(shared for _, shared in results) == 9
+    assert flight.metrics["coalesced_requests"] == 9
+    assert flight.in_flight() == 0
+
+def test_sequential_calls_are_not_coalesced():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return len(calls)
+
+    async def run():
+        flight = SingleFlight()
+        return [await flight.do("k", fetch) for _ in range(3)]
+
+    assert asyncio.run(run()) == [(1, False), (2, False), (3, False)]
+
+def test_leader_error_reaches_followers():
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ConnectionError("upstream down")
+
+    async def run():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("k", fail) for _ in range(3)), return_exceptions=True)
+        return flight, results
+
+    flight, results = asyncio.run(run())
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert flight.metrics["leader_errors"] == 1
+    assert flight.in_flight() == 0
+
+def test_slow_leader_releases_followers_after_max_wait():
+    async def slow():
+        await asyncio.sleep(0.2)
+        return "leader"
+
+    async def fast():
+        return "own"
+
+    async def run():
+        flight = SingleFlight(max_wait=0.01)
+        leader = asyncio.ensure_future(flight.do("k", slow))
+        await asyncio.sleep(0)
+        follower = await flight.do("k", fast)
+        return flight, await leader, follower
+
+    flight, leader, follower = asyncio.run(run())
+
+    assert leader == ("leader", False)
+    assert follower == ("own", False)
+    assert flight.metrics["wait_timeouts"] == 1
+
+def test_only_configured_reads_are_coalescable():
+    coalescer = RequestCoalescer(CoalescingConfig())
+
+    assert coalescer.is_coalescable(make_request("/api/v1/accounts/AC1/balance"))
+    assert not coalescer.is_coalescable(make_request("/api/v1/accounts/AC1/balance", method="POST"))
+    assert not coalescer.is_coalescable(make_request("/api/v1/payments"))
+    assert not RequestCoalescer(CoalescingConfig(enabled=False)).is_coalescable(
+        make_request("/api/v1/accounts/AC1/balance"))
+
+def test_key_covers_query_principal_and_vary_headers():
+    coalescer = RequestCoalescer(CoalescingConfig())
+    path = "/api/v1/accounts/AC1"
+
+    key = coalescer.build_key("accounts", make_request(path, query="a=1&b=2"), "user:1")
+
+    assert key == coalescer.build_key("accounts", make_request(path, query="b=2&a=1"), "user:1")
+    assert key != coalescer.build_key("accounts", make_request(path, query="a=1&b=3"), "user:1")
+    assert key != coalescer.build_key("accounts", make_request(path, query="a=1&b=2"), "user:2")
+    assert key != coalescer.build_key(
+        "accounts", make_request(path, query="a=1&b=2", headers={"Accept-Language": "hi"}), "user:1")
+
+def test_non_coalescable_requests_bypass_single_flight():
+    coalescer = RequestCoalescer(CoalescingConfig())
+    result = UpstreamResult(status_code=201, content=b"{}")
+
+    async def post():
+        return result
+
+    assert asyncio.run(coalescer.execute("accounts", make_request("/api/v1/transactions", "POST"), "user:1", post)) is result
+    assert coalescer.get_metrics()["coalescable_requests"] == 0
+
+def test_coalescing_metrics_are_labelled_by_route_not_path():
+    coalescer = RequestCoalescer(CoalescingConfig())
+    template = "/api/v1/accounts/{path:path}"
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return UpstreamResult(status_code=200, content=b"{}")
+
+    async def run():
+        for route in (template, None):
+            requests = [make_request(f"/api/v1/accounts/AC{i % 2}/balance", route=route) for i in range(4)]
+            await asyncio.gather(*(coalescer.execute("accounts", r, "user:1", fetch) for r in requests))
+
+    asyncio.run(run())
+
+    assert coalescer.get_metrics()["coalesced_by_route"] == {
+        template: 2,
+        r"/api/v1/accounts/[^/]+/balance$": 2
+    }
@@ -0,0 +1,78 @@
+"""
+Tests for the fast JSON encoders and precompiled row encoders.
+"""
+
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from backend.benchmarks.statement_serialization import TransactionResponse, TransactionType, make_rows
+from backend.shared.serialization import (
+    TRANSACTION_ENCODER, FastJSONResponse, compile_row_encoder, dumps, encode_rows, json_default, loads
+)
+
+class Row:
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+def test_decimals_keep_exact_digits():
+    payload = {"amount": Decimal("1234567890.10"), "rate": Decimal("0.0725")}
+
+    assert loads(dumps(payload)) == {"amount": "1234567890.10", "rate": "0.0725"}
+
+def test_json_default_handles_banking_types():
+    value = uuid.uuid4()
+
+    assert json_default(TransactionType.DEPOSIT) == "DEPOSIT"
+    assert json_default(date(2025, 3, 31)) == "2025-03-31"
+    assert json_default(datetime(2025, 3, 31, 9, 30)) == "2025-03-31T09:30:00"
+    assert json_default(value) == str(value)
+    with pytest.raises(TypeError):
+        json_default(object())
+
+def test_transaction_encoder_matches_pydantic_response():
+    rows = make_rows(50)
+
+    encoded = loads(dumps(encode_rows(TRANSACTION_ENCODER, rows, account_number="AC-1")))
+    expected = jsonable_encoder([
+        TransactionResponse(
+            transaction_id=r.transaction_id,
+            account_number="AC-1",
+            transaction_type=r.transaction_type.value,
+            amount=r.amount,
+            balance_before=r.balance_before,
+            balance_after=r.balance_after,
+            description=r.description,
+            status=r.status.value,
+            created_at=r.created_at,
+            processed_at=r.processed_at
+        )
+        for r in rows
+    ])
+
+    assert encoded == expected
+
+def test_row_encoder_follows_paths_and_callables():
+    encoder = compile_row_encoder({
+        "number": "account.account_number",
+        "label": lambda row: row.kind.upper()
+    }, name="test")
+    row = Row(account=Row(account_number="AC-9"), kind="savings")
+
+    assert encoder(row) == {"number": "AC-9", "label": "SAVINGS"}
+    assert encoder.fields == ("number", "label")
+
+def test_row_encoder_rejects_invalid_paths():
+    with pytest.raises(ValueError):
+        compile_row_encoder({"x": "balance; import os"})
+    with pytest.raises(ValueError):
+        compile_row_encoder({"x": "account..balance"})
+
+def test_fast_response_renders_exact_amounts():
+    response = FastJSONResponse({"balance": Decimal("10.00")})
+
+    assert response.body == b'{"balance":"10.00"}'
+    assert response.media_type == "application/json"